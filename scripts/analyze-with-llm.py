@@ -9,57 +9,82 @@ Verwendung:
     Optional mit OpenAI:
     OPENAI_API_KEY=xxx python scripts/analyze-with-llm.py --provider openai
 
+    Rate-Limits (Standard: die des Providers) und parallele Requests:
+    python scripts/analyze-with-llm.py --rpm 30 --tpm 12000 --concurrency 4
+
+    Mehrere Artikel pro Request (spart den wiederholten Prompt und Round-Trips):
+    python scripts/analyze-with-llm.py --batch-size 4
+
 Output:
-    data/blog-intelligence.json
+    data/intelligence/              (ein Shard pro Artikel, siehe intelligence_store.py)
+    data/blog-intelligence.json     (Export für die Website)
 """
 
 import os
 import sys
 import json
-import time
+import asyncio
 import argparse
 from pathlib import Path
 from datetime import datetime
 
+import aiohttp
+
+from intelligence_store import IntelligenceStore
+from json_schema import SchemaError, validate
+from llm_cache import ResponseCache
+from llm_scheduler import LLMError, LLMScheduler, TransientError, chat_completion, estimate_tokens
+
 # Konfiguration
 PROJECT_ROOT = Path(__file__).parent.parent
 INPUT_FILE = PROJECT_ROOT / "data" / "blog-content-raw.json"
 OUTPUT_FILE = PROJECT_ROOT / "data" / "blog-intelligence.json"
+STORE_DIR = PROJECT_ROOT / "data" / "intelligence"
+LLM_CACHE_FILE = PROJECT_ROOT / "data" / "llm-cache.json"
+
+# Bei jeder inhaltlichen Änderung am Prompt erhöhen (verwirft den LLM-Cache)
+PROMPT_VERSION = 1
+
+# Provider (beide sprechen die OpenAI-kompatible Chat-Completions-API)
+# rpm/tpm: Rate-Limits des Accounts – der Scheduler plant damit, 429 fängt den Rest ab
+PROVIDERS = {
+    'groq': {
+        'base_url': 'https://api.groq.com/openai/v1',
+        'api_key_env': 'GROQ_API_KEY',
+        'model': 'llama-3.3-70b-versatile',
+        'system': 'Du bist ein präziser JSON-Generator. Antworte NUR mit validem JSON, ohne Markdown-Formatierung, ohne Erklärungen.',
+        'rpm': 30,
+        'tpm': 12000
+    },
+    'openai': {
+        'base_url': 'https://api.openai.com/v1',
+        'api_key_env': 'OPENAI_API_KEY',
+        'model': 'gpt-4o-mini',
+        'system': 'Du bist ein präziser JSON-Generator. Antworte NUR mit validem JSON.',
+        'json_mode': True,
+        'rpm': 60,
+        'tpm': 200000
+    }
+}
 
-# Rate Limiting (Groq: 30 req/min, OpenAI: 60 req/min)
-RATE_LIMIT_DELAY = 2.5  # Sekunden zwischen Requests
-
-
-def get_analysis_prompt(article):
-    """Generiert den Analyse-Prompt für einen Artikel"""
-    return f"""Du bist ein einfühlsamer Content-Analyst für eine Coaching-Website.
-Die Website gehört Kathrin Stahl, einer Coachin die Menschen durch Lebenskrisen, Selbstfindung und persönliches Wachstum begleitet. Sie arbeitet viel mit Pferden, Meditation und systemischen Aufstellungen.
-
-Analysiere diesen Blog-Post TIEFGEHEND. Erfasse nicht nur die Oberfläche, sondern die emotionale und transformative Tiefe.
-
----
-TITEL: {article['title']}
-
-KATEGORIE: {article.get('category', 'unbekannt')}
-
-KERNAUSSAGEN (Blockquotes):
-{chr(10).join(['- ' + bq for bq in article.get('blockquotes', [])][:5]) or '(keine)'}
+MAX_TOKENS = 1500
+DEFAULT_CONCURRENCY = 4
+REQUEST_TIMEOUT = 120
 
-INHALT:
-{article['content'][:4000]}
----
 
-Antworte NUR mit einem validen JSON-Objekt (keine Erklärungen, kein Markdown):
+PROMPT_INTRO = """Du bist ein einfühlsamer Content-Analyst für eine Coaching-Website.
+Die Website gehört Kathrin Stahl, einer Coachin die Menschen durch Lebenskrisen, Selbstfindung und persönliches Wachstum begleitet. Sie arbeitet viel mit Pferden, Meditation und systemischen Aufstellungen."""
 
-{{
+# Antwortformat einer Analyse (im Einzel- und im Batch-Prompt)
+ANALYSIS_FORMAT = """{
   "kernbotschaft": "Die zentrale Erkenntnis in 1-2 Sätzen. Was soll der Leser wirklich verstehen?",
 
   "emotionaleTonalitaet": "EINE von: troestend | aktivierend | reflektierend | heilend | ermutigend | konfrontierend | liebevoll | transformierend",
 
-  "transformation": {{
+  "transformation": {
     "von": "Ausgangszustand des Lesers (z.B. 'Selbstzweifel', 'innerer Kampf')",
     "zu": "Zielzustand (z.B. 'Selbstakzeptanz', 'innere Ruhe')"
-  }},
+  },
 
   "tiefenthemen": [
     "Spezifische Themen, NICHT generisch!",
@@ -78,78 +103,257 @@ Antworte NUR mit einem validen JSON-Objekt (keine Erklärungen, kein Markdown):
     "Persönliche Begründung 2: Anderer Aspekt",
     "Persönliche Begründung 3: Noch ein Aspekt"
   ]
-}}"""
+}"""
+
+# Validierung der Antworten (json_schema.py) – Pflichtfelder und Typen
+ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'required': ['kernbotschaft', 'emotionaleTonalitaet', 'transformation', 'tiefenthemen',
+                 'leserProfil', 'empfehlungsBegründungen'],
+    'properties': {
+        'kernbotschaft': {'type': 'string', 'minLength': 1},
+        'emotionaleTonalitaet': {'type': 'string', 'minLength': 1},
+        'transformation': {
+            'type': 'object',
+            'required': ['von', 'zu'],
+            'properties': {'von': {'type': 'string'}, 'zu': {'type': 'string'}}
+        },
+        'tiefenthemen': {'type': 'array', 'minItems': 1, 'items': {'type': 'string'}},
+        'lebensphase': {'type': 'array', 'items': {'type': 'string'}},
+        'coachingMethode': {'type': 'array', 'items': {'type': 'string'}},
+        'leserProfil': {'type': 'string'},
+        'empfehlungsBegründungen': {'type': 'array', 'minItems': 1, 'items': {'type': 'string'}}
+    }
+}
+
+
+def format_article(article):
+    """Artikel-Block für den Prompt (Titel, Kategorie, Blockquotes, Inhalt)"""
+    return f"""TITEL: {article['title']}
+
+KATEGORIE: {article.get('category', 'unbekannt')}
+
+KERNAUSSAGEN (Blockquotes):
+{chr(10).join(['- ' + bq for bq in article.get('blockquotes', [])][:5]) or '(keine)'}
+
+INHALT:
+{article['content'][:4000]}"""
+
+
+def get_analysis_prompt(article):
+    """Generiert den Analyse-Prompt für einen Artikel"""
+    return f"""{PROMPT_INTRO}
+
+Analysiere diesen Blog-Post TIEFGEHEND. Erfasse nicht nur die Oberfläche, sondern die emotionale und transformative Tiefe.
+
+---
+{format_article(article)}
+---
+
+Antworte NUR mit einem validen JSON-Objekt (keine Erklärungen, kein Markdown):
+
+{ANALYSIS_FORMAT}"""
+
+
+def get_batch_prompt(articles):
+    """Analyse-Prompt für mehrere Artikel – Einleitung und Format stehen nur einmal drin"""
+    blocks = '\n---\n'.join(f"ARTIKEL {number}\n{format_article(article)}"
+                             for number, article in enumerate(articles, 1))
+    return f"""{PROMPT_INTRO}
+
+Analysiere diese {len(articles)} Blog-Posts TIEFGEHEND, jeden für sich. Erfasse nicht nur die Oberfläche, sondern die emotionale und transformative Tiefe.
+
+---
+{blocks}
+---
 
+Antworte NUR mit einem validen JSON-Objekt (keine Erklärungen, kein Markdown), das jede Artikel-Nummer auf ihre Analyse abbildet:
+{{"1": <Analyse>, "2": <Analyse>, ...}}
 
-def analyze_with_groq(article, api_key):
-    """Analysiert einen Artikel mit Groq (Llama 3)"""
-    from groq import Groq
+Jede <Analyse> hat dieses Format:
 
-    client = Groq(api_key=api_key)
-    prompt = get_analysis_prompt(article)
+{ANALYSIS_FORMAT}"""
 
+
+def _chat_payload(prompt, provider, max_tokens):
+    settings = PROVIDERS[provider]
+    payload = {
+        'model': settings['model'],
+        'messages': [
+            {'role': 'system', 'content': settings['system']},
+            {'role': 'user', 'content': prompt}
+        ],
+        'temperature': 0.3,
+        'max_tokens': max_tokens
+    }
+    if settings.get('json_mode'):
+        payload['response_format'] = {'type': 'json_object'}
+    return payload
+
+
+def build_request(article, provider):
+    """Chat-Completion-Payload für die Analyse eines Artikels"""
+    return _chat_payload(get_analysis_prompt(article), provider, MAX_TOKENS)
+
+
+def build_batch_request(articles, provider):
+    """Chat-Completion-Payload für die Analyse mehrerer Artikel in einem Request"""
+    return _chat_payload(get_batch_prompt(articles), provider, MAX_TOKENS * len(articles))
+
+
+def request_tokens(payload):
+    """Geschätzte Tokens eines Requests (Prompt + maximale Antwort) für das TPM-Budget"""
+    return sum(estimate_tokens(message['content']) for message in payload['messages']) + payload['max_tokens']
+
+
+def parse_analysis_response(result_text):
+    """Antworttext → Analyse-Dict (wirft ValueError bei ungültigem JSON)"""
+    result_text = result_text.strip()
+
+    # Bereinige mögliche Markdown-Wrapper
+    if result_text.startswith('```'):
+        result_text = result_text.split('```')[1]
+        if result_text.startswith('json'):
+            result_text = result_text[4:]
+    result_text = result_text.strip()
+
+    return json.loads(result_text)
+
+
+def _parse_json(text):
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Du bist ein präziser JSON-Generator. Antworte NUR mit validem JSON, ohne Markdown-Formatierung, ohne Erklärungen."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1500
-        )
-
-        result_text = response.choices[0].message.content.strip()
-
-        # Bereinige mögliche Markdown-Wrapper
-        if result_text.startswith('```'):
-            result_text = result_text.split('```')[1]
-            if result_text.startswith('json'):
-                result_text = result_text[4:]
-        result_text = result_text.strip()
-
-        return json.loads(result_text)
-
-    except json.JSONDecodeError as e:
-        print(f"    ⚠️  JSON Parse Error: {e}")
-        print(f"    Response: {result_text[:200]}...")
-        return None
-    except Exception as e:
-        print(f"    ❌ API Error: {e}")
-        return None
-
-
-def analyze_with_openai(article, api_key):
-    """Analysiert einen Artikel mit OpenAI GPT-4"""
-    from openai import OpenAI
-
-    client = OpenAI(api_key=api_key)
-    prompt = get_analysis_prompt(article)
+        return parse_analysis_response(text)
+    except ValueError as e:
+        raise LLMError(f"JSON Parse Error: {e} – Response: {text[:200]}...")
+
 
+def check_analysis(analysis):
+    """Prüft eine Analyse gegen ANALYSIS_SCHEMA (wirft LLMError)"""
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Du bist ein präziser JSON-Generator. Antworte NUR mit validem JSON."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1500,
-            response_format={"type": "json_object"}
-        )
-
-        result_text = response.choices[0].message.content.strip()
-        return json.loads(result_text)
-
-    except Exception as e:
-        print(f"    ❌ API Error: {e}")
-        return None
+        validate(analysis, ANALYSIS_SCHEMA)
+    except SchemaError as e:
+        raise LLMError(f"Schema-Fehler: {e}")
+    return analysis
+
+
+def read_analysis(text):
+    """Antworttext eines Einzel-Requests → geprüfte Analyse (wirft LLMError)"""
+    return check_analysis(_parse_json(text))
+
+
+def read_batch(text, count):
+    """Antworttext eines Batch-Requests → Liste mit `count` Einträgen
+
+    Jeder Eintrag ist die geprüfte Analyse oder ein LLMError für genau diesen
+    Artikel. Ist die Antwort insgesamt unbrauchbar, wird LLMError geworfen.
+    """
+    data = _parse_json(text)
+    if not isinstance(data, dict):
+        raise LLMError(f"Batch-Antwort ist kein Objekt: {text[:200]}...")
+    results = []
+    for number in range(1, count + 1):
+        try:
+            if str(number) not in data:
+                raise LLMError(f"Analyse für Artikel {number} fehlt")
+            results.append(check_analysis(data[str(number)]))
+        except LLMError as e:
+            results.append(e)
+    return results
+
+
+async def analyze_articles(articles, provider, api_key, base_url=None, rpm=None, tpm=None,
+                           concurrency=DEFAULT_CONCURRENCY, on_result=None, cache=None, batch_size=1):
+    """Analysiert alle Artikel parallel unter den Rate-Limits des Providers
+
+    Gibt (Analysen, Statistik) zurück; die Analysen stehen in der Reihenfolge
+    von `articles`, None wenn ein Artikel nicht analysiert werden konnte.
+    Mit `cache` (llm_cache.ResponseCache) gehen nur Requests an die API, deren
+    exakter Inhalt noch nie beantwortet wurde.
+    Mit `batch_size` > 1 teilen sich bis zu so viele Artikel einen Request. Ist
+    die Antwort unbrauchbar, wird der Batch halbiert und erneut geschickt; fehlt
+    nur einzelnen Artikeln eine gültige Analyse, gehen nur diese noch einmal raus.
+    on_result(index, analysis, error) wird aufgerufen, sobald ein Artikel fertig ist.
+    """
+    settings = PROVIDERS[provider]
+    scheduler = LLMScheduler(rpm or settings['rpm'], tpm or settings['tpm'], concurrency=concurrency)
+    base_url = base_url or settings['base_url']
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {'cached': 0, 'batches': 0, 'split': 0}
+
+    # Cache-Schlüssel ist immer der Einzel-Request – unabhängig davon, in welchem Batch ein Artikel landet
+    analyses = [None] * len(articles)
+    keys = {}
+    pending = []
+    for index, article in enumerate(articles):
+        if cache:
+            keys[index] = cache.key(provider, build_request(article, provider))
+            cached = cache.get(keys[index])
+            if cached is not None:
+                analyses[index] = cached
+                stats['cached'] += 1
+                continue
+        pending.append(index)
+
+    def finish(index, result):
+        error = result if isinstance(result, Exception) else None
+        if not error:
+            analyses[index] = result
+            if cache:
+                cache.put(keys[index], result, articles[index]['url'])
+        if on_result:
+            on_result(index, None if error else result, error)
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)) as session:
+        async def send(payload, read):
+            async def call():
+                return read(await chat_completion(session, base_url, api_key, payload))
+
+            async with semaphore:
+                return await scheduler.submit(call, request_tokens(payload))
+
+        async def analyze_one(index):
+            try:
+                finish(index, await send(build_request(articles[index], provider), read_analysis))
+            except LLMError as e:
+                finish(index, e)
+
+        async def analyze_batch(indices):
+            if len(indices) == 1:
+                return await analyze_one(indices[0])
+
+            stats['batches'] += 1
+            payload = build_batch_request([articles[index] for index in indices], provider)
+            try:
+                results = await send(payload, lambda text: read_batch(text, len(indices)))
+            except TransientError as e:
+                # Retries sind ausgeschöpft – kleinere Requests helfen da nicht
+                for index in indices:
+                    finish(index, e)
+                return
+            except LLMError:
+                results = None
+
+            failed = indices
+            if results is not None:
+                failed = [index for index, result in zip(indices, results) if isinstance(result, Exception)]
+                for index, result in zip(indices, results):
+                    if not isinstance(result, Exception):
+                        finish(index, result)
+            if not failed:
+                return
+
+            # Nur die Fehlgeschlagenen erneut – und halbieren, wenn gar nichts geklappt hat
+            stats['split'] += 1
+            if len(failed) == len(indices):
+                parts = [failed[:len(failed) // 2], failed[len(failed) // 2:]]
+            else:
+                parts = [failed]
+            await asyncio.gather(*(analyze_batch(part) for part in parts))
+
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), max(1, batch_size))]
+        await asyncio.gather(*(analyze_batch(batch) for batch in batches))
+
+    return analyses, {**scheduler.stats, **stats}
 
 
 def is_real_llm_analysis(analysis):
@@ -214,6 +418,16 @@ def main():
                         help='Nur N Artikel analysieren (für Tests)')
     parser.add_argument('--skip-existing', action='store_true',
                         help='Überspringe bereits analysierte Artikel')
+    parser.add_argument('--rpm', type=int, default=None,
+                        help='Requests pro Minute (Standard: Limit des Providers)')
+    parser.add_argument('--tpm', type=int, default=None,
+                        help='Tokens pro Minute (Standard: Limit des Providers)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Gleichzeitige Requests (Standard: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='Artikel pro Request (Standard: 1); fehlerhafte Batches werden aufgeteilt')
+    parser.add_argument('--base-url', default=None,
+                        help='Andere OpenAI-kompatible API-URL (z.B. Proxy oder lokaler Server)')
     args = parser.parse_args()
 
     print("=" * 60)
@@ -223,20 +437,13 @@ def main():
     print()
 
     # API Key prüfen
-    if args.provider == 'groq':
-        api_key = os.environ.get('GROQ_API_KEY')
-        if not api_key:
-            print("❌ GROQ_API_KEY nicht gesetzt!")
+    api_key = os.environ.get(PROVIDERS[args.provider]['api_key_env'])
+    if not api_key:
+        print(f"❌ {PROVIDERS[args.provider]['api_key_env']} nicht gesetzt!")
+        if args.provider == 'groq':
             print("   Setze: export GROQ_API_KEY=dein_key")
             print("   Oder hol dir einen kostenlosen Key: https://console.groq.com")
-            sys.exit(1)
-        analyze_fn = lambda a: analyze_with_groq(a, api_key)
-    else:
-        api_key = os.environ.get('OPENAI_API_KEY')
-        if not api_key:
-            print("❌ OPENAI_API_KEY nicht gesetzt!")
-            sys.exit(1)
-        analyze_fn = lambda a: analyze_with_openai(a, api_key)
+        sys.exit(1)
 
     # Lade extrahierte Inhalte
     if not INPUT_FILE.exists():
@@ -255,29 +462,37 @@ def main():
     protected_analyses = {}  # Echte LLM-Analysen die nicht überschrieben werden dürfen
     fallback_analyses = {}   # Fallback-Analysen die überschrieben werden können
 
-    if OUTPUT_FILE.exists():
-        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-            existing_data = json.load(f)
-            for art in existing_data.get('articles', []):
-                if art.get('analysis'):
-                    url = art['url']
-                    analysis = art['analysis']
+    # Nur die Analysen laden – Artikeltexte im Store bleiben ungelesen
+    store = IntelligenceStore(STORE_DIR, legacy_file=OUTPUT_FILE)
+    if len(store):
+        for art in store.load(fields=('analysis',)):
+            if art.get('analysis'):
+                url = art['url']
+                analysis = art['analysis']
 
-                    # Prüfe ob es eine echte LLM-Analyse ist
-                    if analysis.get('_isFallback') or not is_real_llm_analysis(analysis):
-                        fallback_analyses[url] = analysis
-                    else:
-                        protected_analyses[url] = analysis
+                # Prüfe ob es eine echte LLM-Analyse ist
+                if analysis.get('_isFallback') or not is_real_llm_analysis(analysis):
+                    fallback_analyses[url] = analysis
+                else:
+                    protected_analyses[url] = analysis
 
         print(f"📚 {len(protected_analyses)} echte LLM-Analysen (geschützt)")
         print(f"📝 {len(fallback_analyses)} Fallback-Analysen (können überschrieben werden)")
 
+    # LLM-Cache: Schlüssel ist der exakte Request (Prompt, Modell, Provider)
+    cache = ResponseCache(LLM_CACHE_FILE, PROMPT_VERSION)
+    if cache.stats['invalidated']:
+        print(f"🔄 {cache.stats['invalidated']} Cache-Einträge einer älteren Prompt-Version verworfen")
+    cached_urls = cache.urls()
+
     # Bei --skip-existing: Überspringe ALLE bestehenden Analysen
-    # Ohne Flag: Überspringe nur geschützte (echte) Analysen, versuche Fallbacks zu ersetzen
+    # Ohne Flag: Echte Analysen entscheidet der Cache – geschützt bleiben nur solche,
+    # die der Cache noch nicht kennt (aus der Zeit vor dem Cache); Fallbacks werden ersetzt
     if args.skip_existing:
         existing_analyses = {**protected_analyses, **fallback_analyses}
     else:
-        existing_analyses = protected_analyses  # Nur echte Analysen schützen
+        existing_analyses = {url: analysis for url, analysis in protected_analyses.items()
+                             if url not in cached_urls}
 
     # Filtere nur Blog-Posts (keine Quizze, Angebote etc.)
     blog_articles = [a for a in articles if a.get('type') == 'blog']
@@ -288,67 +503,86 @@ def main():
     print(f"📊 {len(blog_articles)} Blog-Posts zu analysieren")
     print()
 
-    # Analysiere jeden Artikel
-    results = []
-    success_count = 0
-    error_count = 0
-
-    for i, article in enumerate(blog_articles):
+    # Überspringe bereits analysierte (echte LLM-Analysen sind immer geschützt)
+    pending = []
+    for article in blog_articles:
         url = article['url']
-        title = article['title'][:40]
-
-        print(f"[{i+1}/{len(blog_articles)}] {title}...")
-
-        # Überspringe bereits analysierte (echte LLM-Analysen sind immer geschützt)
         if url in existing_analyses:
             article['analysis'] = existing_analyses[url]
-            results.append(article)
             if url in protected_analyses:
-                print(f"    🛡️  Geschützt (echte LLM-Analyse)")
+                print(f"  🛡️  Geschützt (echte LLM-Analyse): {article['title'][:40]}")
+                # In den Cache übernehmen – ab jetzt löst eine Änderung am Artikel eine neue Analyse aus
+                if not args.skip_existing:
+                    request = build_request(article, args.provider)
+                    cache.put(cache.key(args.provider, request), existing_analyses[url], url)
             else:
-                print(f"    ⏭️  Übersprungen (bereits analysiert)")
-            continue
+                print(f"  ⏭️  Übersprungen (bereits analysiert): {article['title'][:40]}")
+        else:
+            pending.append(article)
+
+    # Analysiere die übrigen parallel (Cache-Treffer ohne API) – Ausgabe in Fertigstellungs-Reihenfolge
+    if pending:
+        print()
+        print(f"🤖 {len(pending)} Artikel: Cache prüfen, Rest über die API (max. {args.concurrency} gleichzeitig)...")
+    done = [0]
 
-        # LLM Analyse
-        analysis = analyze_fn(article)
+    def report(index, analysis, error):
+        done[0] += 1
+        print(f"[{done[0]}] {pending[index]['title'][:40]}...")
+        if analysis:
+            print(f"    ✓ Analysiert: {analysis.get('emotionaleTonalitaet', '?')}")
+        else:
+            print(f"    ❌ {error}")
 
+    analyses, run_stats = asyncio.run(analyze_articles(
+        pending, args.provider, api_key, base_url=args.base_url, rpm=args.rpm, tpm=args.tpm,
+        concurrency=args.concurrency, on_result=report, cache=cache, batch_size=args.batch_size
+    )) if pending else ([], {'rate_limited': 0, 'retries': 0, 'cached': 0, 'batches': 0, 'split': 0})
+    cache.save()
+
+    # Ergebnisse in der ursprünglichen Reihenfolge übernehmen
+    success_count = 0
+    error_count = 0
+    stale_count = 0
+    for article, analysis in zip(pending, analyses):
         if analysis:
             article['analysis'] = analysis
             success_count += 1
-            print(f"    ✓ Analysiert: {analysis.get('emotionaleTonalitaet', '?')}")
+        elif article['url'] in protected_analyses:
+            # Lieber die alte echte Analyse behalten als einen Fallback
+            article['analysis'] = protected_analyses[article['url']]
+            stale_count += 1
         else:
             article['analysis'] = create_default_analysis(article)
             error_count += 1
-            print(f"    ⚠️  Fallback verwendet")
-
-        results.append(article)
-
-        # Rate Limiting
-        if i < len(blog_articles) - 1:
-            time.sleep(RATE_LIMIT_DELAY)
+    results = blog_articles
 
     print()
     print("-" * 60)
     print("STATISTIKEN")
     print("-" * 60)
-    print(f"  Erfolgreich:    {success_count}")
+    print(f"  Erfolgreich:    {success_count} (davon aus dem Cache: {run_stats['cached']})")
+    print(f"  Alte Analyse:   {stale_count}")
     print(f"  Fallback:       {error_count}")
     print(f"  Gesamt:         {len(results)}")
+    print(f"  Rate-Limits:    {run_stats['rate_limited']} (Retries: {run_stats['retries']})")
+    if args.batch_size > 1:
+        print(f"  Batches:        {run_stats['batches']} (aufgeteilt: {run_stats['split']})")
     print()
 
-    # Speichere Ergebnis
-    output_data = {
-        'analyzedAt': datetime.now().isoformat(),
-        'provider': args.provider,
-        'totalArticles': len(results),
-        'articles': results
-    }
-
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
-
-    print(f"💾 Gespeichert: {OUTPUT_FILE}")
+    # Speichere Ergebnis (nur geänderte Shards werden geschrieben)
+    written = store.update(results)
+    removed = store.retain([article['url'] for article in results])
+    changed = store.set_meta(provider=args.provider)
+    # Zeitstempel nur bei geänderten Analysen – ein Lauf komplett aus dem Cache ändert nichts
+    if changed or written or removed or 'analyzedAt' not in store.meta:
+        store.set_meta(analyzedAt=datetime.now().isoformat())
+    store.save()
+    store.export(OUTPUT_FILE)
+
+    print(f"💾 Gespeichert: {STORE_DIR} ({store.stats['written']} Shards geschrieben, "
+          f"{store.stats['unchanged']} unverändert)")
+    print(f"   Export: {OUTPUT_FILE}")
     print()
     print("✅ Phase 2 abgeschlossen!")
     print("   Nächster Schritt: python scripts/generate-embeddings.py")
@@ -0,0 +1,254 @@
+"""
+ANN Index
+Approximative Nächste-Nachbarn-Suche über Embeddings (generate-smart-connections.py)
+
+IVF-Index (inverted file) für Kosinus-Ähnlichkeit, nur mit NumPy:
+- Sphärisches k-Means (fester Seed) teilt die Vektoren in `lists` Zellen;
+  jeder Vektor gehört zu genau einer Zelle (nächster Zentroid).
+- Eine Anfrage durchsucht nur die `probes` Zellen mit den nächsten Zentroiden.
+  Die Kandidaten werden exakt nachgerechnet – die Top-k sind echte
+  Ähnlichkeiten, nur eventuell nicht alle echten Top-k.
+- Gerechnet wird pro Zelle: alle Anfragen, die diese Zelle besuchen, gegen
+  alle Vektoren der Zelle in einem Matrixprodukt.
+- Einfügen ist inkrementell (nächste Zelle); wächst der Index auf mehr als
+  RETRAIN_FACTOR × die Trainingsgröße, werden die Zellen neu trainiert.
+  Entfernen markiert nur, save() verdichtet.
+
+Layout:
+    data/embeddings/ann-index.npz   centroids, vectors, cells, keys, params
+
+Benötigt: pip install numpy
+"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+
+INDEX_VERSION = 1
+
+# Zellen ≈ LISTS_FACTOR × √n; durchsucht werden DEFAULT_PROBES davon
+LISTS_FACTOR = 4
+DEFAULT_PROBES = 8
+# Kleine Indizes haben kleine Zellen: dann mehr Zellen durchsuchen, damit im
+# Mittel mindestens MIN_CANDIDATES × k Kandidaten nachgerechnet werden
+MIN_CANDIDATES = 4
+KMEANS_ITERATIONS = 8
+TRAIN_SAMPLE = 50_000
+RETRAIN_FACTOR = 4
+QUERY_BLOCK = 8192
+ASSIGN_BLOCK = 4096
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _nearest(vectors, centroids, count=1):
+    """Die `count` nächsten Zentroide je Vektor (m × count), blockweise"""
+    result = np.empty((len(vectors), count), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK):
+        similarities = vectors[start:start + ASSIGN_BLOCK] @ centroids.T
+        if count < similarities.shape[1]:
+            result[start:start + len(similarities)] = np.argpartition(-similarities, count - 1, axis=1)[:, :count]
+        else:
+            result[start:start + len(similarities)] = np.argsort(-similarities, axis=1)[:, :count]
+    return result
+
+
+def spherical_kmeans(vectors, lists, iterations=KMEANS_ITERATIONS, seed=0):
+    """Zentroide (lists × d, normalisiert) für normalisierte Vektoren"""
+    rng = np.random.default_rng(seed)
+    lists = max(1, min(lists, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), lists, replace=False)].copy()
+    for _ in range(iterations):
+        cells = _nearest(vectors, centroids)[:, 0]
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, cells, vectors)
+        empty = np.flatnonzero(np.bincount(cells, minlength=lists) == 0)
+        # Leere Zellen bekommen einen zufälligen Vektor als neuen Zentroid
+        sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """IVF-Index: Schlüssel → normalisierter Vektor, gruppiert nach k-Means-Zellen"""
+
+    def __init__(self, dimensions, lists=None, seed=0):
+        self.dimensions = dimensions
+        self.lists = lists
+        self.seed = seed
+        self.centroids = None
+        self.trained_size = 0
+        self.keys = []
+        self._ids = {}
+        self.vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self.cells = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self._lookup = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def train(self):
+        """Trainiert die Zellen auf allen lebenden Vektoren neu und ordnet alle neu zu"""
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            self.centroids = None
+            self.trained_size = 0
+            return
+        lists = self.lists or max(1, round(LISTS_FACTOR * math.sqrt(len(live))))
+        rng = np.random.default_rng(self.seed)
+        sample = live if len(live) <= TRAIN_SAMPLE else np.sort(rng.choice(live, TRAIN_SAMPLE, replace=False))
+        self.centroids = spherical_kmeans(self.vectors[sample], lists, seed=self.seed)
+        self.cells = _nearest(self.vectors, self.centroids)[:, 0]
+        self.trained_size = len(live)
+        self._lookup = None
+
+    def add(self, keys, vectors):
+        """Fügt Vektoren hinzu; schon enthaltene Schlüssel werden übersprungen"""
+        vectors = _normalize(vectors)
+        new = [i for i, key in enumerate(keys) if key not in self._ids]
+        if not new:
+            return 0
+        if len(set(keys[i] for i in new)) != len(new):
+            raise ValueError("Doppelte Schlüssel in einem add()")
+        vectors = vectors[new]
+        for i in new:
+            self._ids[keys[i]] = len(self.keys)
+            self.keys.append(keys[i])
+        self.vectors = np.concatenate((self.vectors, vectors))
+        self.alive = np.concatenate((self.alive, np.ones(len(new), dtype=bool)))
+
+        if self.centroids is None or len(self._ids) > RETRAIN_FACTOR * self.trained_size:
+            self.train()
+        else:
+            self.cells = np.concatenate((self.cells, _nearest(vectors, self.centroids)[:, 0]))
+            self._lookup = None
+        return len(new)
+
+    def remove(self, keys):
+        """Entfernt Schlüssel (werden bei Anfragen ignoriert, save() lässt sie weg)"""
+        removed = 0
+        for key in keys:
+            row = self._ids.pop(key, None)
+            if row is not None:
+                self.alive[row] = False
+                removed += 1
+        self._lookup = None
+        return removed
+
+    def _inverted_lists(self):
+        """Lebende IDs sortiert nach Zelle + Startposition jeder Zelle"""
+        if self._lookup is None:
+            live = np.flatnonzero(self.alive)
+            order = live[np.argsort(self.cells[live], kind='stable')]
+            starts = np.searchsorted(self.cells[order], np.arange(len(self.centroids) + 1))
+            self._lookup = (order, starts)
+        return self._lookup
+
+    def search(self, queries, k, probes=DEFAULT_PROBES, exclude=None):
+        """Top-k je Anfrage → (Schlüssel-Listen, Scores-Listen), absteigend nach Kosinus
+
+        exclude: optional pro Anfrage ein Schlüssel, der nicht zurückkommen soll
+        (z.B. der Artikel selbst). Gleichstand: früher eingefügter Schlüssel zuerst.
+        """
+        queries = _normalize(queries)
+        excluded = np.array([self._ids.get(key, -1) for key in exclude] if exclude is not None
+                            else [-1] * len(queries), dtype=np.int64)
+        keys = [[] for _ in queries]
+        scores = [[] for _ in queries]
+        if not len(self._ids) or not len(queries) or k <= 0:
+            return keys, scores
+
+        for start in range(0, len(queries), QUERY_BLOCK):
+            block = slice(start, start + QUERY_BLOCK)
+            query_ids, ids, similarities = self._search_block(queries[block], k, probes, excluded[block])
+            for query, row_ids, row_similarities in zip(query_ids, ids, similarities):
+                keys[start + query] = [self.keys[i] for i in row_ids]
+                scores[start + query] = row_similarities.tolist()
+        return keys, scores
+
+    def _search_block(self, queries, k, probes, excluded):
+        order, starts = self._inverted_lists()
+        lists = len(self.centroids)
+        probes = min(max(probes, math.ceil(MIN_CANDIDATES * k * lists / len(order))), lists)
+        probed = _nearest(queries, self.centroids, probes).ravel()
+        visitors = np.repeat(np.arange(len(queries)), probes)
+        by_cell = np.argsort(probed, kind='stable')
+        visitors, probed = visitors[by_cell], probed[by_cell]
+        bounds = np.searchsorted(probed, np.arange(len(self.centroids) + 1))
+
+        # Pro Zelle: alle besuchenden Anfragen gegen alle Vektoren der Zelle
+        found_queries, found_ids, found_similarities = [], [], []
+        for cell in np.flatnonzero(np.diff(bounds)):
+            members = order[starts[cell]:starts[cell + 1]]
+            if not len(members):
+                continue
+            visiting = visitors[bounds[cell]:bounds[cell + 1]]
+            similarities = queries[visiting] @ self.vectors[members].T
+            similarities[excluded[visiting][:, None] == members[None, :]] = -np.inf
+            if len(members) > k:
+                top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+                similarities = np.take_along_axis(similarities, top, axis=1)
+                ids = members[top]
+            else:
+                ids = np.broadcast_to(members, similarities.shape)
+            found_queries.append(np.repeat(visiting, ids.shape[1]))
+            found_ids.append(ids.ravel())
+            found_similarities.append(similarities.ravel())
+
+        if not found_ids:
+            return [], [], []
+        query_ids = np.concatenate(found_queries)
+        ids = np.concatenate(found_ids)
+        similarities = np.concatenate(found_similarities)
+
+        # Je Anfrage absteigend sortieren und die ersten k (ohne ausgeschlossene) behalten
+        ranking = np.lexsort((ids, -similarities, query_ids))
+        query_ids, ids, similarities = query_ids[ranking], ids[ranking], similarities[ranking]
+        first = np.searchsorted(query_ids, query_ids, side='left')
+        keep = (np.arange(len(query_ids)) - first < k) & (similarities > -np.inf)
+        query_ids, ids, similarities = query_ids[keep], ids[keep], similarities[keep]
+        groups = np.flatnonzero(np.r_[True, query_ids[1:] != query_ids[:-1]])
+        return query_ids[groups], np.split(ids, groups[1:]), np.split(similarities, groups[1:])
+
+    def save(self, path):
+        """Schreibt den Index atomar (nur lebende Einträge)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        centroids = self.centroids if self.centroids is not None else np.zeros((0, self.dimensions), np.float32)
+        tmp_file = path.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, centroids=centroids, vectors=self.vectors[self.alive], cells=self.cells[self.alive],
+                     keys=np.array([key for key, alive in zip(self.keys, self.alive) if alive], dtype=str),
+                     params=np.array([INDEX_VERSION, self.lists or 0, self.seed, self.dimensions,
+                                      self.trained_size]))
+        tmp_file.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        """Lädt einen gespeicherten Index (None wenn er fehlt oder unlesbar ist)"""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                version, lists, seed, dimensions, trained_size = (int(v) for v in data['params'])
+                if version != INDEX_VERSION:
+                    return None
+                index = cls(dimensions, lists or None, seed)
+                index.centroids = data['centroids'] if len(data['centroids']) else None
+                index.vectors = data['vectors']
+                index.cells = data['cells']
+                index.keys = data['keys'].tolist()
+        except (OSError, ValueError, KeyError):
+            return None
+        index.trained_size = trained_size
+        index._ids = {key: row for row, key in enumerate(index.keys)}
+        index.alive = np.ones(len(index.keys), dtype=bool)
+        return index
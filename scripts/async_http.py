@@ -0,0 +1,167 @@
+"""
+Async HTTP Pool
+Gemeinsamer asyncio-Client für die Crawler-Skripte (z.B. migrate-blog-complete.py)
+
+- HTTP/1.1 Keep-Alive Connection-Pool (eine TCP-Verbindung pro Slot, wiederverwendet)
+- Concurrency-Limit pro Host
+- Exponentielles Backoff mit Jitter bei 429/5xx und Netzwerkfehlern (Retry-After wird beachtet)
+- Optional: Conditional GETs über http_cache.HTTPCache (304 → Body aus dem Cache)
+
+Benötigt: pip install aiohttp
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import aiohttp
+
+# Status-Codes bei denen ein erneuter Versuch sinnvoll ist
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'
+
+
+@dataclass
+class FetchResult:
+    """Antwort eines Requests (Body bereits vollständig gelesen)"""
+    url: str
+    status: int
+    body: bytes
+    headers: dict = field(default_factory=dict)
+    encoding: str = 'utf-8'
+    from_cache: bool = False
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    @property
+    def text(self):
+        return self.body.decode(self.encoding or 'utf-8', errors='replace')
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After Header (Sekunden oder HTTP-Datum) → Sekunden, None wenn ungültig"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class AsyncHTTPPool:
+    """Keep-Alive Connection-Pool mit Limit pro Host und Retry-Policy
+
+    Verwendung:
+        async with AsyncHTTPPool(per_host_limit=4, cache=HTTPCache(path)) as pool:
+            result = await pool.fetch(url)
+    """
+
+    def __init__(self, per_host_limit=4, total_limit=32, max_retries=4,
+                 backoff_base=0.5, backoff_max=30.0, timeout=15, headers=None, cache=None):
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.headers = {'User-Agent': DEFAULT_USER_AGENT, **(headers or {})}
+        self.cache = cache
+        self.session = None
+        self._semaphores = {}
+        self.stats = {'requests': 0, 'retries': 0, 'failed': 0}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.total_limit,
+            limit_per_host=self.per_host_limit,
+            keepalive_timeout=30,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+        self.session = None
+
+    def _semaphore(self, url):
+        """Ein Semaphore pro Host begrenzt parallele Requests"""
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._semaphores[host]
+
+    def backoff_delay(self, attempt):
+        """Exponentielles Backoff mit Full Jitter: uniform(0, min(max, base * 2^attempt))"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def fetch(self, url, headers=None):
+        """GET mit Retries. Gibt FetchResult zurück, wirft nach dem letzten Fehlversuch."""
+        attempt = 0
+        headers = dict(headers or {})
+        if self.cache:
+            headers.update(self.cache.conditional_headers(url))
+
+        while True:
+            delay = None
+            try:
+                async with self._semaphore(url):
+                    self.stats['requests'] += 1
+                    async with self.session.get(url, headers=headers) as response:
+                        body = await response.read()
+                        result = FetchResult(
+                            url=str(response.url),
+                            status=response.status,
+                            body=body,
+                            headers=response.headers.copy(),
+                            encoding=response.charset or 'utf-8',
+                        )
+
+                if result.status == 304 and self.cache:
+                    cached = self.cache.load(url)
+                    if cached:
+                        body, entry = cached
+                        return FetchResult(
+                            url=result.url,
+                            status=200,
+                            body=body,
+                            headers=result.headers,
+                            encoding=entry.get('encoding') or 'utf-8',
+                            from_cache=True,
+                        )
+
+                if result.ok and self.cache:
+                    self.cache.store(url, result.body, result.headers, result.encoding)
+
+                if result.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    # Aufgegeben: 4xx sofort, 429/5xx nach dem letzten Versuch
+                    if result.status >= 400:
+                        self.stats['failed'] += 1
+                    return result
+
+                retry_after = parse_retry_after(result.headers.get('Retry-After'))
+                delay = min(self.backoff_max, retry_after) if retry_after is not None else None
+
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    self.stats['failed'] += 1
+                    raise
+
+            # Warten außerhalb des Semaphores, damit andere Requests weiterlaufen
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay if delay is not None else self.backoff_delay(attempt))
+            attempt += 1
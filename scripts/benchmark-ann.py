@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+ANN Benchmark
+Vergleicht den IVF-Index (ann_index.py) mit der exakten Suche (embedding_similarity.py)
+
+Misst Recall@k (Anteil der exakten Top-k, die der Index findet) und die
+Laufzeiten für Aufbau, Anfragen und inkrementelles Einfügen – auf
+synthetischen, geclusterten Embeddings (ähnliche Artikel liegen nah beieinander)
+oder auf den gespeicherten Embeddings aus data/embeddings/.
+
+Verwendung:
+    python scripts/benchmark-ann.py
+    python scripts/benchmark-ann.py --sizes 5000 20000 --dimensions 256 --probes 4 8 16
+    python scripts/benchmark-ann.py --store
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from ann_index import DEFAULT_PROBES, IVFIndex
+from embedding_similarity import top_k_similar
+
+PROJECT_ROOT = Path(__file__).parent.parent
+EMBEDDINGS_DIR = PROJECT_ROOT / "data" / "embeddings"
+
+# Anteil der Vektoren, die nach dem Aufbau einzeln nachgereicht werden
+INSERT_FRACTION = 0.05
+
+
+def clustered_embeddings(n, dimensions, cluster_size=20, noise=0.8, seed=0):
+    """n Vektoren um n / cluster_size zufällige Zentren (float32)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, n // cluster_size), dimensions))
+    vectors = centers[rng.integers(0, len(centers), n)] + noise * rng.standard_normal((n, dimensions))
+    return vectors.astype(np.float32)
+
+
+def stored_embeddings():
+    """Alle Vektoren aus dem Embedding-Store (ohne Modell-Prüfung)"""
+    import json
+
+    with open(EMBEDDINGS_DIR / 'index.json', 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    return np.array(np.memmap(EMBEDDINGS_DIR / index['file'], dtype=np.float32, mode='r',
+                              shape=(index['count'], index['dimensions'])))
+
+
+def recall_at_k(found, exact):
+    """Mittlerer Anteil der exakten Top-k in den gefundenen Top-k"""
+    hits = [len(set(row) & set(expected)) / len(expected) for row, expected in zip(found, exact) if len(expected)]
+    return sum(hits) / len(hits) if hits else 1.0
+
+
+def benchmark(embeddings, k, probes):
+    n = len(embeddings)
+    keys = list(range(n))
+
+    start = time.perf_counter()
+    exact, _ = top_k_similar(embeddings, k=k)
+    exact_seconds = time.perf_counter() - start
+    exact = exact.tolist()
+
+    start = time.perf_counter()
+    index = IVFIndex(embeddings.shape[1])
+    split = n - int(n * INSERT_FRACTION)
+    index.add(keys[:split], embeddings[:split])
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(split, n):
+        index.add(keys[i:i + 1], embeddings[i:i + 1])
+    insert_ms = (time.perf_counter() - start) * 1000 / max(1, n - split)
+
+    print(f"📊 n={n} d={embeddings.shape[1]} k={k}  Zellen: {len(index.centroids)}")
+    print(f"   Exakt:    {exact_seconds:7.2f}s")
+    print(f"   Aufbau:   {build_seconds:7.2f}s   Einfügen: {insert_ms:.2f}ms je Vektor")
+    for probe in probes:
+        start = time.perf_counter()
+        found, _ = index.search(embeddings, k, probes=probe, exclude=keys)
+        seconds = time.perf_counter() - start
+        print(f"   probes={probe:<3} {seconds:7.2f}s   ({exact_seconds / seconds:4.1f}× schneller)   "
+              f"Recall@{k}: {recall_at_k(found, exact):.3f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recall und Laufzeit: ANN-Index vs. exakte Suche')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2000, 10000, 20000],
+                        help='Anzahl Vektoren (synthetisch)')
+    parser.add_argument('--dimensions', type=int, default=256, help='Dimensionen (synthetisch)')
+    parser.add_argument('--probes', type=int, nargs='+', default=[DEFAULT_PROBES // 2, DEFAULT_PROBES,
+                                                                  DEFAULT_PROBES * 2],
+                        help='Durchsuchte Zellen je Anfrage')
+    parser.add_argument('-k', type=int, default=15, help='Nachbarn je Anfrage')
+    parser.add_argument('--store', action='store_true', help='Gespeicherte Embeddings statt synthetischer Daten')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ANN BENCHMARK - IVF-Index vs. exakte Suche")
+    print("=" * 60)
+    print()
+
+    if args.store:
+        if not (EMBEDDINGS_DIR / 'index.json').exists():
+            print(f"❌ Kein Embedding-Store gefunden: {EMBEDDINGS_DIR}")
+            sys.exit(1)
+        benchmark(stored_embeddings(), args.k, args.probes)
+        return
+
+    for n in args.sizes:
+        benchmark(clustered_embeddings(n, args.dimensions), args.k, args.probes)
+
+
+if __name__ == '__main__':
+    main()
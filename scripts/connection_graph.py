@@ -0,0 +1,309 @@
+"""
+Connection Graph
+Persistente Score-Matrizen für inkrementelle Läufe von generate-smart-connections.py
+
+Gespeichert werden die vollständigen paarweisen Matrizen (Regel-Score,
+Rang-Art, Typ und – mit Embeddings – die Kosinus-Ähnlichkeit) und die Top-k
+jedes Artikels. Ein Fingerabdruck pro Artikel zeigt, was sich seit dem letzten
+Lauf geändert hat: nur dessen Zeilen und Spalten werden neu berechnet. Die
+Top-k eines anderen Artikels werden nur neu bestimmt, wenn ein geänderter
+Artikel darin steht oder neu hineinkommt – das Ergebnis ist identisch mit
+einer vollständigen Neuberechnung.
+
+Layout:
+    data/connection-graph/graph.json       {version, config, similarity, urls, fingerprints}
+    data/connection-graph/total.npy        n × n int32    Regel-Score inkl. Reisen
+    data/connection-graph/kind.npy         n × n int16    -1 keine, 0 Regel, 1 + j nur Reise j
+    data/connection-graph/types.npy        n × n int8     Typ-Code (ArticleFeatures.type_names)
+    data/connection-graph/similarity.npy   n × n float32  Kosinus (nur mit Embeddings)
+    data/connection-graph/rules.npy        n × RULE_TOP_K Spalten der Top-Regel-Treffer (-1 = leer)
+    data/connection-graph/similar.npy      n × SIMILAR_TOP_K Spalten der ähnlichsten Artikel
+
+Kleine Änderungen patchen die Matrizen per memmap an Ort und Stelle; graph.json
+wird vorher gelöscht und erst danach neu geschrieben – ein Abbruch dazwischen
+führt beim nächsten Lauf zu einer vollständigen Neuberechnung.
+
+Benötigt: pip install numpy
+"""
+
+import json
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from connection_scoring import (BLOCK_BUDGET, ArticleFeatures, row_blocks, rule_components, rule_entries,
+                                rule_keys, top_rules)
+from json_index import load_index, save_index
+
+GRAPH_VERSION = 1
+
+RULE_TOP_K = 10
+SIMILAR_TOP_K = 15
+
+# Ändert sich mehr als dieser Anteil der Artikel, wird alles neu berechnet
+MAX_CHANGED_FRACTION = 0.5
+
+# Zeilen pro Block beim Berechnen geänderter Zeilen/Spalten und der Ähnlichkeiten
+ROW_BLOCK = 512
+
+MATRICES = {'total': np.int32, 'kind': np.int16, 'types': np.int8, 'similarity': np.float32}
+TOP_LISTS = ('rules', 'similar')
+
+
+def fingerprint(*parts):
+    """SHA-256 über JSON-serialisierbare Teile (Schlüssel sortiert)"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def top_similar(similarities, rows, top_k):
+    """Top-k Spalten je Zeile ohne die Zeile selbst; absteigend, Gleichstand: kleinere Spalte"""
+    similarities = np.array(similarities, dtype=np.float32)
+    similarities[np.arange(len(rows)), rows] = -np.inf
+    k = max(0, min(top_k, similarities.shape[1] - 1))
+    if not k:
+        return np.zeros((len(rows), 0), dtype=np.int64)
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    order = np.lexsort((top, -np.take_along_axis(similarities, top, axis=1)), axis=-1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def _blocks(rows, size=ROW_BLOCK):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class ConnectionGraph:
+    """Paarweise Scores und Top-k aller Artikel, inkrementell fortgeschrieben"""
+
+    def __init__(self, graph_dir, journey_maps, related_categories, config=None):
+        self.graph_dir = Path(graph_dir)
+        self.graph_file = self.graph_dir / 'graph.json'
+        self.journey_maps = journey_maps
+        self.related_categories = related_categories
+        # Andere Reisen, Kategorien oder ein anderes Embedding-Backend verwerfen den Graphen
+        self.config = fingerprint(GRAPH_VERSION, journey_maps, related_categories, config)
+        self.stats = {'changed': 0, 'removed': 0, 'recomputed': 0, 'full': False}
+        self.urls, self.fingerprints, self.with_similarity = self._load_graph()
+        self.features = None
+        self.arrays = {}
+        self._rewrite = False
+
+    def _load_graph(self):
+        data = load_index(self.graph_file, GRAPH_VERSION, config=self.config)
+        if data is None:
+            return [], [], False
+        return data.get('urls', []), data.get('fingerprints', []), data.get('similarity', False)
+
+    def _open_arrays(self, with_similarity):
+        """Gespeicherte Matrizen per memmap (r+) öffnen; False wenn sie fehlen oder nicht passen"""
+        n = len(self.urls)
+        names = [name for name in MATRICES if name != 'similarity' or with_similarity]
+        tops = [name for name in TOP_LISTS if name != 'similar' or with_similarity]
+        try:
+            arrays = {name: np.load(self.graph_dir / f"{name}.npy", mmap_mode='r+') for name in names}
+            arrays.update({name: np.load(self.graph_dir / f"{name}.npy") for name in tops})
+        except (OSError, ValueError):
+            return False
+        if any(arrays[name].shape != (n, n) or arrays[name].dtype != MATRICES[name] for name in names):
+            return False
+        if any(len(arrays[name]) != n for name in tops):
+            return False
+        self.arrays = arrays
+        return True
+
+    def update(self, articles, fingerprints, embeddings=None):
+        """Bringt Matrizen und Top-k auf den Stand von `articles`
+
+        fingerprints: ein Fingerabdruck pro Artikel (ändert er sich, wird der
+        Artikel neu bewertet). embeddings: normalisierte Vektoren (n × d) oder
+        None (nur Regeln). Gibt die Zeilen zurück, deren Top-k neu bestimmt wurden.
+        """
+        n = len(articles)
+        urls = [article['url'] for article in articles]
+        self.features = ArticleFeatures(articles, self.journey_maps, self.related_categories)
+
+        previous = {url: (row, digest) for row, (url, digest) in enumerate(zip(self.urls, self.fingerprints))}
+        changed = np.array([i for i, (url, digest) in enumerate(zip(urls, fingerprints))
+                            if previous.get(url, (None, None))[1] != digest], dtype=np.int64)
+        with_similarity = embeddings is not None
+        self.stats['changed'] = len(changed)
+        self.stats['removed'] = len(set(self.urls) - set(urls))
+
+        incremental = (self.urls and self.with_similarity == with_similarity
+                       and len(changed) <= MAX_CHANGED_FRACTION * n and self._open_arrays(with_similarity))
+        old_urls = self.urls
+        self.urls, self.fingerprints, self.with_similarity = urls, list(fingerprints), with_similarity
+
+        if not incremental:
+            self._build(n, embeddings)
+            rows = np.arange(n)
+        elif urls != old_urls:
+            # Artikel hinzugekommen, entfernt oder umsortiert: Bekanntes übernehmen, Rest neu
+            self._remap([previous[url][0] if url in previous else -1 for url in urls])
+            self._score(changed, embeddings)
+            rows = np.arange(n)
+        else:
+            # Nur Änderungen: an Ort und Stelle patchen
+            self.graph_file.unlink(missing_ok=True)
+            affected = self._affected(changed, embeddings) if len(changed) else changed
+            self._score(changed, embeddings)
+            rows = np.union1d(changed, affected)
+
+        self._derive(rows)
+        self.stats['recomputed'] = len(rows)
+        return rows
+
+    def _build(self, n, embeddings):
+        """Alles neu: volle Matrizen blockweise berechnen"""
+        self.stats['full'] = True
+        self._rewrite = True
+        self.arrays = {
+            'total': np.zeros((n, n), dtype=np.int32),
+            'kind': np.full((n, n), -1, dtype=np.int16),
+            'types': np.zeros((n, n), dtype=np.int8),
+        }
+        for start, stop in row_blocks(self.features.row_costs(), BLOCK_BUDGET):
+            self._store_rows(np.arange(start, stop))
+        if embeddings is not None:
+            self.arrays['similarity'] = np.zeros((n, n), dtype=np.float32)
+            for rows in _blocks(np.arange(n)):
+                self.arrays['similarity'][rows] = embeddings[rows] @ embeddings.T
+
+    def _remap(self, old_rows):
+        """Neue Matrizen in neuer Reihenfolge; old_rows[i] = alte Zeile des Artikels i oder -1"""
+        self._rewrite = True
+        n = len(old_rows)
+        old_rows = np.array(old_rows, dtype=np.int64)
+        kept = np.flatnonzero(old_rows >= 0)
+        arrays = {}
+        for name in MATRICES:
+            if name not in self.arrays:
+                continue
+            fill = -1 if name == 'kind' else 0
+            arrays[name] = np.full((n, n), fill, dtype=MATRICES[name])
+            arrays[name][np.ix_(kept, kept)] = self.arrays[name][np.ix_(old_rows[kept], old_rows[kept])]
+        self.arrays = arrays
+
+    def _store_rows(self, rows):
+        score, types, journeys, first_journey = self.features.score_rows(rows)
+        total, kind = rule_components(score, journeys, first_journey)
+        self.arrays['total'][rows] = total
+        self.arrays['kind'][rows] = kind
+        self.arrays['types'][rows] = types
+
+    def _score(self, changed, embeddings):
+        """Zeilen und Spalten der geänderten Artikel neu berechnen"""
+        for rows in _blocks(changed):
+            self._store_rows(rows)
+            score, types, journeys, first_journey = self.features.score_columns(rows)
+            total, kind = rule_components(score, journeys, first_journey)
+            self.arrays['total'][:, rows] = total
+            self.arrays['kind'][:, rows] = kind
+            self.arrays['types'][:, rows] = types
+            if embeddings is not None:
+                similarities = embeddings[rows] @ embeddings.T
+                self.arrays['similarity'][rows] = similarities
+                self.arrays['similarity'][:, rows] = similarities.T
+
+    def _affected(self, changed, embeddings):
+        """Unveränderte Zeilen, deren Top-k ein geänderter Artikel verlässt oder betritt
+
+        Vor _score aufrufen: verglichen wird das jeweils letzte Element der alten
+        Top-k mit den neuen Werten der geänderten Spalten.
+        """
+        n = len(self.urls)
+        others = np.setdiff1d(np.arange(n), changed)
+        journeys = len(self.features.journey_names)
+
+        # Verlässt: ein geänderter Artikel steht in den alten Top-k
+        touched = np.zeros(n, dtype=bool)
+        for name in TOP_LISTS:
+            if name in self.arrays:
+                touched |= np.isin(self.arrays[name], changed).any(axis=1)
+
+        # Betritt: der neue Wert schlägt das bisher letzte Element der Top-k
+        rules = self.arrays['rules'][others]
+        last = rules[:, -1]
+        if rules.shape[1] == RULE_TOP_K:
+            last_keys = np.where(last >= 0, rule_keys(self.arrays['total'][others, last],
+                                                      self.arrays['kind'][others, last], last, n, journeys), -1)
+        else:
+            # Weniger Artikel als Plätze: jede Verbindung kommt hinein
+            last_keys = np.full(len(others), -1)
+        if embeddings is not None and self.arrays['similar'].shape[1]:
+            last_similar = self.arrays['similar'][others, -1]
+            last_similarities = np.asarray(self.arrays['similarity'][others, last_similar])
+
+        for columns in _blocks(changed):
+            score, _, journeys_hit, first_journey = self.features.score_columns(columns)
+            total, kind = rule_components(score[others], journeys_hit[others], first_journey[others])
+            touched[others] |= (rule_keys(total, kind, columns[None, :], n, journeys) > last_keys[:, None]).any(axis=1)
+            if embeddings is not None and self.arrays['similar'].shape[1]:
+                similarities = embeddings[others] @ embeddings[columns].T
+                touched[others] |= ((similarities > last_similarities[:, None])
+                                    | ((similarities == last_similarities[:, None])
+                                       & (columns[None, :] < last_similar[:, None]))).any(axis=1)
+        touched[changed] = False
+        return np.flatnonzero(touched)
+
+    def _derive(self, rows):
+        """Top-k der Zeilen `rows` aus den vollen Matrix-Zeilen bestimmen"""
+        n = len(self.urls)
+        if not n:
+            return
+        journeys = len(self.features.journey_names)
+        tops = {'rules': min(RULE_TOP_K, n)}
+        if self.with_similarity:
+            tops['similar'] = max(0, min(SIMILAR_TOP_K, n - 1))
+        for name, width in tops.items():
+            if name not in self.arrays or self.arrays[name].shape != (n, width):
+                self.arrays[name] = np.full((n, width), -1, dtype=np.int64)
+                rows = np.arange(n)
+        for block in _blocks(rows):
+            if not len(block):
+                continue
+            self.arrays['rules'][block] = top_rules(np.asarray(self.arrays['total'][block]),
+                                                    np.asarray(self.arrays['kind'][block]), journeys, RULE_TOP_K)
+            if self.with_similarity:
+                self.arrays['similar'][block] = top_similar(self.arrays['similarity'][block], block, SIMILAR_TOP_K)
+
+    def rule_connections(self, rows):
+        """{url: Regel-Verbindungen} für `rows` – wie connection_scoring.rule_based_connections"""
+        return {
+            self.urls[row]: rule_entries(self.features, self.urls, self.arrays['rules'][row],
+                                         self.arrays['total'][row], self.arrays['kind'][row],
+                                         self.arrays['types'][row])
+            for row in rows
+        }
+
+    def similar(self, rows):
+        """{url: [{url, similarity}]} der ähnlichsten Artikel für `rows`"""
+        return {
+            self.urls[row]: [{'url': self.urls[column], 'similarity': float(self.arrays['similarity'][row, column])}
+                             for column in self.arrays['similar'][row]]
+            for row in rows
+        }
+
+    def save(self):
+        """Schreibt Matrizen (nur nach Neuaufbau; sonst flush der memmaps), Top-k und zuletzt graph.json"""
+        self.graph_dir.mkdir(parents=True, exist_ok=True)
+        for name, array in self.arrays.items():
+            if name in MATRICES and not self._rewrite:
+                array.flush()
+            else:
+                self._write_array(name, array)
+        if not self.with_similarity:
+            for name in ('similarity', 'similar'):
+                (self.graph_dir / f"{name}.npy").unlink(missing_ok=True)
+        self._rewrite = False
+
+        save_index(self.graph_file, GRAPH_VERSION, {'config': self.config, 'similarity': self.with_similarity,
+                                                    'urls': self.urls, 'fingerprints': self.fingerprints})
+
+    def _write_array(self, name, array):
+        path = self.graph_dir / f"{name}.npy"
+        tmp_file = path.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            np.save(f, np.asarray(array))
+        tmp_file.replace(path)
@@ -0,0 +1,400 @@
+"""
+Connection Scoring
+Vektorisierte regelbasierte Verbindungs-Scores für generate-smart-connections.py
+
+Jeder Artikel wird einmal in ganzzahlige Merkmals-IDs übersetzt (Themen,
+Themen-Wörter, Lebensphasen, Tonalität, Transformation, Kategorie). Die
+paarweisen Scores entstehen dann blockweise aus dünn besetzten Produkten
+(Postings + np.bincount) und Vergleichen ganzer Vektoren – es gibt keine
+Python-Schleife über Artikelpaare. Pro Zeile wählt argpartition die Top-k.
+Reisen laufen über invertierte Indizes (Thema → Artikel, Reise → Start- und
+Ziel-Kandidaten); ihr Aufwand wächst mit den tatsächlichen Treffern, nicht
+mit n² × Reisen.
+
+Regeln pro Paar (a, b), a ≠ b:
+    Kategorie gleich +15 (vertiefung), verwandte Kategorie +8
+    Themen: +10 pro gemeinsamem Thema; pro Paar verschiedener Themen +3 bei
+            Teilstring, +2 pro gemeinsamem Wort (Trennung an '-')
+            – ab mehr als 15 Punkten vertiefung
+    Transformation: von=von +8, zu=zu +8, zu(a)=von(b) +15
+            – ab mehr als 10 Punkten naechster-schritt
+    Gleiche Tonalität +5, gemeinsame Lebensphase +5
+    Reisen: +20 pro Reise, bei der a ein Start- und b ein Zielthema hat;
+            der Typ kommt von der letzten passenden Reise
+Nur Paare mit Score > 0 (oder einer Reise) zählen. Bei Gleichstand stehen
+Regel-Treffer in Artikel-Reihenfolge vor reinen Reise-Treffern (Reihenfolge
+der Reisen, dann der Artikel).
+
+Benötigt: pip install numpy
+"""
+
+from bisect import bisect_right
+from collections import Counter
+
+import numpy as np
+
+# Max. Einträge der Zwischen-Arrays pro Zeilenblock (begrenzt den Speicher)
+BLOCK_BUDGET = 1 << 21
+
+RULE_TYPES = ('ergaenzung', 'vertiefung', 'naechster-schritt')
+
+
+class SparseRows:
+    """Dünn besetzte Matrix Zeilen × Merkmale im CSR-Format (indptr, indices, values)"""
+
+    def __init__(self, indptr, indices, values, n_columns):
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+        self.n_columns = n_columns
+
+    @classmethod
+    def from_rows(cls, rows, n_columns):
+        """rows: pro Zeile ein dict Merkmal → Gewicht"""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=indptr[1:])
+        indices = np.fromiter((f for row in rows for f in row), dtype=np.int64, count=indptr[-1])
+        values = np.fromiter((v for row in rows for v in row.values()), dtype=np.float64, count=indptr[-1])
+        return cls(indptr, indices, values, n_columns)
+
+    def transpose(self):
+        """Merkmale × Zeilen – die Postings-Listen für block_product"""
+        order = np.argsort(self.indices, kind='stable')
+        rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        indptr = np.zeros(self.n_columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.n_columns), out=indptr[1:])
+        return SparseRows(indptr, rows[order], self.values[order], len(self.indptr) - 1)
+
+    def dot(self, dense, budget=BLOCK_BUDGET):
+        """Produkt mit einer dichten Matrix (n_columns × k) → (Zeilen × k), zeilenblockweise"""
+        n_rows = len(self.indptr) - 1
+        out = np.zeros((n_rows, dense.shape[1]), dtype=np.float64)
+        costs = np.diff(self.indptr) * dense.shape[1] + 1
+        for start, stop in row_blocks(costs, budget):
+            lo, hi = self.indptr[start], self.indptr[stop]
+            products = self.values[lo:hi, None] * dense[self.indices[lo:hi]]
+            # Summe je Zeile über ihre Einträge; leere Zeilen bleiben 0
+            starts = self.indptr[start:stop] - lo
+            filled = np.diff(self.indptr[start:stop + 1]) > 0
+            if filled.any():
+                out[start:stop][filled] = np.add.reduceat(products, starts[filled], axis=0)
+        return out
+
+    def take(self, rows):
+        """Nur die Zeilen `rows` (in dieser Reihenfolge)"""
+        starts = self.indptr[rows]
+        lengths = self.indptr[np.asarray(rows) + 1] - starts
+        indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        positions = _ragged_positions(starts, lengths)
+        return SparseRows(indptr, self.indices[positions], self.values[positions], self.n_columns)
+
+    def expansion(self, postings):
+        """Pro Zeile: Anzahl Postings-Einträge, die block_product für sie anfasst"""
+        lengths = np.diff(postings.indptr)[self.indices]
+        cumulative = np.concatenate(([0], np.cumsum(lengths)))
+        return cumulative[self.indptr[1:]] - cumulative[self.indptr[:-1]]
+
+
+def _ragged_positions(starts, lengths):
+    """Alle Positionen starts[i] .. starts[i]+lengths[i]-1, aneinandergehängt"""
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+
+def block_matches(left, postings, start, stop):
+    """Alle Treffer von left[start:stop] in den Postings: (Zellen, Merkmale, Gewichte)
+
+    Zelle = lokale Zeile × n + Spalte. Innerhalb einer Zelle kommen die Treffer
+    in der Reihenfolge der Merkmale ihrer Zeile.
+    """
+    lo, hi = left.indptr[start], left.indptr[stop]
+    features = left.indices[lo:hi]
+    rows = np.repeat(np.arange(stop - start), np.diff(left.indptr[start:stop + 1]))
+
+    # Jeder Eintrag der Zeile wird zu allen Postings seines Merkmals aufgefächert
+    starts = postings.indptr[features]
+    lengths = postings.indptr[features + 1] - starts
+    positions = _ragged_positions(starts, lengths)
+    weights = np.repeat(left.values[lo:hi], lengths) * postings.values[positions]
+    cells = np.repeat(rows, lengths) * postings.n_columns + postings.indices[positions]
+    return cells, np.repeat(features, lengths), weights
+
+
+def block_product(left, postings, start, stop):
+    """Dichtes Produkt left[start:stop] · right^T, mit postings = right.transpose()"""
+    size, n = stop - start, postings.n_columns
+    cells, _, weights = block_matches(left, postings, start, stop)
+    return np.bincount(cells, weights=weights, minlength=size * n).reshape(size, n)
+
+
+def row_blocks(costs, budget):
+    """Teilt Zeilen in zusammenhängende Blöcke mit Kostensumme ≤ budget (mind. eine Zeile)"""
+    cumulative = np.cumsum(costs)
+    start = 0
+    while start < len(costs):
+        base = cumulative[start - 1] if start else 0
+        stop = max(start + 1, int(np.searchsorted(cumulative, base + budget, side='right')))
+        yield start, stop
+        start = stop
+
+
+def substring_pairs(themes):
+    """Alle Paare (i, j), i ≠ j, bei denen themes[i] in themes[j] vorkommt"""
+    joined = '\0'.join(themes)
+    starts = [0]
+    for theme in themes[:-1]:
+        starts.append(starts[-1] + len(theme) + 1)
+
+    pairs = []
+    for i, theme in enumerate(themes):
+        position = joined.find(theme)
+        while position != -1:
+            j = bisect_right(starts, position) - 1
+            if j != i:
+                pairs.append((i, j))
+            if j + 1 == len(themes):
+                break
+            # Ein Treffer pro Thema genügt – weiter beim nächsten
+            position = joined.find(theme, starts[j + 1])
+    return pairs
+
+
+def _ids(values, vocabulary):
+    return np.fromiter((vocabulary.setdefault(value, len(vocabulary)) for value in values),
+                       dtype=np.int64, count=len(values))
+
+
+class ArticleFeatures:
+    """Ganzzahlig codierte Merkmale aller Artikel (einmal pro Lauf berechnet)"""
+
+    def __init__(self, articles, journey_maps, related_categories):
+        analyses = [article.get('analysis') or {} for article in articles]
+        theme_lists = [analysis.get('tiefenthemen', []) for analysis in analyses]
+        self.n = len(articles)
+
+        # Themen: Vokabular, Wörter je Thema, Teilstring-Nachbarn
+        theme_ids = {}
+        counts = [Counter(theme_ids.setdefault(theme, len(theme_ids)) for theme in themes) for themes in theme_lists]
+        themes = list(theme_ids)
+        word_ids = {}
+        theme_words = [{word_ids.setdefault(word, len(word_ids)) for word in theme.split('-')} for theme in themes]
+        neighbours = [set() for _ in themes]
+        for i, j in substring_pairs(themes):
+            neighbours[i].add(j)
+            neighbours[j].add(i)
+
+        # theme_score(a, b) = left[a] · right[b] über vier Merkmalsbereiche:
+        #   10 · gemeinsame Themen
+        #   −2 · |Wörter(t)| für gleiche Themen (die Wort-Summe zählt sie mit, die Regel nicht)
+        #    3 · Teilstring-Paare
+        #    2 · gemeinsame Wörter über alle Themenpaare
+        v, w = len(themes), len(word_ids)
+        left, right = [], []
+        for count in counts:
+            substrings = Counter()
+            words = Counter()
+            for theme, c in count.items():
+                for other in neighbours[theme]:
+                    substrings[other] += c
+                for word in theme_words[theme]:
+                    words[word] += c
+            row = {theme: 10.0 for theme in count}
+            row.update({v + theme: -2.0 * len(theme_words[theme]) * c for theme, c in count.items()})
+            row.update({2 * v + theme: 3.0 * c for theme, c in substrings.items()})
+            row.update({3 * v + word: 2.0 * c for word, c in words.items()})
+            left.append(row)
+            column = {theme: 1.0 for theme in count}
+            column.update({v + theme: float(c) for theme, c in count.items()})
+            column.update({2 * v + theme: float(c) for theme, c in count.items()})
+            column.update({3 * v + word: float(c) for word, c in words.items()})
+            right.append(column)
+        self.theme_left = SparseRows.from_rows(left, 3 * v + w)
+        self.theme_right = SparseRows.from_rows(right, 3 * v + w)
+        self.theme_postings = self.theme_right.transpose()
+
+        # Lebensphasen: gemeinsame Phase ⇔ Produkt > 0
+        phase_ids = {}
+        phases = [{phase_ids.setdefault(phase, len(phase_ids)): 1.0 for phase in analysis.get('lebensphase', [])}
+                  for analysis in analyses]
+        self.phases = SparseRows.from_rows(phases, len(phase_ids))
+        self.phase_postings = self.phases.transpose()
+
+        # Kategorie: Score-Tabelle über das Kategorie-Vokabular
+        category_ids = {}
+        self.category = _ids([article.get('category', '') for article in articles], category_ids)
+        categories = list(category_ids)
+        self.category_scores = np.array([
+            [15 if a == b else 8 if b in related_categories.get(a, []) else 0 for b in categories]
+            for a in categories
+        ], dtype=np.int64).reshape(len(categories), len(categories))
+
+        self.tonality = _ids([analysis.get('emotionaleTonalitaet') for analysis in analyses], {})
+
+        # Transformation: gemeinsames Vokabular für von/zu, damit zu(a)=von(b) vergleichbar ist
+        transformations = [analysis.get('transformation', {}) for analysis in analyses]
+        states = {}
+        self.has_transformation = np.array([bool(t) for t in transformations], dtype=bool)
+        self.von = _ids([t.get('von', '').lower() if t else None for t in transformations], states)
+        self.zu = _ids([t.get('zu', '').lower() if t else None for t in transformations], states)
+
+        # Reisen: invertierter Index Thema → Artikel, daraus je Reise die Start- und
+        # Ziel-Kandidaten. Ein Paar (a, b) passt zu Reise j ⇔ a startet j und b ist Ziel von j
+        # – als dünnes Produkt Start-Zeilen · Ziel-Postings über die Reise-IDs.
+        theme_articles = [[] for _ in themes]
+        for article, count in enumerate(counts):
+            for theme in count:
+                theme_articles[theme].append(article)
+        journeys = list(journey_maps.items())
+        self.journey_names = [name for name, _ in journeys]
+        self.type_names = list(RULE_TYPES)
+        self.journey_types = np.array([self._type_code(journey['type']) for _, journey in journeys], dtype=np.int64)
+        starts = [{} for _ in articles]
+        targets = [{} for _ in articles]
+        for j, (_, journey) in enumerate(journeys):
+            for rows, journey_themes in ((starts, journey['themes']), (targets, journey['next'])):
+                for theme in journey_themes:
+                    for article in theme_articles[theme_ids[theme]] if theme in theme_ids else ():
+                        rows[article][j] = 1.0
+        self.journey_starts = SparseRows.from_rows(starts, len(journeys))
+        self.journey_targets = SparseRows.from_rows(targets, len(journeys))
+        self.journey_postings = self.journey_targets.transpose()
+
+    def _type_code(self, name):
+        if name not in self.type_names:
+            self.type_names.append(name)
+        return self.type_names.index(name)
+
+    def row_costs(self):
+        """Speicherbedarf pro Zeile in Array-Einträgen (für row_blocks)"""
+        return (self.n + self.theme_left.expansion(self.theme_postings)
+                + self.phases.expansion(self.phase_postings)
+                + self.journey_starts.expansion(self.journey_postings))
+
+    def score_block(self, start, stop):
+        """Scores (int64) und Typ-Codes aller Paare start ≤ a < stop, b beliebig
+
+        Paare ohne Verbindung (und a = b) haben Score 0, dazu kommen Anzahl und
+        Codes der passenden Reisen.
+        """
+        return self.score_rows(np.arange(start, stop))
+
+    def score_rows(self, rows):
+        """Wie score_block, für beliebige Zeilen `rows` gegen alle Artikel (len(rows) × n)"""
+        size = len(rows)
+        theme = block_product(self.theme_left.take(rows), self.theme_postings, 0, size)
+        shared_phase = block_product(self.phases.take(rows), self.phase_postings, 0, size) > 0
+        cells, journey_ids, _ = block_matches(self.journey_starts.take(rows), self.journey_postings, 0, size)
+        return self._scores(np.asarray(rows), np.arange(self.n), theme, shared_phase, cells, journey_ids)
+
+    def score_columns(self, columns):
+        """Wie score_block, für alle Artikel gegen die Spalten `columns` (n × len(columns))
+
+        Gerechnet über die transponierten Produkte: Spalte c · Zeilen-Postings.
+        """
+        size = len(columns)
+        theme = block_product(self.theme_right.take(columns), self.theme_left.transpose(), 0, size).T
+        shared_phase = block_product(self.phases.take(columns), self.phase_postings, 0, size).T > 0
+        cells, journey_ids, _ = block_matches(self.journey_targets.take(columns), self.journey_starts.transpose(),
+                                              0, size)
+        # Zellen (Spalte, Zeile) → (Zeile, Spalte); die Reihenfolge je Zelle bleibt erhalten
+        cells = cells % self.n * size + cells // self.n
+        return self._scores(np.arange(self.n), np.asarray(columns), theme, shared_phase, cells, journey_ids)
+
+    def _scores(self, rows, columns, theme, shared_phase, cells, journey_ids):
+        theme = np.rint(theme).astype(np.int64)
+        same_category = self.category[rows, None] == self.category[None, columns]
+        both = self.has_transformation[rows, None] & self.has_transformation[None, columns]
+        trans = both * (8 * (self.von[rows, None] == self.von[None, columns])
+                        + 8 * (self.zu[rows, None] == self.zu[None, columns])
+                        + 15 * (self.zu[rows, None] == self.von[None, columns]))
+
+        score = (self.category_scores[self.category[rows, None], self.category[None, columns]] + theme + trans
+                 + 5 * (self.tonality[rows, None] == self.tonality[None, columns]) + 5 * shared_phase)
+        types = np.where(trans > 10, 2, np.where((theme > 15) | same_category, 1, 0))
+
+        # Reisen: nur die tatsächlichen Treffer; je Zelle aufsteigend nach Reise-ID
+        journeys = np.bincount(cells, minlength=score.size).reshape(score.shape)
+        first_journey = np.full(score.shape, -1, dtype=np.int64)
+        matched, first = np.unique(cells, return_index=True)
+        last = len(cells) - 1 - np.unique(cells[::-1], return_index=True)[1]
+        first_journey.flat[matched] = journey_ids[first]
+        # Der Typ kommt von der letzten passenden Reise
+        types.flat[matched] = self.journey_types[journey_ids[last]]
+
+        own = rows[:, None] == columns[None, :]
+        score[own] = 0
+        journeys[own] = 0
+        return score, types, journeys, first_journey
+
+
+def rule_components(score, journeys, first_journey):
+    """(total, kind) je Paar aus score_block
+
+    total: Regel-Score plus 20 je Reise; kind: -1 keine Verbindung, 0 Regel-Treffer,
+    1 + j reiner Treffer der Reise j (j = erste passende Reise).
+    """
+    rule = score > 0
+    total = np.where(rule, score, 0) + 20 * journeys
+    kind = np.where(rule, 0, np.where(journeys > 0, 1 + first_journey, -1))
+    return total, kind
+
+
+def rule_keys(total, kind, columns, n, n_journeys):
+    """Ein int64-Schlüssel pro Paar: Score, dann Tie-Break-Rang (kleiner Rang gewinnt); -1 = keine Verbindung
+
+    Rang: Regel-Treffer in Artikel-Reihenfolge vor reinen Reise-Treffern
+    (Reihenfolge der Reisen, dann der Artikel).
+    """
+    span = (n_journeys + 2) * n
+    rank = np.asarray(kind, dtype=np.int64) * n + columns
+    return np.where(kind >= 0, np.asarray(total, dtype=np.int64) * span + (span - 1 - rank), -1)
+
+
+def top_rules(total, kind, n_journeys, top_k):
+    """Top-k Spalten je Zeile über volle Zeilen (Spalte = Artikel-Index), absteigend; -1 = leer"""
+    n = total.shape[1]
+    key = rule_keys(total, kind, np.arange(n), n, n_journeys)
+    k = min(top_k, n)
+    top = np.argpartition(-key, k - 1, axis=1)[:, :k]
+    top_keys = np.take_along_axis(key, top, axis=1)
+    order = np.argsort(-top_keys, axis=1, kind='stable')
+    top = np.take_along_axis(top, order, axis=1)
+    return np.where(np.take_along_axis(top_keys, order, axis=1) >= 0, top, -1)
+
+
+def rule_entries(features, urls, columns, total, kind, types):
+    """Verbindungs-dicts einer Zeile für die Spalten `columns` (-1 beendet die Liste)"""
+    related = []
+    for column in columns:
+        if column < 0:
+            break
+        connection = {'url': urls[column], 'score': int(total[column]),
+                      'type': features.type_names[types[column]]}
+        if kind[column] > 0:
+            connection['journey'] = features.journey_names[kind[column] - 1]
+        related.append(connection)
+    return related
+
+
+def rule_based_connections(articles, journey_maps, related_categories, top_k=10):
+    """Top-k regelbasierte Verbindungen pro Artikel
+
+    Gibt {url: [{'url', 'score', 'type'}, ...]} zurück, absteigend nach Score;
+    reine Reise-Treffer tragen zusätzlich 'journey' (die erste passende Reise).
+    """
+    features = ArticleFeatures(articles, journey_maps, related_categories)
+    n = features.n
+    urls = [article['url'] for article in articles]
+    if not n:
+        return {}
+
+    connections = {}
+    for start, stop in row_blocks(features.row_costs(), BLOCK_BUDGET):
+        score, types, journeys, first_journey = features.score_block(start, stop)
+        total, kind = rule_components(score, journeys, first_journey)
+        top = top_rules(total, kind, len(features.journey_names), top_k)
+        for local, row in enumerate(range(start, stop)):
+            connections[urls[row]] = rule_entries(features, urls, top[local], total[local], kind[local], types[local])
+
+    return connections
@@ -89,57 +89,223 @@ def extract_description(html):
 
     return ""
 
-def extract_content(html):
-    """Extrahiert den Hauptinhalt aus WordPress/Elementor HTML."""
-    content_parts = []
-
-    # Entferne Script und Style Tags
-    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
-
-    # Finde Elementor Text-Editor Widgets (Hauptinhalt)
-    text_widgets = re.findall(
-        r'<div class="elementor-widget-container">\s*(.*?)\s*</div>\s*</div>',
-        html, flags=re.DOTALL
-    )
+# Tokenizer für extract_content: ein Vorwärtsdurchlauf, keine Regex über die ganze Seite
+TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9:-]*)([^>]*)>')
+TAG_START_PATTERN = re.compile(r'</?[a-zA-Z]')
+ATTR_PATTERN = re.compile(r'''([^\s=/>"']+)(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]*))?''')
+CLASS_PATTERN = re.compile(r'''\bclass\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+RAW_TEXT_END = {
+    'script': re.compile(r'</script\s*>', re.IGNORECASE),
+    'style': re.compile(r'</style\s*>', re.IGNORECASE),
+}
 
-    for widget in text_widgets:
-        # Bereinige den Inhalt
-        text = widget.strip()
-        if not text or len(text) < 50:
+WIDGET_CLASS = 'elementor-widget-container'
+STRIPPED_ATTRS = ('style', 'class')
+# Tags, die ohne Inhalt entfernt werden (span auch mit Attributen, p/h* nur ohne)
+EMPTY_REMOVABLE = {'span', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+
+def iter_tokens(html):
+    """Zerlegt HTML in (art, name, text) mit art in 'text', 'comment', 'start', 'end'.
+
+    script/style werden samt Inhalt übersprungen. Jede Stelle wird nur einmal
+    angesehen: fehlt ein schließendes '-->' oder '>', ist der Rest der Seite Text.
+    """
+    pos = 0
+    length = len(html)
+
+    while pos < length:
+        lt = html.find('<', pos)
+        if lt == -1:
+            yield 'text', None, html[pos:]
+            return
+        if lt > pos:
+            yield 'text', None, html[pos:lt]
+            pos = lt
+
+        if html.startswith('<!--', pos):
+            end = html.find('-->', pos + 4)
+            end = length if end == -1 else end + 3
+            yield 'comment', None, html[pos:end]
+            pos = end
             continue
 
-        # Entferne Elementor-spezifische Wrapper
-        text = re.sub(r'<div[^>]*class="[^"]*elementor[^"]*"[^>]*>', '', text)
-        text = re.sub(r'</div>', '', text)
+        match = TAG_PATTERN.match(html, pos)
+        if not match:
+            if TAG_START_PATTERN.match(html, pos):
+                # Tag-Anfang ohne '>' – danach kommt keines mehr
+                yield 'text', None, html[pos:]
+                return
+            yield 'text', None, '<'
+            pos += 1
+            continue
 
-        # Behalte nur sinnvolle HTML-Tags
-        # Entferne inline styles aber behalte Tags
-        text = re.sub(r'\s*style="[^"]*"', '', text)
-        text = re.sub(r'\s*class="[^"]*"', '', text)
-        text = re.sub(r'\s*data-[a-z-]+="[^"]*"', '', text)
+        closing, name, _ = match.groups()
+        name = name.lower()
+        pos = match.end()
 
-        # Konvertiere span mit bold zu strong
-        text = re.sub(r'<span[^>]*font-weight:\s*bold[^>]*>(.*?)</span>', r'<strong>\1</strong>', text, flags=re.DOTALL)
-        text = re.sub(r'<b>(.*?)</b>', r'<strong>\1</strong>', text, flags=re.DOTALL)
+        if not closing and name in RAW_TEXT_END:
+            end = RAW_TEXT_END[name].search(html, pos)
+            pos = end.end() if end else length
+            continue
 
-        # Entferne leere Tags
-        text = re.sub(r'<span[^>]*>\s*</span>', '', text)
-        text = re.sub(r'<p>\s*</p>', '', text)
-        text = re.sub(r'<h[1-6]>\s*</h[1-6]>', '', text)
+        yield ('end' if closing else 'start'), name, match.group(0)
+
+
+def _class_value(tag):
+    match = CLASS_PATTERN.search(tag)
+    return (match.group(1) or match.group(2) or '') if match else ''
+
+
+def _strip_attributes(tag, name, closing):
+    """Entfernt style, class und data-* (samt führendem Whitespace) aus einem Start-Tag"""
+    if closing:
+        return tag
+    start = len(name) + 1
+    end = len(tag) - 1
+    attrs = tag[start:end]
+    kept = []
+    last = 0
+    for match in ATTR_PATTERN.finditer(attrs):
+        attr = match.group(1).lower()
+        if attr in STRIPPED_ATTRS or attr.startswith('data-'):
+            kept.append(attrs[last:match.start()].rstrip())
+            last = match.end()
+    if not kept:
+        return tag
+    kept.append(attrs[last:])
+    return tag[:start] + ''.join(kept) + tag[end:]
+
+
+class _WidgetBuilder:
+    """Sammelt den bereinigten Inhalt eines Elementor-Widgets
+
+    Elementor-Wrapper-Divs fallen weg, <b> wird zu <strong>, leere span/p/h*
+    werden beim schließenden Tag wieder verworfen.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.raw_parts = []
+        self.divs = []      # offene <div>: True = Elementor-Wrapper (wird nicht ausgegeben)
+        self.inline = []    # offene span/b/p/h*: [name, schließendes Tag, Position, sichtbar, Tags, entfernbar]
+        self.visible = 0    # Anzahl nicht-leerer Teile
+        self.tags = 0       # Anzahl ausgegebener Tags (auch später wieder entfernter)
+
+    def _emit(self, text):
+        self.parts.append(text)
+        if text.strip():
+            self.visible += 1
+        if text.startswith('<'):
+            self.tags += 1
+
+    def text(self, text):
+        self.raw_parts.append(text)
+        self._emit(text)
+
+    def start(self, name, tag):
+        self.raw_parts.append(tag)
+        if name == 'div':
+            is_wrapper = 'elementor' in _class_value(tag)
+            self.divs.append(is_wrapper)
+            if not is_wrapper:
+                self._emit(_strip_attributes(tag, name, False))
+            return
+
+        stripped = _strip_attributes(tag, name, False)
+        close = f"</{name}>"
+        if name == 'b' and stripped == '<b>':
+            stripped, close = '<strong>', '</strong>'
+        if name in EMPTY_REMOVABLE or name == 'b':
+            removable = name == 'span' or (name in EMPTY_REMOVABLE and stripped == f"<{name}>")
+            self.inline.append([name, close, len(self.parts), self.visible, self.tags, removable])
+        self._emit(stripped)
+
+    def end(self, name, tag):
+        """Verarbeitet ein schließendes Tag; gibt True zurück, wenn das Widget damit endet."""
+        self.raw_parts.append(tag)
+        if name == 'div':
+            if not self.divs:
+                self.raw_parts.pop()
+                return True
+            if not self.divs.pop():
+                self._emit(tag)
+            return False
+
+        for depth in range(len(self.inline) - 1, -1, -1):
+            if self.inline[depth][0] == name:
+                _, close, position, visible, tags, removable = self.inline[depth]
+                del self.inline[depth:]
+                # span nur ohne jedes Kind-Tag, p/h* auch wenn darin nur leere span standen
+                empty = self.visible == visible + 1 and (name != 'span' or self.tags == tags + 1)
+                if removable and empty:
+                    del self.parts[position:]
+                    self.visible = visible
+                else:
+                    self._emit(close)
+                return False
+
+        self._emit(tag)
+        return False
 
-        # Bereinige mehrfache Leerzeichen/Newlines
+    def result(self):
+        """Bereinigter Text oder None, wenn das Widget zu kurz ist"""
+        if len(''.join(self.raw_parts).strip()) < 50:
+            return None
+        text = ''.join(self.parts)
         text = re.sub(r'\n\s*\n', '\n\n', text)
         text = re.sub(r'  +', ' ', text)
+        return text.strip() if len(text.strip()) > 100 else None
 
-        if len(text.strip()) > 100:
-            content_parts.append(text.strip())
 
-    # Fallback: Suche nach article oder main content
-    if not content_parts:
-        match = re.search(r'<article[^>]*>(.*?)</article>', html, flags=re.DOTALL)
-        if match:
-            content_parts.append(match.group(1))
+def extract_content(html):
+    """Extrahiert den Hauptinhalt aus WordPress/Elementor HTML.
+
+    Ein Durchlauf über die Tokens: Widget-Container werden über die div-Tiefe
+    abgegrenzt und direkt bereinigt; Fallback ist das erste <article>.
+    """
+    content_parts = []
+    widget = None
+    article = None        # Roh-HTML des ersten <article>
+    article_depth = 0
+    article_done = False
+
+    for kind, name, text in iter_tokens(html):
+        # Fallback: erstes <article> roh mitschreiben
+        if not article_done:
+            if article_depth and not (kind == 'end' and name == 'article' and article_depth == 1):
+                article.append(text)
+            if name == 'article':
+                if kind == 'start':
+                    article_depth += 1
+                    if article is None:
+                        article = []
+                elif article_depth:
+                    article_depth -= 1
+                    article_done = article_depth == 0
+
+        if widget is not None:
+            if kind == 'start':
+                widget.start(name, text)
+            elif kind == 'end':
+                if widget.end(name, text):
+                    result = widget.result()
+                    if result:
+                        content_parts.append(result)
+                    widget = None
+            else:
+                widget.text(text)
+        elif kind == 'start' and name == 'div' and WIDGET_CLASS in _class_value(text).split():
+            widget = _WidgetBuilder()
+
+    # Nicht geschlossenes Widget am Seitenende
+    if widget is not None:
+        result = widget.result()
+        if result:
+            content_parts.append(result)
+
+    if not content_parts and article_done:
+        content_parts.append(''.join(article))
 
     return '\n\n'.join(content_parts)
 
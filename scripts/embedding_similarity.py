@@ -0,0 +1,99 @@
+"""
+Embedding Similarity
+Top-k Kosinus-Ähnlichkeiten über eine Embedding-Matrix (generate-smart-connections.py)
+
+Die Vektoren werden einmal normalisiert – danach ist Kosinus ein Skalarprodukt,
+und die Ähnlichkeiten entstehen als Matrixprodukte von Blöcken
+(block_size Zeilen × block_size Spalten). Pro Zeile bleiben nur die Top-k
+(argpartition); die volle n × n Matrix existiert nie. Große Kataloge werden in
+eine memory-mapped Datei normalisiert, statt komplett im RAM zu liegen.
+
+Benötigt: pip install numpy
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 1024
+
+# Ab dieser Größe (float32) liegen die normalisierten Vektoren als memmap auf der Platte
+MEMMAP_MIN_BYTES = 256 * 1024 * 1024
+
+
+def normalize_rows(embeddings, out, block_size=DEFAULT_BLOCK_SIZE):
+    """Schreibt die auf Länge 1 normalisierten Zeilen (float32) nach `out`
+
+    Nullvektoren bleiben Nullvektoren (Ähnlichkeit 0 zu allem).
+    """
+    for start in range(0, len(embeddings), block_size):
+        block = np.asarray(embeddings[start:start + block_size], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        out[start:start + len(block)] = block / norms
+    return out
+
+
+def _merge_top_k(indices, scores, candidate_indices, candidate_scores, k):
+    """Top-k aus bisherigen Treffern und neuen Kandidaten, absteigend; Gleichstand: kleinerer Index"""
+    indices = np.concatenate((indices, candidate_indices), axis=1)
+    scores = np.concatenate((scores, candidate_scores), axis=1)
+    if indices.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        indices = np.take_along_axis(indices, keep, axis=1)
+        scores = np.take_along_axis(scores, keep, axis=1)
+    order = np.lexsort((indices, -scores), axis=-1)
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def top_k_normalized(normalized, k, block_size=DEFAULT_BLOCK_SIZE):
+    """Top-k je Zeile über bereits normalisierte Vektoren (Array oder memmap), ohne die Zeile selbst"""
+    n = len(normalized)
+    k = max(0, min(k, n - 1))
+    top_indices = np.zeros((n, k), dtype=np.int64)
+    top_scores = np.zeros((n, k), dtype=np.float32)
+    if not k:
+        return top_indices, top_scores
+
+    for row_start in range(0, n, block_size):
+        rows = np.asarray(normalized[row_start:row_start + block_size])
+        row_ids = np.arange(row_start, row_start + len(rows))
+        indices = np.zeros((len(rows), 0), dtype=np.int64)
+        scores = np.zeros((len(rows), 0), dtype=np.float32)
+
+        for column_start in range(0, n, block_size):
+            columns = np.asarray(normalized[column_start:column_start + block_size])
+            similarities = rows @ columns.T
+            column_ids = np.arange(column_start, column_start + len(columns))
+            similarities[row_ids[:, None] == column_ids[None, :]] = -np.inf
+            candidates = np.broadcast_to(column_ids, similarities.shape)
+            indices, scores = _merge_top_k(indices, scores, candidates, similarities, k)
+
+        top_indices[row_start:row_start + len(rows)] = indices
+        top_scores[row_start:row_start + len(rows)] = scores
+
+    return top_indices, top_scores
+
+
+def top_k_similar(embeddings, k=15, block_size=DEFAULT_BLOCK_SIZE, workdir=None):
+    """Die k ähnlichsten anderen Zeilen je Zeile
+
+    embeddings: (n, d) – Liste, Array oder memmap.
+    Gibt (indices, scores) zurück, je (n, min(k, n-1)), absteigend nach
+    Kosinus-Ähnlichkeit; bei Gleichstand kommt der kleinere Index zuerst.
+    """
+    n = len(embeddings)
+    dimensions = len(embeddings[0]) if n else 0
+
+    if n * dimensions * 4 < MEMMAP_MIN_BYTES:
+        normalized = normalize_rows(embeddings, np.empty((n, dimensions), dtype=np.float32), block_size)
+        return top_k_normalized(normalized, k, block_size)
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        normalized = np.lib.format.open_memmap(Path(tmp) / 'normalized.npy', mode='w+',
+                                               dtype=np.float32, shape=(n, dimensions))
+        normalize_rows(embeddings, normalized, block_size)
+        result = top_k_normalized(normalized, k, block_size)
+        del normalized
+    return result
@@ -0,0 +1,189 @@
+"""
+Embedding Store
+Persistente Embeddings für generate-smart-connections.py
+
+Die Vektoren liegen als float32-Matrix in einer Binärdatei, die per memmap
+gelesen wird; der Index bildet den SHA-256 des Embedding-Texts auf die Zeile
+ab. Neue Vektoren werden nur angehängt – unveränderte Texte werden nie erneut
+eingebettet, und ohne neue Texte reicht der Store für eine komplette
+Neuberechnung ohne API. Ein anderes Embedding-Modell verwirft den Store.
+
+Layout:
+    data/embeddings/index.json      {model, dimensions, file, count, rows: Hash → Zeile}
+    data/embeddings/vectors-N.f32   count × dimensions float32 (Zeilen in Einfüge-Reihenfolge)
+
+prune() schreibt eine neue Vektordatei (N+1) und schaltet erst danach den
+Index um – ein Abbruch dazwischen lässt den alten Stand intakt.
+
+Benötigt: pip install numpy
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from json_index import load_index, save_index
+
+INDEX_VERSION = 1
+
+# Obergrenzen pro Embedding-Request (OpenAI: max. 2048 Texte, ~300k Tokens)
+EMBED_BATCH_SIZE = 256
+EMBED_BATCH_CHARS = 200_000
+
+
+def text_hash(text):
+    """SHA-256 über den Embedding-Text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def embedding_batches(texts, max_items=EMBED_BATCH_SIZE, max_chars=EMBED_BATCH_CHARS):
+    """Teilt Texte in Batches mit höchstens max_items Texten und max_chars Zeichen (mind. ein Text)"""
+    batch, chars = [], 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or chars + len(text) > max_chars):
+            yield batch
+            batch, chars = [], 0
+        batch.append(text)
+        chars += len(text)
+    if batch:
+        yield batch
+
+
+class EmbeddingStore:
+    """Text-Hash → Embedding, gespeichert als memory-mapped float32-Matrix (thread-safe)"""
+
+    def __init__(self, store_dir, model):
+        self.store_dir = Path(store_dir)
+        self.model = model
+        self.index_file = self.store_dir / 'index.json'
+        self.vectors_file = self.store_dir / 'vectors-0.f32'
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._matrix = None
+        self.stats = {'hits': 0, 'added': 0, 'removed': 0, 'invalidated': 0}
+        self.dimensions, self.rows = self._load_index()
+
+    def _load_index(self):
+        data = load_index(self.index_file, INDEX_VERSION)
+        if data is None:
+            return None, {}
+        if data.get('model') != self.model:
+            # Anderes Modell: Vektoren sind nicht vergleichbar – alles neu
+            self.stats['invalidated'] = len(data.get('rows', {}))
+            self._dirty = True
+            return None, {}
+        self.vectors_file = self.store_dir / data.get('file', self.vectors_file.name)
+        rows = data.get('rows', {})
+        expected = len(rows) * (data.get('dimensions') or 0) * 4
+        if not self.vectors_file.exists() or self.vectors_file.stat().st_size < expected:
+            return None, {}
+        return data.get('dimensions'), rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, text):
+        return text_hash(text) in self.rows
+
+    @property
+    def matrix(self):
+        """Alle Vektoren als (count, dimensions) memmap (nur lesen)"""
+        with self._lock:
+            if self._matrix is None:
+                if not self.rows:
+                    return np.zeros((0, self.dimensions or 0), dtype=np.float32)
+                self._matrix = np.memmap(self.vectors_file, dtype=np.float32, mode='r',
+                                         shape=(len(self.rows), self.dimensions))
+            return self._matrix
+
+    def missing(self, texts):
+        """Texte ohne gespeichertes Embedding (ohne Duplikate, in Eingabe-Reihenfolge)"""
+        with self._lock:
+            seen = set()
+            result = []
+            for text in texts:
+                digest = text_hash(text)
+                if digest not in self.rows and digest not in seen:
+                    seen.add(digest)
+                    result.append(text)
+            self.stats['hits'] += len(texts) - len(result)
+            return result
+
+    def add(self, texts, vectors):
+        """Hängt die Embeddings `vectors` (len(texts) × dimensions) an"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape[0] != len(texts):
+            raise ValueError(f"{len(texts)} Texte, aber {vectors.shape[0]} Vektoren")
+        with self._lock:
+            if self.dimensions is None:
+                self.dimensions = vectors.shape[1]
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Dimension {vectors.shape[1]} statt {self.dimensions}")
+
+            new = {}
+            for text, vector in zip(texts, vectors):
+                digest = text_hash(text)
+                if digest not in self.rows and digest not in new:
+                    new[digest] = vector
+            if not new:
+                return
+
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            self.vectors_file.touch()
+            with open(self.vectors_file, 'r+b') as f:
+                # Reste eines abgebrochenen Laufs (Zeilen ohne Index-Eintrag) abschneiden
+                f.truncate(len(self.rows) * self.dimensions * 4)
+                f.seek(0, 2)
+                f.write(np.stack(list(new.values())).tobytes())
+            for digest in new:
+                self.rows[digest] = len(self.rows)
+            self.stats['added'] += len(new)
+            self._matrix = None
+            self._dirty = True
+
+    def get(self, texts):
+        """Embeddings für `texts` als (len(texts), dimensions) Array (KeyError wenn einer fehlt)"""
+        rows = [self.rows[text_hash(text)] for text in texts]
+        return np.asarray(self.matrix[rows])
+
+    def prune(self, texts):
+        """Entfernt Embeddings, deren Text nicht in `texts` vorkommt, und verdichtet die Datei"""
+        keep = {text_hash(text) for text in texts}
+        with self._lock:
+            kept = [(digest, row) for digest, row in self.rows.items() if digest in keep]
+            removed = len(self.rows) - len(kept)
+            if not removed:
+                return 0
+
+            old_file = self.vectors_file
+            generation = int(old_file.stem.rsplit('-', 1)[-1]) + 1
+            self.vectors_file = self.store_dir / f"vectors-{generation}.f32"
+            with open(self.vectors_file, 'wb') as f:
+                if kept:
+                    old = np.memmap(old_file, dtype=np.float32, mode='r', shape=(len(self.rows), self.dimensions))
+                    f.write(np.ascontiguousarray(old[[row for _, row in kept]]).tobytes())
+                    del old
+
+            self.rows = {digest: row for row, (digest, _) in enumerate(kept)}
+            self.stats['removed'] += removed
+            self._matrix = None
+            self._write_index()
+            return removed
+
+    def save(self):
+        """Schreibt den Index (nur wenn sich etwas geändert hat); Vektoren schreibt add() sofort"""
+        with self._lock:
+            if self._dirty:
+                self._write_index()
+
+    def _write_index(self):
+        save_index(self.index_file, INDEX_VERSION, {'model': self.model, 'dimensions': self.dimensions,
+                                                    'file': self.vectors_file.name, 'count': len(self.rows),
+                                                    'rows': self.rows})
+        self._dirty = False
+        # Vektordateien früherer Generationen (prune, anderes Modell) werden erst jetzt gelöscht
+        for stale in self.store_dir.glob('vectors-*.f32'):
+            if stale != self.vectors_file:
+                stale.unlink(missing_ok=True)
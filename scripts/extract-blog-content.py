@@ -4,23 +4,33 @@ Content Extraction Script - Phase 1
 Extrahiert strukturierte Daten aus allen Blog-Posts
 
 Verwendung:
-    python scripts/extract-blog-content.py
+    python scripts/extract-blog-content.py [--workers N] [--no-cache]
 
 Output:
     data/blog-content-raw.json
+    data/blog-content-cache.json    (Extraktion pro Datei, Schlüssel: Content-Hash)
 """
 
 import os
 import json
 import re
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+from extraction_cache import ExtractionCache, content_hash
+from json_index import write_atomic
+
 # Konfiguration
 PROJECT_ROOT = Path(__file__).parent.parent
 HTML_DIR = PROJECT_ROOT
 OUTPUT_FILE = PROJECT_ROOT / "data" / "blog-content-raw.json"
+CACHE_FILE = PROJECT_ROOT / "data" / "blog-content-cache.json"
+
+# Bei jeder Änderung an der Extraktion erhöhen (verwirft den Cache)
+EXTRACTOR_VERSION = 1
 
 # Seiten die KEINE Blog-Posts sind
 EXCLUDE_FILES = {
@@ -212,65 +222,141 @@ def detect_special_type(filename, soup):
     return 'blog'
 
 
-def process_html_file(filepath):
-    """Verarbeitet eine einzelne HTML-Datei"""
-    filename = filepath.name
+def extract_article(html, filename):
+    """Extrahiert die Artikeldaten aus HTML; gibt (article, skipped) zurück"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extrahiere alle Daten
+    title = extract_title(soup)
+    content = extract_article_content(soup)
+
+    # Überspringe leere oder sehr kurze Seiten
+    if not title or len(content) < 100:
+        return None, 'zu kurz'
+
+    article = {
+        'url': filename,
+        'title': title,
+        'type': detect_special_type(filename, soup),
+        'category': extract_category(soup, filename),
+        'image': extract_image(soup),
+        'excerpt': extract_excerpt(soup),
+        'content': content,
+        'wordCount': len(content.split()),
+        'blockquotes': extract_blockquotes(soup),
+        'headings': extract_headings(soup),
+        'internalLinks': extract_internal_links(soup, filename)
+    }
 
-    # Überspringe Nicht-Blog-Dateien
-    if filename in EXCLUDE_FILES:
-        return None
+    return article, None
 
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            html = f.read()
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Extrahiere alle Daten
-        title = extract_title(soup)
-        content = extract_article_content(soup)
-
-        # Überspringe leere oder sehr kurze Seiten
-        if not title or len(content) < 100:
-            print(f"  ⚠️  Übersprungen (zu kurz): {filename}")
-            return None
-
-        article = {
-            'url': filename,
-            'title': title,
-            'type': detect_special_type(filename, soup),
-            'category': extract_category(soup, filename),
-            'image': extract_image(soup),
-            'excerpt': extract_excerpt(soup),
-            'content': content,
-            'wordCount': len(content.split()),
-            'blockquotes': extract_blockquotes(soup),
-            'headings': extract_headings(soup),
-            'internalLinks': extract_internal_links(soup, filename)
-        }
-
-        return article
 
+def _extract_worker(job):
+    """Worker für den Prozess-Pool: (Dateiname, HTML) → (Dateiname, Artikel, Übersprungen, Fehler)"""
+    filename, html = job
+    try:
+        article, skipped = extract_article(html, filename)
+        return filename, article, skipped, None
     except Exception as e:
-        print(f"  ❌ Fehler bei {filename}: {e}")
-        return None
+        return filename, None, None, str(e)
+
+
+def extract_all(html_files, cache=None, workers=None):
+    """Extrahiert alle Blog-Dateien; nur neue oder geänderte werden geparst
+
+    Geparst wird in einem Prozess-Pool (BeautifulSoup ist CPU-gebunden).
+    Unveränderte Dateien übernehmen ihr Ergebnis aus dem Cache. Die Ergebnisse
+    kommen unabhängig von der Pool-Reihenfolge nach Dateiname sortiert zurück:
+    [{'file', 'article', 'skipped', 'error', 'cached'}]
+    """
+    results = {}
+    jobs = []
+    digests = {}
+
+    for filepath in sorted(html_files, key=lambda path: path.name):
+        filename = filepath.name
+        if filename in EXCLUDE_FILES:
+            continue
+
+        result = {'file': filename, 'article': None, 'skipped': None, 'error': None, 'cached': False}
+        results[filename] = result
+        try:
+            data = filepath.read_bytes()
+            html = data.decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            result['error'] = str(e)
+            continue
+
+        digests[filename] = content_hash(data)
+        cached = cache.get(filename, digests[filename]) if cache else None
+        if cached:
+            result.update(cached, cached=True)
+        else:
+            jobs.append((filename, html))
+
+    if len(jobs) > 1 and workers != 1:
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            extracted = list(pool.map(_extract_worker, jobs, chunksize=chunksize))
+    else:
+        extracted = [_extract_worker(job) for job in jobs]
+
+    for filename, article, skipped, error in extracted:
+        results[filename].update(article=article, skipped=skipped, error=error)
+        # Fehler nicht cachen – beim nächsten Lauf erneut versuchen
+        if cache and not error:
+            cache.put(filename, digests[filename], article, skipped)
+
+    if cache:
+        cache.prune(results)
+
+    return [results[filename] for filename in sorted(results)]
+
+
+def write_output(articles, output_file=OUTPUT_FILE):
+    """Schreibt die Artikel; bleibt die Datei unverändert, wenn sich keiner geändert hat"""
+    if output_file.exists():
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                if json.load(f).get('articles') == articles:
+                    return False
+        except (OSError, ValueError):
+            pass
+
+    output_data = {
+        'extractedAt': datetime.now().isoformat(),
+        'totalArticles': len(articles),
+        'articles': articles
+    }
+
+    write_atomic(output_file, json.dumps(output_data, ensure_ascii=False, indent=2))
+    return True
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Extrahiert strukturierte Daten aus allen Blog-Posts')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Anzahl paralleler Prozesse (Standard: CPU-Kerne, 1 = ohne Pool)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Alle Dateien neu extrahieren (Cache ignorieren und neu aufbauen)')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("CONTENT EXTRACTION - Phase 1")
     print("=" * 60)
     print()
 
-    # Erstelle Output-Verzeichnis
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-
     # Finde alle HTML-Dateien
     html_files = list(HTML_DIR.glob('*.html'))
     print(f"📁 Gefunden: {len(html_files)} HTML-Dateien")
     print()
 
-    # Verarbeite jede Datei
+    cache = ExtractionCache(CACHE_FILE, EXTRACTOR_VERSION)
+    if args.no_cache:
+        cache.clear()
+
+    # Verarbeite alle Dateien (parallel, unveränderte aus dem Cache)
     articles = []
     stats = {
         'total': 0,
@@ -279,19 +365,29 @@ def main():
         'retreat': 0,
         'angebot': 0,
         'quiz': 0,
-        'skipped': 0
+        'skipped': len([f for f in html_files if f.name in EXCLUDE_FILES]),
+        'cached': 0
     }
 
-    for filepath in sorted(html_files):
-        article = process_html_file(filepath)
+    for result in extract_all(html_files, cache, args.workers):
+        article = result['article']
+        if result['error']:
+            print(f"  ❌ Fehler bei {result['file']}: {result['error']}")
+        elif result['skipped']:
+            print(f"  ⚠️  Übersprungen ({result['skipped']}): {result['file']}")
+
         if article:
             articles.append(article)
             stats['total'] += 1
             stats[article['type']] = stats.get(article['type'], 0) + 1
-            print(f"  ✓ {article['url'][:40]:<40} [{article['type']}]")
+            if result['cached']:
+                stats['cached'] += 1
+            print(f"  ✓ {article['url'][:40]:<40} [{article['type']}]{' (Cache)' if result['cached'] else ''}")
         else:
             stats['skipped'] += 1
 
+    cache.save()
+
     print()
     print("-" * 60)
     print("STATISTIKEN")
@@ -302,20 +398,15 @@ def main():
     print(f"  - Retreats:         {stats['retreat']}")
     print(f"  - Angebote:         {stats['angebot']}")
     print(f"  - Quizze:           {stats['quiz']}")
+    print(f"  Aus dem Cache:      {stats['cached']}")
     print(f"  Übersprungen:       {stats['skipped']}")
     print()
 
     # Speichere Ergebnis
-    output_data = {
-        'extractedAt': datetime.now().isoformat(),
-        'totalArticles': len(articles),
-        'articles': articles
-    }
-
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
-
-    print(f"💾 Gespeichert: {OUTPUT_FILE}")
+    if write_output(articles, OUTPUT_FILE):
+        print(f"💾 Gespeichert: {OUTPUT_FILE}")
+    else:
+        print(f"💾 Unverändert: {OUTPUT_FILE}")
     print()
     print("✅ Phase 1 abgeschlossen!")
     print("   Nächster Schritt: python scripts/analyze-with-llm.py")
@@ -0,0 +1,78 @@
+"""
+Extraction Cache
+Persistenter Cache für extract-blog-content.py
+
+Pro HTML-Datei werden der SHA-256 des Inhalts und das Ergebnis der Extraktion
+gespeichert (Artikel oder Grund fürs Überspringen). Unveränderte Seiten
+übernehmen beim nächsten Lauf ihr altes Ergebnis, ohne erneut geparst zu
+werden. Ändert sich die Extraktionslogik, verwirft eine neue
+Extraktor-Version den ganzen Cache.
+
+Layout:
+    data/blog-content-cache.json    Dateiname → {hash, article, skipped}
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+
+from json_index import load_index, save_index
+
+INDEX_VERSION = 1
+
+
+def content_hash(data):
+    """SHA-256 über den Roh-Inhalt einer Datei (bytes)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractionCache:
+    """Cache Dateiname → Extraktionsergebnis, gültig solange der Content-Hash passt (thread-safe)"""
+
+    def __init__(self, cache_file, extractor_version):
+        self.cache_file = Path(cache_file)
+        self.extractor_version = extractor_version
+        self._lock = threading.Lock()
+        self._dirty = False
+        index = load_index(self.cache_file, INDEX_VERSION, extractor=extractor_version)
+        self.entries = (index or {}).get('entries', {})
+        self.stats = {'hits': 0, 'misses': 0, 'removed': 0}
+
+    def get(self, filename, digest):
+        """Gespeichertes Ergebnis {'article', 'skipped'} für unveränderten Inhalt (oder None)"""
+        with self._lock:
+            entry = self.entries.get(filename)
+            if entry and entry['hash'] == digest:
+                self.stats['hits'] += 1
+                return {'article': entry['article'], 'skipped': entry['skipped']}
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, filename, digest, article, skipped=None):
+        """Speichert ein Ergebnis; `skipped` ist der Grund, wenn kein Artikel entstanden ist"""
+        with self._lock:
+            self.entries[filename] = {'hash': digest, 'article': article, 'skipped': skipped}
+            self._dirty = True
+
+    def clear(self):
+        """Verwirft alle Einträge (z.B. --no-cache); save() schreibt den neu aufgebauten Cache"""
+        with self._lock:
+            if self.entries:
+                self.entries = {}
+                self._dirty = True
+
+    def prune(self, filenames):
+        """Entfernt Einträge für Dateien, die es nicht mehr gibt"""
+        with self._lock:
+            for filename in set(self.entries) - set(filenames):
+                del self.entries[filename]
+                self.stats['removed'] += 1
+                self._dirty = True
+
+    def save(self):
+        """Schreibt den Cache (nur wenn sich etwas geändert hat)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            save_index(self.cache_file, INDEX_VERSION, {'extractor': self.extractor_version, 'entries': self.entries})
+            self._dirty = False
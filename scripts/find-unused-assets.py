@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Unreferenced Asset Collector
+Findet nicht mehr referenzierte Dateien in wp-content/ und wp-includes/
+
+Baut einen Referenz-Index über alle HTML-, CSS- (url()), JS- und JSON-Dateien
+und verfolgt Referenzen transitiv: Eine CSS-Datei in wp-content zählt erst,
+wenn sie selbst erreichbar ist – dann werden auch ihre Fonts/Bilder erreichbar.
+wp-json/ (REST-Spiegel, von Tests und Skripten gelesen) wird nie eingesammelt,
+sondern wie der restliche Code nur nach Referenzen durchsucht.
+
+Verwendung:
+    python scripts/find-unused-assets.py                 # Nur Report
+    python scripts/find-unused-assets.py --quarantine    # Unreferenzierte Dateien verschieben
+    python scripts/find-unused-assets.py --restore       # Quarantäne rückgängig machen
+
+Output:
+    data/unused-assets-report.json
+"""
+
+import re
+import json
+import shutil
+import argparse
+from fnmatch import fnmatch
+from collections import deque, defaultdict
+from datetime import datetime
+from html import unescape
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+# Konfiguration
+PROJECT_ROOT = Path(__file__).parent.parent
+REPORT_FILE = PROJECT_ROOT / "data" / "unused-assets-report.json"
+QUARANTINE_DIR = PROJECT_ROOT / "_archive" / "unused-assets"
+
+# Verzeichnisse deren Dateien eingesammelt werden können
+ASSET_DIRS = ['wp-content', 'wp-includes']
+
+# Dateien mit diesen Endungen werden nach Referenzen durchsucht
+SCANNABLE_EXTENSIONS = {
+    '.html', '.htm', '.css', '.js', '.mjs', '.json', '.xml',
+    '.webmanifest', '.txt', '.py', '.sh', '.yml', '.yaml', '.md'
+}
+
+# Nie durchsuchen (und nie als Wurzel betrachten)
+SKIP_DIRS = {'.git', 'node_modules', '_archive', '__pycache__', 'dist', '.venv', 'venv'}
+
+# Generierte Reports und Caches listen Asset-Pfade auf, ohne sie zu verwenden –
+# sonst wäre jeder im letzten Report gelistete Pfad beim nächsten Lauf referenziert
+GENERATED_FILES = [
+    'data/*-report.json',
+    'data/http-cache/*',
+    'data/intelligence/*',
+    'data/post-index.json',
+    'data/blog-content-cache.json',
+    'data/llm-cache.json',
+]
+
+# Host-Namen unter denen die Seite (früher) erreichbar war
+SITE_HOSTS = {'coaching.kathrinstahl.com', 'www.coaching.kathrinstahl.com', 'nickheymann.github.io'}
+SITE_PATH_PREFIXES = ['/kathrin-coaching/']
+
+# Referenz-Kandidaten
+URL_FUNCTION_PATTERN = re.compile(r'url\(\s*["\']?([^"\')]+?)["\']?\s*\)', re.IGNORECASE)
+CSS_IMPORT_PATTERN = re.compile(r'@import\s+["\']([^"\']+)["\']', re.IGNORECASE)
+QUOTED_PATTERN = re.compile(r'["\']([^"\'<>\n]{3,2000})["\']')
+ASSET_PATH_PATTERN = re.compile(r'(?:wp-content|wp-includes)/[^\s"\'<>()\\,;]+')
+
+
+class AssetReferenceIndexer:
+    """Sammelt Referenzen aus Text-Dateien und bildet die erreichbare Menge"""
+
+    def __init__(self, root: Path):
+        self.root = root.resolve()
+        self.assets = self._collect_assets()
+        self.reachable = set()
+        self.referenced_by = defaultdict(set)
+        self.scanned_files = 0
+
+    def _collect_assets(self):
+        """Alle Dateien in den Asset-Verzeichnissen (relativ, POSIX) mit Größe"""
+        assets = {}
+        for dir_name in ASSET_DIRS:
+            base = self.root / dir_name
+            if not base.exists():
+                continue
+            for path in base.rglob('*'):
+                if path.is_file():
+                    assets[path.relative_to(self.root).as_posix()] = path.stat().st_size
+        return assets
+
+    def _root_files(self):
+        """Alle durchsuchbaren Dateien außerhalb der Asset-Verzeichnisse (ohne generierte Reports)"""
+        stack = [self.root]
+        while stack:
+            current = stack.pop()
+            for entry in current.iterdir():
+                if entry.is_dir():
+                    if entry.name in SKIP_DIRS or (current == self.root and entry.name in ASSET_DIRS):
+                        continue
+                    stack.append(entry)
+                elif entry.suffix.lower() in SCANNABLE_EXTENSIONS or entry.name == '_headers':
+                    if not self._is_generated(entry):
+                        yield entry
+
+    def _is_generated(self, path: Path) -> bool:
+        """Report- oder Cache-Datei eines Skripts (inklusive REPORT_FILE)?"""
+        if path.resolve() == REPORT_FILE.resolve():
+            return True
+        rel = path.relative_to(self.root).as_posix()
+        return any(fnmatch(rel, pattern) for pattern in GENERATED_FILES)
+
+    @staticmethod
+    def extract_candidates(text: str):
+        """Extrahiert alle Strings die Pfade sein könnten"""
+        # JSON escaped Slashes (WordPress REST API: "wp-content\/uploads\/...")
+        text = text.replace('\\/', '/')
+
+        candidates = set()
+        candidates.update(URL_FUNCTION_PATTERN.findall(text))
+        candidates.update(CSS_IMPORT_PATTERN.findall(text))
+        candidates.update(ASSET_PATH_PATTERN.findall(text))
+
+        for quoted in QUOTED_PATTERN.findall(text):
+            # srcset: "a.jpg 576w, b.jpg 169w"
+            for piece in re.split(r'[\s,]+', quoted):
+                if '.' in piece or '/' in piece:
+                    candidates.add(piece)
+
+        return candidates
+
+    def resolve(self, candidate: str, source: Path):
+        """Löst einen Kandidaten relativ zur Quelldatei auf (oder None)"""
+        candidate = unescape(candidate.strip())
+        if not candidate or candidate.startswith(('data:', 'mailto:', 'tel:', 'javascript:', '#')):
+            return None
+
+        if '://' in candidate or candidate.startswith('//'):
+            parsed = urlparse(candidate if '://' in candidate else 'https:' + candidate)
+            if parsed.hostname not in SITE_HOSTS:
+                return None
+            candidate = parsed.path
+
+        candidate = unquote(candidate.split('#')[0].split('?')[0])
+        if not candidate:
+            return None
+
+        for prefix in SITE_PATH_PREFIXES:
+            if candidate.startswith(prefix):
+                candidate = candidate[len(prefix) - 1:]
+                break
+
+        if candidate.startswith('/'):
+            options = [self.root / candidate.lstrip('/')]
+        else:
+            options = [source.parent / candidate, self.root / candidate]
+
+        for option in options:
+            try:
+                rel = self._normalize(option).relative_to(self.root).as_posix()
+            except ValueError:
+                continue
+            if rel in self.assets:
+                return rel
+
+        return None
+
+    @staticmethod
+    def _normalize(path: Path) -> Path:
+        """Normalisiert '..' und '.' ohne das Dateisystem anzufassen"""
+        parts = []
+        for part in path.parts:
+            if part == '..':
+                if len(parts) > 1:
+                    parts.pop()
+            elif part != '.':
+                parts.append(part)
+        return Path(*parts)
+
+    def _scan(self, path: Path):
+        """Liefert alle aufgelösten Asset-Referenzen einer Datei"""
+        try:
+            text = path.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            return set()
+
+        self.scanned_files += 1
+        found = set()
+        for candidate in self.extract_candidates(text):
+            rel = self.resolve(candidate, path)
+            if rel:
+                found.add(rel)
+        return found
+
+    def build(self, protected=()):
+        """Breitensuche: Wurzel-Dateien → referenzierte Assets → deren Referenzen"""
+        queue = deque()
+
+        def mark(rel, source):
+            self.referenced_by[rel].add(source)
+            if rel not in self.reachable:
+                self.reachable.add(rel)
+                if Path(rel).suffix.lower() in SCANNABLE_EXTENSIONS:
+                    queue.append(rel)
+
+        for rel in self.assets:
+            if any(rel.startswith(prefix) for prefix in protected):
+                mark(rel, '(geschützt)')
+
+        for path in self._root_files():
+            source = path.relative_to(self.root).as_posix()
+            for rel in self._scan(path):
+                mark(rel, source)
+
+        while queue:
+            source = queue.popleft()
+            for rel in self._scan(self.root / source):
+                mark(rel, source)
+
+        return self.reachable
+
+    def unreferenced(self):
+        """Nicht erreichbare Assets, sortiert nach Pfad"""
+        return sorted(rel for rel in self.assets if rel not in self.reachable)
+
+
+def format_size(size):
+    """Formatiert Bytes lesbar"""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def quarantine(root: Path, files):
+    """Verschiebt Dateien nach _archive/unused-assets/ (Struktur bleibt erhalten)"""
+    moved = []
+    for rel in files:
+        source = root / rel
+        target = QUARANTINE_DIR / rel
+        if not source.exists():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(source), str(target))
+        moved.append(rel)
+
+        # Leere Verzeichnisse aufräumen
+        parent = source.parent
+        while parent != root and parent.exists() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+    return moved
+
+
+def restore(root: Path):
+    """Holt alle Dateien aus der Quarantäne zurück"""
+    restored = 0
+    if not QUARANTINE_DIR.exists():
+        return restored
+
+    for path in sorted(QUARANTINE_DIR.rglob('*')):
+        if path.is_file():
+            target = root / path.relative_to(QUARANTINE_DIR)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(path), str(target))
+            restored += 1
+
+    shutil.rmtree(QUARANTINE_DIR)
+    return restored
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Findet unreferenzierte WordPress-Assets')
+    parser.add_argument('--quarantine', action='store_true',
+                        help=f'Unreferenzierte Dateien nach {QUARANTINE_DIR.relative_to(PROJECT_ROOT)}/ verschieben')
+    parser.add_argument('--restore', action='store_true',
+                        help='Dateien aus der Quarantäne zurückholen')
+    parser.add_argument('--protect', action='append', default=[], metavar='PREFIX',
+                        help='Pfad-Präfix immer behalten (mehrfach möglich)')
+    parser.add_argument('--top', type=int, default=15,
+                        help='Anzahl der größten Verzeichnisse im Report')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧹 UNREFERENCED ASSET COLLECTOR")
+    print("=" * 60)
+
+    if args.restore:
+        count = restore(PROJECT_ROOT)
+        print(f"\n   ♻️  {count} Dateien wiederhergestellt")
+        return
+
+    indexer = AssetReferenceIndexer(PROJECT_ROOT)
+    print(f"📁 {len(indexer.assets)} Asset-Dateien gefunden")
+
+    indexer.build(protected=args.protect)
+    unused = indexer.unreferenced()
+
+    total_size = sum(indexer.assets.values())
+    unused_size = sum(indexer.assets[rel] for rel in unused)
+
+    by_dir = defaultdict(lambda: {'files': 0, 'bytes': 0})
+    for rel in unused:
+        key = '/'.join(rel.split('/')[:3])
+        by_dir[key]['files'] += 1
+        by_dir[key]['bytes'] += indexer.assets[rel]
+
+    print(f"🔍 {indexer.scanned_files} Dateien nach Referenzen durchsucht")
+    print()
+    print("-" * 60)
+    print("ERGEBNIS")
+    print("-" * 60)
+    print(f"  Assets gesamt:     {len(indexer.assets):5} Dateien ({format_size(total_size)})")
+    print(f"  Erreichbar:        {len(indexer.reachable):5} Dateien")
+    print(f"  Unreferenziert:    {len(unused):5} Dateien ({format_size(unused_size)})")
+    print()
+
+    print("📂 Unreferenziert nach Verzeichnis:")
+    for key, info in sorted(by_dir.items(), key=lambda x: -x[1]['bytes'])[:args.top]:
+        print(f"   {key:50} {info['files']:4} Dateien  {format_size(info['bytes']):>9}")
+
+    report = {
+        'generatedAt': datetime.now().isoformat(),
+        'totalFiles': len(indexer.assets),
+        'totalBytes': total_size,
+        'reachableFiles': len(indexer.reachable),
+        'unreferencedFiles': len(unused),
+        'unreferencedBytes': unused_size,
+        'byDirectory': dict(sorted(by_dir.items())),
+        'unreferenced': [{'path': rel, 'bytes': indexer.assets[rel]} for rel in unused]
+    }
+
+    if args.quarantine:
+        moved = quarantine(PROJECT_ROOT, unused)
+        report['quarantined'] = moved
+        print(f"\n   📦 {len(moved)} Dateien nach {QUARANTINE_DIR.relative_to(PROJECT_ROOT)}/ verschoben")
+        print("   Rückgängig: python scripts/find-unused-assets.py --restore")
+
+    REPORT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\n   📄 Report: {REPORT_FILE}")
+
+
+if __name__ == '__main__':
+    main()
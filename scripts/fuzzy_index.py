@@ -0,0 +1,190 @@
+"""
+Fuzzy Index
+Indizes für die Duplikat-Erkennung der Blog-Migration
+
+- TitleTrigramIndex: Trigramm-Index über Titel, liefert Kandidaten für den
+  exakten SequenceMatcher-Vergleich statt alle Paare zu prüfen
+- SimHashIndex: 64-Bit SimHash über bereinigten Text mit Band-Index, findet
+  Near-Duplicates (z.B. umbenannte Reposts) in O(1) pro Abfrage
+"""
+
+import re
+import hashlib
+from collections import Counter, defaultdict
+from itertools import chain
+from difflib import SequenceMatcher
+
+SIMHASH_BITS = 64
+
+
+def trigrams(text):
+    """Zeichen-Trigramme eines (bereits normalisierten) Strings als Multimenge
+
+    Wiederholte Trigramme werden durchnummeriert ('en ', 1), ('en ', 2) …, damit die
+    Schnittmenge zweier Titel als einfache Mengen-Schnittmenge zählt.
+    """
+    padded = f"  {text} "
+    grams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+    if len(set(grams)) == len(grams):
+        return [(gram, 1) for gram in grams]
+
+    seen = Counter()
+    numbered = []
+    for gram in grams:
+        seen[gram] += 1
+        numbered.append((gram, seen[gram]))
+    return numbered
+
+
+def _length_bound(a, b):
+    """Obere Schranke für SequenceMatcher.ratio() allein aus den Längen"""
+    total = a + b
+    return 2 * min(a, b) / total if total else 1.0
+
+
+class TitleTrigramIndex:
+    """Inverted Index Trigramm → Titel, mit exakter Nachprüfung per SequenceMatcher
+
+    Kandidaten müssen die Längen-Schranke von ratio() erfüllen und einen Mindestanteil
+    gemeinsamer Trigramme haben (Dice-Koeffizient >= min_dice); erst für sie wird die
+    teure ratio() berechnet. Titel mit ratio() > 0.85 teilen praktisch immer deutlich
+    mehr Trigramme – nur sehr kurze Titel mit mehreren Tippfehlern fallen durchs Raster.
+
+    Die häufigsten Trigramme einer Anfrage (z.B. 'en ') werden nicht über ihre langen
+    Posting-Listen gezählt, sondern nur für die verbliebenen Kandidaten nachgerechnet.
+    """
+
+    def __init__(self, min_dice=0.4):
+        self.min_dice = min_dice
+        self.titles = []
+        self.gram_sets = []
+        self.postings = defaultdict(list)
+
+    @staticmethod
+    def normalize(title):
+        return (title or '').lower()
+
+    def add(self, title):
+        """Fügt einen Titel hinzu, gibt dessen Position zurück"""
+        position = len(self.titles)
+        normalized = self.normalize(title)
+        grams = trigrams(normalized)
+        self.titles.append(normalized)
+        self.gram_sets.append(frozenset(grams))
+        for gram in grams:
+            self.postings[gram].append(position)
+        return position
+
+    def candidates(self, title, threshold):
+        """Positionen (aufsteigend) mit passender Länge und genügend gemeinsamen Trigrammen"""
+        normalized = self.normalize(title)
+        length = len(normalized)
+        grams = trigrams(normalized)
+
+        # Mindestzahl gemeinsamer Trigramme bei der kürzesten noch möglichen Länge
+        shortest = length * threshold / (2 - threshold) + 1
+        required = self.min_dice * (len(grams) + shortest) / 2
+
+        # Die `skipped` häufigsten Trigramme können höchstens `skipped` beitragen
+        grams.sort(key=lambda gram: len(self.postings.get(gram, ())))
+        skipped = int(required // 2)
+        probed = grams[:len(grams) - skipped]
+        shared = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in probed))
+
+        query = frozenset(grams)
+        result = []
+        for position, count in shared.most_common():
+            if count < required - skipped:
+                break
+            other = self.titles[position]
+            if _length_bound(length, len(other)) <= threshold:
+                continue
+            if skipped:
+                count = len(query & self.gram_sets[position])
+            if 2 * count >= self.min_dice * (len(grams) + len(self.gram_sets[position])):
+                result.append(position)
+
+        return sorted(result)
+
+    def matches(self, title, threshold, limit=None):
+        """Positionen (aufsteigend) mit SequenceMatcher.ratio() > threshold
+
+        limit: nur Positionen < limit prüfen (z.B. bis zu einem früheren Slug-Treffer)
+        """
+        normalized = self.normalize(title)
+
+        for position in self.candidates(title, threshold):
+            if limit is not None and position >= limit:
+                break
+
+            # Gleiche Argument-Reihenfolge wie PostDeduplicator.similarity(neu, alt)
+            matcher = SequenceMatcher(None, normalized, self.titles[position])
+            if matcher.quick_ratio() > threshold and matcher.ratio() > threshold:
+                yield position
+
+
+def _shingles(text, size=3):
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def simhash(text, bits=SIMHASH_BITS):
+    """SimHash über Wort-3-Shingles (stabil über Läufe, kein Python-hash())"""
+    values = []
+    for shingle in _shingles(text):
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=bits // 8).digest()
+        values.append(format(int.from_bytes(digest, 'big'), f'0{bits}b'))
+    if not values:
+        return 0
+
+    # Bit gesetzt wenn die Mehrheit der Shingles es gesetzt hat (Spalten zählen statt Bit-Schleife)
+    fingerprint = 0
+    majority = len(values) / 2
+    for bit, column in enumerate(reversed(list(zip(*values)))):
+        if column.count('1') > majority:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """Band-Index über SimHash-Fingerprints
+
+    Mit max_distance + 1 Bändern teilt jedes Paar mit Hamming-Distanz <= max_distance
+    mindestens ein identisches Band (Schubfachprinzip) – es werden also keine
+    Treffer übersehen, aber nur wenige Kandidaten geprüft.
+    """
+
+    def __init__(self, max_distance=3, bits=SIMHASH_BITS):
+        self.max_distance = max_distance
+        self.bits = bits
+        self.bands = max_distance + 1
+        self.band_width = -(-bits // self.bands)
+        self.fingerprints = []
+        self.buckets = defaultdict(list)
+
+    def _band_keys(self, fingerprint):
+        mask = (1 << self.band_width) - 1
+        return [(band, fingerprint >> (band * self.band_width) & mask) for band in range(self.bands)]
+
+    def add(self, fingerprint):
+        position = len(self.fingerprints)
+        self.fingerprints.append(fingerprint)
+        for key in self._band_keys(fingerprint):
+            self.buckets[key].append(position)
+        return position
+
+    def matches(self, fingerprint):
+        """Positionen (aufsteigend) mit Hamming-Distanz <= max_distance"""
+        candidates = set()
+        for key in self._band_keys(fingerprint):
+            candidates.update(self.buckets.get(key, ()))
+        return sorted(
+            position for position in candidates
+            if hamming_distance(fingerprint, self.fingerprints[position]) <= self.max_distance
+        )
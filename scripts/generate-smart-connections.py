@@ -6,25 +6,62 @@ Berechnet semantische Ähnlichkeiten und generiert intelligente Verbindungen
 Verwendung:
     OPENAI_API_KEY=xxx python scripts/generate-smart-connections.py
 
+    Embeddings werden in data/embeddings/ gespeichert – nur neue oder geänderte
+    Artikel gehen an die API; sind alle bekannt, geht es auch ohne Key.
+
+    Lokale Embeddings (BM25 + SVD, ohne API und Netz – z.B. in CI):
+    python scripts/generate-smart-connections.py --embeddings local
+
+    Ab ANN_MIN_ARTICLES Artikeln wird approximativ gesucht (IVF-Index);
+    erzwingen mit --search exact oder --search ann.
+
     Oder ohne Embeddings (nur regelbasiert):
     python scripts/generate-smart-connections.py --no-embeddings
 
+    Inkrementell (nur geänderte Artikel neu bewerten, Matrizen in data/connection-graph/):
+    python scripts/generate-smart-connections.py --incremental
+
 Output:
-    data/blog-intelligence.json (aktualisiert mit 'related' Feld)
+    data/intelligence/              ('related' Feld in den meta-Shards)
+    data/blog-intelligence.json     (Export für die Website)
+    data/embeddings/                (Embedding-Store, siehe embedding_store.py)
+    data/embeddings/ann-index.npz   (ANN-Index für große Kataloge, siehe ann_index.py)
+    data/connection-graph/          (Score-Matrizen für --incremental, siehe connection_graph.py)
 """
 
 import os
 import sys
-import json
 import argparse
 from pathlib import Path
 from datetime import datetime
-import random
+import hashlib
+
+import numpy as np
+
+from ann_index import IVFIndex
+from connection_graph import ConnectionGraph, fingerprint
+from connection_scoring import rule_based_connections
+from embedding_similarity import DEFAULT_BLOCK_SIZE, normalize_rows, top_k_similar
+from embedding_store import EmbeddingStore, embedding_batches, text_hash
+from local_embeddings import local_embeddings
+from intelligence_store import IntelligenceStore
 
 # Konfiguration
 PROJECT_ROOT = Path(__file__).parent.parent
-INPUT_FILE = PROJECT_ROOT / "data" / "blog-intelligence.json"
 OUTPUT_FILE = PROJECT_ROOT / "data" / "blog-intelligence.json"
+STORE_DIR = PROJECT_ROOT / "data" / "intelligence"
+EMBEDDINGS_DIR = PROJECT_ROOT / "data" / "embeddings"
+ANN_INDEX_NAME = "ann-index.npz"
+GRAPH_DIR = PROJECT_ROOT / "data" / "connection-graph"
+
+# Ab so vielen Artikeln sucht --search auto approximativ statt exakt (alle Paare)
+ANN_MIN_ARTICLES = 10_000
+
+# Ein anderes Modell verwirft alle gespeicherten Embeddings
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Felder, die die Connection-Engine braucht (ohne Artikeltexte)
+CONNECTION_FIELDS = ('title', 'type', 'category', 'image', 'excerpt', 'analysis')
 
 # Verbindungstypen mit Begründungen
 CONNECTION_TYPES = {
@@ -94,93 +131,30 @@ RELATED_CATEGORIES = {
 }
 
 
-def calculate_theme_similarity(themes1, themes2):
-    """Berechnet Ähnlichkeit basierend auf gemeinsamen Themen"""
-    if not themes1 or not themes2:
-        return 0
-
-    # Exakte Übereinstimmungen
-    common = set(themes1) & set(themes2)
-    score = len(common) * 10
-
-    # Partielle Übereinstimmungen (Substring-Match)
-    for t1 in themes1:
-        for t2 in themes2:
-            if t1 != t2:
-                if t1 in t2 or t2 in t1:
-                    score += 3
-                # Wortweise Überlappung
-                words1 = set(t1.split('-'))
-                words2 = set(t2.split('-'))
-                common_words = words1 & words2
-                if common_words:
-                    score += len(common_words) * 2
-
-    return score
-
-
-def calculate_transformation_similarity(trans1, trans2):
-    """Berechnet Ähnlichkeit basierend auf Transformationen"""
-    if not trans1 or not trans2:
-        return 0
-
-    score = 0
-
-    # Gleicher Ausgangszustand
-    if trans1.get('von', '').lower() == trans2.get('von', '').lower():
-        score += 8
-
-    # Gleicher Zielzustand
-    if trans1.get('zu', '').lower() == trans2.get('zu', '').lower():
-        score += 8
-
-    # Zielzustand von einem ist Ausgangszustand vom anderen (Reise!)
-    if trans1.get('zu', '').lower() == trans2.get('von', '').lower():
-        score += 15  # Sehr hohe Relevanz für "nächster Schritt"
-
-    return score
-
-
-def find_journey_connection(article, all_articles):
-    """Findet Artikel die auf der gleichen Reise weiterführen"""
-    connections = []
-
-    analysis = article.get('analysis', {})
-    themes = analysis.get('tiefenthemen', [])
-
-    for journey_name, journey in JOURNEY_MAPS.items():
-        # Ist dieser Artikel Teil einer Reise?
-        if any(t in themes for t in journey['themes']):
-            # Finde Artikel mit "next" Themen
-            for other in all_articles:
-                if other['url'] == article['url']:
-                    continue
-
-                other_themes = other.get('analysis', {}).get('tiefenthemen', [])
-                if any(t in other_themes for t in journey['next']):
-                    connections.append({
-                        'url': other['url'],
-                        'type': journey['type'],
-                        'score': 20,
-                        'journey': journey_name
-                    })
-
-    return connections
+def stable_choice(options, *key):
+    """Wählt deterministisch aus options: gleicher Schlüssel → gleiche Wahl, in jedem Lauf"""
+    digest = hashlib.sha256('\0'.join(key).encode('utf-8')).digest()
+    return options[int.from_bytes(digest[:8], 'big') % len(options)]
 
 
 def generate_reason(article, other_article, connection_type):
-    """Generiert eine personalisierte Begründung"""
+    """Generiert eine personalisierte Begründung
+
+    Die Auswahl hängt nur vom Artikelpaar ab (stable_choice statt random) –
+    ein erneuter Lauf erzeugt dieselben Begründungen und damit keinen Diff.
+    """
+    pair = (article['url'], other_article['url'])
     analysis = article.get('analysis', {})
     other_analysis = other_article.get('analysis', {})
 
     # Verwende LLM-generierte Begründungen wenn verfügbar
     llm_reasons = other_analysis.get('empfehlungsBegründungen', [])
     if llm_reasons:
-        return random.choice(llm_reasons)
+        return stable_choice(llm_reasons, *pair)
 
     # Fallback: Template-basiert
     templates = CONNECTION_TYPES.get(connection_type, CONNECTION_TYPES['ergaenzung'])
-    base_reason = random.choice(templates)
+    base_reason = stable_choice(templates, *pair)
 
     # Personalisiere mit Themen
     themes = other_analysis.get('tiefenthemen', [])
@@ -191,148 +165,202 @@ def generate_reason(article, other_article, connection_type):
     return base_reason
 
 
-def calculate_connections_with_embeddings(articles, api_key):
-    """Berechnet Verbindungen mit OpenAI Embeddings"""
-    from openai import OpenAI
-    import numpy as np
-
-    print("🧮 Generiere Embeddings...")
+def get_embedding_text(article):
+    """Text für das Embedding eines Artikels (Titel + Kernbotschaft + Themes)"""
+    analysis = article.get('analysis', {})
+    parts = [
+        article.get('title', ''),
+        analysis.get('kernbotschaft', ''),
+        ' '.join(analysis.get('tiefenthemen', []))
+    ]
+    return ' '.join(parts)
+
+
+def similar_articles(articles, embeddings, search='auto', block_size=DEFAULT_BLOCK_SIZE,
+                     index_file=None, keys=None):
+    """Die 15 ähnlichsten Artikel je Artikel → {url: [{url, similarity}]}
+
+    search: 'exact' (blockweise Matrixprodukte, siehe embedding_similarity.py),
+    'ann' (IVF-Index, siehe ann_index.py) oder 'auto' (ann ab ANN_MIN_ARTICLES).
+    Mit index_file wird der ANN-Index gespeichert und beim nächsten Lauf nur um
+    neue `keys` ergänzt bzw. um verschwundene bereinigt.
+    """
+    if search == 'auto':
+        search = 'ann' if len(articles) >= ANN_MIN_ARTICLES else 'exact'
+
+    if search == 'exact':
+        indices, scores = top_k_similar(embeddings, k=15, block_size=block_size, workdir=PROJECT_ROOT / "data")
+        return {
+            article['url']: [{'url': articles[j]['url'], 'similarity': float(sim)}
+                             for j, sim in zip(indices[i], scores[i])]
+            for i, article in enumerate(articles)
+        }
+
+    keys = keys or [article['url'] for article in articles]
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    index = IVFIndex.load(index_file) if index_file else None
+    if index is None or index.dimensions != embeddings.shape[1]:
+        index = IVFIndex(embeddings.shape[1])
+    wanted = set(keys)
+    removed = index.remove([key for key in index.keys if key in index and key not in wanted])
+    added = index.add(keys, embeddings)
+    print(f"🗂️  ANN-Index: {len(index)} Einträge ({added} neu, {removed} entfernt)")
+
+    found, scores = index.search(embeddings, 15, exclude=keys)
+    if index_file:
+        index.save(index_file)
+
+    url_of = dict(zip(keys, (article['url'] for article in articles)))
+    return {
+        article['url']: [{'url': url_of[key], 'similarity': sim} for key, sim in zip(found[i], scores[i])]
+        for i, article in enumerate(articles)
+    }
 
-    client = OpenAI(api_key=api_key)
 
-    # Erstelle Text für Embedding (Titel + Kernbotschaft + Themes)
-    def get_embedding_text(article):
-        analysis = article.get('analysis', {})
-        parts = [
-            article.get('title', ''),
-            analysis.get('kernbotschaft', ''),
-            ' '.join(analysis.get('tiefenthemen', []))
-        ]
-        return ' '.join(parts)
+def load_embeddings(articles, api_key, store=None):
+    """Embedding-Texte und -Vektoren aller Artikel → (texts, embeddings)
 
-    # Batch-Embedding (effizienter)
+    Embeddings kommen aus dem EmbeddingStore; nur neue oder geänderte Texte
+    werden (in begrenzten Batches) bei OpenAI angefragt. Ist alles im Store,
+    wird weder die API noch api_key gebraucht.
+    """
+    store = store or EmbeddingStore(EMBEDDINGS_DIR, EMBEDDING_MODEL)
     texts = [get_embedding_text(a) for a in articles]
+    missing = store.missing(texts)
+    print(f"🧮 Embeddings: {len(texts) - len(missing)} aus dem Store, {len(missing)} neu")
+
+    if missing:
+        from openai import OpenAI
 
-    response = client.embeddings.create(
-        input=texts,
-        model="text-embedding-3-small"
-    )
+        client = OpenAI(api_key=api_key)
+        for batch in embedding_batches(missing):
+            response = client.embeddings.create(input=batch, model=EMBEDDING_MODEL)
+            store.add(batch, [r.embedding for r in sorted(response.data, key=lambda r: r.index)])
+            # Nach jedem Batch sichern – ein Abbruch kostet nur den laufenden Batch
+            store.save()
 
-    embeddings = [r.embedding for r in response.data]
+    embeddings = store.get(texts)
+    store.prune(texts)
+    store.save()
+    return texts, embeddings
 
-    # Cosine Similarity Matrix
-    def cosine_similarity(a, b):
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+
+def calculate_connections_with_embeddings(articles, api_key, block_size=DEFAULT_BLOCK_SIZE, store=None,
+                                          search='auto'):
+    """Berechnet Verbindungen mit OpenAI Embeddings (aus dem EmbeddingStore, siehe load_embeddings)"""
+    texts, embeddings = load_embeddings(articles, api_key, store)
 
     print("🔗 Berechne Ähnlichkeiten...")
 
-    similarity_matrix = {}
-    for i, article in enumerate(articles):
-        url = article['url']
-        similarities = []
+    # Schlüssel mit Text-Hash: ein geänderter Artikel ersetzt seinen alten Eintrag im ANN-Index
+    keys = [f"{article['url']}#{text_hash(text)}" for article, text in zip(articles, texts)]
+    return similar_articles(articles, embeddings, search, block_size,
+                            index_file=EMBEDDINGS_DIR / ANN_INDEX_NAME, keys=keys)
 
-        for j, other in enumerate(articles):
-            if i != j:
-                sim = cosine_similarity(embeddings[i], embeddings[j])
-                similarities.append({
-                    'url': other['url'],
-                    'similarity': float(sim)
-                })
 
-        # Sortiere nach Ähnlichkeit
-        similarities.sort(key=lambda x: x['similarity'], reverse=True)
-        similarity_matrix[url] = similarities[:15]  # Top 15
+def calculate_connections_local(articles, store, block_size=DEFAULT_BLOCK_SIZE, search='auto'):
+    """Berechnet Verbindungen mit lokalen Embeddings (BM25 + SVD, siehe local_embeddings.py)
 
-    return similarity_matrix
+    Braucht weder API noch Netz; die Artikeltexte kommen aus den body-Shards des Stores.
+    Die Vektoren entstehen jedes Mal neu – ein ANN-Index wird daher nicht gespeichert.
+    """
+    print("🧮 Berechne lokale Embeddings (BM25 + SVD)...")
+    urls = {article['url'] for article in articles}
+    contents = {a['url']: a.get('content', '') for a in store.load(fields=('content',)) if a['url'] in urls}
+    embeddings = local_embeddings(articles, contents)
 
+    print("🔗 Berechne Ähnlichkeiten...")
+    return similar_articles(articles, embeddings, search, block_size)
 
-def calculate_connections_rule_based(articles):
-    """Berechnet Verbindungen ohne Embeddings (regelbasiert)"""
-    print("🔗 Berechne regelbasierte Verbindungen...")
 
+def merge_connections(articles, similarity_matrix, rule_connections):
+    """Kombiniert Embedding-Ähnlichkeit (Top 15) und Regel-Score zu den Top 10 je Artikel"""
     connections = {}
-
     for article in articles:
         url = article['url']
-        analysis = article.get('analysis', {})
-        category = article.get('category', '')
-        themes = analysis.get('tiefenthemen', [])
-        transformation = analysis.get('transformation', {})
 
-        scored_connections = []
+        # Merge: Embedding-Similarity + Rule-Score
+        merged = {}
 
-        for other in articles:
-            if other['url'] == url:
-                continue
+        for sim in similarity_matrix.get(url, []):
+            merged[sim['url']] = {
+                'url': sim['url'],
+                'similarity': sim['similarity'],
+                'score': sim['similarity'] * 50  # Normalisiere auf ~50
+            }
 
-            other_analysis = other.get('analysis', {})
-            other_category = other.get('category', '')
-            other_themes = other_analysis.get('tiefenthemen', [])
-            other_transformation = other_analysis.get('transformation', {})
-
-            score = 0
-            conn_type = 'ergaenzung'
-
-            # 1. Gleiche Kategorie
-            if category == other_category:
-                score += 15
-                conn_type = 'vertiefung'
-
-            # 2. Verwandte Kategorie
-            elif other_category in RELATED_CATEGORIES.get(category, []):
-                score += 8
-                conn_type = 'ergaenzung'
-
-            # 3. Themen-Ähnlichkeit
-            theme_score = calculate_theme_similarity(themes, other_themes)
-            score += theme_score
-            if theme_score > 15:
-                conn_type = 'vertiefung'
-
-            # 4. Transformations-Ähnlichkeit
-            trans_score = calculate_transformation_similarity(transformation, other_transformation)
-            score += trans_score
-            if trans_score > 10:
-                conn_type = 'naechster-schritt'
-
-            # 5. Gleiche emotionale Tonalität
-            if analysis.get('emotionaleTonalitaet') == other_analysis.get('emotionaleTonalitaet'):
-                score += 5
-
-            # 6. Gleiche Lebensphase
-            phases1 = set(analysis.get('lebensphase', []))
-            phases2 = set(other_analysis.get('lebensphase', []))
-            if phases1 & phases2:
-                score += 5
-
-            if score > 0:
-                scored_connections.append({
-                    'url': other['url'],
-                    'score': score,
-                    'type': conn_type
-                })
-
-        # Journey-Connections hinzufügen
-        journey_conns = find_journey_connection(article, articles)
-        for jc in journey_conns:
-            existing = next((c for c in scored_connections if c['url'] == jc['url']), None)
-            if existing:
-                existing['score'] += jc['score']
-                existing['type'] = jc['type']
+        for rule in rule_connections.get(url, []):
+            if rule['url'] in merged:
+                merged[rule['url']]['score'] += rule['score']
+                merged[rule['url']]['type'] = rule.get('type', 'ergaenzung')
             else:
-                scored_connections.append(jc)
+                merged[rule['url']] = {
+                    'url': rule['url'],
+                    'score': rule['score'],
+                    'type': rule.get('type', 'ergaenzung')
+                }
 
         # Sortiere und nimm Top 10
-        scored_connections.sort(key=lambda x: x['score'], reverse=True)
-        connections[url] = scored_connections[:10]
+        sorted_conns = sorted(merged.values(), key=lambda x: x['score'], reverse=True)[:10]
+        connections[url] = sorted_conns
 
     return connections
 
 
+def calculate_connections_rule_based(articles):
+    """Berechnet Verbindungen ohne Embeddings (regelbasiert, siehe connection_scoring.py)"""
+    print("🔗 Berechne regelbasierte Verbindungen...")
+
+    return rule_based_connections(articles, JOURNEY_MAPS, RELATED_CATEGORIES, top_k=10)
+
+
+def article_fingerprint(article, embedding_text=None):
+    """Alles, was die Verbindungen eines Artikels oder seine Anzeige bei anderen beeinflusst"""
+    return fingerprint({field: article.get(field) for field in CONNECTION_FIELDS}, embedding_text)
+
+
+def calculate_connections_incremental(articles, backend, api_key=None, store=None):
+    """Berechnet Verbindungen inkrementell über den ConnectionGraph (siehe connection_graph.py)
+
+    Nur Artikel mit geändertem Fingerabdruck werden neu bewertet; die Top-k
+    anderer Artikel nur, wenn ein geänderter Artikel hineinkommt oder herausfällt.
+    Gibt (connections, rows) zurück – connections nur für die Artikel in rows.
+    """
+    texts, embeddings = [None] * len(articles), None
+    if backend == 'openai':
+        texts, embeddings = load_embeddings(articles, api_key, store)
+        embeddings = normalize_rows(embeddings, np.empty(embeddings.shape, dtype=np.float32))
+
+    graph = ConnectionGraph(GRAPH_DIR, JOURNEY_MAPS, RELATED_CATEGORIES,
+                            config={'backend': backend, 'model': EMBEDDING_MODEL if backend else None})
+    rows = graph.update(articles, [article_fingerprint(a, text) for a, text in zip(articles, texts)], embeddings)
+    graph.save()
+
+    stats = graph.stats
+    if stats['full']:
+        print(f"🔗 Verbindungs-Graph komplett neu berechnet ({len(articles)} Artikel)")
+    else:
+        print(f"🔗 Verbindungs-Graph: {stats['changed']} geändert, {stats['removed']} entfernt, "
+              f"{stats['recomputed']} Artikel mit neuen Verbindungen")
+
+    rule_connections = graph.rule_connections(rows)
+    if embeddings is None:
+        return rule_connections, rows
+    return merge_connections([articles[i] for i in rows], graph.similar(rows), rule_connections), rows
+
+
 def main():
     parser = argparse.ArgumentParser(description='Smart Connection Engine')
     parser.add_argument('--no-embeddings', action='store_true',
                         help='Nur regelbasierte Verbindungen (keine API nötig)')
+    parser.add_argument('--embeddings', choices=['openai', 'local'], default='openai',
+                        help='Embedding-Backend (default: openai; ohne Key und ohne gespeicherte Embeddings: local)')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help=f'Zeilen pro Block der Ähnlichkeitsberechnung (Standard: {DEFAULT_BLOCK_SIZE})')
+    parser.add_argument('--search', choices=['auto', 'exact', 'ann'], default='auto',
+                        help=f'Ähnlichkeitssuche: exakt oder ANN-Index (auto: ANN ab {ANN_MIN_ARTICLES} Artikeln)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Nur geänderte Artikel neu bewerten (Score-Matrizen in data/connection-graph/)')
     args = parser.parse_args()
 
     print("=" * 60)
@@ -340,64 +368,50 @@ def main():
     print("=" * 60)
     print()
 
-    # Lade analysierte Artikel
-    if not INPUT_FILE.exists():
-        print(f"❌ Input-Datei nicht gefunden: {INPUT_FILE}")
+    # Lade analysierte Artikel (nur die benötigten Felder, keine Artikeltexte)
+    store = IntelligenceStore(STORE_DIR, legacy_file=OUTPUT_FILE)
+    if not len(store):
+        print(f"❌ Keine analysierten Artikel gefunden: {STORE_DIR}")
         print("   Führe zuerst aus: python scripts/analyze-with-llm.py")
         sys.exit(1)
 
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    articles = [a for a in data['articles'] if a.get('type') == 'blog']
+    # Inkrementell bleiben die 'related' unveränderter Artikel stehen – sie werden mitgeladen
+    fields = CONNECTION_FIELDS + ('related',) if args.incremental else CONNECTION_FIELDS
+    articles = [a for a in store.load(fields=fields) if a.get('type') == 'blog']
     print(f"📊 {len(articles)} Blog-Posts geladen")
     print()
 
     # Berechne Verbindungen
-    if args.no_embeddings:
+    backend = None if args.no_embeddings else args.embeddings
+    api_key, embedding_store = None, None
+    if backend == 'openai':
+        api_key = os.environ.get('OPENAI_API_KEY')
+        embedding_store = EmbeddingStore(EMBEDDINGS_DIR, EMBEDDING_MODEL)
+        if embedding_store.stats['invalidated']:
+            print(f"🔄 {embedding_store.stats['invalidated']} Embeddings eines anderen Modells verworfen")
+        # Ohne Key geht es trotzdem, wenn der Store schon alle Texte kennt (Offline-Neuberechnung)
+        if not api_key and embedding_store.missing([get_embedding_text(a) for a in articles]):
+            print("⚠️  OPENAI_API_KEY nicht gesetzt, verwende lokale Embeddings (BM25 + SVD)")
+            backend = 'local'
+
+    if args.incremental and backend == 'local':
+        # Lokale Vektoren entstehen aus dem ganzen Korpus neu – jede Änderung verschiebt alle
+        print("⚠️  --incremental braucht gespeicherte Embeddings oder --no-embeddings, berechne alles neu")
+
+    rows = None
+    if args.incremental and backend != 'local':
+        connections, rows = calculate_connections_incremental(articles, backend, api_key, embedding_store)
+    elif backend is None:
         connections = calculate_connections_rule_based(articles)
-        embeddings_used = False
     else:
-        api_key = os.environ.get('OPENAI_API_KEY')
-        if not api_key:
-            print("⚠️  OPENAI_API_KEY nicht gesetzt, verwende regelbasierte Verbindungen")
-            connections = calculate_connections_rule_based(articles)
-            embeddings_used = False
+        if backend == 'openai':
+            similarity_matrix = calculate_connections_with_embeddings(articles, api_key, args.block_size,
+                                                                      store=embedding_store, search=args.search)
         else:
-            similarity_matrix = calculate_connections_with_embeddings(articles, api_key)
-            # Kombiniere mit regelbasierten Verbindungen
-            rule_connections = calculate_connections_rule_based(articles)
-
-            connections = {}
-            for article in articles:
-                url = article['url']
-
-                # Merge: Embedding-Similarity + Rule-Score
-                merged = {}
-
-                for sim in similarity_matrix.get(url, []):
-                    merged[sim['url']] = {
-                        'url': sim['url'],
-                        'similarity': sim['similarity'],
-                        'score': sim['similarity'] * 50  # Normalisiere auf ~50
-                    }
-
-                for rule in rule_connections.get(url, []):
-                    if rule['url'] in merged:
-                        merged[rule['url']]['score'] += rule['score']
-                        merged[rule['url']]['type'] = rule.get('type', 'ergaenzung')
-                    else:
-                        merged[rule['url']] = {
-                            'url': rule['url'],
-                            'score': rule['score'],
-                            'type': rule.get('type', 'ergaenzung')
-                        }
-
-                # Sortiere und nimm Top 10
-                sorted_conns = sorted(merged.values(), key=lambda x: x['score'], reverse=True)[:10]
-                connections[url] = sorted_conns
-
-            embeddings_used = True
+            similarity_matrix = calculate_connections_local(articles, store, args.block_size, args.search)
+        # Kombiniere mit regelbasierten Verbindungen
+        connections = merge_connections(articles, similarity_matrix, calculate_connections_rule_based(articles))
+    embeddings_used = backend is not None
 
     print()
     print("📝 Generiere Begründungen...")
@@ -405,7 +419,9 @@ def main():
     # Füge 'related' zu jedem Artikel hinzu
     article_lookup = {a['url']: a for a in articles}
 
-    for article in articles:
+    # Inkrementell nur die Artikel, deren Verbindungen neu bestimmt wurden
+    updated = articles if rows is None else [articles[i] for i in rows]
+    for article in updated:
         url = article['url']
         article_connections = connections.get(url, [])
 
@@ -433,14 +449,15 @@ def main():
 
         article['related'] = related
 
-    # Update data
-    data['articles'] = data['articles']  # Behält alle Artikel (auch non-blog)
-    data['connectionsGeneratedAt'] = datetime.now().isoformat()
-    data['embeddingsUsed'] = embeddings_used
-
-    # Speichere
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Speichere nur 'related' – unveränderte Shards bleiben unangetastet, non-blog Artikel auch
+    written = store.update([{'url': article['url'], 'related': article['related']} for article in updated])
+    changed = store.set_meta(embeddingsUsed=embeddings_used, embeddingBackend=backend)
+    # Zeitstempel nur wenn sich Verbindungen geändert haben – sonst bleiben Index
+    # und Export byte-identisch (Shards aus dem Import des Exports zählen nicht)
+    if changed or written or 'connectionsGeneratedAt' not in store.meta:
+        store.set_meta(connectionsGeneratedAt=datetime.now().isoformat())
+    store.save()
+    store.export(OUTPUT_FILE)
 
     print()
     print("-" * 60)
@@ -448,9 +465,10 @@ def main():
     print("-" * 60)
     print(f"  Artikel mit Verbindungen: {len([a for a in articles if a.get('related')])}")
     print(f"  Durchschnittliche Verbindungen: {sum(len(a.get('related', [])) for a in articles) / len(articles):.1f}")
-    print(f"  Embeddings verwendet: {'Ja' if embeddings_used else 'Nein'}")
+    print(f"  Embeddings verwendet: {f'Ja ({backend})' if embeddings_used else 'Nein'}")
     print()
-    print(f"💾 Gespeichert: {OUTPUT_FILE}")
+    print(f"💾 Gespeichert: {STORE_DIR} ({store.stats['written']} Shards geschrieben)")
+    print(f"   Export: {OUTPUT_FILE}")
     print()
     print("✅ Phase 3 & 4 abgeschlossen!")
     print("   Die Daten sind bereit für die JavaScript-Integration.")
@@ -0,0 +1,288 @@
+"""
+HTML Cleaner
+Bereinigt WordPress/Elementor-Seiten in einem Durchgang (für migrate-blog-complete.py)
+
+Statt die ganze Seite mit BeautifulSoup aufzubauen und danach mehrfach über den
+Baum und den fertigen String zu laufen:
+
+1. html.parser liest die Seite; Knoten werden nur innerhalb möglicher Content-Wurzeln
+   (.entry-content, article, …) angelegt. Sobald .entry-content geschlossen ist, ist
+   der Rest der Seite egal.
+2. Ein Post-Order-Durchlauf entfernt Scripts, entpackt Wrapper, entfernt Attribute,
+   benennt Tags um und verwirft leere Tags – und serialisiert dabei direkt.
+
+Die Ausgabe entspricht Zeichen für Zeichen der bisherigen BeautifulSoup-Variante
+(Baumaufbau, Whitespace- und Entity-Behandlung wie BeautifulSoup mit html.parser).
+"""
+
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+from bs4.builder import HTMLParserTreeBuilder
+from bs4.dammit import EntitySubstitution
+from bs4.element import (
+    CData, Comment, Declaration, Doctype, NavigableString, PreformattedString, ProcessingInstruction
+)
+
+# Wie bisher: Selektoren in dieser Reihenfolge, danach das erste <article>
+CONTENT_CLASSES = ['entry-content', 'post-content', None, 'blog-post-content']
+ELEMENTOR_CLASS = 'elementor-widget-container'  # nur innerhalb von <article>
+
+DROP_TAGS = {'script', 'style', 'noscript', 'iframe'}
+SEMANTIC_TAGS = {'p', 'h1', 'h2', 'h3', 'h4', 'ul', 'ol', 'li', 'blockquote', 'strong', 'em', 'a', 'img'}
+RENAME_TAGS = {'b': 'strong', 'i': 'em', 'h1': 'h2'}
+
+# Regeln des html.parser-Builders von BeautifulSoup (leere Elemente, String-Typen, …)
+_BUILDER = HTMLParserTreeBuilder()
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+MAIN_STRING_TYPES = {NavigableString, CData}
+
+_substitute = EntitySubstitution.substitute_xml
+_quote = EntitySubstitution.quoted_attribute_value
+
+
+class _Element:
+    __slots__ = ('name', 'attrs', 'children')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.children = []
+
+
+class _ContentTreeBuilder(HTMLParser):
+    """Baut nur die Teilbäume möglicher Content-Wurzeln auf (wie BeautifulSoup sie bauen würde)"""
+
+    class Done(Exception):
+        pass
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        # Offene Tags: [name, element oder None, in_article, ist .entry-content]
+        self.stack = []
+        self.data = []
+        self.roots = [None] * len(CONTENT_CLASSES)
+        self.first_article = None
+
+    # --- Strings ---
+
+    def _flush(self, string_type=None):
+        if not self.data:
+            return
+        text = ''.join(self.data)
+        self.data = []
+
+        if not any(entry[0] in _BUILDER.preserve_whitespace_tags for entry in self.stack) \
+                and not text.strip(ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+
+        parent = self.stack[-1][1] if self.stack else None
+        if parent is None:
+            return
+
+        if string_type is None:
+            string_type = NavigableString
+            for entry in reversed(self.stack):
+                if entry[0] in _BUILDER.string_containers:
+                    string_type = _BUILDER.string_containers[entry[0]]
+                    break
+        parent.children.append((string_type, text))
+
+    def handle_data(self, data):
+        self.data.append(data)
+
+    def handle_charref(self, name):
+        digits, base = (name[1:], 16) if name[:1] in 'xX' else (name, 10)
+        try:
+            number = int(digits, base)
+        except ValueError:
+            self.data.append(digits)
+            return
+        self.data.append(unescape(f'&#{number};') if number else '\ufffd')
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.data.append(character if character is not None else f'&{name}')
+
+    def _special_string(self, data, string_type):
+        self._flush()
+        self.data.append(data)
+        self._flush(string_type)
+
+    def handle_comment(self, data):
+        self._special_string(data, Comment)
+
+    def handle_decl(self, decl):
+        self._special_string(decl[len('DOCTYPE '):], Doctype)
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self._special_string(data[len('CDATA['):], CData)
+        else:
+            self._special_string(data, Declaration)
+
+    def handle_pi(self, data):
+        self._special_string(data, ProcessingInstruction)
+
+    # --- Tags ---
+
+    def handle_starttag(self, tag, attrs, self_closing=False):
+        self._flush()
+
+        attr_dict = {}
+        for key, value in attrs:
+            attr_dict[key] = '' if value is None else value
+        classes = attr_dict.get('class', '').split()
+
+        parent = self.stack[-1] if self.stack else None
+        in_article = bool(parent and parent[2])
+
+        element = None
+        if parent and parent[1] is not None:
+            element = _Element(tag, attr_dict)
+            parent[1].children.append(element)
+
+        # Mögliche Content-Wurzeln (erste Fundstelle je Selektor)
+        is_entry_content = False
+        for priority, css_class in enumerate(CONTENT_CLASSES):
+            matched = (ELEMENTOR_CLASS in classes and in_article) if css_class is None else css_class in classes
+            if matched and self.roots[priority] is None:
+                element = element or _Element(tag, attr_dict)
+                self.roots[priority] = element
+                is_entry_content = is_entry_content or priority == 0
+        if tag == 'article' and self.first_article is None:
+            element = element or _Element(tag, attr_dict)
+            self.first_article = element
+
+        if tag in _BUILDER.empty_element_tags and not self_closing:
+            return
+        self.stack.append([tag, element, in_article or tag == 'article', is_entry_content])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, self_closing=True)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        for position in range(len(self.stack) - 1, -1, -1):
+            if self.stack[position][0] == tag:
+                closed = self.stack[position:]
+                del self.stack[position:]
+                if any(entry[3] for entry in closed):
+                    raise self.Done()
+                return
+
+    def build(self, html):
+        try:
+            self.feed(html)
+            self.close()
+        except self.Done:
+            pass
+        self._flush()
+        return next((root for root in self.roots if root is not None), self.first_article)
+
+
+def _attribute_string(name, attrs):
+    list_attributes = _BUILDER.cdata_list_attributes.get('*', set()) | \
+        _BUILDER.cdata_list_attributes.get(name, set())
+    parts = []
+    for key, value in sorted(attrs.items()):
+        if key in list_attributes:
+            value = ' '.join(value.split())
+        parts.append(f" {key}={_quote(_substitute(value))}")
+    return ''.join(parts).replace('\xa0', ' ')
+
+
+def _string_output(string_type, text):
+    if issubclass(string_type, PreformattedString):
+        # Unverändert ausgegeben – die alten Regex-Ersetzungen griffen auch hier
+        text = text.replace('&nbsp;', ' ').replace('\xa0', ' ')
+        if '<p>' in text:
+            text = re.sub(r'<p>\s*</p>', '', text)
+            text = re.sub(r'<p>\s*<br\s*/?>\s*</p>', '', text)
+        return string_type.PREFIX + text + string_type.SUFFIX
+    return _substitute(text).replace('\xa0', ' ')
+
+
+def _wrap(name, attributes, parts):
+    if not parts and name in _BUILDER.empty_element_tags:
+        return [f"<{name}{attributes}/>"]
+    return [f"<{name}{attributes}>", *parts, f"</{name}>"]
+
+
+def _clean_tree(root):
+    """Post-Order-Durchlauf: bereinigt und serialisiert in einem Schritt
+
+    Pro Element wird gesammelt: Ausgabe-Teile, Typen mit sichtbarem Text, enthält <img>.
+    """
+    # Frame: [element, nächstes Kind, teile, text_typen, hat_bild]
+    frames = [[root, 0, [], set(), False]]
+
+    while True:
+        frame = frames[-1]
+        element, index = frame[0], frame[1]
+
+        if index < len(element.children):
+            frame[1] += 1
+            child = element.children[index]
+            if isinstance(child, _Element):
+                if child.name not in DROP_TAGS:
+                    frames.append([child, 0, [], set(), False])
+                continue
+            string_type, text = child
+            frame[2].append(_string_output(string_type, text))
+            if text.strip():
+                frame[3].add(string_type)
+            continue
+
+        frames.pop()
+        _, _, parts, text_types, has_image = frame
+        if not frames:
+            return element, parts
+
+        parent = frames[-1]
+        parent[3] |= text_types
+        parent[4] = parent[4] or has_image or element.name == 'img'
+
+        # Wrapper mit Klasse ohne semantische Bedeutung: nur den Inhalt übernehmen
+        if 'class' in element.attrs and element.name not in SEMANTIC_TAGS:
+            parent[2].extend(parts)
+            continue
+
+        # Leere Tags (ohne Text und ohne Bild) verwerfen – <img> selbst eingeschlossen
+        interesting = {_BUILDER.string_containers[element.name]} \
+            if element.name in _BUILDER.string_containers else MAIN_STRING_TYPES
+        if not (text_types & interesting) and not has_image:
+            continue
+
+        name = RENAME_TAGS.get(element.name, element.name)
+        attrs = {key: value for key, value in element.attrs.items()
+                 if key not in ('class', 'style') and not key.startswith('data-')}
+
+        # <p>\s*</p> fiel bisher per Regex weg
+        if name == 'p' and not attrs and not ''.join(parts).strip():
+            continue
+
+        parent[2].extend(_wrap(name, _attribute_string(element.name, attrs), parts))
+
+
+def clean_content(html):
+    """Bereinigt WordPress-HTML zu sauberem Content (leerer String ohne Content-Wurzel)."""
+    root = _ContentTreeBuilder().build(html)
+    if root is None:
+        return ""
+
+    root, parts = _clean_tree(root)
+    content_html = ''.join(_wrap(root.name, _attribute_string(root.name, root.attrs), parts))
+
+    if '\n\n\n' in content_html:
+        content_html = re.sub(r'\n{3,}', '\n\n', content_html)
+
+    # Äußeres content-div entfernen
+    if content_html.startswith('<div'):
+        content_html = content_html[content_html.index('>') + 1:]
+    if content_html.endswith('</div>'):
+        content_html = content_html[:-len('</div>')]
+
+    return content_html.strip()
@@ -0,0 +1,108 @@
+"""
+HTTP Response Cache
+On-Disk Cache für Conditional GETs (ETag / Last-Modified)
+
+Pro URL werden Body (gzip-komprimiert), ETag und Last-Modified gespeichert.
+Beim nächsten Request schickt der Client If-None-Match / If-Modified-Since;
+antwortet der Server mit 304, wird der Body aus dem Cache geliefert.
+
+Layout:
+    <cache_dir>/index.json        URL → Metadaten
+    <cache_dir>/<sha1(url)>.gz    komprimierter Body
+"""
+
+import gzip
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from json_index import load_index, save_index, write_atomic
+
+INDEX_VERSION = 1
+
+
+class HTTPCache:
+    """Persistenter Cache für Conditional GETs (thread-safe)"""
+
+    def __init__(self, cache_dir, read_only=False):
+        self.cache_dir = Path(cache_dir)
+        # read_only (z.B. Dry Run): gecachte Bodies werden genutzt, aber nichts geschrieben
+        self.read_only = read_only
+        self.index_file = self.cache_dir / 'index.json'
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = (load_index(self.index_file, INDEX_VERSION) or {}).get('entries', {})
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'bytes_downloaded': 0, 'bytes_from_cache': 0}
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, url):
+        return self.cache_dir / f"{self._key(url)}.gz"
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since für eine bekannte URL"""
+        entry = self.entries.get(url)
+        if not entry or not self._body_path(url).exists():
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load(self, url):
+        """Gecachter Body + Metadaten (oder None)"""
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        try:
+            with gzip.open(self._body_path(url), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+
+        with self._lock:
+            self.stats['hits'] += 1
+            self.stats['bytes_from_cache'] += len(body)
+        return body, entry
+
+    def store(self, url, body, headers, encoding='utf-8'):
+        """Speichert eine 200-Antwort, sofern sie validierbar ist (ETag oder Last-Modified)"""
+        with self._lock:
+            self.stats['misses'] += 1
+            self.stats['bytes_downloaded'] += len(body)
+
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if self.read_only or (not etag and not last_modified):
+            return False
+
+        # Eindeutige tmp-Datei: parallele Fetches derselben URL dürfen sich nicht
+        # gegenseitig eine halb geschriebene Datei unterschieben
+        write_atomic(self._body_path(url), gzip.compress(body, compresslevel=6))
+
+        with self._lock:
+            self.entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'encoding': encoding,
+                'content_type': headers.get('Content-Type'),
+                'size': len(body),
+                'fetched_at': datetime.now().isoformat()
+            }
+            self.stats['stored'] += 1
+            self._dirty = True
+        return True
+
+    def save(self):
+        """Schreibt den Index (nur wenn sich etwas geändert hat)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            save_index(self.index_file, INDEX_VERSION, {'entries': self.entries})
+            self._dirty = False
@@ -0,0 +1,258 @@
+"""
+Intelligence Store
+Gesharderter Speicher für die Content-Intelligence-Pipeline
+
+Statt einer großen data/blog-intelligence.json gibt es pro Artikel kompakte
+JSON-Shards und einen kleinen Index. Jeder Artikel ist in zwei Feldgruppen
+aufgeteilt:
+
+- meta: alles außer dem Artikeltext (Titel, Kategorie, Analyse, related, ...)
+- body: die großen Felder aus der Extraktion (content, blockquotes, ...)
+
+load(fields=...) liest nur die Gruppen, die für die angefragten Felder nötig
+sind – die Connection-Engine deserialisiert so nie einen Artikeltext.
+update() schreibt nur Shards, deren Inhalt sich wirklich geändert hat.
+
+data/blog-intelligence.json bleibt als vollständiger Export (alle Felder)
+bestehen – er ist die einzige versionierte Kopie der Daten. Ein frischer
+Clone baut daraus den Store auf; weicht die Datei vom zuletzt exportierten
+oder importierten Stand ab (z.B. nach git pull), wird sie neu importiert.
+
+Layout:
+    data/intelligence/index.json                Reihenfolge, Metadaten, Hash pro Shard, Export-Hash
+    data/intelligence/<slug>.meta.json          meta-Felder eines Artikels
+    data/intelligence/<slug>.body.json          body-Felder eines Artikels
+"""
+
+import re
+import json
+import hashlib
+from pathlib import Path
+
+from json_index import load_index, save_index, write_atomic
+
+INDEX_VERSION = 1
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / "data" / "intelligence"
+
+# Große Felder aus extract-blog-content.py, die nur die Analyse braucht
+BODY_FIELDS = ('content', 'blockquotes', 'headings', 'internalLinks')
+GROUPS = ('meta', 'body')
+
+
+def _group(field):
+    return 'body' if field in BODY_FIELDS else 'meta'
+
+
+def _dumps(record):
+    return json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _slug(url):
+    return re.sub(r'[^\w.-]', '_', Path(url).stem) or '_'
+
+
+class IntelligenceStore:
+    """Ein Shard pro Artikel und Feldgruppe, dazu ein Index mit Reihenfolge und Hashes"""
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR, legacy_file=None):
+        self.store_dir = Path(store_dir)
+        self.index_file = self.store_dir / 'index.json'
+        self._dirty = False
+        self._records = {}  # (url, Gruppe) → geladener Datensatz
+        self.stats = {'read': 0, 'written': 0, 'unchanged': 0, 'removed': 0}
+
+        index = self._load_index()
+        self.meta = index['meta']
+        self.order = index['order']
+        self.entries = index['entries']
+        self.export_state = index['export']  # {'hash': Export-Datei, 'state': Store-Stand beim Export}
+
+        if legacy_file and Path(legacy_file).exists():
+            text = Path(legacy_file).read_text(encoding='utf-8')
+            if _hash(text) != self.export_state.get('hash'):
+                self.import_legacy(legacy_file)
+
+    def _load_index(self):
+        empty = {'meta': {}, 'order': [], 'entries': {}, 'export': {}}
+        data = load_index(self.index_file, INDEX_VERSION) or {}
+        return {key: data.get(key, value) for key, value in empty.items()}
+
+    def _shard_path(self, url, group):
+        return self.store_dir / f"{self.entries[url]['slug']}.{group}.json"
+
+    def _read(self, url, group):
+        key = (url, group)
+        if key not in self._records:
+            if group not in self.entries[url]['hashes']:
+                self._records[key] = {}
+            else:
+                with open(self._shard_path(url, group), 'r', encoding='utf-8') as f:
+                    self._records[key] = json.load(f)
+                self.stats['read'] += 1
+        return self._records[key]
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, url):
+        return url in self.entries
+
+    def load(self, fields=None):
+        """Alle Artikel in gespeicherter Reihenfolge
+
+        fields: nur diese Felder laden ('url' ist immer dabei). Gruppen, aus
+        denen kein Feld angefragt ist, werden gar nicht gelesen.
+        """
+        if fields is None:
+            return self._load_groups(GROUPS)
+        groups = [group for group in GROUPS if any(_group(field) == group for field in fields)]
+        return [
+            {key: value for key, value in article.items() if key == 'url' or key in fields}
+            for article in self._load_groups(groups)
+        ]
+
+    def _load_groups(self, groups):
+        articles = []
+        for url in self.order:
+            article = {'url': url}
+            for group in groups:
+                article.update(self._read(url, group))
+            articles.append(article)
+        return articles
+
+    def update(self, articles):
+        """Übernimmt die Felder der Artikel (Merge über bestehende Felder)
+
+        Neue Artikel werden hinten angehängt. Geschrieben wird nur ein Shard,
+        dessen Inhalt sich geändert hat. Gibt die Anzahl geschriebener Shards zurück.
+        """
+        written = 0
+        for article in articles:
+            url = article['url']
+            if url not in self.entries:
+                slugs = {entry['slug'] for entry in self.entries.values()}
+                slug = _slug(url)
+                while slug in slugs:
+                    slug += '_'
+                self.entries[url] = {'slug': slug, 'hashes': {}}
+                self.order.append(url)
+                self._dirty = True
+
+            for group in GROUPS:
+                fields = {key: value for key, value in article.items() if key != 'url' and _group(key) == group}
+                if not fields:
+                    continue
+                record = dict(self._read(url, group))
+                record.update(fields)
+                if self._write_shard(url, group, record):
+                    written += 1
+        return written
+
+    def _write_shard(self, url, group, record):
+        text = _dumps(record)
+        digest = _hash(text)
+        self._records[(url, group)] = record
+        if self.entries[url]['hashes'].get(group) == digest:
+            self.stats['unchanged'] += 1
+            return False
+
+        write_atomic(self._shard_path(url, group), text)
+        self.entries[url]['hashes'][group] = digest
+        self.stats['written'] += 1
+        self._dirty = True
+        return True
+
+    def retain(self, urls):
+        """Entfernt alle Artikel, die nicht in `urls` sind, und übernimmt deren Reihenfolge
+
+        Gibt die Anzahl entfernter Artikel zurück.
+        """
+        keep = set(urls)
+        removed = 0
+        for url in [url for url in self.order if url not in keep]:
+            for group in self.entries[url]['hashes']:
+                self._shard_path(url, group).unlink(missing_ok=True)
+                self._records.pop((url, group), None)
+            del self.entries[url]
+            self.order.remove(url)
+            self.stats['removed'] += 1
+            removed += 1
+            self._dirty = True
+
+        order = [url for url in dict.fromkeys(urls) if url in self.entries]
+        if order != self.order:
+            self.order = order
+            self._dirty = True
+        return removed
+
+    def set_meta(self, **meta):
+        """Setzt Metadaten des Laufs (analyzedAt, provider, ...); True, wenn sich etwas geändert hat"""
+        if any(self.meta.get(key) != value for key, value in meta.items()):
+            self.meta.update(meta)
+            self._dirty = True
+            return True
+        return False
+
+    def save(self):
+        """Schreibt den Index (nur wenn sich etwas geändert hat)"""
+        if not self._dirty:
+            return
+        save_index(self.index_file, INDEX_VERSION,
+                   {'meta': self.meta, 'order': self.order, 'entries': self.entries, 'export': self.export_state},
+                   sort_keys=True, separators=(',', ':'))
+        self._dirty = False
+
+    def _state(self):
+        """Hash über Index-Inhalt (Metadaten, Reihenfolge, Shard-Hashes) – ohne Shards zu lesen"""
+        hashes = {url: self.entries[url]['hashes'] for url in self.order}
+        return _hash(_dumps({'meta': self.meta, 'order': self.order, 'hashes': hashes}))
+
+    def export(self, output_file):
+        """Schreibt den vollständigen Export (alle Felder); nur wenn er sich ändert
+
+        Schlüssel werden sortiert – frisch aktualisierte und von der Platte
+        gelesene Records ergeben so denselben Text, ein unveränderter Lauf
+        hinterlässt keinen Diff. Ist der Store seit dem letzten Export
+        unverändert und die Datei noch die exportierte, wird kein Shard gelesen.
+        """
+        output_file = Path(output_file)
+        state = self._state()
+        current = output_file.read_text(encoding='utf-8') if output_file.exists() else None
+        if current is not None and self.export_state == {'hash': _hash(current), 'state': state}:
+            return False
+
+        articles = self._load_groups(GROUPS)
+        data = {**self.meta, 'totalArticles': len(articles), 'articles': articles}
+        text = json.dumps(data, ensure_ascii=False, sort_keys=True, indent=2)
+
+        written = current != text
+        if written:
+            write_atomic(output_file, text)
+        self._set_export_state(_hash(text), state)
+        return written
+
+    def _set_export_state(self, digest, state):
+        if self.export_state != {'hash': digest, 'state': state}:
+            self.export_state = {'hash': digest, 'state': state}
+            self._dirty = True
+            self.save()
+
+    def import_legacy(self, legacy_file):
+        """Übernimmt eine blog-intelligence.json (bisherige monolithische Datei oder Export)
+
+        Die Datei gibt Artikel und Reihenfolge vor; Artikel, die sie nicht
+        enthält, werden entfernt.
+        """
+        text = Path(legacy_file).read_text(encoding='utf-8')
+        data = json.loads(text)
+        articles = data.get('articles', [])
+        self.update(articles)
+        self.retain([article['url'] for article in articles])
+        self.set_meta(**{key: value for key, value in data.items() if key not in ('articles', 'totalArticles')})
+        # Erst der nächste Export bestätigt den Store-Stand
+        self._set_export_state(_hash(text), None)
+        self.save()
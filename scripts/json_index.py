@@ -0,0 +1,53 @@
+"""
+JSON Index
+Gemeinsames Laden und atomares Schreiben der Indizes und Caches der Pipeline
+
+Jeder Index ist ein JSON-Objekt mit einer 'version'. load_index() liefert
+None statt einer Exception, wenn die Datei fehlt, kaputt ist oder nicht
+passt – der Aufrufer fängt dann leer an.
+write_atomic() schreibt über eine eindeutige tmp-Datei neben dem Ziel und
+replace(): weder ein Abbruch noch ein paralleler Schreiber derselben Datei
+hinterlässt einen halben Stand.
+"""
+
+import json
+import uuid
+from pathlib import Path
+
+
+def load_index(path, version, **expected):
+    """Inhalt einer Index-Datei (dict) oder None
+
+    None, wenn die Datei fehlt, nicht lesbar ist, eine andere Version hat oder
+    eines der `expected`-Felder abweicht (z.B. root=..., extractor=...).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != version:
+        return None
+    if any(data.get(key) != value for key, value in expected.items()):
+        return None
+    return data
+
+
+def write_atomic(path, data):
+    """Schreibt `data` (str als UTF-8 oder bytes) atomar nach `path`"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(data.encode('utf-8') if isinstance(data, str) else data)
+        tmp_file.replace(path)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+def save_index(path, version, fields, **options):
+    """Schreibt {'version': version, **fields} atomar; `options` gehen an json.dumps"""
+    options.setdefault('ensure_ascii', False)
+    write_atomic(path, json.dumps({'version': version, **fields}, **options))
@@ -0,0 +1,56 @@
+"""
+JSON Schema (Teilmenge)
+Validiert geparste JSON-Antworten, z.B. die LLM-Analysen aus analyze-with-llm.py
+
+Unterstützt: type, properties, required, items, enum, minLength, minItems.
+Das reicht für flache Antwortformate – für mehr: pip install jsonschema
+"""
+
+TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool,
+    'null': type(None)
+}
+
+
+class SchemaError(ValueError):
+    """Wert passt nicht zum Schema; path zeigt auf die Stelle (z.B. $.transformation.von)"""
+
+    def __init__(self, message, path='$'):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+
+
+def validate(value, schema, path='$'):
+    """Prüft `value` gegen `schema` und wirft SchemaError beim ersten Fehler"""
+    expected = schema.get('type')
+    if expected:
+        python_type = TYPES[expected]
+        # bool ist in Python ein int – für JSON aber keine Zahl
+        if not isinstance(value, python_type) or (isinstance(value, bool) and expected in ('integer', 'number')):
+            raise SchemaError(f"erwartet {expected}, erhalten {type(value).__name__}", path)
+
+    if 'enum' in schema and value not in schema['enum']:
+        raise SchemaError(f"{value!r} ist keiner von {schema['enum']}", path)
+
+    if isinstance(value, str) and len(value.strip()) < schema.get('minLength', 0):
+        raise SchemaError(f"kürzer als {schema['minLength']} Zeichen", path)
+
+    if isinstance(value, dict):
+        for key in schema.get('required', []):
+            if key not in value:
+                raise SchemaError(f"Feld '{key}' fehlt", path)
+        for key, sub_schema in schema.get('properties', {}).items():
+            if key in value:
+                validate(value[key], sub_schema, f"{path}.{key}")
+
+    if isinstance(value, list):
+        if len(value) < schema.get('minItems', 0):
+            raise SchemaError(f"weniger als {schema['minItems']} Einträge", path)
+        if 'items' in schema:
+            for position, item in enumerate(value):
+                validate(item, schema['items'], f"{path}[{position}]")
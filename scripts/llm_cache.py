@@ -0,0 +1,86 @@
+"""
+LLM Response Cache
+Content-adressierter Cache für LLM-Antworten (z.B. analyze-with-llm.py)
+
+Schlüssel ist der SHA-256 über Provider, Prompt-Version und den kompletten
+Request (Modell, Prompt, Parameter). Ein Treffer heißt: exakt dieselbe
+Anfrage wurde schon beantwortet – ein geänderter Artikel, ein anderes Modell
+oder ein anderer Provider ergeben automatisch einen neuen Schlüssel. Wird die
+Prompt-Version erhöht, verwirft der Cache beim Laden alle alten Einträge.
+
+Layout:
+    data/llm-cache.json    Schlüssel → {result, url, prompt_version, created}
+"""
+
+import json
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from json_index import load_index, save_index
+
+INDEX_VERSION = 1
+
+
+class ResponseCache:
+    """Persistenter Cache Request-Hash → Ergebnis (thread-safe)"""
+
+    def __init__(self, cache_file, prompt_version):
+        self.cache_file = Path(cache_file)
+        self.prompt_version = prompt_version
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'invalidated': 0}
+        self.entries = self._load_index()
+
+    def _load_index(self):
+        entries = (load_index(self.cache_file, INDEX_VERSION) or {}).get('entries', {})
+        current = {key: entry for key, entry in entries.items() if entry.get('prompt_version') == self.prompt_version}
+        if len(current) != len(entries):
+            self.stats['invalidated'] = len(entries) - len(current)
+            self._dirty = True
+        return current
+
+    def key(self, provider, request):
+        """Schlüssel für einen Request (dict, z.B. Chat-Completion-Payload)"""
+        material = json.dumps(
+            {'provider': provider, 'prompt_version': self.prompt_version, 'request': request},
+            ensure_ascii=False, sort_keys=True, separators=(',', ':')
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Gespeichertes Ergebnis (oder None)"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            return entry['result']
+
+    def put(self, key, result, url=None):
+        """Speichert ein Ergebnis"""
+        with self._lock:
+            self.entries[key] = {
+                'result': result,
+                'url': url,
+                'prompt_version': self.prompt_version,
+                'created': datetime.now().isoformat()
+            }
+            self.stats['stored'] += 1
+            self._dirty = True
+
+    def urls(self):
+        """URLs, für die es mindestens einen Eintrag gibt"""
+        with self._lock:
+            return {entry['url'] for entry in self.entries.values() if entry.get('url')}
+
+    def save(self):
+        """Schreibt den Cache (nur wenn sich etwas geändert hat)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            save_index(self.cache_file, INDEX_VERSION, {'entries': self.entries})
+            self._dirty = False
@@ -0,0 +1,186 @@
+"""
+LLM Scheduler
+asyncio-Scheduler für Chat-Completion-Requests (z.B. analyze-with-llm.py)
+
+- Token-Bucket für Requests pro Minute (RPM) und Tokens pro Minute (TPM)
+- Mehrere Requests gleichzeitig (Concurrency-Limit)
+- 429: Retry-After wird beachtet und pausiert den Bucket für alle Requests
+- 5xx/Netzwerkfehler: exponentielles Backoff mit Jitter pro Request
+- Ergebnisse kommen in Eingabe-Reihenfolge zurück, egal wann sie fertig werden
+
+Spricht die OpenAI-kompatible /chat/completions API (OpenAI, Groq).
+
+Benötigt: pip install aiohttp
+"""
+
+import json
+import time
+import asyncio
+import random
+
+import aiohttp
+
+from async_http import parse_retry_after
+
+
+class LLMError(Exception):
+    """Endgültiger Fehler eines Requests (kein erneuter Versuch)"""
+
+
+class TransientError(LLMError):
+    """Vorübergehender Fehler (5xx, Netzwerk) – erneuter Versuch sinnvoll"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimited(TransientError):
+    """429 vom Provider; retry_after in Sekunden (oder None)"""
+
+
+def estimate_tokens(text):
+    """Grobe Token-Schätzung für deutschen Text (eher zu hoch als zu niedrig)"""
+    return len(text) // 3 + 1
+
+
+class TokenBucket:
+    """Token-Bucket mit `per_minute` Tokens pro Minute und Kapazität `capacity`
+
+    acquire() wartet, bis genug Tokens nachgelaufen sind; Wartende werden in
+    Ankunftsreihenfolge bedient. pause() sperrt den Bucket (z.B. nach 429).
+    """
+
+    def __init__(self, per_minute, capacity=None, clock=time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.clock = clock
+        self.tokens = float(self.capacity)
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    async def acquire(self, amount=1):
+        """Nimmt `amount` Tokens (höchstens die Kapazität) und wartet falls nötig"""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = self._refill()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        """Sperrt den Bucket für `seconds` und leert ihn"""
+        now = self._refill()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+
+
+class LLMScheduler:
+    """Führt LLM-Requests unter RPM/TPM-Limits parallel aus
+
+    Verwendung:
+        scheduler = LLMScheduler(rpm=30, tpm=12000, concurrency=4)
+        results = await scheduler.map([(call, tokens), ...])
+    """
+
+    def __init__(self, rpm, tpm=None, concurrency=4, max_retries=5,
+                 backoff_base=1.0, backoff_max=60.0, clock=time.monotonic):
+        self.requests = TokenBucket(rpm, clock=clock)
+        self.tokens = TokenBucket(tpm, clock=clock) if tpm else None
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {'requests': 0, 'rate_limited': 0, 'retries': 0, 'failed': 0}
+
+    def backoff_delay(self, attempt):
+        """Exponentielles Backoff mit Full Jitter: uniform(0, min(max, base * 2^attempt))"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def submit(self, call, tokens=1):
+        """Führt `call()` (async) mit Rate-Limits und Retries aus"""
+        attempt = 0
+        while True:
+            await self.requests.acquire(1)
+            if self.tokens:
+                await self.tokens.acquire(tokens)
+
+            self.stats['requests'] += 1
+            try:
+                return await call()
+            except TransientError as e:
+                if attempt >= self.max_retries:
+                    self.stats['failed'] += 1
+                    raise
+                if isinstance(e, RateLimited):
+                    # Der Provider zählt anders als wir – alle Requests warten lassen
+                    self.stats['rate_limited'] += 1
+                    delay = e.retry_after if e.retry_after is not None else self.backoff_delay(attempt)
+                    delay = min(self.backoff_max, delay)
+                    self.requests.pause(delay)
+                    if self.tokens:
+                        self.tokens.pause(delay)
+                else:
+                    await asyncio.sleep(e.retry_after if e.retry_after is not None else self.backoff_delay(attempt))
+            except LLMError:
+                self.stats['failed'] += 1
+                raise
+
+            self.stats['retries'] += 1
+            attempt += 1
+
+    async def map(self, jobs, on_result=None):
+        """Führt [(call, tokens), ...] aus; Ergebnisse in Eingabe-Reihenfolge
+
+        Fehlgeschlagene Jobs liefern die Exception statt eines Ergebnisses.
+        on_result(index, result) wird aufgerufen, sobald ein Job fertig ist.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = [None] * len(jobs)
+
+        async def run(index, call, tokens):
+            async with semaphore:
+                try:
+                    results[index] = await self.submit(call, tokens)
+                except LLMError as e:
+                    results[index] = e
+            if on_result:
+                on_result(index, results[index])
+
+        await asyncio.gather(*(run(index, call, tokens) for index, (call, tokens) in enumerate(jobs)))
+        return results
+
+
+async def chat_completion(session, base_url, api_key, payload):
+    """POST {base_url}/chat/completions; gibt den Text der ersten Antwort zurück"""
+    url = f"{base_url.rstrip('/')}/chat/completions"
+    headers = {'Authorization': f"Bearer {api_key}"}
+    try:
+        async with session.post(url, json=payload, headers=headers) as response:
+            body = await response.text()
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if response.status == 429:
+                raise RateLimited(f"429: {body[:200]}", retry_after)
+            if response.status >= 500:
+                raise TransientError(f"{response.status}: {body[:200]}", retry_after)
+            if response.status >= 400:
+                raise LLMError(f"{response.status}: {body[:200]}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise TransientError(f"Netzwerkfehler: {e!r}")
+
+    try:
+        return json.loads(body)['choices'][0]['message']['content']
+    except (ValueError, KeyError, IndexError, TypeError):
+        raise LLMError(f"Unerwartete Antwort: {body[:200]}")
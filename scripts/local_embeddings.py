@@ -0,0 +1,152 @@
+"""
+Local Embeddings
+Lokale Dokument-Vektoren für generate-smart-connections.py – ohne API und Netz
+
+BM25-gewichtete Terme aus Titel, Kernbotschaft, Tiefenthemen und Artikeltext,
+als dünn besetzte Matrix (connection_scoring.SparseRows), verdichtet per
+Truncated SVD (randomisiert, fester Seed) zu dichten Vektoren. Gleiche
+Eingabe ergibt immer dieselben Vektoren.
+
+Tokenisierung für Deutsch: Kleinschreibung, Umlaute und ß ausgeschrieben
+(ä → ae, ß → ss), andere Akzente entfernt, Stoppwörter raus, leichtes
+Suffix-Stemming (Beziehungen → bezieh, Größe → groess).
+
+Benötigt: pip install numpy
+"""
+
+import re
+import math
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+from connection_scoring import SparseRows
+
+DIMENSIONS = 128
+SEED = 0
+
+# BM25-Parameter
+K1 = 1.5
+B = 0.75
+
+# Terme, die nur in einem Dokument vorkommen, tragen nichts zur Ähnlichkeit bei
+MIN_DOCUMENT_FREQUENCY = 2
+
+# Titel und Kernbotschaft zählen mehrfach – sie sagen am meisten über den Artikel
+TITLE_WEIGHT = 3
+SUMMARY_WEIGHT = 2
+
+UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Längste zuerst; es bleiben mindestens MIN_STEM Zeichen stehen
+SUFFIXES = ('ungen', 'heiten', 'keiten', 'innen', 'ung', 'heit', 'keit', 'chen', 'lich', 'isch',
+            'ern', 'en', 'er', 'em', 'es', 'e', 'n', 's')
+MIN_STEM = 4
+
+STOPWORDS = frozenset("""
+aber alle allem allen aller alles als also am an ander andere anderen anderer anderes auch auf aus
+bei beim bin bis bist da dabei damit dann das dass dein deine deinem deinen deiner dem den denn der
+des dich die dies diese diesem diesen dieser dieses dir doch dort du durch ein eine einem einen einer
+eines einfach er es etwas euch euer eure fuer ganz gar gegen gibt hab habe haben hast hat hatte hier
+hin hinter ich ihm ihn ihnen ihr ihre ihrem ihren ihrer im immer in ins ist ja jede jedem jeden jeder
+jetzt kann kannst kein keine keinem keinen keiner koennen man manchmal mehr mein meine meinem meinen
+meiner mich mir mit muss musst nach nicht nichts noch nun nur ob oder ohne schon sehr sein seine
+seinem seinen seiner selbst sich sie sind so solche soll sollte sondern sonst ueber um und uns unser
+unsere unter viel vom von vor wann war waren warum was weil weiter welche wenn wer werde werden wie
+wieder will wir wird wirst wo wurde zu zum zur zwar zwischen
+""".split())
+
+
+def normalize(text):
+    """Kleinschreibung, Umlaute ausgeschrieben, übrige Akzente entfernt"""
+    text = text.lower().translate(UMLAUTS)
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def stem(word):
+    """Leichtes Stemming: ein Suffix ab, sofern mindestens MIN_STEM Zeichen bleiben"""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Text → Liste von Termen (normalisiert, ohne Stoppwörter, gestemmt)"""
+    return [stem(token) for token in TOKEN_PATTERN.findall(normalize(text))
+            if len(token) > 2 and token not in STOPWORDS]
+
+
+def document_text(article, content=''):
+    """Text, aus dem die lokalen Vektoren eines Artikels entstehen"""
+    analysis = article.get('analysis') or {}
+    themes = ' '.join(theme.replace('-', ' ') for theme in analysis.get('tiefenthemen', []))
+    return ' '.join([article.get('title', '')] * TITLE_WEIGHT
+                    + [analysis.get('kernbotschaft', ''), themes] * SUMMARY_WEIGHT
+                    + [content or ''])
+
+
+def bm25_matrix(documents):
+    """Tokenisierte Dokumente → zeilennormalisierte BM25-Matrix (SparseRows)"""
+    counts = [Counter(tokens) for tokens in documents]
+    frequency = Counter(term for count in counts for term in count)
+    min_df = MIN_DOCUMENT_FREQUENCY if len(documents) > 2 else 1
+    vocabulary = {term: i for i, term in enumerate(sorted(t for t, df in frequency.items() if df >= min_df))}
+
+    n = len(documents)
+    average_length = sum(len(tokens) for tokens in documents) / n if n else 0
+    rows = []
+    for tokens, count in zip(documents, counts):
+        length_norm = K1 * (1 - B + B * len(tokens) / average_length) if average_length else K1
+        row = {}
+        for term, tf in count.items():
+            if term in vocabulary:
+                idf = math.log(1 + (n - frequency[term] + 0.5) / (frequency[term] + 0.5))
+                row[vocabulary[term]] = idf * tf * (K1 + 1) / (tf + length_norm)
+        norm = math.sqrt(sum(w * w for w in row.values())) or 1.0
+        rows.append({term: w / norm for term, w in row.items()})
+    return SparseRows.from_rows(rows, len(vocabulary))
+
+
+def truncated_svd(matrix, rank, oversample=10, iterations=4, seed=SEED):
+    """Randomisierte Truncated SVD (Halko et al.) einer SparseRows-Matrix
+
+    Gibt (U, S, Vt) mit `rank` Komponenten zurück; Vorzeichen sind so
+    festgelegt, dass der betragsgrößte Eintrag jeder Spalte von U positiv ist.
+    """
+    transposed = matrix.transpose()
+    n_rows, n_columns = len(matrix.indptr) - 1, matrix.n_columns
+    width = min(rank + oversample, n_rows, n_columns)
+    rng = np.random.default_rng(seed)
+
+    basis = matrix.dot(rng.standard_normal((n_columns, width)))
+    for _ in range(iterations):
+        basis, _ = np.linalg.qr(basis)
+        basis, _ = np.linalg.qr(transposed.dot(basis))
+        basis = matrix.dot(basis)
+    basis, _ = np.linalg.qr(basis)
+
+    small = transposed.dot(basis).T
+    u, s, vt = np.linalg.svd(small, full_matrices=False)
+    u = basis @ u[:, :rank]
+    signs = np.sign(u[np.abs(u).argmax(axis=0), np.arange(u.shape[1])])
+    signs[signs == 0] = 1
+    return u * signs, s[:rank], vt[:rank] * signs[:, None]
+
+
+def local_embeddings(articles, contents=None, dimensions=DIMENSIONS):
+    """Dichte Vektoren (len(articles) × ≤ dimensions, float32) für alle Artikel
+
+    contents: optional {url: Artikeltext}; ohne Text zählen nur Titel,
+    Kernbotschaft und Tiefenthemen.
+    """
+    contents = contents or {}
+    documents = [tokenize(document_text(article, contents.get(article['url'], ''))) for article in articles]
+    matrix = bm25_matrix(documents)
+    rank = min(dimensions, len(articles), matrix.n_columns)
+    if not rank:
+        return np.zeros((len(articles), 1), dtype=np.float32)
+    u, s, _ = truncated_svd(matrix, rank)
+    return (u * s).astype(np.float32)
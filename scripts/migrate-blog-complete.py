@@ -4,8 +4,9 @@ MASTER BLOG MIGRATION SCRIPT
 Crawlt, dedupliziert, bereinigt und migriert ALLE Blog-Posts von der alten Website.
 
 Performance-Features:
-- Paralleles Crawling (5 Worker)
+- Async Crawling (Keep-Alive-Pool, Limit pro Host, Backoff mit Jitter, Prefetch)
 - Caching (bereits gecrawlte Posts)
+- HTTP-Cache mit Conditional GETs (ETag/Last-Modified, 304 → kein Download)
 - Incrementelles Update (nur geänderte Posts)
 - Progress Bar
 - Automatische Validation
@@ -14,11 +15,14 @@ Usage:
     python scripts/migrate-blog-complete.py
     python scripts/migrate-blog-complete.py --force-all  # Alle Posts neu generieren
     python scripts/migrate-blog-complete.py --dry-run    # Nur analysieren
+    python scripts/migrate-blog-complete.py --crawler sync  # requests statt asyncio
+    python scripts/migrate-blog-complete.py --no-http-cache # Ohne Conditional GETs
 """
 
 import os
 import re
 import json
+import asyncio
 import hashlib
 import requests
 from pathlib import Path
@@ -30,6 +34,14 @@ from datetime import datetime
 import argparse
 from difflib import SequenceMatcher
 
+import html_cleaner
+import post_templates
+from http_cache import HTTPCache
+from migration_journal import MigrationJournal
+from fuzzy_index import TitleTrigramIndex, SimHashIndex, simhash
+from json_index import write_atomic
+from post_index import PostIndex, extract_title
+
 # ============================================
 # KONFIGURATION
 # ============================================
@@ -39,11 +51,23 @@ BLOG_URL = f"{BASE_URL}/blog"
 CACHE_FILE = "data/blog-migration-cache.json"
 OUTPUT_DIR = Path(__file__).parent.parent
 DATA_DIR = OUTPUT_DIR / "data"
+HTTP_CACHE_DIR = DATA_DIR / "http-cache"
+POST_INDEX_FILE = DATA_DIR / "post-index.json"
+JOURNAL_FILE = DATA_DIR / "blog-migration-journal.jsonl"
 TEMPLATES_DIR = OUTPUT_DIR / "templates"
 
+# WordPress REST API (Discovery), Post-Sitemap von Yoast als Fallback
+REST_POSTS_PATH = "/wp-json/wp/v2/posts"
+REST_CATEGORIES_PATH = "/wp-json/wp/v2/categories"
+REST_FIELDS = "id,slug,link,title,categories,date_gmt,modified_gmt"
+REST_PER_PAGE = 100  # Maximum der WordPress REST API
+POST_SITEMAP_PATH = "/post-sitemap.xml"
+
 # Performance Settings
 MAX_WORKERS = 5  # Parallele Downloads
 SIMILARITY_THRESHOLD = 0.85  # Für Deduplizierung (0-1)
+SIMHASH_MAX_DISTANCE = 3  # Max. abweichende Bits (von 64) für inhaltliche Duplikate
+MIN_SIMHASH_WORDS = 50  # Kürzere Texte werden nicht per SimHash verglichen
 
 # Kategorien Mapping (für bessere Organisation)
 CATEGORY_MAPPING = {
@@ -74,6 +98,11 @@ DEFAULT_IMAGES = {
     "Allgemein": "wp-content/uploads/2021/04/Me-ich-Kathrin-Hogaza-1060x1042.jpg"
 }
 
+
+def content_hash(text):
+    """SHA-256 eines Strings (für Änderungserkennung im Migrations-Cache)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
 # ============================================
 # KLASSEN
 # ============================================
@@ -81,12 +110,32 @@ DEFAULT_IMAGES = {
 class BlogCrawler:
     """Crawlt alle Blog-Posts von der alten WordPress-Website."""
 
-    def __init__(self):
+    def __init__(self, base_url=BASE_URL, cache=None):
+        self.base_url = base_url.rstrip('/')
+        self.blog_url = f"{self.base_url}/blog"
+        self.cache = cache
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'
         })
 
+    def _get(self, url):
+        """GET (conditional, falls im HTTP-Cache) → (status, body bytes, encoding)."""
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        response = self.session.get(url, timeout=10, headers=headers)
+        encoding = response.encoding or 'utf-8'
+
+        if response.status_code == 304 and self.cache:
+            cached = self.cache.load(url)
+            if cached:
+                body, entry = cached
+                return 200, body, entry.get('encoding') or encoding
+
+        if response.ok and self.cache:
+            self.cache.store(url, response.content, response.headers, encoding)
+
+        return response.status_code, response.content, encoding
+
     def crawl_all_posts(self):
         """Crawlt alle Blog-Post URLs mit Pagination."""
         print("📡 Crawle alte Website...")
@@ -94,16 +143,16 @@ class BlogCrawler:
         page = 1
 
         while True:
-            url = f"{BLOG_URL}/page/{page}" if page > 1 else BLOG_URL
+            url = self._listing_url(page)
             print(f"   Seite {page}...", end=" ")
 
             try:
-                response = self.session.get(url, timeout=10)
-                if response.status_code == 404:
+                status, body, _ = self._get(url)
+                if status == 404:
                     print("(keine weiteren Seiten)")
                     break
 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(body, 'html.parser')
                 posts = self._extract_posts_from_page(soup)
 
                 if not posts:
@@ -121,6 +170,10 @@ class BlogCrawler:
         print(f"   Gesamt: {len(all_posts)} Posts")
         return all_posts
 
+    def _listing_url(self, page):
+        """URL der Blog-Übersicht für eine Seite."""
+        return f"{self.blog_url}/page/{page}" if page > 1 else self.blog_url
+
     def _extract_posts_from_page(self, soup):
         """Extrahiert Blog-Post Informationen aus einer Seite."""
         posts = []
@@ -139,7 +192,7 @@ class BlogCrawler:
                 if not link_elem:
                     continue
 
-                url = urljoin(BASE_URL, link_elem['href'])
+                url = urljoin(self.base_url, link_elem['href'])
                 title = title_elem.get_text(strip=True)
 
                 # Kategorie
@@ -166,13 +219,260 @@ class BlogCrawler:
     def download_post_content(self, url):
         """Downloaded den vollständigen HTML-Content eines Posts."""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.text
+            status, body, encoding = self._get(url)
+            if status >= 400:
+                raise requests.HTTPError(f"HTTP {status}")
+            return body.decode(encoding, errors='replace')
         except Exception as e:
             print(f"   ✗ Download Fehler für {url}: {e}")
             return None
 
+    def download_posts(self, urls):
+        """Downloaded mehrere Posts parallel. Gibt {url: html oder None} zurück."""
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            return dict(zip(urls, executor.map(self.download_post_content, urls)))
+
+
+class AsyncBlogCrawler(BlogCrawler):
+    """Crawlt die alte Website mit asyncio über einen Keep-Alive Connection-Pool.
+
+    - Parallele Requests, begrenzt pro Host (per_host_limit)
+    - Exponentielles Backoff mit Jitter bei 429/5xx/Netzwerkfehlern
+    - Spekulatives Prefetching der nächsten Übersichtsseite; verrät die
+      Pagination die letzte Seite, werden alle restlichen Seiten sofort geladen
+    - discovery='rest': Post-Liste samt Metadaten über die WordPress REST API
+      (wenige JSON-Seiten statt HTML-Übersichten), parallel dazu die Post-Sitemap
+      als Fallback; erst wenn beides fehlt, die HTML-Pagination
+    """
+
+    def __init__(self, base_url=BASE_URL, cache=None, per_host_limit=MAX_WORKERS, prefetch=True,
+                 discovery='rest', rest_per_page=REST_PER_PAGE, **pool_options):
+        super().__init__(base_url, cache)
+        self.per_host_limit = per_host_limit
+        self.prefetch = prefetch
+        self.discovery = discovery
+        self.rest_per_page = rest_per_page
+        self.pool_options = pool_options
+
+    def _pool(self):
+        from async_http import AsyncHTTPPool
+        return AsyncHTTPPool(
+            per_host_limit=self.per_host_limit,
+            headers={'User-Agent': self.session.headers['User-Agent']},
+            cache=self.cache,
+            **self.pool_options
+        )
+
+    def crawl_all_posts(self):
+        """Crawlt alle Blog-Post URLs mit Pagination."""
+        return asyncio.run(self.crawl_all_posts_async())
+
+    def download_posts(self, urls):
+        """Downloaded mehrere Posts parallel. Gibt {url: html oder None} zurück."""
+        return asyncio.run(self.download_posts_async(urls))
+
+    async def crawl_all_posts_async(self):
+        """Post-Liste per REST API/Sitemap (discovery='rest'), sonst über die HTML-Übersichten."""
+        if self.discovery == 'rest':
+            posts, source = await self.discover_posts_async()
+            if posts:
+                print(f"   Gesamt: {len(posts)} Posts ({source})")
+                return posts
+            print("   REST API und Sitemap nicht verfügbar – nutze HTML-Übersichten")
+        return await self.crawl_listing_pages_async()
+
+    async def discover_posts_async(self):
+        """REST API und Post-Sitemap parallel; REST gewinnt. Gibt (posts oder None, Quelle) zurück."""
+        print("📡 Lade Post-Liste über die WordPress REST API...")
+        async with self._pool() as pool:
+            rest_task = asyncio.create_task(self._discover_rest(pool))
+            sitemap_task = asyncio.create_task(self._discover_sitemap(pool))
+
+            posts = await rest_task
+            if posts is not None:
+                sitemap_task.cancel()
+                await asyncio.gather(sitemap_task, return_exceptions=True)
+                return posts, 'REST API'
+            return await sitemap_task, 'Sitemap'
+
+    def _rest_posts_url(self, page):
+        return f"{self.base_url}{REST_POSTS_PATH}?per_page={self.rest_per_page}&page={page}&_fields={REST_FIELDS}"
+
+    @staticmethod
+    async def _fetch_json(pool, url):
+        """GET → (FetchResult, JSON) oder (None, None) bei Fehler"""
+        try:
+            result = await pool.fetch(url)
+            if result.ok:
+                return result, json.loads(result.body)
+        except Exception:
+            pass
+        return None, None
+
+    async def _discover_rest(self, pool):
+        """Alle Posts über /wp/v2/posts (Seiten ab 2 parallel), None wenn die API fehlt."""
+        categories_url = f"{self.base_url}{REST_CATEGORIES_PATH}?per_page={REST_PER_PAGE}&_fields=id,name"
+        (first, items), (_, categories) = await asyncio.gather(
+            self._fetch_json(pool, self._rest_posts_url(1)), self._fetch_json(pool, categories_url)
+        )
+        if not isinstance(items, list):
+            return None
+
+        pages = [items]
+        total_pages = first.headers.get('X-WP-TotalPages')
+        if total_pages and total_pages.isdigit():
+            rest = await asyncio.gather(*(
+                self._fetch_json(pool, self._rest_posts_url(page)) for page in range(2, int(total_pages) + 1)
+            ))
+            for _, page_items in rest:
+                if not isinstance(page_items, list):
+                    return None
+                pages.append(page_items)
+        else:
+            # Ohne Header (z.B. Proxy): Seite für Seite, bis eine nicht mehr voll ist
+            page = 1
+            while len(pages[-1]) >= self.rest_per_page:
+                page += 1
+                _, page_items = await self._fetch_json(pool, self._rest_posts_url(page))
+                if not page_items:
+                    break
+                pages.append(page_items)
+
+        category_names = {
+            category['id']: unescape(category['name'])
+            for category in (categories if isinstance(categories, list) else [])
+        }
+        return [self._post_from_rest(item, category_names) for page_items in pages for item in page_items]
+
+    @staticmethod
+    def _post_from_rest(item, category_names):
+        """REST-Objekt → Post-Dict wie aus den HTML-Übersichten (plus Metadaten)"""
+        title = item.get('title', {})
+        title = title.get('rendered', '') if isinstance(title, dict) else str(title)
+        category = next(
+            (category_names[cid] for cid in item.get('categories', []) if cid in category_names), "Uncategorized"
+        )
+        return {
+            'title': unescape(re.sub(r'<[^>]+>', '', title)).strip(),
+            'url': item['link'],
+            'slug': item['slug'],
+            'category': CATEGORY_MAPPING.get(category, category),
+            'id': item.get('id'),
+            'date': item.get('date_gmt'),
+            'modified': item.get('modified_gmt')
+        }
+
+    async def _discover_sitemap(self, pool):
+        """Posts aus der Yoast Post-Sitemap (nur URL/Slug, Titel aus dem Slug), None wenn sie fehlt."""
+        try:
+            result = await pool.fetch(f"{self.base_url}{POST_SITEMAP_PATH}")
+        except Exception:
+            return None
+        if not result.ok:
+            return None
+
+        posts = []
+        for url in re.findall(r'<loc>\s*([^<\s]+)\s*</loc>', result.text):
+            slug = urlparse(url).path.strip('/').split('/')[-1]
+            if slug and not re.search(r'\.(jpe?g|png|gif|webp)$', slug, re.IGNORECASE):
+                posts.append({
+                    'title': slug.replace('-', ' ').capitalize(),
+                    'url': unescape(url),
+                    'slug': slug,
+                    'category': CATEGORY_MAPPING['Uncategorized']
+                })
+        return posts or None
+
+    async def crawl_listing_pages_async(self):
+        """Lädt Übersichtsseiten parallel, wertet sie aber in Seitenreihenfolge aus."""
+        print("📡 Crawle alte Website (async)...")
+        all_posts = []
+        tasks = {}
+
+        async with self._pool() as pool:
+            def schedule(page):
+                if page not in tasks:
+                    tasks[page] = asyncio.create_task(self._fetch_listing(pool, page))
+
+            page = 1
+
+            try:
+                while True:
+                    schedule(page)
+                    if self.prefetch:
+                        schedule(page + 1)
+
+                    print(f"   Seite {page}...", end=" ")
+                    status, posts, last_page = await tasks[page]
+
+                    if status == 404:
+                        print("(keine weiteren Seiten)")
+                        break
+                    if status is None or status >= 400:
+                        print(f"✗ Fehler: HTTP {status}")
+                        break
+                    if not posts:
+                        print("(keine Posts gefunden)")
+                        break
+
+                    all_posts.extend(posts)
+                    print(f"✓ {len(posts)} Posts gefunden")
+
+                    if self.prefetch and last_page:
+                        for next_page in range(page + 1, last_page + 1):
+                            schedule(next_page)
+
+                    page += 1
+            finally:
+                # Nicht mehr benötigte Prefetches abbrechen
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        print(f"   Gesamt: {len(all_posts)} Posts")
+        return all_posts
+
+    async def _fetch_listing(self, pool, page):
+        """Lädt eine Übersichtsseite → (status, posts, letzte Seite laut Pagination)."""
+        try:
+            result = await pool.fetch(self._listing_url(page))
+        except Exception:
+            return None, [], None
+
+        if not result.ok:
+            return result.status, [], None
+
+        soup = BeautifulSoup(result.body, 'html.parser')
+        return result.status, self._extract_posts_from_page(soup), self._find_last_page(soup)
+
+    @staticmethod
+    def _find_last_page(soup):
+        """Höchste Seitenzahl aus den Pagination-Links (/page/N), None wenn keine."""
+        pages = [
+            int(match.group(1))
+            for link in soup.find_all('a', href=True)
+            for match in [re.search(r'/page/(\d+)/?$', link['href'])]
+            if match
+        ]
+        return max(pages) if pages else None
+
+    async def download_posts_async(self, urls):
+        """Downloaded alle Posts über den gemeinsamen Pool."""
+        async with self._pool() as pool:
+            async def download(url):
+                try:
+                    result = await pool.fetch(url)
+                    if result.ok:
+                        return result.text
+                    print(f"   ✗ Download Fehler für {url}: HTTP {result.status}")
+                except Exception as e:
+                    print(f"   ✗ Download Fehler für {url}: {e}")
+                return None
+
+            pages = await asyncio.gather(*(download(url) for url in urls))
+
+        return dict(zip(urls, pages))
+
 
 class PostDeduplicator:
     """Findet und entfernt Duplikate basierend auf Titel und Content."""
@@ -197,52 +497,82 @@ class PostDeduplicator:
         print(f"   ✓ {len(new_posts) - len(deduplicated_new)} interne Duplikate entfernt")
 
         # Schritt 2: Prüfe gegen vorhandene Posts
+        # Slug exakt per Dict, Titel per Trigramm-Index statt SequenceMatcher über alle Paare
+        first_by_slug = {}
+        title_index = TitleTrigramIndex()
+        for position, old_post in enumerate(old_posts):
+            first_by_slug.setdefault(old_post.get('slug', ''), position)
+            title_index.add(old_post.get('title', ''))
+
         unique_posts = []
         duplicates = []
 
         for new_post in deduplicated_new:
-            is_duplicate = False
-
-            # Prüfe gegen vorhandene Posts
-            for old_post in old_posts:
-                # Slug-Match (exakt)
-                if new_post['slug'] == old_post.get('slug', ''):
-                    is_duplicate = True
-                    duplicates.append((new_post, old_post, 'slug'))
-                    break
-
-                # Titel-Match (fuzzy)
-                if self.similarity(new_post['title'], old_post.get('title', '')) > SIMILARITY_THRESHOLD:
-                    is_duplicate = True
-                    duplicates.append((new_post, old_post, 'title'))
-                    break
-
-            if not is_duplicate:
+            # Wie bisher gewinnt der erste vorhandene Post; bei gleicher Position der Slug
+            slug_position = first_by_slug.get(new_post['slug'])
+            title_position = next(
+                title_index.matches(new_post['title'], SIMILARITY_THRESHOLD, limit=slug_position), None
+            )
+
+            if title_position is not None:
+                duplicates.append((new_post, old_posts[title_position], 'title'))
+            elif slug_position is not None:
+                duplicates.append((new_post, old_posts[slug_position], 'slug'))
+            else:
                 unique_posts.append(new_post)
 
         print(f"   ✓ {len(unique_posts)} wirklich neue Posts, {len(duplicates)} bereits vorhanden")
         return unique_posts, duplicates
 
+    def find_content_duplicates(self, old_posts, new_posts):
+        """Findet umbenannte Reposts über SimHash des bereinigten Texts (Feld 'text').
+
+        Bringt ein Post 'words' und 'simhash' schon mit (vorhandene Posts aus dem
+        Post-Index), wird sein Text nicht gebraucht.
+        Posts mit weniger als MIN_SIMHASH_WORDS Wörtern werden nicht verglichen.
+        Neue Posts werden auch untereinander geprüft.
+        """
+        index = SimHashIndex(max_distance=SIMHASH_MAX_DISTANCE)
+        indexed_posts = []
+
+        def long_enough(post):
+            words = post['words'] if 'words' in post else len(post.get('text', '').split())
+            return words >= MIN_SIMHASH_WORDS
+
+        def fingerprint_of(post):
+            return post['simhash'] if 'simhash' in post else simhash(post['text'])
+
+        for old_post in old_posts:
+            if long_enough(old_post):
+                index.add(fingerprint_of(old_post))
+                indexed_posts.append(old_post)
+
+        unique_posts = []
+        duplicates = []
+
+        for new_post in new_posts:
+            if long_enough(new_post):
+                fingerprint = fingerprint_of(new_post)
+                matches = index.matches(fingerprint)
+                if matches:
+                    duplicates.append((new_post, indexed_posts[matches[0]], 'content'))
+                    continue
+                index.add(fingerprint)
+                indexed_posts.append(new_post)
+            unique_posts.append(new_post)
+
+        if duplicates:
+            print(f"   ✓ {len(duplicates)} inhaltliche Duplikate (umbenannte Reposts) entfernt")
+        return unique_posts, duplicates
+
 
 class ContentCleaner:
     """Bereinigt WordPress/Elementor HTML zu sauberem semantischem HTML."""
 
     @staticmethod
     def extract_title(html):
-        """Extrahiert Titel aus HTML."""
-        match = re.search(r'<meta\s+property="og:title"\s+content="([^"]+)"', html)
-        if match:
-            title = match.group(1)
-            title = re.sub(r'\s*[-–]\s*KATHRIN STAHL.*$', '', title)
-            return unescape(title.strip())
-
-        match = re.search(r'<title>([^<]+)</title>', html)
-        if match:
-            title = match.group(1)
-            title = re.sub(r'\s*[-–]\s*KATHRIN STAHL.*$', '', title)
-            return unescape(title.strip())
-
-        return "Untitled"
+        """Extrahiert Titel aus HTML (gleiche Regeln wie der Post-Index)."""
+        return extract_title(html)
 
     @staticmethod
     def extract_description(html):
@@ -270,279 +600,65 @@ class ContentCleaner:
 
     @staticmethod
     def clean_content(html):
-        """Bereinigt WordPress-HTML zu sauberem Content."""
-        soup = BeautifulSoup(html, 'html.parser')
+        """Bereinigt WordPress-HTML zu sauberem Content (ein Durchgang, siehe html_cleaner.py)."""
+        return html_cleaner.clean_content(html)
 
-        # Finde Hauptinhalt (WordPress-spezifisch)
-        content_selectors = [
-            '.entry-content',
-            '.post-content',
-            'article .elementor-widget-container',
-            '.blog-post-content'
-        ]
+    @staticmethod
+    def html_to_text(html):
+        """Reiner Text aus (bereinigtem) HTML, z.B. für den SimHash-Vergleich."""
+        text = re.sub(r'<[^>]+>', ' ', html)
+        return re.sub(r'\s+', ' ', unescape(text)).strip()
 
-        content_div = None
-        for selector in content_selectors:
-            content_div = soup.select_one(selector)
-            if content_div:
+    @staticmethod
+    def extract_article_text(html):
+        """Artikeltext einer bereits migrierten Seite (ohne Zurück-Link und Autorin-Box)."""
+        soup = BeautifulSoup(html, 'html.parser')
+        article = None
+        for selector in ['.article-content', 'article', '.entry-content', 'main']:
+            article = soup.select_one(selector)
+            if article:
                 break
-
-        if not content_div:
-            # Fallback: Suche <article>
-            content_div = soup.find('article')
-
-        if not content_div:
+        if not article:
             return ""
 
-        # Entferne unerwünschte Elemente
-        for tag in content_div.find_all(['script', 'style', 'noscript', 'iframe']):
+        for tag in article.select('script, style, .back-link, .author-bio'):
             tag.decompose()
-
-        # Entferne WordPress-Wrapper Klassen
-        for tag in content_div.find_all(True):
-            if tag.has_attr('class'):
-                # Behalte nur semantische Tags
-                if tag.name not in ['p', 'h1', 'h2', 'h3', 'h4', 'ul', 'ol', 'li', 'blockquote', 'strong', 'em', 'a', 'img']:
-                    tag.unwrap()
-                else:
-                    # Entferne Klassen aber behalte Tag
-                    del tag['class']
-
-            # Entferne Inline-Styles
-            if tag.has_attr('style'):
-                del tag['style']
-
-            # Entferne data-Attribute
-            attrs_to_remove = [attr for attr in tag.attrs if attr.startswith('data-')]
-            for attr in attrs_to_remove:
-                del tag[attr]
-
-        # Konvertiere <b> zu <strong>, <i> zu <em>
-        for b in content_div.find_all('b'):
-            b.name = 'strong'
-        for i in content_div.find_all('i'):
-            i.name = 'em'
-
-        # Konvertiere h1 zu h2 (h1 ist für Titel reserviert)
-        for h1 in content_div.find_all('h1'):
-            h1.name = 'h2'
-
-        # Entferne leere Tags
-        for tag in content_div.find_all():
-            if not tag.get_text(strip=True) and not tag.find('img'):
-                tag.decompose()
-
-        # Extrahiere sauberen HTML-String
-        content_html = str(content_div)
-
-        # Weitere Bereinigungen mit Regex
-        content_html = re.sub(r'&nbsp;', ' ', content_html)
-        content_html = re.sub(r'\xa0', ' ', content_html)
-        content_html = re.sub(r'<p>\s*</p>', '', content_html)
-        content_html = re.sub(r'<p>\s*<br\s*/?>\s*</p>', '', content_html)
-        content_html = re.sub(r'\n{3,}', '\n\n', content_html)
-
-        # Entferne äußere content-div Tags
-        content_html = re.sub(r'^<div[^>]*>', '', content_html)
-        content_html = re.sub(r'</div>$', '', content_html)
-
-        return content_html.strip()
+        return re.sub(r'\s+', ' ', article.get_text(' ')).strip()
 
 
 class TemplateGenerator:
-    """Generiert HTML aus Templates mit Blog-Enhancements."""
+    """Generiert HTML aus Templates mit Blog-Enhancements.
+
+    Layout und Partials (Header aus components/header.html, Footer, Autorin-Bio, CTA)
+    werden einmal kompiliert und für alle Posts wiederverwendet.
+    """
 
-    def __init__(self, templates_dir):
+    def __init__(self, templates_dir, header_file=post_templates.HEADER_FILE):
         self.templates_dir = Path(templates_dir)
+        self.template = post_templates.compile_post_template(header_file)
+
+    @property
+    def version(self):
+        """Kurzer Hash über Layout und Partials – ändert sich mit jedem Template-Update"""
+        return self.template.version
 
     def generate_post_html(self, post_data):
         """Generiert vollständiges HTML für einen Blog-Post."""
-        title = post_data['title']
-        description = post_data.get('description', '')
-        content = post_data['content']
         category = post_data['category']
-        image = post_data.get('image') or DEFAULT_IMAGES.get(category, DEFAULT_IMAGES['Allgemein'])
-        slug = post_data['slug']
-        read_time = self._estimate_read_time(content)
-
-        template = f'''<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} | Kathrin Stahl</title>
-    <meta name="description" content="{description}">
-    <link rel="canonical" href="https://nickheymann.github.io/kathrin-coaching/{slug}.html">
-    <meta property="og:title" content="{title} | Kathrin Stahl">
-    <meta property="og:description" content="{description}">
-    <meta property="og:type" content="article">
-    <meta property="og:image" content="https://nickheymann.github.io/kathrin-coaching/{image}">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Cormorant+Garamond:ital,wght@0,400;0,500;0,600;1,400&family=Montserrat:wght@400;500;600&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="css/blog-enhancements.css">
-    <style>
-        *,*::before,*::after{{box-sizing:border-box;margin:0;padding:0}}
-        :root{{--color-primary:#2C4A47;--color-primary-light:#3D6B66;--color-accent:#C4A962;--color-cream:#FAF8F5;--color-white:#FFFFFF;--color-text:#2D2D2D;--color-text-light:#5A5A5A;--font-heading:'Cormorant Garamond',Georgia,serif;--font-body:'Montserrat',-apple-system,sans-serif}}
-        html{{scroll-behavior:smooth}}
-        body{{font-family:var(--font-body);font-size:16px;line-height:1.8;color:var(--color-text);background:var(--color-white)}}
-        img{{max-width:100%;height:auto;display:block}}
-        a{{color:var(--color-primary);text-decoration:none}}
-        a:hover{{text-decoration:underline}}
-        h1,h2,h3{{font-family:var(--font-heading);font-weight:500;color:var(--color-primary);line-height:1.3}}
-        h1{{font-size:clamp(2rem,4vw,3rem);margin-bottom:1.5rem}}
-        h2{{font-size:clamp(1.5rem,3vw,2rem);margin:2.5rem 0 1rem}}
-        h3{{font-size:clamp(1.25rem,2.5vw,1.5rem);margin:2rem 0 .75rem}}
-        p{{margin-bottom:1.5rem}}
-        .container{{max-width:800px;margin:0 auto;padding:0 24px}}
-        .container-wide{{max-width:1200px;margin:0 auto;padding:0 24px}}
-        header{{position:fixed;top:0;left:0;right:0;z-index:1000;background:rgba(255,255,255,.95);backdrop-filter:blur(10px);border-bottom:1px solid rgba(0,0,0,.05)}}
-        .header-inner{{display:flex;justify-content:space-between;align-items:center;height:80px;max-width:1200px;margin:0 auto;padding:0 24px}}
-        .logo{{font-family:var(--font-heading);font-size:1.5rem;font-weight:500;color:var(--color-primary);text-decoration:none}}
-        nav{{display:flex;align-items:center;gap:35px}}
-        nav a{{font-size:.9rem;font-weight:500;color:var(--color-text);text-decoration:none}}
-        nav a:hover{{color:var(--color-primary)}}
-        .nav-cta{{background:var(--color-accent);color:white!important;padding:12px 24px;border-radius:4px}}
-        .menu-toggle{{display:none;flex-direction:column;gap:5px;background:none;border:none;cursor:pointer}}
-        .menu-toggle span{{width:24px;height:2px;background:var(--color-primary)}}
-        .article-hero{{padding:140px 0 60px;background:linear-gradient(135deg,var(--color-primary) 0%,var(--color-primary-light) 100%);text-align:center;color:white}}
-        .article-hero h1{{color:white;max-width:800px;margin:0 auto 1rem}}
-        .article-meta{{display:flex;justify-content:center;gap:20px;font-size:.9rem;opacity:.9;flex-wrap:wrap}}
-        .article-category{{background:var(--color-accent);padding:5px 15px;border-radius:20px;font-size:.8rem;text-transform:uppercase;font-weight:600;margin-bottom:1rem;display:inline-block}}
-        .featured-image{{margin:-40px auto 0;max-width:900px;padding:0 24px}}
-        .featured-image img{{border-radius:16px;box-shadow:0 20px 60px rgba(0,0,0,.15);width:100%}}
-        .article-content{{padding:60px 0 80px}}
-        .article-content p{{font-size:1.1rem}}
-        .article-content blockquote{{border-left:4px solid var(--color-accent);padding-left:24px;margin:2rem 0;font-style:italic;color:var(--color-text-light);font-size:1.2rem}}
-        .article-content ul,.article-content ol{{margin:1.5rem 0;padding-left:1.5rem}}
-        .article-content li{{margin-bottom:.75rem;font-size:1.1rem}}
-        .article-content strong{{color:var(--color-primary)}}
-        .article-content em{{color:var(--color-text-light)}}
-        .back-link{{padding:20px 0}}
-        .back-link a{{display:inline-flex;align-items:center;gap:8px;color:var(--color-text-light);font-size:.9rem}}
-        .back-link a:hover{{color:var(--color-primary)}}
-        .cta-section{{background:var(--color-cream);padding:80px 0;text-align:center}}
-        .cta-section h2{{margin-bottom:1rem}}
-        .cta-section p{{max-width:600px;margin:0 auto 2rem;color:var(--color-text-light)}}
-        .cta-btn{{display:inline-block;background:var(--color-primary);color:white;padding:16px 32px;border-radius:4px;font-weight:600;text-decoration:none}}
-        .cta-btn:hover{{background:var(--color-primary-light);text-decoration:none}}
-        footer{{background:var(--color-primary);color:white;padding:60px 0 30px}}
-        .footer-content{{display:grid;grid-template-columns:2fr 1fr 1fr;gap:60px;margin-bottom:40px}}
-        .footer-brand h3{{font-size:1.5rem;color:white;margin-bottom:1rem}}
-        .footer-brand p{{opacity:.8}}
-        .footer-links h4{{color:var(--color-accent);margin-bottom:1rem;font-family:var(--font-body);font-weight:600}}
-        .footer-links ul{{list-style:none}}
-        .footer-links li{{margin-bottom:.5rem}}
-        .footer-links a{{color:white;opacity:.8}}
-        .footer-bottom{{border-top:1px solid rgba(255,255,255,.1);padding-top:30px;text-align:center;font-size:.85rem;opacity:.7}}
-        .footer-bottom a{{color:white}}
-        @media(max-width:992px){{nav{{display:none}}nav.mobile-open{{display:flex;position:absolute;top:80px;left:0;right:0;flex-direction:column;background:white;padding:20px;box-shadow:0 10px 30px rgba(0,0,0,.1)}}nav.mobile-open a{{padding:15px 0;border-bottom:1px solid rgba(0,0,0,.05)}}.menu-toggle{{display:flex}}}}
-        @media(max-width:768px){{.footer-content{{grid-template-columns:1fr;gap:40px}}}}
-    </style>
-</head>
-<body>
-    <header>
-        <div class="header-inner">
-            <a href="index.html" class="logo">Kathrin Stahl</a>
-            <nav id="mainNav">
-                <a href="index.html">Start</a>
-                <a href="index.html#angebote">Angebote</a>
-                <a href="kathrin.html">Über mich</a>
-                <a href="blog.html">Blog</a>
-                <a href="media.html">Videos</a>
-                <a href="https://cal.com/kathrinstahl" target="_blank" class="nav-cta">Erstgespräch</a>
-            </nav>
-            <button class="menu-toggle" onclick="document.getElementById('mainNav').classList.toggle('mobile-open')">
-                <span></span><span></span><span></span>
-            </button>
-        </div>
-    </header>
-
-    <section class="article-hero">
-        <div class="container">
-            <span class="article-category">{category}</span>
-            <h1>{title}</h1>
-            <div class="article-meta">
-                <span>{read_time} Min. Lesezeit</span>
-            </div>
-        </div>
-    </section>
-
-    <div class="featured-image">
-        <img src="{image}" alt="{title}" loading="lazy">
-    </div>
-
-    <article class="article-content">
-        <div class="container">
-            <div class="back-link">
-                <a href="blog.html">← Zurück zum Blog</a>
-            </div>
-
-            {content}
-
-            {self._generate_author_bio()}
-        </div>
-    </article>
-
-    <section class="cta-section">
-        <div class="container">
-            <h2>Bereit für den nächsten Schritt?</h2>
-            <p>Lass uns in einem kostenlosen Erstgespräch herausfinden, wie ich dich auf deinem Weg begleiten kann.</p>
-            <a href="https://cal.com/kathrinstahl" target="_blank" class="cta-btn">Kostenloses Erstgespräch buchen</a>
-        </div>
-    </section>
-
-    <footer>
-        <div class="container-wide">
-            <div class="footer-content">
-                <div class="footer-brand">
-                    <h3>Kathrin Stahl</h3>
-                    <p>Glück über Zweifel – Begleitung auf deinem Weg zu mehr Selbstliebe, Klarheit und einem Leben, das sich richtig anfühlt.</p>
-                </div>
-                <div class="footer-links">
-                    <h4>Navigation</h4>
-                    <ul>
-                        <li><a href="index.html">Startseite</a></li>
-                        <li><a href="blog.html">Blog</a></li>
-                        <li><a href="kathrin.html">Über mich</a></li>
-                        <li><a href="media.html">Videos</a></li>
-                    </ul>
-                </div>
-                <div class="footer-links">
-                    <h4>Kontakt</h4>
-                    <ul>
-                        <li>Portugal & Online</li>
-                        <li><a href="https://cal.com/kathrinstahl">Termin buchen</a></li>
-                    </ul>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>© 2025 Kathrin Stahl | <a href="impressum.html">Impressum</a> | <a href="datenschutzerklaerung.html">Datenschutz</a></p>
-            </div>
-        </div>
-    </footer>
-
-    <script src="js/blog-enhancements.js"></script>
-</body>
-</html>'''
-
-        return template
-
-    def _generate_author_bio(self):
-        """Generiert Autorin-Bio HTML."""
-        return '''
-            <div class="author-bio">
-                <img src="wp-content/uploads/2021/04/Me-ich-Kathrin-Hogaza-1060x1042.jpg" alt="Kathrin Stahl">
-                <div class="author-bio-content">
-                    <h4>Kathrin Stahl</h4>
-                    <p>Ich begleite Menschen auf ihrem Weg zu mehr Selbstliebe, innerer Klarheit und einem Leben, das sich richtig anfühlt. Mit Herz, Erfahrung und der besonderen Kraft der Pferde.</p>
-                    <div class="author-bio-links">
-                        <a href="kathrin.html">Mehr über mich</a>
-                        <a href="https://cal.com/kathrinstahl" target="_blank">Erstgespräch buchen</a>
-                    </div>
-                </div>
-            </div>
-        '''
+        content = post_data['content']
+        return self.template.render({
+            'TITLE': post_data['title'],
+            'DESCRIPTION': post_data.get('description', ''),
+            'CONTENT': content,
+            'CATEGORY': category,
+            'IMAGE': post_data.get('image') or DEFAULT_IMAGES.get(category, DEFAULT_IMAGES['Allgemein']),
+            'SLUG': post_data['slug'],
+            'READ_TIME': self._estimate_read_time(content)
+        })
+
+    def render_many(self, posts):
+        """Generiert HTML für viele Posts mit demselben kompilierten Template."""
+        return [self.generate_post_html(post_data) for post_data in posts]
 
     @staticmethod
     def _estimate_read_time(content):
@@ -555,19 +671,29 @@ class TemplateGenerator:
 class MigrationOrchestrator:
     """Orchestriert den gesamten Migrations-Prozess."""
 
-    def __init__(self, dry_run=False, force_all=False):
+    def __init__(self, dry_run=False, force_all=False, crawler='async', http_cache=True, resume=False,
+                 discovery='rest'):
         self.dry_run = dry_run
         self.force_all = force_all
-        self.crawler = BlogCrawler()
+        self.resume = resume
+        self.http_cache = HTTPCache(HTTP_CACHE_DIR, read_only=dry_run) if http_cache else None
+        if crawler == 'async':
+            self.crawler = AsyncBlogCrawler(cache=self.http_cache, discovery=discovery)
+        else:
+            self.crawler = BlogCrawler(cache=self.http_cache)
         self.deduplicator = PostDeduplicator()
         self.cleaner = ContentCleaner()
         self.template_gen = TemplateGenerator(TEMPLATES_DIR)
+        self.post_index = PostIndex(OUTPUT_DIR, POST_INDEX_FILE)
         self.cache = self._load_cache()
+        self.journal = MigrationJournal(JOURNAL_FILE)
         self.stats = {
             'crawled': 0,
             'new': 0,
             'duplicates': 0,
             'migrated': 0,
+            'refreshed': 0,
+            'unchanged': 0,
             'failed': 0
         }
 
@@ -580,32 +706,82 @@ class MigrationOrchestrator:
         return {'posts': [], 'last_run': None}
 
     def _save_cache(self):
-        """Speichert Cache."""
+        """Speichert Cache (atomar über eine temporäre Datei)."""
         self.cache['last_run'] = datetime.now().isoformat()
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(self.cache, f, indent=2, ensure_ascii=False)
+        write_atomic(CACHE_FILE, json.dumps(self.cache, indent=2, ensure_ascii=False))
 
-    def _get_existing_posts(self):
-        """Liste aller bereits vorhandenen Blog-Posts im Projekt."""
-        existing = []
-        for html_file in OUTPUT_DIR.glob('*.html'):
-            # Skip non-blog pages
-            if html_file.stem in ['index', 'blog', 'kathrin', 'media', 'contact', 'impressum', 'datenschutzerklaerung']:
-                continue
+    def _compact_journal(self):
+        """Übernimmt alle Journal-Einträge in den Cache (ein Eintrag je Slug) und leert das Journal.
 
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    title = self.cleaner.extract_title(content)
-                    existing.append({
-                        'slug': html_file.stem,
-                        'title': title,
-                        'file': str(html_file)
-                    })
-            except:
-                pass
-
-        return existing
+        Gibt die Slugs der übernommenen Einträge zurück. Im Dry Run wird das
+        Journal nur gelesen; Cache und Journal bleiben unverändert.
+        """
+        entries = self.journal.load()
+        if not entries:
+            return set()
+        if self.dry_run:
+            return {entry['slug'] for entry in entries}
+
+        position_by_slug = {record['slug']: i for i, record in enumerate(self.cache['posts'])}
+        for entry in entries:
+            if entry['slug'] in position_by_slug:
+                self.cache['posts'][position_by_slug[entry['slug']]] = entry
+            else:
+                position_by_slug[entry['slug']] = len(self.cache['posts'])
+                self.cache['posts'].append(entry)
+
+        # Erst Cache sichern, dann Journal leeren – ein Absturz dazwischen schadet nicht
+        self._save_cache()
+        self.journal.reset()
+        return {entry['slug'] for entry in entries}
+
+    def _save_http_cache(self):
+        """Speichert den Index des HTTP-Caches."""
+        if self.http_cache:
+            self.http_cache.save()
+
+    def _save_post_index(self):
+        """Speichert den Post-Index (nicht im Dry Run)."""
+        if not self.dry_run:
+            self.post_index.save()
+
+    def _get_existing_posts(self):
+        """Liste aller bereits vorhandenen Blog-Posts im Projekt.
+
+        Kommt aus dem persistenten Post-Index: unveränderte Dateien werden nur per
+        stat() geprüft, neue/geänderte nur bis zum Titel im <head> gelesen.
+        """
+        self.post_index.refresh()
+        self._save_post_index()
+        return self.post_index.posts()
+
+    def _attach_existing_fingerprints(self, existing_posts):
+        """Wortzahl und SimHash vorhandener Posts (nur für die inhaltliche Deduplizierung).
+
+        Kommen aus dem Post-Index; geparst werden nur neue oder geänderte Dateien.
+        """
+        fingerprints = self.post_index.content_fingerprints(self.cleaner.extract_article_text)
+        self._save_post_index()
+        for post in existing_posts:
+            post.update(fingerprints.get(post['slug'], {'words': 0, 'simhash': 0}))
+
+    def _migrated_records(self):
+        """Letzter Cache-Eintrag je Slug für Posts, deren Datei noch existiert."""
+        records = {}
+        for record in self.cache['posts']:
+            if (OUTPUT_DIR / f"{record['slug']}.html").exists():
+                records[record['slug']] = record
+        return records
+
+    def _posts_to_refresh(self, crawled_posts, new_posts):
+        """Bereits migrierte Posts (laut Cache), die erneut geprüft werden."""
+        records = self._migrated_records()
+        new_slugs = {post['slug'] for post in new_posts}
+        refresh = {}
+        for post in crawled_posts:
+            if post['slug'] in records and post['slug'] not in new_slugs:
+                refresh.setdefault(post['slug'], (post, records[post['slug']]))
+        return list(refresh.values())
 
     def run(self):
         """Führt komplette Migration durch."""
@@ -613,9 +789,17 @@ class MigrationOrchestrator:
         print("🚀 BLOG MIGRATION GESTARTET")
         print("=" * 60)
 
+        # Journal eines abgebrochenen Laufs übernehmen
+        journaled_slugs = self._compact_journal()
+        if journaled_slugs:
+            action = "gefunden" if self.dry_run else "übernommen"
+            print(f"\n📓 {len(journaled_slugs)} Posts aus abgebrochenem Lauf {action}")
+        skip_slugs = journaled_slugs if self.resume else set()
+
         # Phase 1: Crawling
         crawled_posts = self.crawler.crawl_all_posts()
         self.stats['crawled'] = len(crawled_posts)
+        self._save_http_cache()
 
         # Phase 2: Deduplizierung
         existing_posts = self._get_existing_posts()
@@ -623,7 +807,16 @@ class MigrationOrchestrator:
         self.stats['new'] = len(new_posts)
         self.stats['duplicates'] = len(duplicates)
 
-        if not new_posts and not self.force_all:
+        # Mit --force-all: bereits migrierte Posts auf Änderungen prüfen
+        refresh_posts = self._posts_to_refresh(crawled_posts, new_posts) if self.force_all else []
+
+        # Mit --resume: im Journal erledigte Posts überspringen
+        if skip_slugs:
+            new_posts = [post for post in new_posts if post['slug'] not in skip_slugs]
+            refresh_posts = [(post, record) for post, record in refresh_posts if post['slug'] not in skip_slugs]
+            self.stats['new'] = len(new_posts)
+
+        if not new_posts and not refresh_posts:
             print("\n✓ Keine neuen Posts gefunden. Alle Posts bereits migriert.")
             return
 
@@ -634,13 +827,39 @@ class MigrationOrchestrator:
                 print(f"   - {post['title']}")
             if len(new_posts) > 10:
                 print(f"   ... und {len(new_posts) - 10} weitere")
+            if refresh_posts:
+                print(f"\n   Würde {len(refresh_posts)} migrierte Posts auf Änderungen prüfen")
             return
 
-        # Phase 3: Migration (Parallel)
+        # Phase 3: Download (ein Pool für alle Posts, Conditional GET über den HTTP-Cache)
+        urls = [post['url'] for post in new_posts] + [post['url'] for post, _ in refresh_posts]
+        print(f"\n📥 Lade {len(urls)} Posts...")
+        html_by_url = self.crawler.download_posts(urls)
+        self._save_http_cache()
+
+        # Phase 3b: Inhaltliche Duplikate (umbenannte Reposts) per SimHash
+        content_by_url = {}
+        for post in new_posts:
+            html = html_by_url.get(post['url'])
+            if html:
+                content_by_url[post['url']] = self.cleaner.clean_content(html)
+                post['text'] = self.cleaner.html_to_text(content_by_url[post['url']])
+
+        self._attach_existing_fingerprints(existing_posts)
+        new_posts, content_duplicates = self.deduplicator.find_content_duplicates(existing_posts, new_posts)
+        self.stats['new'] = len(new_posts)
+        self.stats['duplicates'] += len(content_duplicates)
+
+        # Phase 4: Migration (Parallel, jeder fertige Post landet sofort im Journal)
         print(f"\n⚡ Migriere {len(new_posts)} Posts (parallel mit {MAX_WORKERS} Workers)...")
 
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            futures = {executor.submit(self._migrate_post, post): post for post in new_posts}
+        with self.journal, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    self._migrate_post, post, html_by_url.get(post['url']), content_by_url.get(post['url'])
+                ): post
+                for post in new_posts
+            }
 
             for i, future in enumerate(as_completed(futures), 1):
                 post = futures[future]
@@ -656,59 +875,144 @@ class MigrationOrchestrator:
                     self.stats['failed'] += 1
                     print(f"   [{i}/{len(new_posts)}] ✗ {post['title'][:50]} - {e}")
 
-        # Phase 4: Cache speichern
+            # Phase 4b: Aktualisierung bereits migrierter Posts (nur bei Änderungen)
+            if refresh_posts:
+                self._refresh_posts(refresh_posts, html_by_url)
+
+        # Phase 5: Journal in den Cache kompaktieren
+        self._compact_journal()
         self._save_cache()
 
-        # Phase 5: Report
+        # Phase 6: Report
         self._print_report()
 
-    def _migrate_post(self, post):
-        """Migriert einen einzelnen Post."""
+    def _build_post_data(self, post, html, content=None):
+        """Metadaten + bereinigter Content eines Posts (None wenn zu wenig Content)."""
+        if content is None:
+            content = self.cleaner.clean_content(html)
+        if not content or len(content) < 200:
+            return None
+
+        return {
+            'title': self.cleaner.extract_title(html),
+            'description': self.cleaner.extract_description(html),
+            'content': content,
+            'category': post['category'],
+            'image': self.cleaner.extract_featured_image(html),
+            'slug': post['slug']
+        }
+
+    @staticmethod
+    def _write_if_changed(output_file, new_html):
+        """Schreibt nur, wenn sich der Inhalt der Datei ändert. Gibt zurück, ob geschrieben wurde."""
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                if f.read() == new_html:
+                    return False
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(new_html)
+        return True
+
+    def _render_post(self, post_data, html, record):
+        """Rendert einen Post, schreibt ihn bei Änderung und aktualisiert die Hashes im Cache-Eintrag."""
+        new_html = self.template_gen.generate_post_html(post_data)
+        written = self._write_if_changed(OUTPUT_DIR / f"{post_data['slug']}.html", new_html)
+
+        record.update({
+            'title': post_data['title'],
+            'html_hash': content_hash(html),
+            'source_hash': content_hash(json.dumps(post_data, sort_keys=True, ensure_ascii=False)),
+            'template_version': self.template_gen.version,
+            'output_hash': content_hash(new_html)
+        })
+        return written
+
+    def _migrate_post(self, post, html=None, content=None):
+        """Migriert einen einzelnen Post (html/content bereits geladen oder wird geladen)."""
         try:
             # Download HTML
-            html = self.crawler.download_post_content(post['url'])
+            if html is None:
+                html = self.crawler.download_post_content(post['url'])
             if not html:
                 return False
 
-            # Extrahiere Metadaten
-            title = self.cleaner.extract_title(html)
-            description = self.cleaner.extract_description(html)
-            image = self.cleaner.extract_featured_image(html)
-            content = self.cleaner.clean_content(html)
-
-            if not content or len(content) < 200:
+            # Metadaten + Content, dann Generieren und Speichern
+            post_data = self._build_post_data(post, html, content)
+            if not post_data:
                 return False
 
-            # Generiere HTML
-            post_data = {
-                'title': title,
-                'description': description,
-                'content': content,
-                'category': post['category'],
-                'image': image,
-                'slug': post['slug']
-            }
-
-            new_html = self.template_gen.generate_post_html(post_data)
+            record = {'slug': post['slug'], 'url': post['url']}
+            self._render_post(post_data, html, record)
+            record['migrated_at'] = datetime.now().isoformat()
 
-            # Speichern
-            output_file = OUTPUT_DIR / f"{post['slug']}.html"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(new_html)
-
-            # Cache updaten
-            self.cache['posts'].append({
-                'slug': post['slug'],
-                'title': title,
-                'url': post['url'],
-                'migrated_at': datetime.now().isoformat()
-            })
+            # Journal statt gemeinsam genutzter Liste (nur der Writer-Thread schreibt)
+            self.journal.record(record)
 
             return True
 
         except Exception as e:
             return False
 
+    def _refresh_post(self, post, record, html):
+        """Aktualisiert einen bereits migrierten Post, falls sich Quelle oder Template geändert haben.
+
+        Rückgabe: 'updated', 'unchanged' oder False (Fehler).
+        """
+        if not html:
+            return False
+
+        template_version = self.template_gen.version
+        if record.get('html_hash') == content_hash(html) and record.get('template_version') == template_version:
+            return 'unchanged'
+
+        post_data = self._build_post_data(post, html)
+        if not post_data:
+            return False
+
+        source_hash = content_hash(json.dumps(post_data, sort_keys=True, ensure_ascii=False))
+        if record.get('source_hash') == source_hash and record.get('template_version') == template_version:
+            record = {**record, 'html_hash': content_hash(html)}
+            self.journal.record(record)
+            return 'unchanged'
+
+        record = dict(record)
+        written = self._render_post(post_data, html, record)
+        if written:
+            record['migrated_at'] = datetime.now().isoformat()
+        self.journal.record(record)
+        return 'updated' if written else 'unchanged'
+
+    def _refresh_posts(self, refresh_posts, html_by_url):
+        """Prüft bereits migrierte Posts und rendert nur geänderte neu (parallel)."""
+        print(f"\n🔄 Prüfe {len(refresh_posts)} migrierte Posts auf Änderungen...")
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self._refresh_post, post, record, html_by_url.get(post['url'])): post
+                for post, record in refresh_posts
+            }
+
+            for future in as_completed(futures):
+                post = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = False
+                    print(f"   ✗ {post['title'][:50]} - {e}")
+
+                if result == 'updated':
+                    self.stats['refreshed'] += 1
+                    print(f"   ✓ aktualisiert: {post['title'][:50]}")
+                elif result == 'unchanged':
+                    self.stats['unchanged'] += 1
+                else:
+                    self.stats['failed'] += 1
+
+        print(f"   ✓ {self.stats['refreshed']} aktualisiert, {self.stats['unchanged']} unverändert")
+
     def _print_report(self):
         """Gibt Migrations-Report aus."""
         print("\n" + "=" * 60)
@@ -718,7 +1022,14 @@ class MigrationOrchestrator:
         print(f"Neu:          {self.stats['new']} Posts")
         print(f"Duplikate:    {self.stats['duplicates']} Posts")
         print(f"Migriert:     {self.stats['migrated']} Posts")
+        if self.force_all:
+            print(f"Aktualisiert: {self.stats['refreshed']} Posts ({self.stats['unchanged']} unverändert)")
         print(f"Fehlgeschlagen: {self.stats['failed']} Posts")
+        if self.http_cache:
+            cache_stats = self.http_cache.stats
+            print(f"HTTP-Cache:   {cache_stats['hits']} unverändert (304), "
+                  f"{cache_stats['bytes_downloaded'] / 1024:.0f} KB geladen, "
+                  f"{cache_stats['bytes_from_cache'] / 1024:.0f} KB aus Cache")
         print("=" * 60)
 
 
@@ -729,10 +1040,26 @@ class MigrationOrchestrator:
 def main():
     parser = argparse.ArgumentParser(description='Blog Migration Tool')
     parser.add_argument('--dry-run', action='store_true', help='Nur analysieren, keine Änderungen')
-    parser.add_argument('--force-all', action='store_true', help='Alle Posts neu generieren')
+    parser.add_argument('--force-all', action='store_true',
+                        help='Bereits migrierte Posts neu generieren, wenn sich Quelle oder Template geändert haben')
+    parser.add_argument('--crawler', choices=['async', 'sync'], default='async',
+                        help='async: aiohttp Keep-Alive-Pool (default), sync: requests + Threads')
+    parser.add_argument('--discovery', choices=['rest', 'html'], default='rest',
+                        help='rest: WordPress REST API + Sitemap (default, nur async), html: Blog-Übersichtsseiten')
+    parser.add_argument('--no-http-cache', action='store_true',
+                        help='Keine Conditional GETs, alles neu laden')
+    parser.add_argument('--resume', action='store_true',
+                        help='Nach Abbruch fortsetzen: im Journal erledigte Posts überspringen')
     args = parser.parse_args()
 
-    orchestrator = MigrationOrchestrator(dry_run=args.dry_run, force_all=args.force_all)
+    orchestrator = MigrationOrchestrator(
+        dry_run=args.dry_run,
+        force_all=args.force_all,
+        crawler=args.crawler,
+        discovery=args.discovery,
+        http_cache=not args.no_http_cache,
+        resume=args.resume
+    )
     orchestrator.run()
 
 
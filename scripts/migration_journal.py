@@ -0,0 +1,103 @@
+"""
+Migration Journal
+Append-only JSONL-Journal für migrate-blog-complete.py
+
+Jeder fertig migrierte Post wird sofort als eine Zeile angehängt. Geschrieben
+wird ausschließlich von einem eigenen Writer-Thread; die Worker legen ihre
+Einträge nur in eine Queue. Nach einem Absturz oder Ctrl-C steht im Journal,
+was schon erledigt ist (--resume), am Ende wird es in den Cache kompaktiert.
+
+Layout:
+    data/blog-migration-journal.jsonl    ein JSON-Objekt pro Zeile
+"""
+
+import os
+import json
+import queue
+import threading
+from pathlib import Path
+
+_STOP = object()
+
+
+class MigrationJournal:
+    """Append-only Journal mit einem einzigen Writer-Thread"""
+
+    def __init__(self, path, fsync=False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self.error = None
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def load(self):
+        """Alle vollständigen Einträge (eine abgebrochene letzte Zeile wird ignoriert)"""
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def open(self):
+        """Startet den Writer-Thread"""
+        if self._thread is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._write_loop, name='migration-journal', daemon=True)
+            self._thread.start()
+        return self
+
+    def record(self, entry):
+        """Hängt einen Eintrag an (thread-safe, blockiert nicht)"""
+        if self._thread is None:
+            raise RuntimeError("Journal ist nicht geöffnet")
+        self._queue.put(entry)
+
+    def _write_loop(self):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            while True:
+                entries = [self._queue.get()]
+                # Alles, was inzwischen wartet, in einem Rutsch schreiben
+                while True:
+                    try:
+                        entries.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(entry is _STOP for entry in entries)
+                lines = [json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries if entry is not _STOP]
+                try:
+                    f.writelines(lines)
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                except OSError as e:
+                    self.error = e
+                    return
+                if stop:
+                    return
+
+    def close(self):
+        """Schreibt alle ausstehenden Einträge und beendet den Writer-Thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        if self.error:
+            raise self.error
+
+    def reset(self):
+        """Leert das Journal (nach dem Kompaktieren)"""
+        if self.path.exists():
+            self.path.unlink()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
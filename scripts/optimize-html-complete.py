@@ -362,9 +362,140 @@ class SemanticHTMLOptimizer:
                 del tag['style']
 
 
+class LCPImageSelector:
+    """Bestimmt das wahrscheinliche LCP-Bild einer Seite per Layout-Heuristik
+
+    Statt der Dokument-Reihenfolge zählt, wo ein Bild steht (Hero, Featured
+    Image vs. Header/Navigation/Dropdown), wie groß es deklariert ist und wie
+    tief es im DOM verschachtelt ist.
+    """
+
+    # Container die typischerweise das größte sichtbare Bild enthalten
+    HERO_CONTAINERS = {
+        'article-hero': 60,
+        'featured-image': 60,
+        'hero': 50,
+        'page-hero': 50,
+        'hero-image': 50,
+        'elementor-widget-image': 15,
+    }
+
+    # Container die nie das LCP-Element enthalten (Header, Menüs, Footer)
+    EXCLUDED_CONTAINERS = ['header', 'nav', 'footer', 'aside']
+    EXCLUDED_CLASSES = [
+        'dropdown', 'menu', 'logo', 'icon', 'avatar', 'author-bio',
+        'footer', 'sidebar', 'modal', 'popup'
+    ]
+
+    # Bilder kleiner als das sind Icons/Thumbnails
+    MIN_DIMENSION = 150
+
+    # Mindest-Score damit überhaupt ein Bild priorisiert wird
+    MIN_SCORE = 10
+
+    def select(self, soup: BeautifulSoup):
+        """Gibt das LCP-Kandidaten-<img> zurück (oder None)"""
+        best, best_score = None, self.MIN_SCORE - 1
+
+        for position, img in enumerate(soup.find_all('img')):
+            score = self.score(img, position)
+            if score is not None and score > best_score:
+                best, best_score = img, score
+
+        return best
+
+    def score(self, img, position: int = 0):
+        """Bewertet ein <img> als LCP-Kandidat, None = ausgeschlossen"""
+        if not img.get('src') or self._is_hidden(img):
+            return None
+
+        width, height = self._declared_size(img)
+        if (width and width < self.MIN_DIMENSION) or (height and height < self.MIN_DIMENSION):
+            return None
+
+        score = 0
+        depth = 0
+
+        for parent in img.parents:
+            if parent.name in (None, '[document]', 'body', 'html'):
+                break
+            depth += 1
+
+            if parent.name in self.EXCLUDED_CONTAINERS:
+                # <header> innerhalb eines Artikels ist ein Artikel-Header, kein Site-Header
+                if parent.name != 'header' or not parent.find_parent(['article', 'main']):
+                    return None
+            if self._is_hidden(parent):
+                return None
+
+            if self._has_excluded_class(parent):
+                return None
+
+            for cls in parent.get('class', []):
+                score += self.HERO_CONTAINERS.get(cls.lower(), 0)
+
+            if parent.name in ('main', 'article'):
+                score += 10
+
+        if self._has_excluded_class(img):
+            return None
+
+        # Deklarierte Größe: größere Fläche → wahrscheinlicher LCP
+        if width and height:
+            score += min(40, (width * height) // 25000)
+        elif width or self._srcset_max_width(img):
+            score += min(30, max(width, self._srcset_max_width(img)) // 40)
+        else:
+            score += 5
+
+        # Flache Bilder liegen eher im ersten Viewport
+        score -= depth
+
+        # Spätere Bilder liegen eher unterhalb des Folds
+        score -= min(position * 2, 40)
+
+        return score
+
+    def _has_excluded_class(self, tag) -> bool:
+        """Prüft Klassen und ihre Bestandteile (z.B. 'dropdown-icon-img' → dropdown,
+        'author-bio-links' → author-bio)"""
+        for cls in tag.get('class', []):
+            # An Bindestrich-Grenzen vergleichen, damit auch 'author-bio' als Ganzes passt
+            padded = '-' + re.sub(r'[-_]+', '-', cls.lower()) + '-'
+            if any(f'-{name}-' in padded for name in self.EXCLUDED_CLASSES):
+                return True
+        return False
+
+    @staticmethod
+    def _is_hidden(tag) -> bool:
+        """Prüft auf hidden/aria-hidden/display:none"""
+        if tag.has_attr('hidden') or tag.get('aria-hidden') == 'true':
+            return True
+        style = tag.get('style', '').replace(' ', '').lower()
+        return 'display:none' in style or 'visibility:hidden' in style
+
+    @staticmethod
+    def _declared_size(img) -> Tuple[int, int]:
+        """Liest width/height Attribute (0 wenn nicht gesetzt)"""
+        def to_int(value):
+            match = re.match(r'\s*(\d+)', str(value or ''))
+            return int(match.group(1)) if match else 0
+
+        return to_int(img.get('width')), to_int(img.get('height'))
+
+    @staticmethod
+    def _srcset_max_width(img) -> int:
+        """Größte w-Angabe im srcset"""
+        widths = re.findall(r'\s(\d+)w', img.get('srcset', ''))
+        return max((int(w) for w in widths), default=0)
+
+
 class PerformanceOptimizer:
     """Optimiert HTML für Performance"""
 
+    def __init__(self):
+        self.lcp_selector = LCPImageSelector()
+
     def optimize(self, soup: BeautifulSoup, file_path: Path) -> BeautifulSoup:
         """Wendet Performance-Optimierungen an"""
 
@@ -383,17 +514,21 @@ class PerformanceOptimizer:
         return soup
 
     def _add_lazy_loading(self, soup: BeautifulSoup, file_path: Path):
-        """Fügt lazy loading zu Bildern hinzu"""
-        images = soup.find_all('img')
-
-        for i, img in enumerate(images):
-            # Erste 2 Bilder nicht lazy loaden (Hero, Featured Image)
-            if i < 2:
-                # Füge fetchpriority="high" für Hero-Bild hinzu
-                if i == 0:
-                    img['fetchpriority'] = 'high'
+        """Priorisiert das LCP-Bild und fügt lazy loading zu allen anderen hinzu"""
+        lcp_image = self.lcp_selector.select(soup)
+
+        for img in soup.find_all('img'):
+            if img is lcp_image:
+                # LCP-Bild sofort und mit hoher Priorität laden
+                img['fetchpriority'] = 'high'
+                if img.get('loading') == 'lazy':
+                    del img['loading']
                 continue
 
+            # Nur ein Bild pro Seite darf fetchpriority="high" haben
+            if img.get('fetchpriority') == 'high':
+                del img['fetchpriority']
+
             # Lazy loading für restliche Bilder
             if not img.get('loading'):
                 img['loading'] = 'lazy'
@@ -402,6 +537,48 @@ class PerformanceOptimizer:
             if not img.get('decoding'):
                 img['decoding'] = 'async'
 
+        self._add_image_preload(soup, lcp_image)
+
+    def _add_image_preload(self, soup: BeautifulSoup, img):
+        """Fügt <link rel="preload" as="image"> für das LCP-Bild hinzu
+
+        Ohne LCP-Bild (img=None) werden nur alte Bild-Preloads entfernt.
+        """
+        head = soup.find('head')
+        if not head:
+            return
+
+        src = img.get('src') if img is not None else None
+        srcset = img.get('srcset') if img is not None else None
+
+        # Alte Bild-Preloads entfernen (LCP-Bild kann sich geändert haben),
+        # ein bereits passender Preload bleibt als einziger stehen
+        current = None
+        for link in head.find_all('link', rel='preload'):
+            if link.get('as') != 'image':
+                continue
+            if current is None and img is not None and link.get('href') == src \
+                    and link.get('imagesrcset') == srcset:
+                current = link
+            else:
+                link.decompose()
+        if current is not None or img is None:
+            return
+
+        link = soup.new_tag('link', rel='preload', href=src)
+        link['as'] = 'image'
+        if srcset:
+            link['imagesrcset'] = srcset
+            if img.get('sizes'):
+                link['imagesizes'] = img['sizes']
+        link['fetchpriority'] = 'high'
+
+        charset_meta = head.find('meta', charset=True)
+        if charset_meta:
+            charset_meta.insert_after(link)
+        else:
+            head.insert(0, link)
+
     def _add_preconnects(self, soup: BeautifulSoup):
         """Fügt preconnect für externe Ressourcen hinzu"""
         head = soup.find('head')
@@ -0,0 +1,196 @@
+"""
+Post Index
+Persistenter Index der vorhandenen Blog-Posts im Projekt-Root
+
+Pro *.html-Datei werden Slug, Titel und normalisierter Titel gespeichert,
+zusammen mit Größe und mtime der Datei:
+
+- Kalter Lauf: von jeder Datei wird nur der <head> gelesen (blockweise, bis
+  der Titel feststeht oder </head> erreicht ist)
+- Warmer Lauf: nur stat() – Dateien mit unveränderter Größe/mtime werden
+  gar nicht geöffnet
+- Für die inhaltliche Deduplizierung kommen Wortzahl und SimHash des
+  Artikeltexts dazu (content_fingerprints), am selben Größe/mtime-Schlüssel:
+  geparst werden nur neue oder geänderte Dateien
+
+Genutzt von migrate-blog-complete.py (Deduplizierung) und rename-urls.py
+(Link-Tooling).
+
+Layout:
+    data/post-index.json    Pfad → {size, mtime_ns, slug, title, normalized_title[, words, simhash]}
+"""
+
+import re
+import threading
+import unicodedata
+from html import unescape
+from pathlib import Path
+
+from fuzzy_index import simhash
+from json_index import load_index, save_index
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_FILE = Path(__file__).parent.parent / "data" / "post-index.json"
+
+# Seiten im Root, die keine Blog-Posts sind
+NON_POST_PAGES = {'index', 'blog', 'kathrin', 'media', 'contact', 'impressum', 'datenschutzerklaerung'}
+
+OG_TITLE_PATTERN = re.compile(r'<meta\s+property="og:title"\s+content="([^"]+)"')
+TITLE_PATTERN = re.compile(r'<title>([^<]+)</title>')
+TITLE_SUFFIX_PATTERN = re.compile(r'\s*[-–]\s*KATHRIN STAHL.*$')
+
+HEAD_CHUNK_SIZE = 16 * 1024
+# Ohne </head> nach so vielen Zeichen wird die ganze Datei gelesen
+MAX_HEAD_SIZE = 512 * 1024
+
+
+def extract_title(html):
+    """Titel aus og:title, sonst <title>, ohne " - KATHRIN STAHL" ("Untitled" wenn keiner)."""
+    match = OG_TITLE_PATTERN.search(html) or TITLE_PATTERN.search(html)
+    if not match:
+        return "Untitled"
+    title = TITLE_SUFFIX_PATTERN.sub('', match.group(1))
+    return unescape(title.strip())
+
+
+def normalize_title(title):
+    """Vergleichsform eines Titels: Kleinbuchstaben, Umlaute aufgelöst, nur Wörter"""
+    title = unicodedata.normalize('NFKC', title or '').lower()
+    title = title.replace('ä', 'ae').replace('ö', 'oe').replace('ü', 'ue').replace('ß', 'ss')
+    return ' '.join(re.findall(r'\w+', title))
+
+
+def read_head(path):
+    """Liest eine HTML-Datei nur so weit, wie es für den Titel nötig ist
+
+    og:title hat Vorrang vor <title>: sobald og:title gefunden ist, oder </head>
+    erreicht ist, wird abgebrochen. Fehlt </head>, wird die ganze Datei gelesen.
+    Titel-Tags nach </head> (z.B. in Scripts im <body>) zählen damit nicht mehr.
+    """
+    chunks = []
+    with open(path, 'r', encoding='utf-8') as f:
+        size = 0
+        while True:
+            chunk = f.read(HEAD_CHUNK_SIZE)
+            if not chunk:
+                return ''.join(chunks)
+            chunks.append(chunk)
+            size += len(chunk)
+
+            head = ''.join(chunks)
+            if OG_TITLE_PATTERN.search(head):
+                return head
+            end = head.find('</head>')
+            if end != -1:
+                return head[:end]
+            if size >= MAX_HEAD_SIZE:
+                return head + f.read()
+
+
+class PostIndex:
+    """Index der HTML-Dateien in `root_dir`, persistiert in `index_file` (thread-safe)"""
+
+    def __init__(self, root_dir, index_file=DEFAULT_INDEX_FILE):
+        self.root_dir = Path(root_dir)
+        self.index_file = Path(index_file)
+        self._lock = threading.Lock()
+        self._dirty = False
+        index = load_index(self.index_file, INDEX_VERSION, root=str(self.root_dir.resolve()))
+        self.entries = (index or {}).get('entries', {})
+        self.stats = {'unchanged': 0, 'read': 0, 'removed': 0}
+
+    def refresh(self):
+        """Gleicht den Index mit dem Dateisystem ab; liest nur neue oder geänderte Dateien"""
+        with self._lock:
+            seen = set()
+            for html_file in sorted(self.root_dir.glob('*.html')):
+                try:
+                    stat = html_file.stat()
+                except OSError:
+                    continue
+                seen.add(html_file.name)
+
+                entry = self.entries.get(html_file.name)
+                if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                    self.stats['unchanged'] += 1
+                    continue
+
+                try:
+                    title = extract_title(read_head(html_file))
+                except (OSError, UnicodeDecodeError):
+                    self.entries.pop(html_file.name, None)
+                    continue
+
+                self.entries[html_file.name] = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'slug': html_file.stem,
+                    'title': title,
+                    'normalized_title': normalize_title(title)
+                }
+                self.stats['read'] += 1
+                self._dirty = True
+
+            for name in set(self.entries) - seen:
+                del self.entries[name]
+                self.stats['removed'] += 1
+                self._dirty = True
+        return self
+
+    def posts(self, exclude=NON_POST_PAGES):
+        """Blog-Posts als [{'slug', 'title', 'normalized_title', 'file'}], nach Dateiname sortiert"""
+        with self._lock:
+            return [
+                {
+                    'slug': entry['slug'],
+                    'title': entry['title'],
+                    'normalized_title': entry['normalized_title'],
+                    'file': str(self.root_dir / name)
+                }
+                for name, entry in sorted(self.entries.items())
+                if entry['slug'] not in exclude
+            ]
+
+    def content_fingerprints(self, text_of, exclude=NON_POST_PAGES):
+        """Wortzahl und SimHash des Artikeltexts je Post: {slug: {'words', 'simhash'}}
+
+        text_of(html) liefert den Artikeltext. Das Ergebnis steht im Index-Eintrag;
+        refresh() ersetzt den Eintrag bei geänderter Größe/mtime, nur dann wird
+        die Datei hier erneut gelesen und geparst.
+        """
+        with self._lock:
+            fingerprints = {}
+            for name, entry in sorted(self.entries.items()):
+                if entry['slug'] in exclude:
+                    continue
+                if 'simhash' not in entry:
+                    try:
+                        with open(self.root_dir / name, 'r', encoding='utf-8') as f:
+                            text = text_of(f.read())
+                    except (OSError, UnicodeDecodeError):
+                        fingerprints[entry['slug']] = {'words': 0, 'simhash': 0}
+                        continue
+                    entry['words'] = len(text.split())
+                    entry['simhash'] = simhash(text)
+                    self._dirty = True
+                fingerprints[entry['slug']] = {'words': entry['words'], 'simhash': entry['simhash']}
+            return fingerprints
+
+    def get(self, slug):
+        """Eintrag zu einem Slug (oder None)"""
+        entry = self.entries.get(f"{slug}.html")
+        return dict(entry) if entry else None
+
+    def find_title(self, title):
+        """Slugs aller Dateien mit gleichem normalisierten Titel"""
+        normalized = normalize_title(title)
+        return [entry['slug'] for _, entry in sorted(self.entries.items())
+                if entry['normalized_title'] == normalized]
+
+    def save(self):
+        """Schreibt den Index (nur wenn sich etwas geändert hat)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            save_index(self.index_file, INDEX_VERSION, {'root': str(self.root_dir.resolve()), 'entries': self.entries})
+            self._dirty = False
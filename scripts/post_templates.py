@@ -0,0 +1,259 @@
+"""
+Post Templates
+Vorkompilierte Templates für generierte Blog-Posts (für migrate-blog-complete.py)
+
+Statt jeden Post aus einem großen f-String zu bauen, wird das Layout einmal
+kompiliert: Partials (Header aus components/header.html, Footer, Autorin-Bio,
+CTA) werden eingesetzt, der Rest in feste Textstücke und Slots zerlegt. Ein
+Post ist danach nur noch ein ''.join() über diese Stücke.
+
+Syntax:
+    {{TITLE}}        Slot, pro Post befüllt
+    {{> footer}}     Partial, beim Kompilieren eingesetzt
+"""
+
+import re
+import hashlib
+from pathlib import Path
+
+HEADER_FILE = Path(__file__).parent.parent / "components" / "header.html"
+
+SLOT_PATTERN = re.compile(r'\{\{\s*([\w-]+)\s*\}\}')
+PARTIAL_PATTERN = re.compile(r'\{\{>\s*([\w-]+)\s*\}\}')
+
+# Seitengerüst eines Posts; Slots in Großbuchstaben, Partials per {{> name}}
+POST_LAYOUT = '''<!DOCTYPE html>
+<html lang="de">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{TITLE}} | Kathrin Stahl</title>
+    <meta name="description" content="{{DESCRIPTION}}">
+    <link rel="canonical" href="https://nickheymann.github.io/kathrin-coaching/{{SLUG}}.html">
+    <meta property="og:title" content="{{TITLE}} | Kathrin Stahl">
+    <meta property="og:description" content="{{DESCRIPTION}}">
+    <meta property="og:type" content="article">
+    <meta property="og:image" content="https://nickheymann.github.io/kathrin-coaching/{{IMAGE}}">
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Cormorant+Garamond:ital,wght@0,400;0,500;0,600;1,400&family=Montserrat:wght@400;500;600&display=swap" rel="stylesheet">
+    <link rel="stylesheet" href="css/blog-enhancements.css">{{> header_styles}}
+    <style>
+        *,*::before,*::after{box-sizing:border-box;margin:0;padding:0}
+        :root{--color-primary:#2C4A47;--color-primary-light:#3D6B66;--color-accent:#C4A962;--color-cream:#FAF8F5;--color-white:#FFFFFF;--color-text:#2D2D2D;--color-text-light:#5A5A5A;--font-heading:'Cormorant Garamond',Georgia,serif;--font-body:'Montserrat',-apple-system,sans-serif}
+        html{scroll-behavior:smooth}
+        body{font-family:var(--font-body);font-size:16px;line-height:1.8;color:var(--color-text);background:var(--color-white)}
+        img{max-width:100%;height:auto;display:block}
+        a{color:var(--color-primary);text-decoration:none}
+        a:hover{text-decoration:underline}
+        h1,h2,h3{font-family:var(--font-heading);font-weight:500;color:var(--color-primary);line-height:1.3}
+        h1{font-size:clamp(2rem,4vw,3rem);margin-bottom:1.5rem}
+        h2{font-size:clamp(1.5rem,3vw,2rem);margin:2.5rem 0 1rem}
+        h3{font-size:clamp(1.25rem,2.5vw,1.5rem);margin:2rem 0 .75rem}
+        p{margin-bottom:1.5rem}
+        .container{max-width:800px;margin:0 auto;padding:0 24px}
+        .container-wide{max-width:1200px;margin:0 auto;padding:0 24px}
+        header{position:fixed;top:0;left:0;right:0;z-index:1000;background:rgba(255,255,255,.95);backdrop-filter:blur(10px);border-bottom:1px solid rgba(0,0,0,.05)}
+        .header-inner{display:flex;justify-content:space-between;align-items:center;height:80px;max-width:1200px;margin:0 auto;padding:0 24px}
+        .logo{font-family:var(--font-heading);font-size:1.5rem;font-weight:500;color:var(--color-primary);text-decoration:none}
+        nav{display:flex;align-items:center;gap:35px}
+        nav a{font-size:.9rem;font-weight:500;color:var(--color-text);text-decoration:none}
+        nav a:hover{color:var(--color-primary)}
+        .nav-cta{background:var(--color-accent);color:white!important;padding:12px 24px;border-radius:4px}
+        .menu-toggle{display:none;flex-direction:column;gap:5px;background:none;border:none;cursor:pointer}
+        .menu-toggle span{width:24px;height:2px;background:var(--color-primary)}
+        .article-hero{padding:140px 0 60px;background:linear-gradient(135deg,var(--color-primary) 0%,var(--color-primary-light) 100%);text-align:center;color:white}
+        .article-hero h1{color:white;max-width:800px;margin:0 auto 1rem}
+        .article-meta{display:flex;justify-content:center;gap:20px;font-size:.9rem;opacity:.9;flex-wrap:wrap}
+        .article-category{background:var(--color-accent);padding:5px 15px;border-radius:20px;font-size:.8rem;text-transform:uppercase;font-weight:600;margin-bottom:1rem;display:inline-block}
+        .featured-image{margin:-40px auto 0;max-width:900px;padding:0 24px}
+        .featured-image img{border-radius:16px;box-shadow:0 20px 60px rgba(0,0,0,.15);width:100%}
+        .article-content{padding:60px 0 80px}
+        .article-content p{font-size:1.1rem}
+        .article-content blockquote{border-left:4px solid var(--color-accent);padding-left:24px;margin:2rem 0;font-style:italic;color:var(--color-text-light);font-size:1.2rem}
+        .article-content ul,.article-content ol{margin:1.5rem 0;padding-left:1.5rem}
+        .article-content li{margin-bottom:.75rem;font-size:1.1rem}
+        .article-content strong{color:var(--color-primary)}
+        .article-content em{color:var(--color-text-light)}
+        .back-link{padding:20px 0}
+        .back-link a{display:inline-flex;align-items:center;gap:8px;color:var(--color-text-light);font-size:.9rem}
+        .back-link a:hover{color:var(--color-primary)}
+        .cta-section{background:var(--color-cream);padding:80px 0;text-align:center}
+        .cta-section h2{margin-bottom:1rem}
+        .cta-section p{max-width:600px;margin:0 auto 2rem;color:var(--color-text-light)}
+        .cta-btn{display:inline-block;background:var(--color-primary);color:white;padding:16px 32px;border-radius:4px;font-weight:600;text-decoration:none}
+        .cta-btn:hover{background:var(--color-primary-light);text-decoration:none}
+        footer{background:var(--color-primary);color:white;padding:60px 0 30px}
+        .footer-content{display:grid;grid-template-columns:2fr 1fr 1fr;gap:60px;margin-bottom:40px}
+        .footer-brand h3{font-size:1.5rem;color:white;margin-bottom:1rem}
+        .footer-brand p{opacity:.8}
+        .footer-links h4{color:var(--color-accent);margin-bottom:1rem;font-family:var(--font-body);font-weight:600}
+        .footer-links ul{list-style:none}
+        .footer-links li{margin-bottom:.5rem}
+        .footer-links a{color:white;opacity:.8}
+        .footer-bottom{border-top:1px solid rgba(255,255,255,.1);padding-top:30px;text-align:center;font-size:.85rem;opacity:.7}
+        .footer-bottom a{color:white}
+        @media(max-width:992px){nav{display:none}nav.mobile-open{display:flex;position:absolute;top:80px;left:0;right:0;flex-direction:column;background:white;padding:20px;box-shadow:0 10px 30px rgba(0,0,0,.1)}nav.mobile-open a{padding:15px 0;border-bottom:1px solid rgba(0,0,0,.05)}.menu-toggle{display:flex}}
+        @media(max-width:768px){.footer-content{grid-template-columns:1fr;gap:40px}}
+    </style>
+</head>
+<body>
+    {{> header}}
+
+    <section class="article-hero">
+        <div class="container">
+            <span class="article-category">{{CATEGORY}}</span>
+            <h1>{{TITLE}}</h1>
+            <div class="article-meta">
+                <span>{{READ_TIME}} Min. Lesezeit</span>
+            </div>
+        </div>
+    </section>
+
+    <div class="featured-image">
+        <img src="{{IMAGE}}" alt="{{TITLE}}" loading="lazy">
+    </div>
+
+    <article class="article-content">
+        <div class="container">
+            <div class="back-link">
+                <a href="blog.html">← Zurück zum Blog</a>
+            </div>
+
+            {{CONTENT}}
+
+            {{> author_bio}}
+        </div>
+    </article>
+
+    {{> cta}}
+
+    {{> footer}}
+
+    <script src="js/blog-enhancements.js"></script>{{> header_scripts}}
+</body>
+</html>'''
+
+# Eingebauter Header – nur falls components/header.html fehlt
+INLINE_HEADER = '''<header>
+        <div class="header-inner">
+            <a href="index.html" class="logo">Kathrin Stahl</a>
+            <nav id="mainNav">
+                <a href="index.html">Start</a>
+                <a href="index.html#angebote">Angebote</a>
+                <a href="kathrin.html">Über mich</a>
+                <a href="blog.html">Blog</a>
+                <a href="media.html">Videos</a>
+                <a href="https://cal.com/kathrinstahl" target="_blank" class="nav-cta">Erstgespräch</a>
+            </nav>
+            <button class="menu-toggle" onclick="document.getElementById('mainNav').classList.toggle('mobile-open')">
+                <span></span><span></span><span></span>
+            </button>
+        </div>
+    </header>'''
+
+CTA = '''<section class="cta-section">
+        <div class="container">
+            <h2>Bereit für den nächsten Schritt?</h2>
+            <p>Lass uns in einem kostenlosen Erstgespräch herausfinden, wie ich dich auf deinem Weg begleiten kann.</p>
+            <a href="https://cal.com/kathrinstahl" target="_blank" class="cta-btn">Kostenloses Erstgespräch buchen</a>
+        </div>
+    </section>'''
+
+FOOTER = '''<footer>
+        <div class="container-wide">
+            <div class="footer-content">
+                <div class="footer-brand">
+                    <h3>Kathrin Stahl</h3>
+                    <p>Glück über Zweifel – Begleitung auf deinem Weg zu mehr Selbstliebe, Klarheit und einem Leben, das sich richtig anfühlt.</p>
+                </div>
+                <div class="footer-links">
+                    <h4>Navigation</h4>
+                    <ul>
+                        <li><a href="index.html">Startseite</a></li>
+                        <li><a href="blog.html">Blog</a></li>
+                        <li><a href="kathrin.html">Über mich</a></li>
+                        <li><a href="media.html">Videos</a></li>
+                    </ul>
+                </div>
+                <div class="footer-links">
+                    <h4>Kontakt</h4>
+                    <ul>
+                        <li>Portugal & Online</li>
+                        <li><a href="https://cal.com/kathrinstahl">Termin buchen</a></li>
+                    </ul>
+                </div>
+            </div>
+            <div class="footer-bottom">
+                <p>© 2025 Kathrin Stahl | <a href="impressum.html">Impressum</a> | <a href="datenschutzerklaerung.html">Datenschutz</a></p>
+            </div>
+        </div>
+    </footer>'''
+
+AUTHOR_BIO = '''
+            <div class="author-bio">
+                <img src="wp-content/uploads/2021/04/Me-ich-Kathrin-Hogaza-1060x1042.jpg" alt="Kathrin Stahl">
+                <div class="author-bio-content">
+                    <h4>Kathrin Stahl</h4>
+                    <p>Ich begleite Menschen auf ihrem Weg zu mehr Selbstliebe, innerer Klarheit und einem Leben, das sich richtig anfühlt. Mit Herz, Erfahrung und der besonderen Kraft der Pferde.</p>
+                    <div class="author-bio-links">
+                        <a href="kathrin.html">Mehr über mich</a>
+                        <a href="https://cal.com/kathrinstahl" target="_blank">Erstgespräch buchen</a>
+                    </div>
+                </div>
+            </div>
+        '''
+
+# Header aus components/header.html braucht sein CSS und global.js (Menü)
+HEADER_STYLES = '\n    <link rel="stylesheet" href="css/components/header.css">'
+HEADER_SCRIPTS = '\n    <script defer src="js/global.js"></script>'
+
+
+class CompiledTemplate:
+    """Template mit eingesetzten Partials, zerlegt in Textstücke und Slots"""
+
+    def __init__(self, source, partials=None):
+        self.source = self._expand(source, partials or {})
+        self.version = hashlib.sha1(self.source.encode('utf-8')).hexdigest()[:12]
+
+        # Gerade Positionen: feste Textstücke, ungerade: Slot-Namen
+        self.pieces = SLOT_PATTERN.split(self.source)
+        self.slots = [(position, self.pieces[position]) for position in range(1, len(self.pieces), 2)]
+        self.slot_names = {name for _, name in self.slots}
+
+    @staticmethod
+    def _expand(source, partials, depth=0):
+        if depth > 10:
+            raise ValueError("Partials zu tief verschachtelt")
+
+        def replace(match):
+            name = match.group(1)
+            if name not in partials:
+                raise KeyError(f"Unbekanntes Partial: {name}")
+            return CompiledTemplate._expand(partials[name], partials, depth + 1)
+
+        return PARTIAL_PATTERN.sub(replace, source)
+
+    def render(self, values):
+        """Befüllt alle Slots (fehlender Wert → KeyError)"""
+        pieces = self.pieces[:]
+        for position, name in self.slots:
+            pieces[position] = str(values[name])
+        return ''.join(pieces)
+
+
+def load_header(header_file=HEADER_FILE):
+    """Header-Partial samt CSS/JS; ohne components/header.html der eingebaute Header"""
+    if header_file is not None:
+        try:
+            with open(header_file, 'r', encoding='utf-8') as f:
+                return {'header': f.read().strip(), 'header_styles': HEADER_STYLES, 'header_scripts': HEADER_SCRIPTS}
+        except OSError:
+            pass
+    return {'header': INLINE_HEADER, 'header_styles': '', 'header_scripts': ''}
+
+
+def compile_post_template(header_file=HEADER_FILE):
+    """Kompiliertes Post-Layout mit allen Partials"""
+    partials = {'author_bio': AUTHOR_BIO, 'cta': CTA, 'footer': FOOTER, **load_header(header_file)}
+    return CompiledTemplate(POST_LAYOUT, partials)
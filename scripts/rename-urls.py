@@ -8,6 +8,8 @@ import os
 import re
 import shutil
 
+from post_index import PostIndex
+
 # Mapping: alte URL → neue URL
 URL_MAPPING = {
     # BLOG POSTS - Achtsamkeit
@@ -69,12 +71,31 @@ URL_MAPPING = {
     "mit-pferden-sein-und-heilen.html": "pferde-heilen.html",
 }
 
-def rename_files(project_dir):
-    """Benennt Dateien um."""
-    renamed = []
+def check_mapping(index):
+    """Prüft URL_MAPPING gegen den Post-Index.
+
+    Gibt (fehlende Quellen, belegte Ziele) zurück – ein belegtes Ziel würde beim
+    Umbenennen einen anderen Post überschreiben.
+    """
+    missing = []
+    collisions = []
     for old_name, new_name in URL_MAPPING.items():
         if old_name == new_name:
             continue
+        old_slug = os.path.splitext(old_name)[0]
+        new_entry = index.get(os.path.splitext(new_name)[0])
+        if index.get(old_slug) is None:
+            missing.append(old_name)
+        elif new_entry is not None:
+            collisions.append((old_name, new_name, new_entry['title']))
+    return missing, collisions
+
+def rename_files(project_dir, skip=()):
+    """Benennt Dateien um (außer denen in skip)."""
+    renamed = []
+    for old_name, new_name in URL_MAPPING.items():
+        if old_name == new_name or old_name in skip:
+            continue
         old_path = os.path.join(project_dir, old_name)
         new_path = os.path.join(project_dir, new_name)
 
@@ -173,9 +194,18 @@ def main():
     print("URL-Refactoring: Kurze, prägnante Pfade")
     print("=" * 60)
 
+    index = PostIndex(project_dir).refresh()
+    missing, collisions = check_mapping(index)
+    if missing:
+        print(f"\n⚠️  {len(missing)} Quelldateien nicht vorhanden (bereits umbenannt?)")
+    for old_name, new_name, title in collisions:
+        print(f"⚠️  {old_name} → {new_name} übersprungen: Ziel existiert bereits ({title})")
+
     print("\n1. Dateien umbenennen...")
-    renamed = rename_files(project_dir)
+    renamed = rename_files(project_dir, skip={old_name for old_name, _, _ in collisions})
     print(f"   → {len(renamed)} Dateien umbenannt")
+    index.refresh()
+    index.save()
 
     print("\n2. Links aktualisieren...")
     files_changed, total_changes = update_all_links(project_dir)
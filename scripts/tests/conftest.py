@@ -0,0 +1,131 @@
+"""
+Gemeinsame Fixtures für die Python-Skripte in scripts/
+
+Die Skripte haben Bindestriche im Namen und werden deshalb über
+load_script() per Dateipfad importiert.
+"""
+
+import sys
+import time
+import threading
+import importlib.util
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Hilfsmodule (async_http.py etc.) importierbar machen
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+_loaded_scripts = {}
+
+
+def load_script(name):
+    """Importiert scripts/<name>.py als Modul (einmal pro Testlauf)"""
+    if name not in _loaded_scripts:
+        spec = importlib.util.spec_from_file_location(name.replace('-', '_'), SCRIPTS_DIR / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded_scripts[name] = module
+    return _loaded_scripts[name]
+
+
+class StandInServer:
+    """Lokaler HTTP/1.1-Server mit Keep-Alive als Ersatz für die echte Website
+
+    routes: {pfad: (status, body, headers)} oder {pfad: callable(handler) -> (status, body, headers)}
+    GET und POST werden gleich behandelt; der Request-Body steht in handler.body.
+    """
+
+    def __init__(self, routes=None, delay=0.0):
+        self.routes = dict(routes or {})
+        self.delay = delay
+        self.requests = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with stand_in._lock:
+                    stand_in.connections += 1
+
+            def do_GET(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self.body = self.rfile.read(length) if length else b''
+                with stand_in._lock:
+                    stand_in.requests.append(self.path)
+                    stand_in.in_flight += 1
+                    stand_in.max_in_flight = max(stand_in.max_in_flight, stand_in.in_flight)
+                try:
+                    if stand_in.delay:
+                        time.sleep(stand_in.delay)
+                    status, body, headers = stand_in.respond(self)
+                finally:
+                    with stand_in._lock:
+                        stand_in.in_flight -= 1
+
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+                self.send_response(status)
+                headers = {'Content-Type': 'text/html; charset=utf-8', **(headers or {})}
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_POST = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    def respond(self, handler):
+        path = handler.path.split('?')[0]
+        route = self.routes.get(path)
+        if route is None:
+            return 404, '<h1>Not Found</h1>', {}
+        if callable(route):
+            return route(handler)
+        return route
+
+    def count(self, path):
+        return sum(1 for p in self.requests if p.split('?')[0] == path)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    """Factory: stand_in_server(routes, delay=...) startet einen lokalen Server"""
+    servers = []
+
+    def start(routes=None, delay=0.0):
+        server = StandInServer(routes, delay).__enter__()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.__exit__()
@@ -0,0 +1,124 @@
+"""
+Tests für ann_index.IVFIndex (Recall gegen die exakte Suche, inkrementelles
+Einfügen/Entfernen, Persistenz) und die ANN-Suche in generate-smart-connections.py.
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import ann_index  # noqa: E402
+from ann_index import IVFIndex  # noqa: E402
+from conftest import load_script  # noqa: E402
+from embedding_similarity import top_k_similar  # noqa: E402
+
+LEGACY_FILE = Path(__file__).parent.parent.parent / 'data' / 'blog-intelligence.json'
+
+
+def clustered(n, d=32, cluster_size=10, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n // cluster_size, d))
+    return (centers[rng.integers(0, len(centers), n)] + 0.8 * rng.normal(size=(n, d))).astype(np.float32)
+
+
+def recall(found, exact):
+    return np.mean([len(set(row) & set(expected)) / len(expected) for row, expected in zip(found, exact)])
+
+
+def test_recall_against_exact_search():
+    vectors = clustered(2000)
+    keys = list(range(len(vectors)))
+    index = IVFIndex(vectors.shape[1])
+    index.add(keys, vectors)
+
+    found, scores = index.search(vectors, 10, exclude=keys)
+    exact, exact_scores = top_k_similar(vectors, k=10)
+
+    assert recall(found, exact.tolist()) >= 0.9
+    # Gefundene Scores sind echte Kosinus-Ähnlichkeiten, absteigend, ohne die Anfrage selbst
+    assert found[0][0] == exact[0][0] and scores[0][0] == pytest.approx(exact_scores[0][0], abs=1e-5)
+    assert all(row == sorted(row, reverse=True) for row in scores)
+    assert all(i not in row for i, row in enumerate(found))
+
+    # Alle Zellen durchsuchen = exakte Suche
+    found, _ = index.search(vectors[:50], 10, probes=len(index.centroids), exclude=keys[:50])
+    assert found == exact[:50].tolist()
+
+
+def test_incremental_insert_and_remove():
+    vectors = clustered(600)
+    index = IVFIndex(vectors.shape[1])
+    assert index.add([f"a{i}" for i in range(500)], vectors[:500]) == 500
+    trained = index.centroids
+
+    # Nachgereichte Vektoren landen in bestehenden Zellen und sind sofort auffindbar
+    assert index.add([f"a{i}" for i in range(600)], vectors) == 100
+    assert index.centroids is trained
+    found, scores = index.search(vectors[550:551], 1)
+    assert found == [['a550']] and scores[0][0] == pytest.approx(1.0)
+
+    assert index.remove(['a550', 'fehlt']) == 1
+    assert 'a550' not in index and len(index) == 599
+    assert 'a550' not in index.search(vectors[550:551], 5)[0][0]
+
+
+def test_growth_triggers_retraining(monkeypatch):
+    monkeypatch.setattr(ann_index, 'RETRAIN_FACTOR', 2)
+    vectors = clustered(300)
+    index = IVFIndex(vectors.shape[1])
+    index.add(list(range(100)), vectors[:100])
+    index.add(list(range(100, 200)), vectors[100:200])
+    assert index.trained_size == 100
+    index.add(list(range(200, 300)), vectors[200:])
+    assert index.trained_size == 300 and len(index.centroids) == round(ann_index.LISTS_FACTOR * 300 ** 0.5)
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    vectors = clustered(400)
+    keys = [f"k{i}" for i in range(400)]
+    index = IVFIndex(vectors.shape[1], seed=3)
+    index.add(keys, vectors)
+    index.remove(keys[:10])
+    index.save(tmp_path / 'ann-index.npz')
+
+    loaded = IVFIndex.load(tmp_path / 'ann-index.npz')
+    assert len(loaded) == 390 and loaded.keys == keys[10:]
+    assert loaded.search(vectors[10:60], 5) == index.search(vectors[10:60], 5)
+
+    assert IVFIndex.load(tmp_path / 'fehlt.npz') is None
+    (tmp_path / 'kaputt.npz').write_bytes(b'kein npz')
+    assert IVFIndex.load(tmp_path / 'kaputt.npz') is None
+
+
+@pytest.mark.skipif(not LEGACY_FILE.exists(), reason='data/blog-intelligence.json fehlt')
+def test_connection_engine_with_ann_search(tmp_path, monkeypatch):
+    connections = load_script('generate-smart-connections')
+    articles = [a for a in json.loads(LEGACY_FILE.read_text(encoding='utf-8'))['articles'] if a.get('type') == 'blog']
+    embeddings = clustered(len(articles), cluster_size=4)
+
+    exact = connections.similar_articles(articles, embeddings, search='exact')
+    index_file = tmp_path / 'ann-index.npz'
+    approximate = connections.similar_articles(articles, embeddings, search='ann', index_file=index_file)
+    assert index_file.exists()
+    matched = [len({c['url'] for c in exact[url]} & {c['url'] for c in approximate[url]}) / 15 for url in exact]
+    assert np.mean(matched) >= 0.9
+
+    # Zweiter Lauf mit einem Artikel weniger: Index wird wiederverwendet und bereinigt
+    again = connections.similar_articles(articles[1:], embeddings[1:], search='ann', index_file=index_file)
+    assert articles[0]['url'] not in {c['url'] for related in again.values() for c in related}
+    assert len(IVFIndex.load(index_file)) == len(articles) - 1
+
+    # Ganzer Lauf mit --search ann (lokale Embeddings, kein Netz)
+    shutil.copy(LEGACY_FILE, tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(connections, 'STORE_DIR', tmp_path / 'intelligence')
+    monkeypatch.setattr(connections, 'OUTPUT_FILE', tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(connections, 'EMBEDDINGS_DIR', tmp_path / 'embeddings')
+    monkeypatch.setattr(sys, 'argv', ['generate-smart-connections.py', '--embeddings', 'local', '--search', 'ann'])
+    connections.main()
+    exported = json.loads((tmp_path / 'blog-intelligence.json').read_text(encoding='utf-8'))
+    assert all(len(article['related']) == 10 for article in exported['articles'] if article.get('type') == 'blog')
@@ -0,0 +1,189 @@
+"""
+Tests für AsyncBlogCrawler (migrate-blog-complete.py) und async_http.AsyncHTTPPool
+gegen einen lokalen Stand-in-Server mit WordPress-Fixture-Seiten.
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import FIXTURES_DIR, load_script
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+
+from async_http import AsyncHTTPPool, parse_retry_after  # noqa: E402
+
+migrate = load_script('migrate-blog-complete')
+
+WP_FIXTURES = FIXTURES_DIR / 'wordpress'
+POST_SLUGS = ['dankbarkeit', 'innere-fuehrung', 'gedankenkarussell', 'ehe-retten', 'freiheit']
+
+
+def wordpress_routes():
+    """Blog-Übersicht (3 Seiten) und Posts wie auf der alten WordPress-Seite"""
+    routes = {
+        '/blog': (200, (WP_FIXTURES / 'blog-page-1.html').read_text(encoding='utf-8'), {}),
+        '/blog/page/2': (200, (WP_FIXTURES / 'blog-page-2.html').read_text(encoding='utf-8'), {}),
+        '/blog/page/3': (200, (WP_FIXTURES / 'blog-page-3.html').read_text(encoding='utf-8'), {}),
+    }
+    post_template = (WP_FIXTURES / 'post.html').read_text(encoding='utf-8')
+    for slug in POST_SLUGS:
+        routes[f'/{slug}/'] = (200, post_template.replace('{title}', slug.replace('-', ' ').title()), {})
+    return routes
+
+
+def make_crawler(server, **options):
+    options.setdefault('backoff_base', 0.01)
+    options.setdefault('discovery', 'html')  # REST-Discovery: test_rest_discovery.py
+    return migrate.AsyncBlogCrawler(base_url=server.url, per_host_limit=3, **options)
+
+
+def test_crawl_all_posts_in_page_order(stand_in_server):
+    server = stand_in_server(wordpress_routes())
+
+    posts = make_crawler(server).crawl_all_posts()
+
+    assert [p['slug'] for p in posts] == POST_SLUGS
+    assert posts[0]['url'] == f"{server.url}/dankbarkeit/"
+    assert posts[3]['category'] == 'Beziehung'  # CATEGORY_MAPPING angewendet
+
+
+def test_crawl_matches_sync_crawler(stand_in_server):
+    server = stand_in_server(wordpress_routes())
+
+    async_posts = make_crawler(server).crawl_all_posts()
+    sync_posts = migrate.BlogCrawler(base_url=server.url).crawl_all_posts()
+
+    assert async_posts == sync_posts
+
+
+def test_pagination_prefetches_all_listing_pages_once(stand_in_server):
+    server = stand_in_server(wordpress_routes())
+
+    make_crawler(server).crawl_all_posts()
+
+    assert server.count('/blog') == 1
+    assert server.count('/blog/page/2') == 1
+    assert server.count('/blog/page/3') == 1
+    # Höchstens ein spekulativer Request hinter der letzten Seite
+    assert server.count('/blog/page/4') <= 1
+
+
+def test_speculative_prefetch_without_pagination_links(stand_in_server):
+    routes = wordpress_routes()
+    for path in ('/blog', '/blog/page/2', '/blog/page/3'):
+        status, body, headers = routes[path]
+        routes[path] = (status, body.replace('/blog/page/', '/archiv/seite/'), headers)
+    server = stand_in_server(routes)
+
+    posts = make_crawler(server).crawl_all_posts()
+
+    assert len(posts) == len(POST_SLUGS)
+    assert server.count('/blog/page/4') == 1
+
+
+def test_crawl_without_prefetch(stand_in_server):
+    server = stand_in_server(wordpress_routes())
+
+    posts = make_crawler(server, prefetch=False).crawl_all_posts()
+
+    assert len(posts) == len(POST_SLUGS)
+    assert server.requests == ['/blog', '/blog/page/2', '/blog/page/3', '/blog/page/4']
+
+
+def test_download_posts_reuses_connections_and_respects_host_limit(stand_in_server):
+    server = stand_in_server(wordpress_routes(), delay=0.05)
+    urls = [f"{server.url}/{slug}/" for slug in POST_SLUGS] * 4
+
+    pages = make_crawler(server).download_posts(urls)
+
+    assert all('elementor-widget-container' in html for html in pages.values())
+    assert len(server.requests) == len(urls)
+    assert server.max_in_flight <= 3
+    # Keep-Alive: deutlich weniger TCP-Verbindungen als Requests
+    assert server.connections <= 3
+
+
+def test_download_failure_returns_none(stand_in_server):
+    server = stand_in_server(wordpress_routes())
+    missing = f"{server.url}/gibt-es-nicht/"
+
+    pages = make_crawler(server).download_posts([missing])
+
+    assert pages == {missing: None}
+
+
+def test_retry_with_backoff_on_server_errors(stand_in_server):
+    attempts = []
+
+    def flaky(handler):
+        attempts.append(handler.path)
+        if len(attempts) < 3:
+            return 503, 'busy', {}
+        return 200, 'ok', {}
+
+    server = stand_in_server({'/flaky': flaky})
+
+    async def run():
+        async with AsyncHTTPPool(backoff_base=0.01) as pool:
+            return await pool.fetch(f"{server.url}/flaky"), pool.stats
+
+    result, stats = asyncio.run(run())
+
+    assert result.status == 200
+    assert result.text == 'ok'
+    assert len(attempts) == 3
+    assert stats['retries'] == 2
+
+
+def test_retry_after_header_is_honoured(stand_in_server):
+    calls = []
+
+    def rate_limited(handler):
+        calls.append(handler.path)
+        if len(calls) == 1:
+            return 429, 'slow down', {'Retry-After': '0'}
+        return 200, 'ok', {}
+
+    server = stand_in_server({'/limited': rate_limited})
+
+    async def run():
+        # Großes Backoff: nur Retry-After=0 hält den Test schnell
+        async with AsyncHTTPPool(backoff_base=60) as pool:
+            return await pool.fetch(f"{server.url}/limited")
+
+    result = asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    assert result.status == 200
+    assert len(calls) == 2
+
+
+def test_gives_up_after_max_retries(stand_in_server):
+    server = stand_in_server({'/down': (500, 'error', {})})
+
+    async def run():
+        async with AsyncHTTPPool(max_retries=2, backoff_base=0.01) as pool:
+            return await pool.fetch(f"{server.url}/down"), await pool.fetch(f"{server.url}/fehlt"), pool.stats
+
+    result, missing, stats = asyncio.run(run())
+
+    assert result.status == 500 and missing.status == 404
+    assert server.count('/down') == 3
+    assert stats['failed'] == 2 and stats['retries'] == 2
+
+
+def test_backoff_delay_is_bounded_and_jittered():
+    pool = AsyncHTTPPool(backoff_base=1, backoff_max=8)
+
+    delays = [pool.backoff_delay(attempt) for attempt in range(10) for _ in range(20)]
+
+    assert all(0 <= d <= 8 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after('') is None
+    assert parse_retry_after('morgen') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
@@ -0,0 +1,147 @@
+"""
+Tests für connection_graph.ConnectionGraph: inkrementelle Läufe müssen exakt
+das Ergebnis einer vollständigen Neuberechnung liefern.
+"""
+
+import copy
+import json
+import random
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import load_script  # noqa: E402
+from connection_graph import ConnectionGraph, fingerprint  # noqa: E402
+from connection_scoring import rule_based_connections  # noqa: E402
+from test_connection_scoring import JOURNEY_MAPS, RELATED_CATEGORIES, THEMES, random_articles  # noqa: E402
+
+LEGACY_FILE = Path(__file__).parent.parent.parent / 'data' / 'blog-intelligence.json'
+
+
+def fingerprints(articles):
+    return [fingerprint(article) for article in articles]
+
+
+def run_graph(graph_dir, articles, embeddings=None):
+    graph = ConnectionGraph(graph_dir, JOURNEY_MAPS, RELATED_CATEGORIES)
+    rows = graph.update(articles, fingerprints(articles), embeddings)
+    graph.save()
+    return graph, rows
+
+
+def normalized(n, seed):
+    vectors = np.random.default_rng(seed).normal(size=(n, 24)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def edit(article, rng):
+    analysis = article.setdefault('analysis', {})
+    analysis['tiefenthemen'] = rng.sample(THEMES, rng.randint(0, 4))
+    article['category'] = rng.choice(list(RELATED_CATEGORIES) + [''])
+
+
+def test_single_edits_match_full_recomputation(tmp_path):
+    rng = random.Random(7)
+    articles = random_articles(200, 7)
+    graph, rows = run_graph(tmp_path, articles)
+    assert graph.stats['full'] and len(rows) == 200
+    assert graph.rule_connections(rows) == rule_based_connections(articles, JOURNEY_MAPS, RELATED_CATEGORIES)
+
+    for _ in range(6):
+        edit(articles[rng.randrange(len(articles))], rng)
+        graph, rows = run_graph(tmp_path, articles)
+        expected = rule_based_connections(articles, JOURNEY_MAPS, RELATED_CATEGORIES)
+
+        assert not graph.stats['full'] and graph.stats['changed'] == 1
+        assert len(rows) < len(articles)
+        assert graph.rule_connections(rows) == {articles[i]['url']: expected[articles[i]['url']] for i in rows}
+        # Alle anderen Zeilen sind unverändert richtig
+        assert graph.rule_connections(range(len(articles))) == expected
+
+
+def test_added_and_removed_articles(tmp_path):
+    articles = random_articles(150, 8)
+    run_graph(tmp_path, articles)
+
+    extra = random_articles(160, 9)[150:]
+    for article in extra:
+        article['url'] = 'neu-' + article['url']
+    articles = articles[5:] + extra
+    graph, _ = run_graph(tmp_path, articles)
+
+    assert not graph.stats['full'] and graph.stats['removed'] == 5 and graph.stats['changed'] == 10
+    assert graph.rule_connections(range(len(articles))) == rule_based_connections(articles, JOURNEY_MAPS,
+                                                                                  RELATED_CATEGORIES)
+
+
+def test_embedding_similarities_are_patched(tmp_path):
+    rng = random.Random(10)
+    articles = random_articles(120, 10)
+    embeddings = normalized(120, 10)
+    run_graph(tmp_path / 'inkrementell', articles, embeddings)
+
+    for i in (3, 50, 119):
+        edit(articles[i], rng)
+        embeddings[i] = normalized(1, i)[0]
+        graph, rows = run_graph(tmp_path / 'inkrementell', articles, embeddings)
+    full, _ = run_graph(tmp_path / 'komplett', articles, embeddings)
+
+    assert not graph.stats['full'] and len(rows) < len(articles)
+    everything = range(len(articles))
+    assert graph.rule_connections(everything) == full.rule_connections(everything)
+    patched, expected = graph.similar(everything), full.similar(everything)
+    for url in expected:
+        assert [c['url'] for c in patched[url]] == [c['url'] for c in expected[url]]
+        assert [c['similarity'] for c in patched[url]] == pytest.approx([c['similarity'] for c in expected[url]])
+
+
+def test_interrupted_or_changed_graph_is_rebuilt(tmp_path):
+    articles = random_articles(60, 11)
+    run_graph(tmp_path, articles)
+
+    (tmp_path / 'graph.json').unlink()
+    graph, _ = run_graph(tmp_path, articles)
+    assert graph.stats['full']
+
+    graph, rows = run_graph(tmp_path, articles)
+    assert not graph.stats['full'] and len(rows) == 0
+
+    changed = ConnectionGraph(tmp_path, {}, RELATED_CATEGORIES)
+    changed.update(articles, fingerprints(articles))
+    assert changed.stats['full']
+
+
+@pytest.mark.skipif(not LEGACY_FILE.exists(), reason='data/blog-intelligence.json fehlt')
+def test_incremental_run_rewrites_only_affected_articles(tmp_path, monkeypatch, capsys):
+    connections = load_script('generate-smart-connections')
+    shutil.copy(LEGACY_FILE, tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(connections, 'STORE_DIR', tmp_path / 'intelligence')
+    monkeypatch.setattr(connections, 'OUTPUT_FILE', tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(connections, 'GRAPH_DIR', tmp_path / 'connection-graph')
+
+    def run(*argv):
+        monkeypatch.setattr(sys, 'argv', ['generate-smart-connections.py', '--no-embeddings', *argv])
+        connections.main()
+        exported = json.loads((tmp_path / 'blog-intelligence.json').read_text(encoding='utf-8'))
+        return {a['url']: [(c['url'], c['type'], c['score']) for c in a.get('related', [])]
+                for a in exported['articles'] if a.get('type') == 'blog'}
+
+    run('--incremental')
+    store = connections.IntelligenceStore(tmp_path / 'intelligence')
+    article = copy.deepcopy(next(a for a in store.load() if a.get('type') == 'blog'))
+    article['analysis']['tiefenthemen'] = ['selbstliebe', 'innere-ruhe']
+    store.update([article])
+    store.save()
+
+    capsys.readouterr()
+    incremental = run('--incremental')
+    output = capsys.readouterr().out
+    assert '1 geändert' in output
+    written = int(output.split('Shards geschrieben')[0].rsplit('(', 1)[1])
+
+    assert incremental == run()
+    assert written < len(incremental)
@@ -0,0 +1,266 @@
+"""
+Tests für connection_scoring (vektorisierte regelbasierte Verbindungen in
+generate-smart-connections.py) gegen die frühere paarweise Python-Schleife.
+"""
+
+import json
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('numpy')
+
+import connection_scoring  # noqa: E402
+
+connections = load_script('generate-smart-connections')
+JOURNEY_MAPS = connections.JOURNEY_MAPS
+RELATED_CATEGORIES = connections.RELATED_CATEGORIES
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+LEGACY_FILE = REPO_ROOT / 'data' / 'blog-intelligence.json'
+
+
+# --- Referenz: die paarweise Implementierung vor der Vektorisierung (unverändert) ---
+
+def calculate_theme_similarity(themes1, themes2):
+    """Berechnet Ähnlichkeit basierend auf gemeinsamen Themen"""
+    if not themes1 or not themes2:
+        return 0
+
+    # Exakte Übereinstimmungen
+    common = set(themes1) & set(themes2)
+    score = len(common) * 10
+
+    # Partielle Übereinstimmungen (Substring-Match)
+    for t1 in themes1:
+        for t2 in themes2:
+            if t1 != t2:
+                if t1 in t2 or t2 in t1:
+                    score += 3
+                # Wortweise Überlappung
+                words1 = set(t1.split('-'))
+                words2 = set(t2.split('-'))
+                common_words = words1 & words2
+                if common_words:
+                    score += len(common_words) * 2
+
+    return score
+
+
+def calculate_transformation_similarity(trans1, trans2):
+    """Berechnet Ähnlichkeit basierend auf Transformationen"""
+    if not trans1 or not trans2:
+        return 0
+
+    score = 0
+
+    # Gleicher Ausgangszustand
+    if trans1.get('von', '').lower() == trans2.get('von', '').lower():
+        score += 8
+
+    # Gleicher Zielzustand
+    if trans1.get('zu', '').lower() == trans2.get('zu', '').lower():
+        score += 8
+
+    # Zielzustand von einem ist Ausgangszustand vom anderen (Reise!)
+    if trans1.get('zu', '').lower() == trans2.get('von', '').lower():
+        score += 15  # Sehr hohe Relevanz für "nächster Schritt"
+
+    return score
+
+
+def find_journey_connection(article, all_articles):
+    """Findet Artikel die auf der gleichen Reise weiterführen"""
+    connections = []
+
+    analysis = article.get('analysis', {})
+    themes = analysis.get('tiefenthemen', [])
+
+    for journey_name, journey in JOURNEY_MAPS.items():
+        # Ist dieser Artikel Teil einer Reise?
+        if any(t in themes for t in journey['themes']):
+            # Finde Artikel mit "next" Themen
+            for other in all_articles:
+                if other['url'] == article['url']:
+                    continue
+
+                other_themes = other.get('analysis', {}).get('tiefenthemen', [])
+                if any(t in other_themes for t in journey['next']):
+                    connections.append({
+                        'url': other['url'],
+                        'type': journey['type'],
+                        'score': 20,
+                        'journey': journey_name
+                    })
+
+    return connections
+
+
+def reference_connections(articles):
+    """Berechnet Verbindungen ohne Embeddings (regelbasiert)"""
+
+    connections = {}
+
+    for article in articles:
+        url = article['url']
+        analysis = article.get('analysis', {})
+        category = article.get('category', '')
+        themes = analysis.get('tiefenthemen', [])
+        transformation = analysis.get('transformation', {})
+
+        scored_connections = []
+
+        for other in articles:
+            if other['url'] == url:
+                continue
+
+            other_analysis = other.get('analysis', {})
+            other_category = other.get('category', '')
+            other_themes = other_analysis.get('tiefenthemen', [])
+            other_transformation = other_analysis.get('transformation', {})
+
+            score = 0
+            conn_type = 'ergaenzung'
+
+            # 1. Gleiche Kategorie
+            if category == other_category:
+                score += 15
+                conn_type = 'vertiefung'
+
+            # 2. Verwandte Kategorie
+            elif other_category in RELATED_CATEGORIES.get(category, []):
+                score += 8
+                conn_type = 'ergaenzung'
+
+            # 3. Themen-Ähnlichkeit
+            theme_score = calculate_theme_similarity(themes, other_themes)
+            score += theme_score
+            if theme_score > 15:
+                conn_type = 'vertiefung'
+
+            # 4. Transformations-Ähnlichkeit
+            trans_score = calculate_transformation_similarity(transformation, other_transformation)
+            score += trans_score
+            if trans_score > 10:
+                conn_type = 'naechster-schritt'
+
+            # 5. Gleiche emotionale Tonalität
+            if analysis.get('emotionaleTonalitaet') == other_analysis.get('emotionaleTonalitaet'):
+                score += 5
+
+            # 6. Gleiche Lebensphase
+            phases1 = set(analysis.get('lebensphase', []))
+            phases2 = set(other_analysis.get('lebensphase', []))
+            if phases1 & phases2:
+                score += 5
+
+            if score > 0:
+                scored_connections.append({
+                    'url': other['url'],
+                    'score': score,
+                    'type': conn_type
+                })
+
+        # Journey-Connections hinzufügen
+        journey_conns = find_journey_connection(article, articles)
+        for jc in journey_conns:
+            existing = next((c for c in scored_connections if c['url'] == jc['url']), None)
+            if existing:
+                existing['score'] += jc['score']
+                existing['type'] = jc['type']
+            else:
+                scored_connections.append(jc)
+
+        # Sortiere und nimm Top 10
+        scored_connections.sort(key=lambda x: x['score'], reverse=True)
+        connections[url] = scored_connections[:10]
+
+    return connections
+
+
+# --- Ende Referenz ---
+
+
+WORDS = ['angst', 'vor', 'eigener', 'groesse', 'selbst', 'liebe', 'innere', 'ruhe', 'los', 'lassen',
+         'koerper', 'als', 'verbuendeter', 'mut', 'ich', 'a', '']
+THEMES = sorted({theme for journey in JOURNEY_MAPS.values() for theme in journey['themes'] + journey['next']})
+STATES = ['Angst', 'angst', 'Vertrauen', 'Selbstzweifel', 'Klarheit', '']
+
+
+def random_articles(n, seed):
+    rng = random.Random(seed)
+    vocabulary = THEMES + ['-'.join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(60)]
+    articles = []
+    for i in range(n):
+        analysis = {
+            'tiefenthemen': [rng.choice(vocabulary) for _ in range(rng.randint(0, 6))],
+            'lebensphase': rng.sample(['midlife', 'neuanfang', 'burnout', 'alltag'], rng.randint(0, 2)),
+            'transformation': rng.choice([{}, {'von': rng.choice(STATES), 'zu': rng.choice(STATES)},
+                                          {'zu': rng.choice(STATES)}, {'von': rng.choice(STATES)}]),
+        }
+        if rng.random() < 0.8:
+            analysis['emotionaleTonalitaet'] = rng.choice(['heilend', 'ermutigend', 'liebevoll'])
+        for key in ('lebensphase', 'transformation', 'tiefenthemen'):
+            if rng.random() < 0.1:
+                del analysis[key]
+        article = {'url': f"artikel-{i}.html", 'title': f"Artikel {i}"}
+        if rng.random() < 0.95:
+            article['analysis'] = analysis
+        if rng.random() < 0.9:
+            article['category'] = rng.choice(list(RELATED_CATEGORIES) + ['', 'sonstiges'])
+        articles.append(article)
+    return articles
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_matches_pairwise_reference(seed, capsys):
+    articles = random_articles(250, seed)
+
+    assert connections.calculate_connections_rule_based(articles) == reference_connections(articles)
+
+
+@pytest.mark.skipif(not LEGACY_FILE.exists(), reason='data/blog-intelligence.json fehlt')
+def test_matches_pairwise_reference_on_blog(capsys):
+    data = json.loads(LEGACY_FILE.read_text(encoding='utf-8'))
+    articles = [article for article in data['articles'] if article.get('type') == 'blog']
+
+    assert connections.calculate_connections_rule_based(articles) == reference_connections(articles)
+
+
+def test_many_overlapping_journeys(monkeypatch, capsys):
+    rng = random.Random(6)
+    journeys = {
+        f"reise-{j}": {'themes': rng.sample(THEMES, rng.randint(1, 3)) + ['gibt-es-nicht'],
+                       'next': rng.sample(THEMES, rng.randint(1, 3)),
+                       'type': rng.choice(['vertiefung', 'naechster-schritt', 'neue-perspektive'])}
+        for j in range(40)
+    }
+    monkeypatch.setattr(connections, 'JOURNEY_MAPS', journeys)
+    monkeypatch.setitem(globals(), 'JOURNEY_MAPS', journeys)
+    articles = random_articles(150, 6)
+
+    assert connections.calculate_connections_rule_based(articles) == reference_connections(articles)
+
+
+def test_small_blocks_give_the_same_result(monkeypatch, capsys):
+    articles = random_articles(120, 4)
+    expected = connections.calculate_connections_rule_based(articles)
+
+    monkeypatch.setattr(connection_scoring, 'BLOCK_BUDGET', 1)
+
+    assert connections.calculate_connections_rule_based(articles) == expected
+
+
+def test_scales_to_thousands_of_articles(capsys):
+    articles = random_articles(4000, 5)
+
+    start = time.monotonic()
+    result = connections.calculate_connections_rule_based(articles)
+
+    assert time.monotonic() - start < 30
+    assert len(result) == 4000
+    assert all(len(related) == 10 for related in result.values())
@@ -0,0 +1,183 @@
+"""
+Golden-Tests für ContentCleaner.clean_content (migrate-blog-complete.py):
+Die Single-Pass-Variante muss exakt die Ausgabe der bisherigen BeautifulSoup-Variante liefern.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import FIXTURES_DIR, load_script
+
+pytest.importorskip('bs4')
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+migrate = load_script('migrate-blog-complete')
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+WP_POSTS = sorted((REPO_ROOT / 'wp-json' / 'wp' / 'v2' / 'posts').glob('*.json'))
+
+
+def reference_clean_content(html):
+    """Bisherige Implementierung (unverändert übernommen)"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    content_selectors = [
+        '.entry-content',
+        '.post-content',
+        'article .elementor-widget-container',
+        '.blog-post-content'
+    ]
+
+    content_div = None
+    for selector in content_selectors:
+        content_div = soup.select_one(selector)
+        if content_div:
+            break
+
+    if not content_div:
+        content_div = soup.find('article')
+
+    if not content_div:
+        return ""
+
+    for tag in content_div.find_all(['script', 'style', 'noscript', 'iframe']):
+        tag.decompose()
+
+    for tag in content_div.find_all(True):
+        if tag.has_attr('class'):
+            if tag.name not in ['p', 'h1', 'h2', 'h3', 'h4', 'ul', 'ol', 'li', 'blockquote', 'strong', 'em', 'a', 'img']:
+                tag.unwrap()
+            else:
+                del tag['class']
+
+        if tag.has_attr('style'):
+            del tag['style']
+
+        attrs_to_remove = [attr for attr in tag.attrs if attr.startswith('data-')]
+        for attr in attrs_to_remove:
+            del tag[attr]
+
+    for b in content_div.find_all('b'):
+        b.name = 'strong'
+    for i in content_div.find_all('i'):
+        i.name = 'em'
+
+    for h1 in content_div.find_all('h1'):
+        h1.name = 'h2'
+
+    for tag in content_div.find_all():
+        if not tag.get_text(strip=True) and not tag.find('img'):
+            tag.decompose()
+
+    content_html = str(content_div)
+
+    content_html = re.sub(r'&nbsp;', ' ', content_html)
+    content_html = re.sub(r'\xa0', ' ', content_html)
+    content_html = re.sub(r'<p>\s*</p>', '', content_html)
+    content_html = re.sub(r'<p>\s*<br\s*/?>\s*</p>', '', content_html)
+    content_html = re.sub(r'\n{3,}', '\n\n', content_html)
+
+    content_html = re.sub(r'^<div[^>]*>', '', content_html)
+    content_html = re.sub(r'</div>$', '', content_html)
+
+    return content_html.strip()
+
+
+def wordpress_page(post, wrapper):
+    """Vollständige Seite wie auf der alten WordPress-Seite, mit Header/Footer-Ballast"""
+    head = post.get('yoast_head', '')
+    body = post['content']['rendered']
+    chrome = (
+        '<header class="site-header"><nav class="menu"><ul><li class="menu-item">'
+        '<a href="/blog">Blog</a></li></ul></nav><script>var x = "<p>";</script></header>'
+    )
+    footer = '<footer class="site-footer"><div class="elementor-widget-container"><p>© Kathrin</p></div></footer>'
+    return (
+        f'<!DOCTYPE html><html lang="de-DE"><head>{head}</head><body class="single">'
+        f'{chrome}{wrapper.format(content=body)}{footer}</body></html>'
+    )
+
+
+WRAPPERS = {
+    'entry-content': '<article class="post"><div class="entry-content" style="x">{content}</div></article>',
+    'elementor': '<article class="post"><div class="elementor-widget-container">{content}</div></article>',
+    'article': '<article class="post hentry" data-id="1">\n{content}\n</article>',
+}
+
+EDGE_CASES = [
+    # Bilder, <br>, leere Absätze, &nbsp;
+    '<div class="entry-content"><p><img src="a.jpg" class="wp-image"></p>\n\n\n<p>&nbsp;</p><p>Text<br>mehr</p></div>',
+    # Wrapper mit Klasse, <b>/<i> mit und ohne Klasse, h1
+    '<div class="entry-content"><div class="x"><span class="y"><b>fett</b> <i class="z">kursiv</i></span></div>'
+    '<h1 class="t" style="c">Titel</h1><b class="q">weg</b></div>',
+    # Kommentare (Gutenberg), Entities, Anführungszeichen in Attributen
+    '<div class="entry-content"><!-- wp:paragraph --><p title="Sag &quot;Ja&quot;">A &amp; B &lt;3 &#8211; &hellip;</p>'
+    '<!-- /wp:paragraph --><p><!-- nur Kommentar --></p><a href="x" title="Bob\'s">Link</a></div>',
+    # Script/Noscript/Iframe mit Bildern, Links um Bilder, data-Attribute
+    '<div class="entry-content"><noscript><img src="n.jpg"></noscript><figure><img src="f.jpg"></figure>'
+    '<a href="/x" data-id="3"><img src="i.jpg"></a><iframe src="v"></iframe><script>1 < 2</script></div>',
+    # Nicht geschlossene Tags und verschachtelte Absätze
+    '<div class="entry-content"><p>eins<p>zwei<p><p></p></p><ul><li>a<li>b</ul><div>ohne Klasse</div>',
+    # Kein Selektor trifft: erstes <article>; kein Content: leerer String
+    '<html><body><article id="a1" class="post  x"><h2>Nur Article</h2>\n\n\n\n<p> </p></article></body></html>',
+    '<html><body><main><p>Nichts</p></main></body></html>',
+    # .post-content vor .entry-content in der Priorität, article-Filter für Elementor
+    '<div class="elementor-widget-container"><p>außerhalb</p></div><div class="post-content"><p>post</p></div>',
+    '<section class="blog-post-content"><p>blog</p></section><article><div class="elementor-widget-container">'
+    '<p>elementor</p></div></article>',
+    # Whitespace in <pre>, Ruby-Text, verschachtelte Listen mit Klassen
+    '<div class="entry-content"><pre>  \n  </pre><p><ruby>漢<rt>kan</rt></ruby></p>'
+    '<ul class="list"><li class="item"><strong class="s">A</strong></li></ul></div>',
+    # Tief verschachtelte, nie geschlossene Absätze
+    '<div class="entry-content">' + '<p>x' * 2000 + '</div>',
+]
+
+
+@pytest.mark.skipif(not WP_POSTS, reason='wp-json Spiegel fehlt')
+@pytest.mark.parametrize('wrapper', WRAPPERS)
+def test_matches_reference_on_mirrored_wordpress_posts(wrapper):
+    for post_file in WP_POSTS:
+        post = json.loads(post_file.read_text(encoding='utf-8'))
+        html = wordpress_page(post, WRAPPERS[wrapper])
+
+        assert migrate.ContentCleaner.clean_content(html) == reference_clean_content(html), post_file.name
+
+
+@pytest.mark.parametrize('html', EDGE_CASES)
+def test_matches_reference_on_edge_cases(html):
+    assert migrate.ContentCleaner.clean_content(html) == reference_clean_content(html)
+
+
+def test_matches_reference_on_crawler_fixture():
+    html = (FIXTURES_DIR / 'wordpress' / 'post.html').read_text(encoding='utf-8').replace('{title}', 'Dankbarkeit')
+
+    cleaned = migrate.ContentCleaner.clean_content(html)
+
+    assert cleaned == reference_clean_content(html)
+    assert '<strong>Du darfst dir selbst vertrauen.</strong>' in cleaned
+
+
+def test_faster_than_reference_on_large_page():
+    body = ''.join(
+        f'<div class="elementor-section"><div class="elementor-column"><div class="elementor-widget-wrap">'
+        f'<p class="x" style="y">Absatz {i} mit <b>Text</b> &amp; <a href="/{i}">Link</a></p></div></div></div>'
+        for i in range(1500)
+    )
+    html = f'<html><body><nav>{"<a href=/>Menü</a>" * 500}</nav><article><div class="entry-content">{body}</div>' \
+           f'</article><footer>{"<p>Footer</p>" * 500}</footer></body></html>'
+
+    start = time.perf_counter()
+    cleaned = migrate.ContentCleaner.clean_content(html)
+    single_pass = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = reference_clean_content(html)
+    reference = time.perf_counter() - start
+
+    assert cleaned == expected
+    assert single_pass < reference / 2
@@ -0,0 +1,154 @@
+"""
+Tests für extract_content (convert-blog-posts.py):
+Der Tokenizer-Durchlauf muss die Ausgabe der bisherigen Regex-Variante liefern
+und bleibt auch bei kaputtem Markup linear.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import load_script
+
+convert = load_script('convert-blog-posts')
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+WP_POSTS = sorted((REPO_ROOT / 'wp-json' / 'wp' / 'v2' / 'posts').glob('*.json'))
+
+# Grenze für die pathologischen Eingaben; die alte Variante brauchte dafür 4–30 s
+TIME_LIMIT = 1.0
+
+
+def reference_extract_content(html):
+    """Bisherige Implementierung (unverändert übernommen)"""
+    content_parts = []
+
+    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+
+    text_widgets = re.findall(
+        r'<div class="elementor-widget-container">\s*(.*?)\s*</div>\s*</div>',
+        html, flags=re.DOTALL
+    )
+
+    for widget in text_widgets:
+        text = widget.strip()
+        if not text or len(text) < 50:
+            continue
+
+        text = re.sub(r'<div[^>]*class="[^"]*elementor[^"]*"[^>]*>', '', text)
+        text = re.sub(r'</div>', '', text)
+
+        text = re.sub(r'\s*style="[^"]*"', '', text)
+        text = re.sub(r'\s*class="[^"]*"', '', text)
+        text = re.sub(r'\s*data-[a-z-]+="[^"]*"', '', text)
+
+        text = re.sub(r'<span[^>]*font-weight:\s*bold[^>]*>(.*?)</span>', r'<strong>\1</strong>', text, flags=re.DOTALL)
+        text = re.sub(r'<b>(.*?)</b>', r'<strong>\1</strong>', text, flags=re.DOTALL)
+
+        text = re.sub(r'<span[^>]*>\s*</span>', '', text)
+        text = re.sub(r'<p>\s*</p>', '', text)
+        text = re.sub(r'<h[1-6]>\s*</h[1-6]>', '', text)
+
+        text = re.sub(r'\n\s*\n', '\n\n', text)
+        text = re.sub(r'  +', ' ', text)
+
+        if len(text.strip()) > 100:
+            content_parts.append(text.strip())
+
+    if not content_parts:
+        match = re.search(r'<article[^>]*>(.*?)</article>', html, flags=re.DOTALL)
+        if match:
+            content_parts.append(match.group(1))
+
+    return '\n\n'.join(content_parts)
+
+
+def widget(content):
+    return (
+        '<div class="elementor-element elementor-element-1a2b elementor-widget elementor-widget-text-editor" '
+        f'data-id="1a2b" data-element_type="widget">\n<div class="elementor-widget-container">\n{content}\n'
+        '</div>\n</div>'
+    )
+
+
+def elementor_page(post):
+    """Elementor-Seite aus den Absätzen eines gespiegelten Posts (drei Blöcke pro Text-Widget)"""
+    blocks = [
+        match.group(0)
+        for match in re.finditer(r'<(p|h[1-6]|ul|ol|blockquote)\b[^>]*>.*?</\1>', post['content']['rendered'], re.DOTALL)
+        if '<div' not in match.group(0)
+    ]
+    widgets = [widget('\n\n'.join(blocks[i:i + 3])) for i in range(0, len(blocks), 3)]
+    return (
+        '<!DOCTYPE html><html><head><style>.x{color:red}</style></head><body>'
+        '<script>document.write("<div class=\\"elementor-widget-container\\">")</script>'
+        '<div class="elementor elementor-1234"><section class="elementor-section"><div class="elementor-container">'
+        + '\n'.join(widgets) +
+        '</div></section></div></body></html>'
+    )
+
+
+EDGE_CASES = [
+    # Inline-Styles, class/data-Attribute, <b>, leere span/p/h*
+    widget('<p style="text-align: center;" class="x" data-id="3">Ein Absatz mit <b>fettem</b> und '
+           '<span style="color: red;"></span>gefärbtem Text, lang genug für das Minimum von hundert Zeichen.</p>'
+           '<p> </p><h2></h2><h3 class="leer"> </h3>'),
+    # Zu kurze Widgets fallen weg, Fallback auf <article>
+    '<article class="post">' + widget('<p>kurz</p>') + '<p>Artikeltext</p></article>',
+    # Kein Widget und kein Article
+    '<main><p>Nichts</p></main>',
+    # Mehrfache Leerzeichen und Leerzeilen
+    widget('<p>Viel    Platz   zwischen     den Wörtern</p>\n  \n \n<p>und zwischen den Absätzen, '
+           'damit insgesamt mehr als hundert Zeichen zusammenkommen.</p>'),
+]
+
+
+@pytest.mark.skipif(not WP_POSTS, reason='wp-json Spiegel fehlt')
+def test_matches_reference_on_mirrored_wordpress_posts():
+    for post_file in WP_POSTS:
+        html = elementor_page(json.loads(post_file.read_text(encoding='utf-8')))
+
+        assert convert.extract_content(html) == reference_extract_content(html), post_file.name
+
+
+@pytest.mark.parametrize('html', EDGE_CASES)
+def test_matches_reference_on_edge_cases(html):
+    assert convert.extract_content(html) == reference_extract_content(html)
+
+
+def test_nested_divs_stay_inside_their_widget():
+    html = widget(
+        '<p>Vor dem Kasten steht ein längerer Absatz, damit das Widget über hundert Zeichen kommt.</p>'
+        '<div class="box"><p>Im Kasten</p></div><p>Nach dem Kasten geht es weiter.</p>'
+    )
+
+    content = convert.extract_content(html)
+
+    assert '<div><p>Im Kasten</p></div>' in content
+    assert content.endswith('<p>Nach dem Kasten geht es weiter.</p>')
+
+
+PATHOLOGICAL = {
+    'unclosed-widgets': '<div class="elementor-widget-container"><p>x</p>' * 4000,
+    'unclosed-article': '<article>' + '<div>' * 4000 + 'Text',
+    'unclosed-comment': '<p>Text</p><!--' + '<div class="elementor-widget-container">' * 4000,
+    'unclosed-tag': '<div class="elementor-widget-container"><a href="' + 'x' * 200000,
+    'stray-brackets': widget('<p>' + 'a < b ' * 50000 + '</p>'),
+    'whitespace': widget('<p>' + ' \n' * 200000 + '</p>'),
+    'unclosed-script': '<script>' + '<div class="elementor-widget-container">' * 4000,
+}
+
+
+@pytest.mark.parametrize('name', PATHOLOGICAL)
+def test_pathological_input_stays_linear(name):
+    html = PATHOLOGICAL[name]
+
+    start = time.perf_counter()
+    convert.extract_content(html)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < TIME_LIMIT, f"{name}: {elapsed:.2f}s"
@@ -0,0 +1,78 @@
+"""
+Tests für embedding_similarity.top_k_similar gegen die frühere paarweise
+Kosinus-Berechnung aus generate-smart-connections.py.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import embedding_similarity  # noqa: E402
+from embedding_similarity import top_k_similar  # noqa: E402
+
+
+def reference_top_k(embeddings, k=15):
+    """Die frühere Schleife: Kosinus pro Paar, stabil absteigend sortiert"""
+    def cosine_similarity(a, b):
+        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+
+    result = []
+    for i in range(len(embeddings)):
+        similarities = [(j, float(cosine_similarity(embeddings[i], embeddings[j])))
+                        for j in range(len(embeddings)) if i != j]
+        similarities.sort(key=lambda x: x[1], reverse=True)
+        result.append(similarities[:k])
+    return result
+
+
+def random_embeddings(n, d=48, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, d)).tolist()
+
+
+def assert_matches_reference(embeddings, indices, scores):
+    for row, expected in enumerate(reference_top_k(embeddings)):
+        assert indices[row].tolist() == [j for j, _ in expected]
+        assert scores[row] == pytest.approx([sim for _, sim in expected], abs=1e-5)
+
+
+@pytest.mark.parametrize('block_size', [1024, 64, 7])
+def test_matches_pairwise_cosine(block_size):
+    embeddings = random_embeddings(300)
+
+    indices, scores = top_k_similar(embeddings, k=15, block_size=block_size)
+
+    assert indices.shape == scores.shape == (300, 15)
+    assert_matches_reference(embeddings, indices, scores)
+
+
+def test_large_matrices_are_memory_mapped(tmp_path, monkeypatch):
+    embeddings = np.asarray(random_embeddings(200))
+    created = []
+    open_memmap = np.lib.format.open_memmap
+    monkeypatch.setattr(embedding_similarity, 'MEMMAP_MIN_BYTES', 0)
+    monkeypatch.setattr(np.lib.format, 'open_memmap', lambda *a, **kw: created.append(a[0]) or open_memmap(*a, **kw))
+
+    indices, scores = top_k_similar(embeddings, block_size=32, workdir=tmp_path)
+
+    assert created and created[0].parent.parent == tmp_path
+    assert list(tmp_path.iterdir()) == []
+    assert_matches_reference(embeddings.tolist(), indices, scores)
+
+
+def test_ties_prefer_earlier_articles_and_skip_self():
+    base = [1.0, 0.0, 0.0]
+    embeddings = [base, [0.0, 1.0, 0.0], base, base, [0.0, 0.0, 0.0]]
+
+    indices, scores = top_k_similar(embeddings, k=3, block_size=2)
+
+    assert indices[0].tolist() == [2, 3, 1]
+    assert indices[3].tolist() == [0, 2, 1]
+    assert scores[0].tolist() == [1.0, 1.0, 0.0]
+    # Nullvektor: Ähnlichkeit 0 statt NaN
+    assert not np.isnan(scores).any()
+
+
+def test_tiny_catalogs():
+    assert top_k_similar([[1.0, 2.0]])[0].shape == (1, 0)
+    indices, _ = top_k_similar([[1.0, 0.0], [0.0, 1.0]], k=15)
+    assert indices.tolist() == [[1], [0]]
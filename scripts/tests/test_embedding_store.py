@@ -0,0 +1,118 @@
+"""
+Tests für embedding_store.EmbeddingStore und die Offline-Neuberechnung in
+generate-smart-connections.py.
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import load_script  # noqa: E402
+from embedding_store import EmbeddingStore, embedding_batches  # noqa: E402
+
+MODEL = 'text-embedding-3-small'
+LEGACY_FILE = Path(__file__).parent.parent.parent / 'data' / 'blog-intelligence.json'
+
+
+def fake_vectors(texts, d=8):
+    return [np.random.default_rng(sum(map(ord, text))).normal(size=d) for text in texts]
+
+
+def test_vectors_survive_reopening(tmp_path):
+    store = EmbeddingStore(tmp_path, MODEL)
+    store.add(['a', 'b', 'c'], fake_vectors(['a', 'b', 'c']))
+    store.save()
+
+    store = EmbeddingStore(tmp_path, MODEL)
+
+    assert isinstance(store.matrix, np.memmap) and store.matrix.dtype == np.float32
+    assert np.allclose(store.get(['c', 'a']), np.asarray(fake_vectors(['c', 'a']), dtype=np.float32))
+    assert store.missing(['a', 'neu', 'b', 'neu']) == ['neu']
+
+
+def test_only_new_texts_are_appended(tmp_path):
+    store = EmbeddingStore(tmp_path, MODEL)
+    store.add(['a', 'b'], fake_vectors(['a', 'b']))
+    size = store.vectors_file.stat().st_size
+
+    store.add(['b', 'c'], fake_vectors(['b', 'c']))
+
+    assert len(store) == 3
+    assert store.vectors_file.stat().st_size == size * 3 // 2
+
+
+def test_model_change_invalidates(tmp_path):
+    store = EmbeddingStore(tmp_path, MODEL)
+    store.add(['a', 'b'], fake_vectors(['a', 'b']))
+    store.save()
+
+    other = EmbeddingStore(tmp_path, 'text-embedding-3-large')
+    other.add(['a'], fake_vectors(['a'], d=16))
+    other.save()
+
+    assert other.stats['invalidated'] == 2
+    assert other.missing(['a', 'b']) == ['b']
+    assert EmbeddingStore(tmp_path, MODEL).missing(['a', 'b']) == ['a', 'b']
+
+
+def test_rows_without_index_entry_are_discarded(tmp_path):
+    store = EmbeddingStore(tmp_path, MODEL)
+    store.add(['a'], fake_vectors(['a']))
+    store.save()
+    # Abbruch nach dem Anhängen, vor dem Speichern des Index
+    store.add(['verloren'], fake_vectors(['verloren']))
+
+    store = EmbeddingStore(tmp_path, MODEL)
+    store.add(['b'], fake_vectors(['b']))
+
+    assert np.allclose(store.get(['b']), np.asarray(fake_vectors(['b']), dtype=np.float32))
+    assert store.vectors_file.stat().st_size == 2 * 8 * 4
+
+
+def test_prune_compacts_into_a_new_file(tmp_path):
+    store = EmbeddingStore(tmp_path, MODEL)
+    store.add(['a', 'b', 'c'], fake_vectors(['a', 'b', 'c']))
+    store.save()
+    old_file = store.vectors_file
+
+    assert store.prune(['c', 'a']) == 1
+
+    reopened = EmbeddingStore(tmp_path, MODEL)
+    assert not old_file.exists() and [p.name for p in tmp_path.glob('*.f32')] == [reopened.vectors_file.name]
+    assert reopened.missing(['a', 'b', 'c']) == ['b']
+    assert np.allclose(reopened.get(['a', 'c']), np.asarray(fake_vectors(['a', 'c']), dtype=np.float32))
+
+
+def test_batches_are_capped():
+    texts = ['x' * 10] * 7 + ['y' * 100]
+
+    assert [len(batch) for batch in embedding_batches(texts, max_items=3, max_chars=1000)] == [3, 3, 2]
+    assert [len(batch) for batch in embedding_batches(texts, max_items=100, max_chars=35)] == [3, 3, 1, 1]
+
+
+@pytest.mark.skipif(not LEGACY_FILE.exists(), reason='data/blog-intelligence.json fehlt')
+def test_connections_are_recomputed_offline_from_the_store(tmp_path, monkeypatch, capsys):
+    connections = load_script('generate-smart-connections')
+    shutil.copy(LEGACY_FILE, tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(connections, 'STORE_DIR', tmp_path / 'intelligence')
+    monkeypatch.setattr(connections, 'OUTPUT_FILE', tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(connections, 'EMBEDDINGS_DIR', tmp_path / 'embeddings')
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.setattr(sys, 'argv', ['generate-smart-connections.py'])
+
+    articles = [a for a in json.loads(LEGACY_FILE.read_text(encoding='utf-8'))['articles'] if a.get('type') == 'blog']
+    texts = [connections.get_embedding_text(article) for article in articles]
+    store = EmbeddingStore(tmp_path / 'embeddings', connections.EMBEDDING_MODEL)
+    store.add(texts, fake_vectors(texts))
+    store.save()
+
+    connections.main()
+
+    exported = json.loads((tmp_path / 'blog-intelligence.json').read_text(encoding='utf-8'))
+    assert exported['embeddingsUsed'] is True
+    assert '0 neu' in capsys.readouterr().out
@@ -0,0 +1,116 @@
+"""
+Tests für extract_all (extract-blog-content.py): parallele Extraktion im
+Prozess-Pool, Cache pro Datei über den Content-Hash, stabile Reihenfolge.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('bs4')
+
+from extraction_cache import ExtractionCache  # noqa: E402
+
+extract = load_script('extract-blog-content')
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+PAGES = ['dankbarkeit.html', 'ehe-retten.html', 'gedankenkarussell.html', 'innere-fuehrung.html',
+         'podcast-6-tue-was-dir-wichtig-ist.html', 'retreats-in-portugal.html', 'impressum.html']
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / 'site'
+    root.mkdir()
+    for name in PAGES:
+        if not (REPO_ROOT / name).exists():
+            pytest.skip(f'{name} fehlt im Projekt')
+        shutil.copy(REPO_ROOT / name, root / name)
+    (root / 'leer.html').write_text('<html><head><title>Leer</title></head><body></body></html>', encoding='utf-8')
+    return root
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(tmp_path / 'cache.json', extract.EXTRACTOR_VERSION)
+
+
+def articles(results):
+    return [result['article'] for result in results if result['article']]
+
+
+def test_pool_matches_sequential_extraction(site, cache, monkeypatch):
+    # Der Pool pickelt _extract_worker über den Modulnamen; load_script() registriert ihn nicht
+    monkeypatch.setitem(sys.modules, extract.__name__, extract)
+    expected = extract.extract_all(list(site.glob('*.html')), workers=1)
+
+    results = extract.extract_all(list(site.glob('*.html')), cache, workers=3)
+
+    assert [result['file'] for result in results] == sorted(set(PAGES + ['leer.html']) - extract.EXCLUDE_FILES)
+    assert results == expected
+    assert articles(results) and not any(result['error'] or result['cached'] for result in results)
+    assert 'leer.html' in [result['file'] for result in results if result['skipped']]
+
+
+def test_unchanged_files_come_from_the_cache(site, tmp_path, monkeypatch):
+    cache_file = tmp_path / 'cache.json'
+    cache = ExtractionCache(cache_file, extract.EXTRACTOR_VERSION)
+    first = extract.extract_all(site.glob('*.html'), cache, workers=1)
+    cache.save()
+
+    changed = site / 'dankbarkeit.html'
+    changed.write_text(changed.read_text(encoding='utf-8').replace('</h1>', ' neu</h1>', 1), encoding='utf-8')
+    (site / 'ehe-retten.html').unlink()
+    parsed = []
+    real_extract = extract.extract_article
+    monkeypatch.setattr(extract, 'extract_article', lambda html, name: parsed.append(name) or real_extract(html, name))
+
+    cache = ExtractionCache(cache_file, extract.EXTRACTOR_VERSION)
+    second = extract.extract_all(site.glob('*.html'), cache, workers=1)
+
+    assert parsed == ['dankbarkeit.html']
+    assert cache.stats == {'hits': 5, 'misses': 1, 'removed': 1}
+    assert second[0]['article']['title'].endswith(' neu')
+    assert articles(second)[1:] == [article for article in articles(first) if article['url'] not in
+                                   ('dankbarkeit.html', 'ehe-retten.html')]
+
+
+def test_new_extractor_version_invalidates_cache(site, tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    cache = ExtractionCache(cache_file, extract.EXTRACTOR_VERSION)
+    extract.extract_all(site.glob('*.html'), cache, workers=1)
+    cache.save()
+
+    assert ExtractionCache(cache_file, extract.EXTRACTOR_VERSION).entries
+    assert ExtractionCache(cache_file, extract.EXTRACTOR_VERSION + 1).entries == {}
+
+
+def test_output_is_only_rewritten_when_articles_change(site, cache, tmp_path):
+    output_file = tmp_path / 'blog-content-raw.json'
+    found = articles(extract.extract_all(site.glob('*.html'), cache, workers=1))
+
+    assert extract.write_output(found, output_file)
+    mtime = output_file.stat().st_mtime_ns
+    assert not extract.write_output(found, output_file)
+    assert output_file.stat().st_mtime_ns == mtime
+    assert extract.write_output(found[1:], output_file)
+
+
+def test_cleared_cache_extracts_everything_again(site, tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    cache = ExtractionCache(cache_file, extract.EXTRACTOR_VERSION)
+    first = extract.extract_all(site.glob('*.html'), cache, workers=1)
+    cache.save()
+
+    cache = ExtractionCache(cache_file, extract.EXTRACTOR_VERSION)
+    cache.clear()
+    second = extract.extract_all(site.glob('*.html'), cache, workers=1)
+    cache.save()
+
+    assert cache.stats['hits'] == 0 and not any(result['cached'] for result in second)
+    assert articles(second) == articles(first)
+    assert set(ExtractionCache(cache_file, extract.EXTRACTOR_VERSION).entries) == {r['file'] for r in second}
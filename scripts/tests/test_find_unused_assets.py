@@ -0,0 +1,93 @@
+"""
+Tests für find-unused-assets.py: transitive Referenzen, generierte Reports
+zählen nicht als Referenz, Quarantäne und Wiederherstellung.
+"""
+
+import json
+import sys
+
+import pytest
+
+from conftest import load_script
+
+assets = load_script('find-unused-assets')
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    files = {
+        'index.html': '<link rel="stylesheet" href="wp-content/themes/t/style.css">'
+                      '<img src="/wp-content/uploads/b.png" srcset="wp-content/uploads/b-300.png 300w">',
+        'wp-content/themes/t/style.css': "body { background: url('../../uploads/bg.jpg'); }",
+        'wp-content/themes/t/unused.css': "body { background: url('../../uploads/nur-hier.jpg'); }",
+        'wp-content/uploads/a.png': 'a',
+        'wp-content/uploads/b.png': 'b',
+        'wp-content/uploads/b-300.png': 'b',
+        'wp-content/uploads/bg.jpg': 'bg',
+        'wp-content/uploads/nur-hier.jpg': 'x',
+        'data/html-analysis-report.json': json.dumps({'file': 'wp-content/uploads/nur-hier.jpg'}),
+        'data/http-cache/abc.json': json.dumps({'body': '<img src="/wp-content/uploads/a.png">'}),
+        'wp-json/wp/v2/posts/1.json': r'{"content": "<img src=\"\/wp-content\/uploads\/rest.jpg\">"}',
+        'wp-json/wp/v2/pages.json': '[]',
+        'wp-content/uploads/rest.jpg': 'r',
+    }
+    for rel, text in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+
+    monkeypatch.setattr(assets, 'PROJECT_ROOT', tmp_path)
+    monkeypatch.setattr(assets, 'REPORT_FILE', tmp_path / 'data' / 'unused-assets-report.json')
+    monkeypatch.setattr(assets, 'QUARANTINE_DIR', tmp_path / '_archive' / 'unused-assets')
+    return tmp_path
+
+
+def run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['find-unused-assets.py', *argv])
+    assets.main()
+    return json.loads(assets.REPORT_FILE.read_text(encoding='utf-8'))
+
+
+def test_references_are_followed_transitively(site):
+    indexer = assets.AssetReferenceIndexer(site)
+    indexer.build()
+    assert indexer.unreferenced() == [
+        'wp-content/themes/t/unused.css',
+        'wp-content/uploads/a.png',
+        'wp-content/uploads/nur-hier.jpg',
+    ]
+    assert indexer.referenced_by['wp-content/uploads/bg.jpg'] == {'wp-content/themes/t/style.css'}
+
+
+def test_report_of_previous_run_is_not_a_reference(site, monkeypatch):
+    first = run(monkeypatch)
+    second = run(monkeypatch)
+    assert [entry['path'] for entry in second['unreferenced']] == [entry['path'] for entry in first['unreferenced']]
+    assert 'wp-content/uploads/a.png' in {entry['path'] for entry in second['unreferenced']}
+
+    indexer = assets.AssetReferenceIndexer(site)
+    indexer.build()
+    assert all('data/' not in source for sources in indexer.referenced_by.values() for source in sources)
+
+
+def test_quarantine_on_second_run_and_restore(site, monkeypatch):
+    run(monkeypatch)
+    report = run(monkeypatch, '--quarantine')
+    assert 'wp-content/uploads/a.png' in report['quarantined']
+    assert not (site / 'wp-content/uploads/a.png').exists()
+    assert (assets.QUARANTINE_DIR / 'wp-content/uploads/a.png').exists()
+
+    run(monkeypatch, '--restore')
+    assert (site / 'wp-content/uploads/a.png').read_text(encoding='utf-8') == 'a'
+    assert not assets.QUARANTINE_DIR.exists()
+
+
+def test_rest_mirror_is_never_collected(site, monkeypatch):
+    run(monkeypatch)
+    report = run(monkeypatch, '--quarantine')
+    paths = {entry['path'] for entry in report['unreferenced']}
+    assert not any(path.startswith('wp-json/') for path in paths)
+    assert (site / 'wp-json/wp/v2/pages.json').exists()
+    # Bilder, die nur der REST-Spiegel verwendet, bleiben referenziert
+    assert 'wp-content/uploads/rest.jpg' not in paths
+    assert (site / 'wp-content/uploads/rest.jpg').exists()
@@ -0,0 +1,172 @@
+"""
+Tests für PostDeduplicator (migrate-blog-complete.py) und fuzzy_index:
+gleiche Ergebnisse wie der paarweise SequenceMatcher-Vergleich, aber indexiert.
+"""
+
+import random
+import time
+from difflib import SequenceMatcher
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('bs4')
+
+from fuzzy_index import SimHashIndex, hamming_distance, simhash  # noqa: E402
+
+migrate = load_script('migrate-blog-complete')
+
+WORDS = [
+    'angst', 'achtsamkeit', 'frieden', 'pferde', 'heldinnenreise', 'innere', 'führung', 'liebe',
+    'dankbarkeit', 'wut', 'geschenk', 'klarheit', 'neubeginn', 'retreat', 'portugal', 'ruhe',
+    'alltag', 'selbstwert', 'grenzen', 'setzen', 'hochbegabung', 'freude', 'wegweiser', 'mut',
+    'die', 'der', 'und', 'in', 'dir', 'wie', 'du', 'deine', 'vom', 'leben', 'ehe', 'kloß', 'hals',
+]
+
+
+def vocabulary(size, seed):
+    """Kunstwörter aus Silben – realistischer als wenige, sich ständig wiederholende Wörter"""
+    rng = random.Random(seed)
+
+    def syllable():
+        return rng.choice('bcdfghklmnprstvwz') + rng.choice('aeiouäöü') + rng.choice(['', '', 'n', 'r', 's', 'ch', 'l'])
+
+    return WORDS + [''.join(syllable() for _ in range(rng.randint(1, 4))) for _ in range(size)]
+
+
+def article(words, seed):
+    rng = random.Random(seed)
+    vocab = vocabulary(300, seed)
+    return ' '.join(rng.choice(vocab) for _ in range(words))
+
+
+def brute_force(old_posts, new_posts):
+    """Ursprünglicher Algorithmus: jedes Paar per SequenceMatcher"""
+    seen, result = set(), []
+    for new_post in new_posts:
+        if new_post['slug'] in seen:
+            continue
+        seen.add(new_post['slug'])
+        match = None
+        for old_post in old_posts:
+            if new_post['slug'] == old_post.get('slug', ''):
+                match = (old_post['slug'], 'slug')
+                break
+            if SequenceMatcher(None, new_post['title'].lower(), old_post.get('title', '').lower()).ratio() > 0.85:
+                match = (old_post['slug'], 'title')
+                break
+        result.append((new_post['slug'], match))
+    return result
+
+
+def mutate(title, rng):
+    """Tippfehler, vertauschte/fehlende Wörter wie bei umbenannten Posts"""
+    chars = list(title)
+    for _ in range(rng.randint(0, 3)):
+        if not chars:
+            break
+        position = rng.randrange(len(chars))
+        action = rng.random()
+        if action < 0.4:
+            chars[position] = rng.choice('aeiouäöünrst')
+        elif action < 0.7:
+            del chars[position]
+        else:
+            chars.insert(position, rng.choice('aeiou '))
+    return ''.join(chars) or title
+
+
+def generate_posts(count, seed, prefix, vocab=None):
+    rng = random.Random(seed)
+    vocab = vocab or vocabulary(count // 2, seed=0)
+    return [
+        {'slug': f"{prefix}-{i}", 'title': ' '.join(rng.choice(vocab) for _ in range(rng.randint(1, 7))).title()}
+        for i in range(count)
+    ]
+
+
+def make_new_posts(old_posts, count, seed):
+    rng = random.Random(seed)
+    new_posts = generate_posts(count, seed + 1, 'neu', vocab=vocabulary(len(old_posts) // 2, seed=0))
+    for post in new_posts:
+        roll = rng.random()
+        source = rng.choice(old_posts)
+        if roll < 0.3:
+            post['title'] = mutate(source['title'], rng)
+        elif roll < 0.4:
+            post['slug'] = source['slug']
+    return new_posts + new_posts[:20]  # interne Duplikate
+
+
+def summarize(unique_posts, duplicates):
+    result = {post['slug']: None for post in unique_posts}
+    result.update({new['slug']: (old['slug'], reason) for new, old, reason in duplicates})
+    return result
+
+
+def test_find_duplicates_matches_pairwise_comparison(capsys):
+    old_posts = generate_posts(250, seed=1, prefix='alt')
+    new_posts = make_new_posts(old_posts, 250, seed=2)
+
+    unique_posts, duplicates = migrate.PostDeduplicator().find_duplicates(old_posts, new_posts)
+
+    expected = brute_force(old_posts, new_posts)
+    assert summarize(unique_posts, duplicates) == dict(expected)
+    assert [p['slug'] for p in unique_posts] == [slug for slug, match in expected if match is None]
+    assert {reason for _, _, reason in duplicates} == {'slug', 'title'}
+
+
+def test_find_duplicates_stays_fast_with_thousands_of_posts(capsys):
+    old_posts = generate_posts(2000, seed=3, prefix='alt')
+    new_posts = make_new_posts(old_posts, 2000, seed=4)
+
+    start = time.perf_counter()
+    unique_posts, duplicates = migrate.PostDeduplicator().find_duplicates(old_posts, new_posts)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert len(unique_posts) + len(duplicates) == len({p['slug'] for p in new_posts})
+
+
+def test_simhash_detects_retitled_repost(capsys):
+    text = article(600, seed=7)
+    words = text.split()
+    words[10], words[300] = 'kurz', 'redigiert'
+    old_posts = [
+        {'slug': 'kloss-im-hals', 'title': 'Kloß im Hals', 'text': text},
+        {'slug': 'dankbarkeit', 'title': 'Dankbarkeit', 'text': article(600, seed=8)},
+    ]
+    new_posts = [
+        {'slug': 'wie-eine-aufstellung-hilft', 'title': 'Wie eine Aufstellung hilft', 'text': ' '.join(words)},
+        {'slug': 'kurz', 'title': 'Kurz', 'text': 'Zu kurz für einen Vergleich'},
+        {'slug': 'neu', 'title': 'Neu', 'text': article(600, seed=9)},
+    ]
+
+    unique_posts, duplicates = migrate.PostDeduplicator().find_content_duplicates(old_posts, new_posts)
+
+    assert [p['slug'] for p in unique_posts] == ['kurz', 'neu']
+    assert [(new['slug'], old['slug'], reason) for new, old, reason in duplicates] == \
+        [('wie-eine-aufstellung-hilft', 'kloss-im-hals', 'content')]
+
+    # Vorhandene Posts aus dem Post-Index bringen nur Wortzahl und SimHash mit
+    indexed = [{'slug': p['slug'], 'words': len(p['text'].split()), 'simhash': simhash(p['text'])} for p in old_posts]
+    _, indexed_duplicates = migrate.PostDeduplicator().find_content_duplicates(indexed, new_posts)
+    assert [(new['slug'], old['slug']) for new, old, _ in indexed_duplicates] == \
+        [('wie-eine-aufstellung-hilft', 'kloss-im-hals')]
+
+
+def test_simhash_index_finds_all_fingerprints_within_distance():
+    rng = random.Random(5)
+    index = SimHashIndex(max_distance=3)
+    fingerprints = [rng.getrandbits(64) for _ in range(500)]
+    for fingerprint in fingerprints:
+        index.add(fingerprint)
+
+    query = fingerprints[42] ^ (1 << 3) ^ (1 << 40) ^ (1 << 63)
+
+    assert index.matches(query) == [
+        i for i, fingerprint in enumerate(fingerprints) if hamming_distance(query, fingerprint) <= 3
+    ]
+    assert 42 in index.matches(query)
+    assert simhash(article(100, seed=1)) == simhash(article(100, seed=1))
@@ -0,0 +1,143 @@
+"""
+Tests für http_cache.HTTPCache: Conditional GETs über den async und den sync Crawler.
+"""
+
+import asyncio
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+
+from async_http import AsyncHTTPPool  # noqa: E402
+from http_cache import HTTPCache  # noqa: E402
+
+migrate = load_script('migrate-blog-complete')
+
+PAGE = '<html><body><article class="post"><p>Stille und Klarheit</p></article></body></html>'
+ETAG = '"v1"'
+LAST_MODIFIED = 'Wed, 01 Oct 2025 08:00:00 GMT'
+
+
+def validating_route(body=PAGE, etag=ETAG, last_modified=LAST_MODIFIED):
+    """Antwortet mit 304 wenn der Client den aktuellen Stand schon hat"""
+    def route(handler):
+        if etag and handler.headers.get('If-None-Match') == etag:
+            return 304, b'', {'ETag': etag}
+        if not etag and last_modified and handler.headers.get('If-Modified-Since') == last_modified:
+            return 304, b'', {}
+        headers = {}
+        if etag:
+            headers['ETag'] = etag
+        if last_modified:
+            headers['Last-Modified'] = last_modified
+        return 200, body, headers
+    return route
+
+
+def fetch_all(urls, cache):
+    async def run():
+        async with AsyncHTTPPool(cache=cache) as pool:
+            return [await pool.fetch(url) for url in urls]
+    return asyncio.run(run())
+
+
+def test_second_run_is_served_from_cache(stand_in_server, tmp_path):
+    server = stand_in_server({'/a/': validating_route(), '/b/': validating_route(etag=None)})
+    urls = [f"{server.url}/a/", f"{server.url}/b/"]
+
+    first_cache = HTTPCache(tmp_path)
+    first = fetch_all(urls, first_cache)
+    first_cache.save()
+
+    second_cache = HTTPCache(tmp_path)
+    second = fetch_all(urls, second_cache)
+
+    assert [r.text for r in first] == [PAGE, PAGE]
+    assert [r.text for r in second] == [PAGE, PAGE]
+    assert all(r.from_cache for r in second)
+    assert second_cache.stats['hits'] == 2
+    assert second_cache.stats['bytes_downloaded'] == 0
+
+
+def test_changed_page_is_downloaded_again(stand_in_server, tmp_path):
+    routes = {'/a/': validating_route()}
+    server = stand_in_server(routes)
+    url = f"{server.url}/a/"
+
+    cache = HTTPCache(tmp_path)
+    fetch_all([url], cache)
+
+    routes['/a/'] = validating_route(body=PAGE.replace('Stille', 'Mut'), etag='"v2"')
+    server.routes = routes
+    result, = fetch_all([url], cache)
+
+    assert 'Mut' in result.text
+    assert not result.from_cache
+    assert cache.entries[url]['etag'] == '"v2"'
+
+
+def test_bodies_are_stored_compressed(stand_in_server, tmp_path):
+    server = stand_in_server({'/a/': validating_route(body=PAGE * 50)})
+    url = f"{server.url}/a/"
+
+    cache = HTTPCache(tmp_path)
+    fetch_all([url], cache)
+
+    body_file = cache._body_path(url)
+    assert body_file.stat().st_size < len(PAGE * 50) / 5
+    assert gzip.decompress(body_file.read_bytes()).decode('utf-8') == PAGE * 50
+
+
+def test_concurrent_stores_of_one_url_never_publish_partial_bodies(tmp_path):
+    cache = HTTPCache(tmp_path)
+    url = 'https://example.com/a/'
+    bodies = [(str(i) * 200_000).encode('utf-8') for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda body: cache.store(url, body, {'ETag': '"v"'}), bodies))
+
+    assert gzip.decompress(cache._body_path(url).read_bytes()) in bodies
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_responses_without_validators_are_not_cached(stand_in_server, tmp_path):
+    server = stand_in_server({'/a/': (200, PAGE, {})})
+
+    cache = HTTPCache(tmp_path)
+    fetch_all([f"{server.url}/a/"], cache)
+
+    assert cache.entries == {}
+    assert cache.conditional_headers(f"{server.url}/a/") == {}
+
+
+def test_read_only_cache_serves_bodies_without_writing(stand_in_server, tmp_path):
+    server = stand_in_server({'/a/': validating_route(), '/b/': validating_route()})
+    first_cache = HTTPCache(tmp_path)
+    fetch_all([f"{server.url}/a/"], first_cache)
+    first_cache.save()
+    before = {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()}
+
+    cache = HTTPCache(tmp_path, read_only=True)
+    fetch_all([f"{server.url}/a/", f"{server.url}/b/"], cache)
+    cache.save()
+
+    assert cache.stats['hits'] == 1 and cache.stats['stored'] == 0
+    assert {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()} == before
+
+
+def test_sync_crawler_uses_conditional_get(stand_in_server, tmp_path):
+    server = stand_in_server({'/a/': validating_route()})
+    url = f"{server.url}/a/"
+
+    cache = HTTPCache(tmp_path)
+    crawler = migrate.BlogCrawler(base_url=server.url, cache=cache)
+
+    assert crawler.download_post_content(url) == PAGE
+    assert crawler.download_post_content(url) == PAGE
+    assert cache.stats['hits'] == 1
+    assert cache.stats['bytes_downloaded'] == len(PAGE)
@@ -0,0 +1,165 @@
+"""
+Tests für intelligence_store.IntelligenceStore und die Connection-Engine
+(generate-smart-connections.py) auf dem gesharderten Store.
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from conftest import load_script
+from intelligence_store import IntelligenceStore
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+LEGACY_FILE = REPO_ROOT / 'data' / 'blog-intelligence.json'
+
+pytestmark = pytest.mark.skipif(not LEGACY_FILE.exists(), reason='data/blog-intelligence.json fehlt')
+
+
+@pytest.fixture
+def legacy(tmp_path):
+    shutil.copy(LEGACY_FILE, tmp_path / 'blog-intelligence.json')
+    return tmp_path / 'blog-intelligence.json'
+
+
+@pytest.fixture
+def store_dir(tmp_path, legacy):
+    IntelligenceStore(tmp_path / 'intelligence', legacy_file=legacy)
+    return tmp_path / 'intelligence'
+
+
+def shard_mtimes(store_dir, group):
+    return {path.name: path.stat().st_mtime_ns for path in store_dir.glob(f'*.{group}.json')}
+
+
+def test_legacy_import_round_trips(store_dir, legacy):
+    data = json.loads(legacy.read_text(encoding='utf-8'))
+
+    store = IntelligenceStore(store_dir)
+
+    assert store.load() == data['articles']
+    assert store.meta['provider'] == data['provider']
+    assert len(list(store_dir.glob('*.meta.json'))) == len(list(store_dir.glob('*.body.json'))) == len(data['articles'])
+
+
+def test_projection_never_reads_body_shards(store_dir):
+    store = IntelligenceStore(store_dir)
+
+    articles = store.load(fields=('title', 'analysis'))
+
+    assert store.stats['read'] == len(articles)
+    assert all(set(article) == {'url', 'title', 'analysis'} for article in articles)
+
+
+def test_update_writes_only_changed_shards(store_dir):
+    store = IntelligenceStore(store_dir)
+    first, second = store.load(fields=('related',))[:2]
+    meta_before, body_before = shard_mtimes(store_dir, 'meta'), shard_mtimes(store_dir, 'body')
+
+    written = store.update([first, {**second, 'related': second['related'][:1]}])
+    store.save()
+
+    assert written == 1
+    assert store.stats['unchanged'] == 1
+    changed = {name for name, mtime in shard_mtimes(store_dir, 'meta').items() if meta_before[name] != mtime}
+    assert changed == {f"{Path(second['url']).stem}.meta.json"}
+    assert shard_mtimes(store_dir, 'body') == body_before
+    assert IntelligenceStore(store_dir).load(fields=('related',))[1]['related'] == second['related'][:1]
+
+
+def test_retain_removes_shards_and_keeps_given_order(store_dir):
+    store = IntelligenceStore(store_dir)
+    urls = store.order[:3]
+
+    store.retain(list(reversed(urls)))
+    store.save()
+
+    store = IntelligenceStore(store_dir)
+    assert store.order == list(reversed(urls))
+    assert len(list(store_dir.glob('*.json'))) == 1 + 2 * 3
+
+
+def test_export_keeps_all_fields_and_is_stable(store_dir, legacy, tmp_path):
+    store = IntelligenceStore(store_dir)
+    export = tmp_path / 'export.json'
+
+    assert store.export(export)
+    assert not store.export(export)
+
+    data = json.loads(export.read_text(encoding='utf-8'))
+    assert data['totalArticles'] == len(store)
+    assert data['articles'] == json.loads(legacy.read_text(encoding='utf-8'))['articles']
+
+    # Unverändert: kein einziger Shard wird für den Export gelesen
+    store = IntelligenceStore(store_dir)
+    assert not store.export(export) and store.stats['read'] == 0
+
+
+def test_fresh_clone_rebuilds_complete_store_from_export(store_dir, tmp_path):
+    export = tmp_path / 'export.json'
+    IntelligenceStore(store_dir).export(export)
+
+    clone = IntelligenceStore(tmp_path / 'clone', legacy_file=export)
+
+    assert clone.load() == IntelligenceStore(store_dir).load()
+    assert all(article.get('content') for article in clone.load(fields=('content',)))
+
+
+def test_changed_export_is_imported_again(store_dir, tmp_path):
+    export = tmp_path / 'export.json'
+    IntelligenceStore(store_dir, legacy_file=export).export(export)
+    assert IntelligenceStore(store_dir, legacy_file=export).stats['written'] == 0
+
+    # Neuere Datei aus git: geänderter Artikel, einer fehlt
+    data = json.loads(export.read_text(encoding='utf-8'))
+    data['articles'][0]['content'] = 'Neuer Text'
+    removed = data['articles'].pop()
+    export.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+    store = IntelligenceStore(store_dir, legacy_file=export)
+    assert store.stats['written'] == 1 and store.stats['removed'] == 1
+    assert store.load(fields=('content',))[0]['content'] == 'Neuer Text'
+    assert removed['url'] not in store
+    assert IntelligenceStore(store_dir, legacy_file=export).stats['written'] == 0
+
+
+def test_connection_engine_touches_only_meta_shards(store_dir, tmp_path, monkeypatch, capsys):
+    connections = load_script('generate-smart-connections')
+    monkeypatch.setattr(connections, 'STORE_DIR', store_dir)
+    monkeypatch.setattr(connections, 'OUTPUT_FILE', tmp_path / 'export.json')
+    monkeypatch.setattr(sys, 'argv', ['generate-smart-connections.py', '--no-embeddings'])
+    body_before = shard_mtimes(store_dir, 'body')
+
+    connections.main()
+
+    assert shard_mtimes(store_dir, 'body') == body_before
+    exported = json.loads((tmp_path / 'export.json').read_text(encoding='utf-8'))
+    blog = [article for article in exported['articles'] if article.get('type') == 'blog']
+    assert blog and all(article['related'] for article in blog)
+    assert exported['embeddingsUsed'] is False
+
+
+def test_unchanged_rerun_leaves_no_diff(store_dir, tmp_path, monkeypatch, capsys):
+    export = tmp_path / 'export.json'
+
+    def run():
+        # Frisch geladenes Modul – die Begründungen dürfen nicht vom Prozesszustand abhängen
+        connections = load_script('generate-smart-connections')
+        monkeypatch.setattr(connections, 'STORE_DIR', store_dir)
+        monkeypatch.setattr(connections, 'OUTPUT_FILE', export)
+        monkeypatch.setattr(sys, 'argv', ['generate-smart-connections.py', '--no-embeddings'])
+        connections.main()
+        files = sorted(store_dir.iterdir()) + [export]
+        return {path.name: (path.read_bytes(), path.stat().st_mtime_ns) for path in files}
+
+    first = run()
+    capsys.readouterr()
+    assert run() == first
+    assert '(0 Shards geschrieben)' in capsys.readouterr().out
+
+    # Frischer Clone: Store wird aus dem Export aufgebaut, der Export bleibt gleich
+    shutil.rmtree(store_dir)
+    assert run()[export.name][0] == first[export.name][0]
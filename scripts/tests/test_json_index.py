@@ -0,0 +1,59 @@
+"""
+Tests für json_index: Laden mit Versions-/Feldprüfung und atomares Schreiben.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import json_index
+from json_index import load_index, save_index, write_atomic
+
+
+def test_load_index_rejects_missing_broken_and_mismatched_files(tmp_path):
+    path = tmp_path / 'index.json'
+    assert load_index(path, 1) is None
+
+    path.write_text('{"version": 1, "root": "/a"', encoding='utf-8')
+    assert load_index(path, 1) is None
+    path.write_text('[1, 2]', encoding='utf-8')
+    assert load_index(path, 1) is None
+
+    save_index(path, 1, {'root': '/a', 'entries': {'ä': 1}})
+    assert load_index(path, 1, root='/a') == {'version': 1, 'root': '/a', 'entries': {'ä': 1}}
+    assert load_index(path, 2) is None
+    assert load_index(path, 1, root='/b') is None
+    assert 'ä' in path.read_text(encoding='utf-8')
+
+
+def test_concurrent_writers_never_leave_partial_files(tmp_path):
+    path = tmp_path / 'sub' / 'body.bin'
+    payloads = [bytes([i]) * 300_000 for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda data: write_atomic(path, data), payloads))
+
+    assert path.read_bytes() in payloads
+    assert [p.name for p in path.parent.iterdir()] == ['body.bin']
+
+
+def test_failed_write_keeps_old_file_and_removes_tmp(tmp_path, monkeypatch):
+    path = tmp_path / 'index.json'
+    save_index(path, 1, {'entries': {}})
+
+    class Unserializable:
+        pass
+
+    with pytest.raises(TypeError):
+        save_index(path, 1, {'entries': Unserializable()})
+
+    def broken_replace(self, target):
+        raise OSError('Platte voll')
+
+    monkeypatch.setattr(json_index.Path, 'replace', broken_replace)
+    with pytest.raises(OSError):
+        write_atomic(path, 'neu')
+
+    assert json.loads(path.read_text(encoding='utf-8')) == {'version': 1, 'entries': {}}
+    assert [p.name for p in tmp_path.iterdir()] == ['index.json']
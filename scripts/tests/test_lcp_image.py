@@ -0,0 +1,128 @@
+"""
+Tests für LCPImageSelector und PerformanceOptimizer._add_lazy_loading
+(optimize-html-complete.py): Auswahl des LCP-Bilds, lazy loading und Preload.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('bs4')
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+optimize = load_script('optimize-html-complete')
+
+import post_templates  # noqa: E402
+
+HEAD = '<head><meta charset="utf-8"><title>Test</title></head>'
+
+
+def soup_of(body, head=HEAD):
+    return BeautifulSoup(f'<html>{head}<body>{body}</body></html>', 'html.parser')
+
+
+def selected_src(body):
+    img = optimize.LCPImageSelector().select(soup_of(body))
+    return img['src'] if img is not None else None
+
+
+def test_hero_container_beats_document_order():
+    body = '''
+        <div class="content"><img src="/erstes.jpg" width="400" height="300"></div>
+        <section class="article-hero"><img src="/hero.jpg" width="1200" height="600"></section>
+    '''
+    assert selected_src(body) == '/hero.jpg'
+
+
+def test_header_navigation_and_excluded_classes_are_skipped():
+    body = '''
+        <header><img src="/logo.png" width="800" height="400"></header>
+        <nav><img src="/nav.png" width="800" height="400"></nav>
+        <div class="dropdown-menu"><img src="/dropdown.jpg" width="800" height="400"></div>
+        <main><img class="author-avatar" src="/avatar.jpg" width="800" height="400"></main>
+        <main><article><img src="/artikel.jpg" width="800" height="400"></article></main>
+    '''
+    assert selected_src(body) == '/artikel.jpg'
+    # <header> innerhalb eines Artikels ist kein Site-Header
+    assert selected_src('<article><header><img src="/titel.jpg" width="900" height="500"></header></article>') \
+        == '/titel.jpg'
+
+
+def test_small_hidden_and_weak_candidates_are_rejected():
+    selector = optimize.LCPImageSelector()
+    small = selector.MIN_DIMENSION - 1
+    assert selected_src(f'<main><img src="/klein.jpg" width="{small}" height="800"></main>') is None
+    assert selected_src('<main><img src="/versteckt.jpg" width="800" height="400" hidden></main>') is None
+    assert selected_src('<div style="display: none"><img src="/aus.jpg" width="800" height="400"></div>') is None
+    # Ohne Größe, ohne Hero-Container und tief verschachtelt bleibt der Score unter MIN_SCORE
+    assert selected_src('<div><div><p><img src="/irgendwo.jpg"></p></div></div>') is None
+
+
+def test_lazy_loading_prioritizes_only_the_lcp_image():
+    soup = soup_of('''
+        <header><img src="/logo.png" width="200" height="200" fetchpriority="high"></header>
+        <div class="featured-image"><img src="/hero.jpg" width="1200" height="600" loading="lazy"
+             srcset="/hero-600.jpg 600w, /hero.jpg 1200w" sizes="100vw"></div>
+        <main><img src="/inhalt.jpg" width="800" height="400"></main>
+    ''')
+    optimize.PerformanceOptimizer()._add_lazy_loading(soup, Path('test.html'))
+
+    images = {img['src']: img for img in soup.find_all('img')}
+    hero = images['/hero.jpg']
+    assert hero['fetchpriority'] == 'high' and not hero.has_attr('loading')
+    for src in ('/logo.png', '/inhalt.jpg'):
+        assert images[src]['loading'] == 'lazy' and images[src]['decoding'] == 'async'
+        assert not images[src].has_attr('fetchpriority')
+
+    preloads = soup.head.find_all('link', rel='preload')
+    assert len(preloads) == 1
+    assert preloads[0]['href'] == '/hero.jpg' and preloads[0]['imagesrcset'] == hero['srcset']
+    assert preloads[0]['imagesizes'] == '100vw'
+
+
+def test_stale_image_preloads_are_removed():
+    head = '''<head><meta charset="utf-8">
+        <link rel="preload" as="image" href="/alt.jpg">
+        <link rel="preload" as="font" href="/font.woff2">
+        <link rel="preload" as="image" href="/hero.jpg">
+        <link rel="preload" as="image" href="/noch-aelter.jpg">
+        <link rel="preload" as="image" href="/hero.jpg">
+    </head>'''
+    soup = soup_of('<section class="hero"><img src="/hero.jpg" width="1200" height="600"></section>', head)
+    optimize.PerformanceOptimizer()._add_lazy_loading(soup, Path('test.html'))
+
+    images = [link['href'] for link in soup.head.find_all('link', rel='preload') if link.get('as') == 'image']
+    assert images == ['/hero.jpg']
+    assert soup.head.find('link', href='/font.woff2') is not None
+
+
+def test_author_bio_photo_is_never_the_lcp_image():
+    body = f'''
+        <main><article>
+            <img src="/beitrag.jpg" width="800" height="400">
+            <p>Text</p>
+            <div class="author-bio">
+                <img width="1060" height="1042" src="/autorin.jpg">
+                <div class="author-bio-links"><img src="/link.jpg" width="900" height="900"></div>
+            </div>
+        </article></main>
+    '''
+    assert selected_src(body) == '/beitrag.jpg'
+    assert selected_src(body.replace('<img src="/beitrag.jpg" width="800" height="400">', '')) is None
+    # Partial aus post_templates (Autorin-Box jeder migrierten Seite)
+    assert selected_src(f'<main><article>{post_templates.AUTHOR_BIO}</article></main>') is None
+
+
+def test_stale_preload_is_removed_without_lcp_candidate():
+    head = '''<head><meta charset="utf-8">
+        <link rel="preload" as="image" href="/altes-hero.jpg">
+        <link rel="preload" as="font" href="/font.woff2">
+    </head>'''
+    soup = soup_of('<div class="author-bio"><img src="/autorin.jpg" width="1060" height="1042"></div>', head)
+    optimize.PerformanceOptimizer()._add_lazy_loading(soup, Path('test.html'))
+
+    assert [link['href'] for link in soup.head.find_all('link', rel='preload')] == ['/font.woff2']
+    assert soup.find('img')['loading'] == 'lazy'
@@ -0,0 +1,144 @@
+"""
+Tests für llm_cache.ResponseCache und den Cache in analyze-with-llm.py:
+API-Requests nur, wenn sich der exakte Request geändert hat.
+"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('aiohttp')
+
+from llm_cache import ResponseCache  # noqa: E402
+
+analyze = load_script('analyze-with-llm')
+
+ANALYSIS = {
+    'kernbotschaft': 'Vertraue dir.', 'emotionaleTonalitaet': 'ermutigend',
+    'transformation': {'von': 'Zweifel', 'zu': 'Vertrauen'}, 'tiefenthemen': ['selbstvertrauen'],
+    'leserProfil': 'Menschen im Umbruch', 'empfehlungsBegründungen': ['Weil du dir vertrauen darfst.']
+}
+
+
+def make_articles():
+    return [
+        {'url': f"artikel-{i}.html", 'title': f"Artikel {i}", 'type': 'blog', 'category': 'selbstliebe',
+         'content': f"Inhalt von Artikel {i}. " * 40, 'blockquotes': [], 'excerpt': ''}
+        for i in range(5)
+    ]
+
+
+def llm_route(handler):
+    return 200, json.dumps({'choices': [{'message': {'content': json.dumps(ANALYSIS)}}]}), {}
+
+
+def analyze_all(server, articles, cache, provider='groq'):
+    analyses, stats = asyncio.run(analyze.analyze_articles(
+        articles, provider, 'test-key', base_url=f"{server.url}/v1", rpm=6000, tpm=10 ** 7, cache=cache
+    ))
+    cache.save()
+    return analyses, stats
+
+
+def test_only_changed_articles_hit_the_api(stand_in_server, tmp_path):
+    server = stand_in_server({'/v1/chat/completions': llm_route})
+    cache_file = tmp_path / 'llm-cache.json'
+    articles = make_articles()
+
+    analyze_all(server, articles, ResponseCache(cache_file, 1))
+    assert server.count('/v1/chat/completions') == 5
+
+    analyses, stats = analyze_all(server, articles, ResponseCache(cache_file, 1))
+    assert server.count('/v1/chat/completions') == 5
+    assert stats['cached'] == 5
+    assert analyses == [ANALYSIS] * 5
+
+    articles[2]['content'] = articles[2]['content'].replace('Inhalt', 'Text', 1)
+    analyses, stats = analyze_all(server, articles, ResponseCache(cache_file, 1))
+    assert server.count('/v1/chat/completions') == 6
+    assert stats['cached'] == 4
+
+
+def test_model_provider_and_prompt_version_are_part_of_the_key(tmp_path):
+    cache = ResponseCache(tmp_path / 'llm-cache.json', 1)
+    article = make_articles()[0]
+    groq = analyze.build_request(article, 'groq')
+    openai = analyze.build_request(article, 'openai')
+
+    assert cache.key('groq', groq) != cache.key('openai', openai)
+    assert cache.key('groq', groq) != cache.key('groq', {**groq, 'model': 'llama-3.1-8b-instant'})
+    assert cache.key('groq', groq) != ResponseCache(tmp_path / 'andere.json', 2).key('groq', groq)
+    assert cache.key('groq', groq) == cache.key('groq', analyze.build_request(dict(article), 'groq'))
+
+
+def test_prompt_version_bump_drops_old_entries(tmp_path):
+    cache_file = tmp_path / 'llm-cache.json'
+    cache = ResponseCache(cache_file, 1)
+    cache.put('a', ANALYSIS, 'artikel-0.html')
+    cache.save()
+
+    bumped = ResponseCache(cache_file, 2)
+    bumped.save()
+
+    assert bumped.entries == {}
+    assert bumped.stats['invalidated'] == 1
+    assert json.loads(cache_file.read_text(encoding='utf-8'))['entries'] == {}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch, stand_in_server):
+    server = stand_in_server({'/v1/chat/completions': llm_route})
+    input_file = tmp_path / 'blog-content-raw.json'
+    monkeypatch.setattr(analyze, 'INPUT_FILE', input_file)
+    monkeypatch.setattr(analyze, 'OUTPUT_FILE', tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(analyze, 'STORE_DIR', tmp_path / 'intelligence')
+    monkeypatch.setattr(analyze, 'LLM_CACHE_FILE', tmp_path / 'llm-cache.json')
+    monkeypatch.setenv('GROQ_API_KEY', 'test-key')
+    monkeypatch.setattr(sys, 'argv', ['analyze-with-llm.py', '--base-url', f"{server.url}/v1", '--rpm', '6000'])
+
+    def run(articles):
+        input_file.write_text(json.dumps({'articles': articles}), encoding='utf-8')
+        analyze.main()
+
+    run.server = server
+    return run
+
+
+def test_analyses_from_before_the_cache_are_kept_until_the_article_changes(project, tmp_path, capsys):
+    articles = make_articles()
+    legacy = {**articles[0], 'analysis': {**ANALYSIS, 'kernbotschaft': 'Alte Analyse'}}
+    (tmp_path / 'blog-intelligence.json').write_text(json.dumps({'articles': [legacy]}), encoding='utf-8')
+
+    project(make_articles())
+    assert project.server.count('/v1/chat/completions') == 4
+
+    project(make_articles())
+    assert project.server.count('/v1/chat/completions') == 4
+    exported = json.loads((tmp_path / 'blog-intelligence.json').read_text(encoding='utf-8'))
+    assert exported['articles'][0]['analysis']['kernbotschaft'] == 'Alte Analyse'
+
+    edited = make_articles()
+    edited[0]['content'] += ' Neuer Absatz.'
+    project(edited)
+    assert project.server.count('/v1/chat/completions') == 5
+    exported = json.loads((tmp_path / 'blog-intelligence.json').read_text(encoding='utf-8'))
+    assert exported['articles'][0]['analysis'] == ANALYSIS
+
+
+def test_fully_cached_rerun_leaves_store_and_export_untouched(project, tmp_path, capsys):
+    project(make_articles())
+    files = [tmp_path / 'intelligence' / 'index.json', tmp_path / 'blog-intelligence.json']
+    before = [(path.read_bytes(), path.stat().st_mtime_ns) for path in files]
+    analyzed_at = json.loads(files[1].read_text(encoding='utf-8'))['analyzedAt']
+
+    project(make_articles())
+    assert project.server.count('/v1/chat/completions') == 5
+    assert [(path.read_bytes(), path.stat().st_mtime_ns) for path in files] == before
+
+    edited = make_articles()[:4]
+    project(edited)
+    assert json.loads(files[1].read_text(encoding='utf-8'))['analyzedAt'] != analyzed_at
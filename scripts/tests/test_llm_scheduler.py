@@ -0,0 +1,252 @@
+"""
+Tests für llm_scheduler und analyze_articles (analyze-with-llm.py) gegen einen
+lokalen Mock-LLM-Server mit Rate-Limits.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('aiohttp')
+
+from json_schema import SchemaError, validate  # noqa: E402
+from llm_scheduler import LLMScheduler, RateLimited, TokenBucket  # noqa: E402
+
+analyze = load_script('analyze-with-llm')
+
+ARTICLES = [
+    {'url': f"artikel-{i}.html", 'title': f"Artikel {i}", 'category': 'achtsamkeit',
+     'content': 'Inhalt ' * 50, 'blockquotes': [], 'excerpt': ''}
+    for i in range(8)
+]
+
+
+def valid_analysis(kernbotschaft, **fields):
+    return {'kernbotschaft': kernbotschaft, 'emotionaleTonalitaet': 'heilend',
+            'transformation': {'von': 'Angst', 'zu': 'Vertrauen'}, 'tiefenthemen': ['vertrauen-finden'],
+            'leserProfil': 'Menschen im Umbruch', 'empfehlungsBegründungen': ['Weil es dir Mut macht.'], **fields}
+
+
+class MockLLM:
+    """Chat-Completions-Endpunkt: max. `limit` Requests pro `window` Sekunden, sonst 429
+
+    Antwortet mit einer Analyse, deren kernbotschaft der Titel aus dem Prompt ist;
+    Batch-Prompts bekommen ein Objekt Artikel-Nummer → Analyse (`item(title)`
+    liefert den Eintrag, None lässt ihn weg). Frühe Artikel antworten langsamer,
+    damit die Fertigstellung nicht der Reihenfolge folgt.
+    """
+
+    def __init__(self, limit=100, window=1.0, retry_after='1', reply=None, item=None):
+        self.limit = limit
+        self.window = window
+        self.retry_after = retry_after
+        self.reply = reply
+        self.item = item
+        self.requests = []
+        self.accepted = []
+        self.rejected = []
+        self._lock = threading.Lock()
+
+    def __call__(self, handler):
+        payload = json.loads(handler.body)
+        titles = re.findall(r'TITEL: (.+)', payload['messages'][1]['content'])
+        title = titles[0]
+        now = time.monotonic()
+        with self._lock:
+            recent = [t for t in self.accepted if now - t < self.window]
+            if len(recent) >= self.limit:
+                self.rejected.append(now)
+                return 429, '{"error": "rate limit"}', {'Retry-After': self.retry_after}
+            self.accepted.append(now)
+            self.requests.append((titles, payload))
+
+        number = int(title.split()[-1])
+        time.sleep(0.02 * (len(ARTICLES) - number))
+        if self.reply:
+            content = self.reply(titles if len(titles) > 1 else title)
+        elif len(titles) > 1:
+            items = {str(n): (self.item or valid_analysis)(t) for n, t in enumerate(titles, 1)}
+            content = json.dumps({n: analysis for n, analysis in items.items() if analysis is not None})
+        else:
+            content = json.dumps(valid_analysis(title))
+        body = json.dumps({'choices': [{'message': {'role': 'assistant', 'content': content}}]})
+        return 200, body, {'Content-Type': 'application/json'}
+
+
+def run(server, **options):
+    # Limits hoch, damit nur das Verhalten des Mock-Servers zählt
+    options.setdefault('rpm', 6000)
+    options.setdefault('tpm', 10 ** 7)
+    return asyncio.run(analyze.analyze_articles(
+        ARTICLES, 'groq', 'test-key', base_url=f"{server.url}/v1", **options
+    ))
+
+
+def test_results_are_ordered_while_requests_run_concurrently(stand_in_server):
+    server = stand_in_server({'/v1/chat/completions': MockLLM()})
+    finished = []
+
+    analyses, stats = run(server, concurrency=4, on_result=lambda index, analysis, error: finished.append(index))
+
+    assert [analysis['kernbotschaft'] for analysis in analyses] == [article['title'] for article in ARTICLES]
+    assert finished != sorted(finished)
+    assert server.max_in_flight > 1
+    assert stats['rate_limited'] == 0
+
+
+def test_429_retry_after_pauses_all_requests(stand_in_server):
+    mock = MockLLM(limit=3, window=0.5, retry_after='1')
+    server = stand_in_server({'/v1/chat/completions': mock})
+
+    analyses, stats = run(server, concurrency=4)
+
+    assert all(analyses)
+    assert stats['rate_limited'] >= 1
+    # Nach dem ersten 429 kommt eine Sekunde lang kein Request mehr an
+    first_rejection = mock.rejected[0]
+    assert not [t for t in mock.accepted if 0 < t - first_rejection < 0.9]
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(600, capacity=2)  # 10 pro Sekunde, zwei sofort
+
+    async def take(n):
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert 0.35 <= asyncio.run(take(6)) < 1.0
+
+
+def test_token_budget_spaces_out_large_requests():
+    started = []
+
+    async def call():
+        started.append(time.monotonic())
+        return 'ok'
+
+    scheduler = LLMScheduler(rpm=6000, tpm=60000, concurrency=8)
+    scheduler.tokens = TokenBucket(60000, capacity=2000)  # 1000 Tokens pro Sekunde
+
+    results = asyncio.run(scheduler.map([(call, 1000)] * 4))
+
+    assert results == ['ok'] * 4
+    # Zwei Requests passen in den Bucket, die anderen warten je ~1 s auf ihre Tokens
+    assert started[3] - started[0] >= 1.8
+
+
+def test_invalid_json_falls_back_without_retry(stand_in_server):
+    mock = MockLLM(reply=lambda title: 'Hier ist die Analyse: {kaputt' if title == 'Artikel 3' else
+                   json.dumps(valid_analysis(title)))
+    server = stand_in_server({'/v1/chat/completions': mock})
+    errors = {}
+
+    analyses, stats = run(server, on_result=lambda index, analysis, error: errors.update({index: error}))
+
+    assert analyses[3] is None
+    assert all(analyses[i] for i in range(len(ARTICLES)) if i != 3)
+    assert 'JSON Parse Error' in str(errors[3])
+    assert len(mock.accepted) == len(ARTICLES)
+    assert stats['retries'] == 0
+
+
+def test_server_errors_are_retried(stand_in_server):
+    calls = []
+
+    def flaky(handler):
+        calls.append(handler.path)
+        if len(calls) <= 2:
+            return 503, 'überlastet', {'Retry-After': '0'}
+        return 200, json.dumps({'choices': [{'message': {'content': json.dumps(valid_analysis('ok'))}}]}), {}
+
+    server = stand_in_server({'/v1/chat/completions': flaky})
+
+    analyses, stats = asyncio.run(analyze.analyze_articles(
+        ARTICLES[:1], 'openai', 'test-key', base_url=f"{server.url}/v1", rpm=6000, tpm=10 ** 7
+    ))
+
+    assert analyses == [valid_analysis('ok')]
+    assert stats['retries'] == 2
+    assert server.count('/v1/chat/completions') == 3
+
+
+def test_scheduler_gives_up_after_max_retries():
+    attempts = []
+
+    async def always_limited():
+        attempts.append(1)
+        raise RateLimited('429', retry_after=0)
+
+    scheduler = LLMScheduler(rpm=6000, max_retries=2)
+    result, = asyncio.run(scheduler.map([(always_limited, 1)]))
+
+    assert isinstance(result, RateLimited)
+    assert len(attempts) == 3
+    assert scheduler.stats['failed'] == 1
+
+
+def test_batches_share_one_prompt(stand_in_server):
+    mock = MockLLM()
+    server = stand_in_server({'/v1/chat/completions': mock})
+
+    analyses, stats = run(server, batch_size=4)
+
+    assert [analysis['kernbotschaft'] for analysis in analyses] == [article['title'] for article in ARTICLES]
+    assert server.count('/v1/chat/completions') == 2
+    assert stats['batches'] == 2 and stats['split'] == 0
+    prompt = mock.requests[0][1]['messages'][1]['content']
+    assert prompt.count('Content-Analyst') == 1 and prompt.count('"kernbotschaft"') == 1
+    assert mock.requests[0][1]['max_tokens'] == 4 * analyze.MAX_TOKENS
+
+
+def test_invalid_item_is_retried_alone(stand_in_server):
+    # Artikel 5 bekommt im Batch eine kaputte Analyse, Artikel 6 fehlt ganz
+    mock = MockLLM(item=lambda title: None if title == 'Artikel 6' else
+                   valid_analysis(title, tiefenthemen='vertrauen') if title == 'Artikel 5' else valid_analysis(title))
+    server = stand_in_server({'/v1/chat/completions': mock})
+
+    analyses, stats = run(server, batch_size=4)
+
+    assert [analysis['kernbotschaft'] for analysis in analyses] == [article['title'] for article in ARTICLES]
+    assert [titles for titles, payload in mock.requests if len(titles) == 1] in (
+        [['Artikel 5'], ['Artikel 6']], [['Artikel 6'], ['Artikel 5']])
+    # Artikel 5 und 6 gehen zusammen noch einmal raus, dann einzeln
+    assert sorted(len(titles) for titles, payload in mock.requests) == [1, 1, 2, 4, 4]
+
+
+def test_unusable_batch_is_split_until_the_bad_article_is_alone(stand_in_server):
+    def reply(titles):
+        if isinstance(titles, list):
+            if 'Artikel 2' in titles:
+                return '{"1": {"kernbotschaft": '
+            return json.dumps({str(n): valid_analysis(t) for n, t in enumerate(titles, 1)})
+        return json.dumps(valid_analysis(titles, tiefenthemen=[]) if titles == 'Artikel 2' else valid_analysis(titles))
+
+    mock = MockLLM(reply=reply)
+    server = stand_in_server({'/v1/chat/completions': mock})
+    errors = {}
+
+    analyses, stats = run(server, batch_size=4, on_result=lambda index, analysis, error: errors.update({index: error}))
+
+    assert analyses[2] is None
+    assert 'tiefenthemen' in str(errors[2])
+    assert all(analyses[i] for i in range(len(ARTICLES)) if i != 2)
+    # [0-3] → [0,1] + [2,3] → [2] + [3]; [4-7] klappt auf Anhieb
+    assert sorted(len(titles) for titles, payload in mock.requests) == [1, 1, 2, 2, 4, 4]
+    assert stats['split'] == 2
+
+
+def test_schema_errors_name_the_field():
+    with pytest.raises(SchemaError, match=r'\$\.transformation\.zu: erwartet string'):
+        validate(valid_analysis('x', transformation={'von': 'a', 'zu': 3}), analyze.ANALYSIS_SCHEMA)
+    with pytest.raises(SchemaError, match="Feld 'leserProfil' fehlt"):
+        validate({k: v for k, v in valid_analysis('x').items() if k != 'leserProfil'}, analyze.ANALYSIS_SCHEMA)
+    with pytest.raises(SchemaError, match='erwartet integer'):
+        validate(True, {'type': 'integer'})
@@ -0,0 +1,91 @@
+"""
+Tests für local_embeddings (BM25 + SVD) und das lokale Backend von
+generate-smart-connections.py.
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import load_script  # noqa: E402
+from connection_scoring import SparseRows  # noqa: E402
+from embedding_similarity import top_k_similar  # noqa: E402
+from local_embeddings import local_embeddings, tokenize, truncated_svd  # noqa: E402
+
+LEGACY_FILE = Path(__file__).parent.parent.parent / 'data' / 'blog-intelligence.json'
+
+TOPICS = {
+    'pferde': 'Pferde spiegeln unsere Gefühle. Mit dem Pferd auf der Koppel lernst du Führung, Vertrauen und Präsenz.',
+    'wut': 'Wut ist ein Geschenk. Deine Wut zeigt dir Grenzen, die verletzt wurden – die Wut will gehört werden.',
+    'ehe': 'Eine Ehe retten heißt, die Beziehung neu zu sehen. Paare in der Beziehungskrise brauchen Gespräche.',
+}
+
+
+def topic_articles():
+    articles = []
+    for topic, text in TOPICS.items():
+        for i in range(4):
+            articles.append({'url': f"{topic}-{i}.html", 'title': f"{topic.title()} Teil {i}",
+                             'analysis': {'kernbotschaft': text.split('.')[i % 2], 'tiefenthemen': [topic]}})
+    return articles, {a['url']: TOPICS[a['url'].split('-')[0]] * (1 + int(a['url'][-6])) for a in articles}
+
+
+def test_german_tokenization():
+    assert tokenize('Die Beziehungen und die Beziehung') == ['bezieh', 'bezieh']
+    assert tokenize('Größe, GRÖSSE und Grösse') == ['groess'] * 3
+    assert tokenize('Ängste im Café – und wir über uns') == ['aengst', 'cafe']
+
+
+def test_truncated_svd_matches_full_svd():
+    rng = np.random.default_rng(1)
+    rows = [{int(f): float(rng.random()) for f in rng.choice(200, 12, replace=False)} for _ in range(60)]
+    matrix = SparseRows.from_rows(rows, 200)
+    dense = np.zeros((60, 200))
+    for i, row in enumerate(rows):
+        for f, v in row.items():
+            dense[i, f] = v
+
+    expected = np.linalg.svd(dense, compute_uv=False)
+
+    # Volle Breite: exakt; wenige Komponenten: randomisiert, aber nah dran
+    u, s, vt = truncated_svd(matrix, 60)
+    assert s == pytest.approx(expected, rel=1e-9)
+    assert np.allclose((u * s) @ vt, dense)
+    _, s, _ = truncated_svd(matrix, 5)
+    assert s == pytest.approx(expected[:5], rel=1e-2)
+
+
+def test_vectors_are_deterministic_and_group_topics():
+    articles, contents = topic_articles()
+
+    first = local_embeddings(articles, contents)
+    second = local_embeddings(articles, contents)
+    indices, _ = top_k_similar(first, k=3)
+
+    assert np.array_equal(first, second) and first.dtype == np.float32
+    for row, neighbours in enumerate(indices):
+        topic = articles[row]['url'].split('-')[0]
+        assert all(articles[j]['url'].startswith(topic) for j in neighbours)
+
+
+@pytest.mark.skipif(not LEGACY_FILE.exists(), reason='data/blog-intelligence.json fehlt')
+@pytest.mark.parametrize('argv', [['--embeddings', 'local'], []])
+def test_connection_engine_runs_without_network(argv, tmp_path, monkeypatch, capsys):
+    connections = load_script('generate-smart-connections')
+    shutil.copy(LEGACY_FILE, tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(connections, 'STORE_DIR', tmp_path / 'intelligence')
+    monkeypatch.setattr(connections, 'OUTPUT_FILE', tmp_path / 'blog-intelligence.json')
+    monkeypatch.setattr(connections, 'EMBEDDINGS_DIR', tmp_path / 'embeddings')
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.setattr(sys, 'argv', ['generate-smart-connections.py'] + argv)
+
+    connections.main()
+
+    exported = json.loads((tmp_path / 'blog-intelligence.json').read_text(encoding='utf-8'))
+    assert exported['embeddingsUsed'] is True and exported['embeddingBackend'] == 'local'
+    assert all(len(article['related']) == 10 for article in exported['articles'])
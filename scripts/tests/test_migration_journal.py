@@ -0,0 +1,125 @@
+"""
+Tests für migration_journal.MigrationJournal und --resume (migrate-blog-complete.py).
+"""
+
+import json
+import threading
+
+import pytest
+
+from conftest import FIXTURES_DIR, load_script
+
+pytest.importorskip('bs4')
+
+from migration_journal import MigrationJournal  # noqa: E402
+
+migrate = load_script('migrate-blog-complete')
+
+POST_TEMPLATE = (FIXTURES_DIR / 'wordpress' / 'post.html').read_text(encoding='utf-8')
+SLUGS = ['dankbarkeit', 'innere-fuehrung', 'gedankenkarussell', 'ehe-retten']
+
+
+def test_concurrent_records_are_written_as_complete_lines(tmp_path):
+    journal = MigrationJournal(tmp_path / 'journal.jsonl')
+
+    def worker(n):
+        for i in range(50):
+            journal.record({'slug': f"{n}-{i}", 'text': 'ä' * 500})
+
+    with journal:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    lines = (tmp_path / 'journal.jsonl').read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 400
+    assert {json.loads(line)['slug'] for line in lines} == {f"{n}-{i}" for n in range(8) for i in range(50)}
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('{"slug": "a"}\n{"slug": "b"}\n{"slug": "c", "ti', encoding='utf-8')
+
+    assert MigrationJournal(path).load() == [{'slug': 'a'}, {'slug': 'b'}]
+
+
+def test_record_requires_open_journal(tmp_path):
+    with pytest.raises(RuntimeError):
+        MigrationJournal(tmp_path / 'journal.jsonl').record({'slug': 'a'})
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrate, 'OUTPUT_DIR', tmp_path)
+    monkeypatch.setattr(migrate, 'CACHE_FILE', str(tmp_path / 'cache.json'))
+    monkeypatch.setattr(migrate, 'JOURNAL_FILE', tmp_path / 'journal.jsonl')
+    monkeypatch.setattr(migrate, 'POST_INDEX_FILE', tmp_path / 'post-index.json')
+    return tmp_path
+
+
+def make_orchestrator(downloaded, **options):
+    orchestrator = migrate.MigrationOrchestrator(crawler='sync', http_cache=False, **options)
+    orchestrator.cache = {'posts': [], 'last_run': None}
+    posts = [
+        {'slug': slug, 'title': slug.replace('-', ' ').title(), 'url': f"https://example.org/{slug}/",
+         'category': 'Allgemein'}
+        for slug in SLUGS
+    ]
+
+    def download_posts(urls):
+        downloaded.extend(urls)
+        return {url: POST_TEMPLATE.replace('{title}', url.split('/')[-2].replace('-', ' ').title()) for url in urls}
+
+    orchestrator.crawler.crawl_all_posts = lambda: posts
+    orchestrator.crawler.download_posts = download_posts
+    return orchestrator
+
+
+def test_resume_skips_journaled_posts_and_compacts_into_cache(project, capsys):
+    # Abgebrochener Lauf: zwei Posts fertig und im Journal, Cache nie geschrieben
+    interrupted = make_orchestrator([])
+    with interrupted.journal:
+        for slug in SLUGS[:2]:
+            post = {'slug': slug, 'url': f"https://example.org/{slug}/", 'category': 'Allgemein'}
+            assert interrupted._migrate_post(post, POST_TEMPLATE.replace('{title}', slug))
+    (project / f"{SLUGS[0]}.html").unlink()  # z.B. vor dem Abbruch nie vollständig gelandet
+
+    downloaded = []
+    make_orchestrator(downloaded, resume=True).run()
+
+    assert downloaded == [f"https://example.org/{slug}/" for slug in SLUGS[2:]]
+    assert not (project / 'journal.jsonl').exists()
+    cache = json.loads((project / 'cache.json').read_text(encoding='utf-8'))
+    assert sorted(record['slug'] for record in cache['posts']) == sorted(SLUGS)
+
+
+def test_without_resume_journal_is_still_compacted(project, capsys):
+    interrupted = make_orchestrator([])
+    with interrupted.journal:
+        post = {'slug': 'alt', 'url': 'https://example.org/alt/', 'category': 'Allgemein'}
+        assert interrupted._migrate_post(post, POST_TEMPLATE.replace('{title}', 'Alt'))
+
+    downloaded = []
+    make_orchestrator(downloaded).run()
+
+    assert len(downloaded) == len(SLUGS)
+    cache = json.loads((project / 'cache.json').read_text(encoding='utf-8'))
+    assert sorted(record['slug'] for record in cache['posts']) == sorted(SLUGS + ['alt'])
+
+
+def test_dry_run_writes_no_files(project, capsys):
+    interrupted = make_orchestrator([])
+    with interrupted.journal:
+        post = {'slug': SLUGS[0], 'url': f"https://example.org/{SLUGS[0]}/", 'category': 'Allgemein'}
+        assert interrupted._migrate_post(post, POST_TEMPLATE.replace('{title}', SLUGS[0]))
+    before = {path: path.stat().st_mtime_ns for path in project.rglob('*')}
+
+    downloaded = []
+    make_orchestrator(downloaded, dry_run=True, resume=True).run()
+
+    assert downloaded == []
+    assert {path: path.stat().st_mtime_ns for path in project.rglob('*')} == before
+    assert not (project / 'cache.json').exists() and not (project / 'post-index.json').exists()
+    assert 'DRY RUN' in capsys.readouterr().out
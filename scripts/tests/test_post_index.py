@@ -0,0 +1,192 @@
+"""
+Tests für post_index.PostIndex: kalter Lauf liest nur den <head>, warmer Lauf nur stat().
+"""
+
+import builtins
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('bs4')
+
+import post_index  # noqa: E402
+from fuzzy_index import simhash  # noqa: E402
+from post_index import PostIndex, extract_title  # noqa: E402
+
+migrate = load_script('migrate-blog-complete')
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+BODY = '<body>' + '<p>Absatz mit Inhalt</p>' * 20000 + '</body></html>'
+
+
+def page(title, og_title=None, style_size=0):
+    og = f'<meta property="og:title" content="{og_title}">' if og_title else ''
+    style = f'<style>{"a{color:red}" * style_size}</style>'
+    return f'<!DOCTYPE html><html><head><title>{title}</title>{style}{og}</head>{BODY}'
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / 'site'
+    root.mkdir()
+    (root / 'dankbarkeit.html').write_text(page('Dankbarkeit | Kathrin Stahl'), encoding='utf-8')
+    (root / 'kloss-im-hals.html').write_text(
+        page('Kloß', og_title='Kloß im Hals &amp; mehr – KATHRIN STAHL Coaching', style_size=5000), encoding='utf-8'
+    )
+    (root / 'index.html').write_text(page('Startseite'), encoding='utf-8')
+    return root
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Protokolliert geöffnete Dateien und gelesene Zeichen"""
+    log = {'files': [], 'chars': 0}
+    real_open = builtins.open
+
+    class CountingFile:
+        def __init__(self, f):
+            self._f = f
+
+        def read(self, *args):
+            data = self._f.read(*args)
+            log['chars'] += len(data)
+            return data
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return self._f.__exit__(*exc)
+
+        def __getattr__(self, name):
+            return getattr(self._f, name)
+
+    def counting_open(file, *args, **kwargs):
+        f = real_open(file, *args, **kwargs)
+        if str(file).endswith('.html'):
+            log['files'].append(Path(file).name)
+            return CountingFile(f)
+        return f
+
+    monkeypatch.setattr(builtins, 'open', counting_open)
+    return log
+
+
+def test_cold_build_reads_only_the_head(site, tmp_path, opened):
+    index = PostIndex(site, tmp_path / 'post-index.json').refresh()
+
+    assert sorted(opened['files']) == ['dankbarkeit.html', 'index.html', 'kloss-im-hals.html']
+    total = sum(f.stat().st_size for f in site.glob('*.html'))
+    assert opened['chars'] < total / 10
+    assert index.posts() == [
+        {'slug': 'dankbarkeit', 'title': 'Dankbarkeit | Kathrin Stahl',
+         'normalized_title': 'dankbarkeit kathrin stahl', 'file': str(site / 'dankbarkeit.html')},
+        {'slug': 'kloss-im-hals', 'title': 'Kloß im Hals & mehr',
+         'normalized_title': 'kloss im hals mehr', 'file': str(site / 'kloss-im-hals.html')},
+    ]
+
+
+def test_warm_run_only_stats(site, tmp_path, opened):
+    index_file = tmp_path / 'post-index.json'
+    PostIndex(site, index_file).refresh().save()
+    opened['files'].clear()
+
+    index = PostIndex(site, index_file).refresh()
+
+    assert opened['files'] == []
+    assert index.stats == {'unchanged': 3, 'read': 0, 'removed': 0}
+    assert [post['slug'] for post in index.posts()] == ['dankbarkeit', 'kloss-im-hals']
+
+
+def test_changed_added_and_deleted_files_are_picked_up(site, tmp_path):
+    index_file = tmp_path / 'post-index.json'
+    PostIndex(site, index_file).refresh().save()
+
+    changed = site / 'dankbarkeit.html'
+    changed.write_text(page('Dankbarkeit im Alltag'), encoding='utf-8')
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    (site / 'neu.html').write_text(page('Neu'), encoding='utf-8')
+    (site / 'kloss-im-hals.html').unlink()
+
+    index = PostIndex(site, index_file).refresh()
+
+    assert index.stats == {'unchanged': 1, 'read': 2, 'removed': 1}
+    assert [(post['slug'], post['title']) for post in index.posts()] == \
+        [('dankbarkeit', 'Dankbarkeit im Alltag'), ('neu', 'Neu')]
+    assert index.find_title('DANKBARKEIT  im alltag!') == ['dankbarkeit']
+
+
+def test_content_fingerprints_parse_only_new_or_changed_files(site, tmp_path):
+    index_file = tmp_path / 'post-index.json'
+    parsed = []
+
+    def text_of(html):
+        parsed.append(extract_title(html))
+        return migrate.ContentCleaner.html_to_text(html)
+
+    index = PostIndex(site, index_file).refresh()
+    fingerprints = index.content_fingerprints(text_of)
+    index.save()
+
+    assert sorted(parsed) == ['Dankbarkeit | Kathrin Stahl', 'Kloß im Hals & mehr']
+    text = migrate.ContentCleaner.html_to_text((site / 'dankbarkeit.html').read_text(encoding='utf-8'))
+    assert fingerprints['dankbarkeit'] == {'words': len(text.split()), 'simhash': simhash(text)}
+
+    # Warmer Lauf: nichts wird geparst, Ergebnis aus dem Index
+    parsed.clear()
+    index = PostIndex(site, index_file).refresh()
+    assert index.content_fingerprints(text_of) == fingerprints and parsed == []
+
+    changed = site / 'dankbarkeit.html'
+    changed.write_text(page('Dankbarkeit im Alltag'), encoding='utf-8')
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    index.refresh()
+    assert set(index.content_fingerprints(text_of)) == {'dankbarkeit', 'kloss-im-hals'}
+    assert parsed == ['Dankbarkeit im Alltag']
+
+
+def test_missing_head_end_falls_back_to_full_read(tmp_path):
+    html_file = tmp_path / 'kaputt.html'
+    html_file.write_text('<html>' + 'x' * (post_index.MAX_HEAD_SIZE + 10) + '<title>Spät</title>', encoding='utf-8')
+
+    assert post_index.extract_title(post_index.read_head(html_file)) == 'Spät'
+
+
+def test_titles_match_full_file_extraction_on_repo_pages(tmp_path):
+    pages = sorted(REPO_ROOT.glob('*.html'))
+    if not pages:
+        pytest.skip('keine HTML-Seiten im Projekt')
+    for html_file in pages:
+        shutil.copy(html_file, tmp_path / html_file.name)
+
+    index = PostIndex(tmp_path, tmp_path / 'data' / 'post-index.json').refresh()
+
+    for html_file in pages:
+        html = html_file.read_text(encoding='utf-8')
+        head_end = html.find('</head>')
+        og_title = post_index.OG_TITLE_PATTERN.search(html)
+        if og_title and head_end != -1 and og_title.start() > head_end:
+            # og:title nur in einem Script im <body> (z.B. studio.html) – zählt bewusst nicht
+            html = html[:head_end]
+        assert index.get(html_file.stem)['title'] == migrate.ContentCleaner.extract_title(html), html_file.name
+
+
+def test_rename_mapping_reports_collisions(site, tmp_path, monkeypatch):
+    rename_urls = load_script('rename-urls')
+    monkeypatch.setattr(rename_urls, 'URL_MAPPING', {
+        'kloss-im-hals.html': 'dankbarkeit.html',
+        'fehlt.html': 'neu.html',
+        'index.html': 'index.html',
+    })
+    index = PostIndex(site, tmp_path / 'post-index.json').refresh()
+
+    missing, collisions = rename_urls.check_mapping(index)
+
+    assert missing == ['fehlt.html']
+    assert collisions == [('kloss-im-hals.html', 'dankbarkeit.html', 'Dankbarkeit | Kathrin Stahl')]
@@ -0,0 +1,100 @@
+"""
+Tests für --force-all (MigrationOrchestrator in migrate-blog-complete.py):
+bereits migrierte Posts werden nur bei geänderter Quelle oder Template neu gerendert und geschrieben.
+"""
+
+import pytest
+
+from conftest import FIXTURES_DIR, load_script
+
+pytest.importorskip('bs4')
+
+migrate = load_script('migrate-blog-complete')
+
+POST_HTML = (FIXTURES_DIR / 'wordpress' / 'post.html').read_text(encoding='utf-8').replace('{title}', 'Dankbarkeit')
+POST = {'slug': 'dankbarkeit', 'title': 'Dankbarkeit', 'url': 'https://example.org/dankbarkeit/', 'category': 'Selbstliebe'}
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrate, 'OUTPUT_DIR', tmp_path)
+    monkeypatch.setattr(migrate, 'CACHE_FILE', str(tmp_path / 'cache.json'))
+    monkeypatch.setattr(migrate, 'JOURNAL_FILE', tmp_path / 'journal.jsonl')
+    orchestrator = migrate.MigrationOrchestrator(force_all=True, crawler='sync', http_cache=False)
+    orchestrator.cache = {'posts': [], 'last_run': None}
+    with orchestrator.journal:
+        assert orchestrator._migrate_post(POST, POST_HTML)
+    orchestrator._compact_journal()
+    return orchestrator
+
+
+def refresh(orchestrator, html):
+    """Ein Refresh-Durchlauf für POST, danach Journal kompaktiert; gibt (Status, Cache-Eintrag) zurück"""
+    record, = orchestrator.cache['posts']
+    with orchestrator.journal:
+        status = orchestrator._refresh_post(POST, record, html)
+    orchestrator._compact_journal()
+    record, = orchestrator.cache['posts']
+    return status, record
+
+
+def output_file(tmp_path):
+    return tmp_path / 'dankbarkeit.html'
+
+
+def test_unchanged_source_is_neither_rendered_nor_written(orchestrator, tmp_path, monkeypatch):
+    mtime = output_file(tmp_path).stat().st_mtime_ns
+    monkeypatch.setattr(orchestrator.template_gen, 'generate_post_html', lambda post_data: pytest.fail('gerendert'))
+
+    assert refresh(orchestrator, POST_HTML)[0] == 'unchanged'
+    assert output_file(tmp_path).stat().st_mtime_ns == mtime
+
+
+def test_changed_markup_with_same_cleaned_source_is_not_rendered(orchestrator, monkeypatch):
+    html = POST_HTML.replace('</body>', '<script>var nonce = "a1b2";</script></body>')
+    monkeypatch.setattr(orchestrator.template_gen, 'generate_post_html', lambda post_data: pytest.fail('gerendert'))
+
+    status, record = refresh(orchestrator, html)
+
+    assert status == 'unchanged'
+    assert record['html_hash'] == migrate.content_hash(html)
+
+
+def test_changed_content_is_rendered_and_written(orchestrator, tmp_path):
+    html = POST_HTML.replace('Du darfst dir selbst vertrauen.', 'Du darfst dir selbst vertrauen und vergeben.')
+
+    status, record = refresh(orchestrator, html)
+
+    assert status == 'updated'
+    assert 'vertrauen und vergeben' in output_file(tmp_path).read_text(encoding='utf-8')
+    assert record['output_hash'] == migrate.content_hash(output_file(tmp_path).read_text(encoding='utf-8'))
+
+
+def test_template_change_rerenders_all_migrated_posts(orchestrator, tmp_path):
+    header_file = tmp_path / 'header.html'
+    header_file.write_text('<header>Neuer Header</header>', encoding='utf-8')
+    orchestrator.template_gen = migrate.TemplateGenerator(migrate.TEMPLATES_DIR, header_file=header_file)
+
+    assert refresh(orchestrator, POST_HTML)[0] == 'updated'
+    assert '<header>Neuer Header</header>' in output_file(tmp_path).read_text(encoding='utf-8')
+    assert refresh(orchestrator, POST_HTML)[0] == 'unchanged'
+
+
+def test_identical_output_is_not_rewritten(orchestrator, tmp_path):
+    orchestrator.cache['posts'][0]['template_version'] = 'alt'
+    mtime = output_file(tmp_path).stat().st_mtime_ns
+
+    status, record = refresh(orchestrator, POST_HTML)
+
+    assert status == 'unchanged'
+    assert output_file(tmp_path).stat().st_mtime_ns == mtime
+    assert record['template_version'] == orchestrator.template_gen.version
+
+
+def test_only_migrated_posts_with_existing_files_are_refreshed(orchestrator, tmp_path):
+    orchestrator.cache['posts'].append({'slug': 'umbenannt', 'url': 'https://example.org/umbenannt/'})
+    crawled = [POST, {**POST, 'slug': 'umbenannt'}, {**POST, 'slug': 'neu'}, POST]
+
+    refresh = orchestrator._posts_to_refresh(crawled, new_posts=[{'slug': 'neu'}])
+
+    assert [(post['slug'], record['slug']) for post, record in refresh] == [('dankbarkeit', 'dankbarkeit')]
@@ -0,0 +1,117 @@
+"""
+Tests für die REST-Discovery von AsyncBlogCrawler (migrate-blog-complete.py) gegen einen
+Stand-in-Server, der den gespiegelten wp-json Ordner wie die WordPress REST API ausliefert.
+"""
+
+import json
+import math
+from html import unescape
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from conftest import load_script
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+
+migrate = load_script('migrate-blog-complete')
+
+WP_V2 = Path(__file__).parent.parent.parent / 'wp-json' / 'wp' / 'v2'
+MIRRORED_POSTS = [json.loads(path.read_text(encoding='utf-8')) for path in sorted((WP_V2 / 'posts').glob('*.json'))]
+MIRRORED_CATEGORIES = [json.loads(path.read_text(encoding='utf-8')) for path in sorted((WP_V2 / 'categories').glob('*.json'))]
+
+pytestmark = pytest.mark.skipif(not MIRRORED_POSTS, reason='wp-json Spiegel fehlt')
+
+
+def collection_route(items, total_pages_header=True):
+    """/wp/v2/<collection>?per_page=&page=&_fields= wie WordPress (neueste zuerst, X-WP-Total*)"""
+    items = sorted(items, key=lambda item: item.get('date_gmt', ''), reverse=True)
+
+    def route(handler):
+        query = parse_qs(urlparse(handler.path).query)
+        per_page = int(query.get('per_page', ['10'])[0])
+        page = int(query.get('page', ['1'])[0])
+        fields = query['_fields'][0].split(',') if '_fields' in query else None
+        total_pages = max(1, math.ceil(len(items) / per_page))
+        if page > total_pages:
+            return 400, json.dumps({'code': 'rest_post_invalid_page_number'}), {}
+
+        chunk = items[(page - 1) * per_page:page * per_page]
+        if fields:
+            chunk = [{key: item[key] for key in fields if key in item} for item in chunk]
+        headers = {'Content-Type': 'application/json; charset=UTF-8'}
+        if total_pages_header:
+            headers.update({'X-WP-Total': str(len(items)), 'X-WP-TotalPages': str(total_pages)})
+        return 200, json.dumps(chunk), headers
+    return route
+
+
+def rest_routes(**options):
+    return {
+        migrate.REST_POSTS_PATH: collection_route(MIRRORED_POSTS, **options),
+        migrate.REST_CATEGORIES_PATH: collection_route(MIRRORED_CATEGORIES, **options),
+    }
+
+
+def make_crawler(server, **options):
+    return migrate.AsyncBlogCrawler(base_url=server.url, per_host_limit=3, backoff_base=0.01, **options)
+
+
+def test_discovers_all_mirrored_posts_with_metadata(stand_in_server, capsys):
+    server = stand_in_server(rest_routes())
+
+    posts = make_crawler(server, rest_per_page=10).crawl_all_posts()
+
+    assert sorted(post['slug'] for post in posts) == sorted(post['slug'] for post in MIRRORED_POSTS)
+    by_slug = {post['slug']: post for post in posts}
+    categories = {category['id']: category['name'] for category in MIRRORED_CATEGORIES}
+    for mirrored in MIRRORED_POSTS:
+        post = by_slug[mirrored['slug']]
+        assert post['url'] == mirrored['link']
+        assert post['title'] == unescape(mirrored['title']['rendered']).strip()
+        assert post['modified'] == mirrored['modified_gmt']
+        first_category = next(categories[cid] for cid in mirrored['categories'] if cid in categories)
+        assert post['category'] == migrate.CATEGORY_MAPPING.get(first_category, first_category)
+    assert '&#8211;' not in ''.join(post['title'] for post in posts)
+
+
+def test_few_requests_instead_of_listing_pages(stand_in_server, capsys):
+    server = stand_in_server(rest_routes())
+
+    make_crawler(server).crawl_all_posts()
+
+    assert server.count(migrate.REST_POSTS_PATH) == math.ceil(len(MIRRORED_POSTS) / migrate.REST_PER_PAGE)
+    assert server.count('/blog') == 0
+    assert all('_fields=' in path for path in server.requests if path.startswith(migrate.REST_POSTS_PATH))
+
+
+def test_pages_without_total_header_are_followed(stand_in_server, capsys):
+    server = stand_in_server(rest_routes(total_pages_header=False))
+
+    posts = make_crawler(server, rest_per_page=20).crawl_all_posts()
+
+    assert len(posts) == len(MIRRORED_POSTS)
+    assert server.count(migrate.REST_POSTS_PATH) == math.ceil(len(MIRRORED_POSTS) / 20)
+
+
+def test_falls_back_to_post_sitemap(stand_in_server, capsys):
+    sitemap = '<?xml version="1.0"?><urlset>' + ''.join(
+        f"<url><loc>{post['link']}</loc></url>" for post in MIRRORED_POSTS
+    ) + '</urlset>'
+    server = stand_in_server({migrate.POST_SITEMAP_PATH: (200, sitemap, {'Content-Type': 'application/xml'})})
+
+    posts = make_crawler(server).crawl_all_posts()
+
+    assert [post['slug'] for post in posts] == [post['slug'] for post in MIRRORED_POSTS]
+    assert server.count('/blog') == 0
+
+
+def test_falls_back_to_listing_pages(stand_in_server, capsys):
+    server = stand_in_server({'/blog': (200, '<html><body></body></html>', {})})
+
+    assert make_crawler(server).crawl_all_posts() == []
+    assert server.count(migrate.REST_POSTS_PATH) == 1
+    assert server.count(migrate.POST_SITEMAP_PATH) == 1
+    assert server.count('/blog') == 1